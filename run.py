@@ -1,5 +1,9 @@
 import os
 import sys
+import time
+
+# Startup timing starts here (see --startup-profile)
+LAUNCHED = time.perf_counter()
 
 # Ensure the root directory is in the python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -7,8 +11,24 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 if __name__ == "__main__":
+    import multiprocessing
     import traceback
 
+    # Frozen builds re-enter here for the out-of-process hook host
+    multiprocessing.freeze_support()
+
+    # --startup-profile: start up, print import and init-phase timings, exit
+    profile = "--startup-profile" in sys.argv
+    if profile:
+        sys.argv.remove("--startup-profile")
+
+    from src.core import startup_profile
+
+    startup_profile.timeline.start = LAUNCHED
+    import_timer = startup_profile.ImportTimer()
+    if profile:
+        import_timer.install()
+
     # Initialize basic logging first
     try:
         from src.core.logger import get_logger, setup_logger
@@ -16,6 +36,7 @@ if __name__ == "__main__":
         setup_logger()  # Ensure 'piemenu' logger exists with handlers
         logger = get_logger("launcher")
         logger.info("Starting MixedBerryPie via launcher")
+        startup_profile.mark(startup_profile.LOGGING_READY)
     except Exception as e:
         print(f"FAILED TO INITIALIZE LOGGER: {e}")
         traceback.print_exc()
@@ -25,7 +46,18 @@ if __name__ == "__main__":
         # Import App inside the try block to catch import errors
         from src.app import MixedBerryPieApp
 
+        startup_profile.mark(startup_profile.APP_IMPORTED)
         menu = MixedBerryPieApp()
+        if profile:
+            import_timer.uninstall()
+            from PyQt6.QtCore import QTimer
+
+            def finish_profile() -> None:
+                startup_profile.mark(startup_profile.EVENT_LOOP)
+                print(startup_profile.report(startup_profile.timeline, import_timer), flush=True)
+                menu.exit_app()
+
+            QTimer.singleShot(0, finish_profile)
         menu.run()
     except Exception as e:
         error_msg = f"Launcher: Application failed to start: {e}"
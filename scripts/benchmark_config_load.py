@@ -0,0 +1,87 @@
+"""Compare config load time: JSON parsing vs. the validated snapshot.
+
+Usage:
+    python scripts/benchmark_config_load.py [--profiles 40] [--items 8] [--depth 3] [--runs 10]
+
+Writes a synthetic configuration with nested submenus to a temporary
+directory, then times ``load_config`` once with the snapshot removed before
+every run (full JSON parse and validation, plus rewriting the snapshot)
+and once with the snapshot in place.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import config
+from src.core.config import AppSettings, MenuProfile, PieSlice
+
+
+def make_items(count: int, depth: int) -> list[PieSlice]:
+    items = []
+    for i in range(count):
+        children = make_items(count, depth - 1) if depth > 1 and i == 0 else []
+        items.append(
+            PieSlice(
+                label=f"Item {i}",
+                key=f"ctrl+shift+{i % 10}",
+                color="#448AFF",
+                action_type="submenu" if children else "key",
+                icon_path=f"icons/item_{i}.svg",
+                submenu_items=children,
+            )
+        )
+    return items
+
+
+def time_loads(runs: int, *, drop_snapshot: bool) -> list[float]:
+    times = []
+    for _ in range(runs):
+        if drop_snapshot and os.path.exists(config._snapshot_path()):
+            os.remove(config._snapshot_path())
+        start = time.perf_counter()
+        config.load_config()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=40)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.CONFIG_DIR = tmp
+        config.CONFIG_FILE = os.path.join(tmp, "menu_config.json")
+        profiles = [
+            MenuProfile(
+                name=f"Profile {p}",
+                trigger_key=f"ctrl+f{p % 12 + 1}",
+                items=make_items(args.items, args.depth),
+                target_apps=[f"app{p}.exe"],
+            )
+            for p in range(args.profiles)
+        ]
+        config.save_config(profiles, AppSettings())
+        size_kb = os.path.getsize(config.CONFIG_FILE) / 1024
+
+        print(f"config: {args.profiles} profiles, {size_kb:.0f} KB")
+        for label, drop in (("json", True), ("snapshot", False)):
+            times = time_loads(args.runs, drop_snapshot=drop)
+            print(
+                f"{label:<10} median={statistics.median(times):.2f}ms "
+                f"min={min(times):.2f}ms max={max(times):.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
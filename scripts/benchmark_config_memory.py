@@ -0,0 +1,103 @@
+"""Measure the memory held by a loaded configuration.
+
+Usage:
+    python scripts/benchmark_config_memory.py [--slices 50000] [--profiles 50]
+
+Writes a synthetic configuration of about ``--slices`` slices (nested
+submenus, colors from a small palette, a few hundred icon paths) to a
+temporary directory and loads it twice: once from the JSON, once from the
+snapshot. For each load, tracemalloc reports the memory retained by the
+returned profiles (every submenu is built while loading) and the peak
+during the load.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import config
+from src.core.config import AppSettings, MenuProfile, PieSlice
+
+PALETTE = ["#FF1744", "#D500F9", "#2979FF", "#E91E63", "#673AB7", "#3F51B5", "#448AFF"]
+ICON_COUNT = 300
+FAN_OUT = 8
+
+
+def make_items(budget: list[int], depth: int, seed: int) -> list[PieSlice]:
+    """Up to FAN_OUT slices, the first of which opens a submenu while budget lasts."""
+    items = []
+    for i in range(FAN_OUT):
+        if budget[0] <= 0:
+            break
+        budget[0] -= 1
+        n = seed * FAN_OUT + i
+        children = make_items(budget, depth - 1, n) if depth > 1 and i < 2 else []
+        items.append(
+            PieSlice(
+                label=f"Item {n}",
+                key=f"ctrl+shift+{n % 10}",
+                color=PALETTE[n % len(PALETTE)],
+                action_type="submenu" if children else "key",
+                icon_path=f"icons/icon_{n % ICON_COUNT}.svg",
+                submenu_items=children,
+            )
+        )
+    return items
+
+
+def walk(items: list[PieSlice]) -> int:
+    return sum(1 + walk(item.submenu_items) for item in items)
+
+
+def measure(label: str, drop_snapshot: bool) -> None:
+    if drop_snapshot:
+        os.remove(config._snapshot_path())
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    profiles, _ = config.load_config()
+    gc.collect()
+    loaded, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = sum(walk(p.items) for p in profiles)
+    print(
+        f"{label:<9} slices={count} retained={(loaded - base) / 2**20:.1f} MiB "
+        f"({(loaded - base) / count:.0f} B/slice) peak={(peak - base) / 2**20:.1f} MiB"
+    )
+    del profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slices", type=int, default=50_000)
+    parser.add_argument("--profiles", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.CONFIG_DIR = tmp
+        config.CONFIG_FILE = os.path.join(tmp, "menu_config.json")
+        per_profile = args.slices // args.profiles
+        profiles = []
+        for p in range(args.profiles):
+            budget = [per_profile]
+            items: list[PieSlice] = []
+            while budget[0] > 0:
+                items.extend(make_items(budget, 6, len(items)))
+            profiles.append(MenuProfile(name=f"Profile {p}", trigger_key="f1", items=items))
+        config.save_config(profiles, AppSettings())
+        del profiles, items
+        size_mb = os.path.getsize(config.CONFIG_FILE) / 2**20
+        print(f"config: {args.profiles} profiles, {size_mb:.1f} MiB")
+
+        measure("json", drop_snapshot=True)
+        measure("snapshot", drop_snapshot=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare keyboard hook decision latency in-process vs. out-of-process.
+
+Usage:
+    python scripts/benchmark_hook_latency.py [--events 500] [--interval-ms 2]
+
+Synthetic key events are fed through the hook filter on a fixed schedule
+while the main thread keeps repainting the pie overlay, which is what holds
+the GIL during real use. For each mode the time from an event's scheduled
+arrival to the filter's verdict is reported as p50/p99/max.
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _percentile(sorted_ns: list[int], pct: float) -> float:
+    idx = min(len(sorted_ns) - 1, int(pct / 100 * len(sorted_ns)))
+    return sorted_ns[idx] / 1000
+
+
+def _report(label: str, latencies: list[int] | None) -> None:
+    if not latencies:
+        print(f"{label:<16} no result")
+        return
+    data = sorted(latencies)
+    print(
+        f"{label:<16} p50={_percentile(data, 50):8.1f}us  "
+        f"p99={_percentile(data, 99):8.1f}us  max={data[-1] / 1000:8.1f}us"
+    )
+
+
+def _paint_until(done: threading.Event) -> int:
+    """Repaint the overlay on this (GUI) thread until ``done`` is set."""
+    from PyQt6.QtWidgets import QApplication
+
+    from src.core.config import DEFAULT_ITEMS, AppSettings
+    from src.ui.overlay import PieOverlay
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    overlay = PieOverlay(DEFAULT_ITEMS, AppSettings())
+    frames = 0
+    while not done.is_set():
+        overlay.grab()
+        app.processEvents()
+        frames += 1
+    return frames
+
+
+def _run_under_paint_load(measure) -> list[int] | None:
+    result: list[list[int] | None] = [None]
+    done = threading.Event()
+
+    def worker() -> None:
+        try:
+            result[0] = measure()
+        finally:
+            done.set()
+
+    threading.Thread(target=worker, daemon=True).start()
+    frames = _paint_until(done)
+    print(f"  ({frames} overlay repaints during measurement)")
+    return result[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500, help="Synthetic events per mode")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Spacing between events")
+    args = parser.parse_args()
+
+    from src.core.hook_host import measure_event_latency
+    from src.core.hook_manager import HookManager, OutOfProcessHookManager
+
+    triggers = ["ctrl+space"]
+    interval_s = args.interval_ms / 1000
+    timeout = args.events * interval_s + 30
+
+    in_proc = HookManager(on_trigger_press=lambda _t: None, on_trigger_release=lambda _t: True)
+    in_proc._table.set_triggers(triggers)
+    in_latencies = _run_under_paint_load(
+        lambda: measure_event_latency(in_proc._win32_event_filter, args.events, interval_s)
+    )
+
+    out_proc = OutOfProcessHookManager(
+        on_trigger_press=lambda _t: None, on_trigger_release=lambda _t: True
+    )
+    out_proc.start_hook(triggers)
+    try:
+        if not out_proc.wait_ready(timeout=30):
+            print("Hook host did not start")
+            sys.exit(1)
+        out_latencies = _run_under_paint_load(
+            lambda: out_proc.run_benchmark(args.events, interval_s, timeout)
+        )
+    finally:
+        out_proc.stop_hook()
+
+    _report("in-process", in_latencies)
+    _report("out-of-process", out_latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare key sequence pacing: cumulative sleeps vs. the deadline scheduler.
+
+Usage:
+    python scripts/benchmark_key_timing.py [--delay-ms 2] [--steps 8] [--runs 20]
+
+Runs a no-op key sequence with the real clock, once pacing each step with
+``time.sleep(delay)`` as _do_execute used to, once with
+KeySequenceScheduler, and reports the requested interval next to the
+achieved mean interval and the worst jitter.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.key_timing import KeySequenceScheduler, SequenceTiming
+
+
+def naive(steps: int, delay_s: float) -> SequenceTiming:
+    timing = SequenceTiming(delay_s)
+    start = time.perf_counter()
+    for _ in range(steps):
+        timing.offsets.append(time.perf_counter() - start)
+        time.sleep(delay_s)
+    return timing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay-ms", type=float, default=2.0)
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    delay_s = args.delay_ms / 1000
+
+    scheduler = KeySequenceScheduler()
+    sleeps = [naive(args.steps, delay_s) for _ in range(args.runs)]
+    for _ in range(args.runs):
+        scheduler.run([lambda: None] * args.steps, delay_s)
+
+    for label, timings in (("sleep", sleeps), ("scheduler", list(scheduler.recent))):
+        mean = sum(t.mean_interval_ms for t in timings) / len(timings)
+        worst = max(t.jitter_ms for t in timings)
+        print(
+            f"{label:<10} requested={args.delay_ms:.2f}ms achieved={mean:.2f}ms "
+            f"worst_jitter={worst:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure text action throughput (characters per second) for 1 KB and 10 KB strings.
+
+Usage:
+    python scripts/benchmark_text_injection.py [--call-us 30] [--runs 5]
+    python scripts/benchmark_text_injection.py --send   # Windows: really types!
+
+Compares typing a string with one SendInput call per key event (what a
+per-character key action costs) against the chunked KEYEVENTF_UNICODE
+batches of the ``text`` action. By default SendInput is a stand-in that
+charges a fixed cost per call, so compilation and ctypes marshalling are
+measured on any platform. With ``--send`` (Windows only) the real user32
+is used: focus an empty editor window within the countdown.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.win32_input import (
+    compile_text,
+    send_input_chunks,
+    send_inputs,
+    text_inputs,
+)
+
+SAMPLE = "Lorem ipsum dolor sit amet, äöü ß € 日本語 😀\n"
+
+
+class CostlyUser32:
+    """SendInput stand-in that busy-waits a fixed cost per call."""
+
+    def __init__(self, call_us: float) -> None:
+        self.call_ns = int(call_us * 1000)
+        self.calls = 0
+
+    def SendInput(self, count: int, _inputs: object, _size: int) -> int:
+        self.calls += 1
+        end = time.perf_counter_ns() + self.call_ns
+        while time.perf_counter_ns() < end:
+            pass
+        return count
+
+    def MapVirtualKeyW(self, vk: int, _map_type: int) -> int:
+        return vk
+
+
+def make_text(size: int) -> str:
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+
+def per_event(text: str, api: Any) -> None:
+    for group in text_inputs(text, api.MapVirtualKeyW):
+        for record in group:
+            send_inputs([record], api)
+
+
+def batched(text: str, api: Any) -> None:
+    chunks = compile_text(text, api)
+    assert chunks is not None
+    send_input_chunks(chunks, api)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--call-us", type=float, default=30.0, help="Cost per SendInput call")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--send", action="store_true", help="Inject for real (Windows only)")
+    args = parser.parse_args()
+
+    if args.send:
+        if sys.platform != "win32":
+            parser.error("--send requires Windows")
+        print("Focus an empty editor window; typing starts in 5 seconds...")
+        time.sleep(5)
+        api: Any = None  # compile_text/send_input_chunks default to the real user32
+        modes = [("batched", batched)]
+        runs = 1
+    else:
+        api = CostlyUser32(args.call_us)
+        modes = [("per-event", per_event), ("batched", batched)]
+        runs = args.runs
+
+    for size in (1024, 10 * 1024):
+        text = make_text(size)
+        for label, func in modes:
+            best = float("inf")
+            for _ in range(runs):
+                start = time.perf_counter()
+                func(text, api)
+                best = min(best, time.perf_counter() - start)
+            print(f"{size // 1024:>3} KB {label:<10} {len(text) / best:>12,.0f} chars/s")
+
+
+if __name__ == "__main__":
+    main()
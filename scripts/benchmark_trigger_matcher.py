@@ -0,0 +1,74 @@
+"""Measure per-event trigger matching cost against the number of triggers.
+
+Usage:
+    python scripts/benchmark_trigger_matcher.py [--events 200000]
+
+Builds trigger tables with growing numbers of chord and two-stroke
+sequence triggers and times TriggerTable.process over a fixed stream of
+ordinary typing. The cost per event should stay flat as triggers grow.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.trigger_table import WM_KEYDOWN, WM_KEYUP, TriggerTable
+
+_MODS = ["ctrl", "alt", "shift", "ctrl+shift", "ctrl+alt", "alt+shift"]
+_KEYS = [chr(c) for c in range(ord("a"), ord("z") + 1)] + [f"f{i}" for i in range(1, 13)]
+
+
+def make_triggers(count: int) -> list[str]:
+    """Mix of single chords and "chord, key" sequences."""
+    triggers: list[str] = []
+    for mod, key, second in itertools.product(_MODS, _KEYS, _KEYS):
+        if len(triggers) >= count:
+            break
+        triggers.append(f"{mod}+{key}, {second}")
+    return triggers
+
+
+def make_stream(events: int) -> list[tuple[int, int]]:
+    """Plain typing with occasional ctrl chords (mostly non-matching)."""
+    stream: list[tuple[int, int]] = []
+    vks = [0x41 + i for i in range(26)]
+    for i in itertools.count():
+        if len(stream) >= events:
+            break
+        vk = vks[i % len(vks)]
+        if i % 10 == 0:
+            stream += [(WM_KEYDOWN, 0xA2), (WM_KEYDOWN, vk), (WM_KEYUP, vk), (WM_KEYUP, 0xA2)]
+        else:
+            stream += [(WM_KEYDOWN, vk), (WM_KEYUP, vk)]
+    return stream[:events]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Modifier add/remove logs would dominate the measurement
+    logging.disable(logging.INFO)
+
+    stream = make_stream(args.events)
+    print(f"{'triggers':>9}  {'ns/event':>9}")
+    for count in (1, 10, 100, 1000, 5000):
+        table = TriggerTable()
+        table.set_triggers(make_triggers(count))
+        process = table.process
+        start = time.perf_counter_ns()
+        for msg, vk in stream:
+            process(msg, vk)
+        elapsed = time.perf_counter_ns() - start
+        print(f"{count:>9}  {elapsed / len(stream):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
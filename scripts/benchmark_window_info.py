@@ -0,0 +1,76 @@
+"""Benchmark cached foreground window lookups on a synthetic focus pattern.
+
+Usage:
+    python scripts/benchmark_window_info.py [--presses 10000] [--query-us 40]
+
+Drives WindowInfoProvider with FakeWindowSystem, charging a fixed cost
+per uncached OS query (window title, process open) to stand in for the
+Win32 calls, and reports hit rates and mean lookup time with and without
+caching.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.window_info import FakeWindowSystem, WindowInfoProvider
+
+
+class SlowFakeWindowSystem(FakeWindowSystem):
+    """Fake whose title and process queries busy-wait like real syscalls."""
+
+    def __init__(self, query_ns: int) -> None:
+        super().__init__()
+        self.query_ns = query_ns
+
+    def _spin(self) -> None:
+        end = time.perf_counter_ns() + self.query_ns
+        while time.perf_counter_ns() < end:
+            pass
+
+    def window_title(self, hwnd: int) -> str:
+        self._spin()
+        return super().window_title(hwnd)
+
+    def open_process(self, pid: int) -> tuple[str, Any] | None:
+        self._spin()
+        return super().open_process(pid)
+
+
+def run(presses: int, query_us: float, title_ttl_s: float, cache: bool) -> WindowInfoProvider:
+    rng = random.Random(42)  # noqa: S311
+    system = SlowFakeWindowSystem(int(query_us * 1000))
+    provider = WindowInfoProvider(
+        system, title_ttl_s=title_ttl_s if cache else 0.0, max_processes=64 if cache else 0
+    )
+    apps = [(hwnd, 1000 + hwnd, f"Window {hwnd}", f"app{hwnd}.exe") for hwnd in range(1, 9)]
+    current = apps[0]
+    for _ in range(presses):
+        # Users mostly press triggers repeatedly in the same window
+        if rng.random() < 0.1:
+            current = rng.choice(apps)
+        system.focus(*current)
+        provider.get_active_window_info()
+    return provider
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--presses", type=int, default=10_000)
+    parser.add_argument("--query-us", type=float, default=40.0, help="Cost per uncached query")
+    parser.add_argument("--title-ttl", type=float, default=0.25)
+    args = parser.parse_args()
+
+    for label, cache in (("uncached", False), ("cached", True)):
+        provider = run(args.presses, args.query_us, args.title_ttl, cache)
+        print(f"{label:<9} {provider.stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
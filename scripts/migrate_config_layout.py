@@ -0,0 +1,40 @@
+"""Convert the local configuration between the single-file and sharded layouts.
+
+Usage:
+    python scripts/migrate_config_layout.py sharded   # manifest + one file per profile
+    python scripts/migrate_config_layout.py single    # one menu_config.json
+
+Close MixedBerryPie first: it writes the configuration in the layout it
+finds on disk.
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import config, config_shards
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("layout", choices=["sharded", "single"])
+    args = parser.parse_args()
+
+    if args.layout == "sharded":
+        migrated = config_shards.migrate_to_shards()
+        target = f"{config_shards.manifest_path()} + {config_shards.shard_dir()}"
+    else:
+        migrated = config_shards.migrate_to_single_file()
+        target = config.CONFIG_FILE
+    if migrated:
+        print(f"Migrated configuration to: {target}")
+        return 0
+    print("Nothing migrated (already in that layout, or the conversion failed; see the log).")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
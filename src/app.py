@@ -1,29 +1,44 @@
 import atexit
 import os
-import shlex
 import signal
 import subprocess
 import sys
-import threading
-import time
 import webbrowser
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from PyQt6.QtCore import QObject, Qt, QTimer, QUrl, pyqtSignal
 from PyQt6.QtGui import QDesktopServices, QIcon
 from PyQt6.QtWidgets import QApplication, QMenu, QMessageBox, QSystemTrayIcon
 
-from src.core import config, i18n
-from src.core.config import MenuProfile
-from src.core.hook_manager import HookManager, _parse_key
+from src.core import i18n, startup_profile
+from src.core.action_executor import ActionExecutor
+from src.core.action_plan import ActionPlanCache
+from src.core.config import AppSettings, MenuProfile, icon_history
+from src.core.config_store import SETTING_CHANGED, ConfigChange, ConfigStore
+from src.core.config_writer import ConfigWriter
+from src.core.direct_actions import DirectActionTable
+from src.core.focus_tracker import ProfilePreResolver, create_default_focus_source
+from src.core.hook_manager import HookManager, OutOfProcessHookManager
+from src.core.hook_recorder import default_recording_path
+from src.core.key_timing import default_scheduler
 from src.core.logger import LOGS_DIR, get_logger, set_file_logging
+from src.core.marking_menu import MarkingMenu, create_default_cursor_source
+from src.core.profile_resolver import ProfileResolver
 from src.core.utils import get_resource_path
 from src.core.version import __version__
-from src.core.win32_input import get_active_window_info, send_pynput_key_safely
-from src.ui.help_dialog import HelpDialog
+from src.core.win32_input import (
+    chord_plan,
+    send_compiled_plan,
+    send_input_chunks,
+    send_key_plan,
+    send_text,
+)
+from src.core.window_info import create_default_provider
 from src.ui.overlay import PieOverlay
-from src.ui.settings_ui import SettingsWindow
-from src.ui.welcome_dialog import WelcomeDialog
+
+if TYPE_CHECKING:
+    # Imported on first use: none of them is needed until the user opens it
+    from src.ui.settings_ui import SettingsWindow
 
 # Use a unique name to avoid shadowing/scoping issues
 app_logger = get_logger("piemenu.app")
@@ -54,15 +69,29 @@ class MixedBerryPieApp(QObject):
             self.app = QApplication(sys.argv)
         else:
             self.app = cast(QApplication, app_instance)
+        startup_profile.mark(startup_profile.QAPPLICATION)
         QApplication.setQuitOnLastWindowClosed(False)  # Keep app running even if window is hidden
         self.app.setApplicationName("MixedBerryPie")
         self.app.setApplicationVersion(__version__)
 
-        # Config
-        self.profiles, self.settings = config.load_config()
+        # Config: one store shared with the settings window and help dialog,
+        # saved write-behind so editing never blocks on serialization
+        self.config_store = ConfigStore(writer=ConfigWriter())
+        self.config_store.load()
+        startup_profile.mark(startup_profile.CONFIG_LOADED)
         # Initialize file logging after loading config
         set_file_logging(self.settings.enable_file_logging)
+        self._profile_resolver: ProfileResolver | None = None
         app_logger.info(f"Loaded {len(self.profiles)} menu profiles")
+        # Slice actions are compiled once per configuration load
+        self.action_plans = ActionPlanCache()
+        self.direct_actions = DirectActionTable([])
+        self.compile_actions()
+        startup_profile.mark(startup_profile.ACTIONS_COMPILED)
+        # Overlay-free actions: profile of the open menu, last action per profile
+        self.menu_profile: MenuProfile | None = None
+        self.last_actions: dict[str, tuple[str, str]] = {}
+        self._direct_consumed: dict[str, bool] = {}
 
         # Initialize translator
         i18n.install_translator(self.app, self.settings.language)
@@ -70,8 +99,17 @@ class MixedBerryPieApp(QObject):
         # Components
         # We start with empty items, will populate on-the-fly when triggered
         self.overlay = PieOverlay([], self.settings)
+        startup_profile.mark(startup_profile.OVERLAY_CREATED)
         self.settings_window: SettingsWindow | None = None
-        self.hook_manager = HookManager(
+        self.window_info = create_default_provider()
+        self.preresolver: ProfilePreResolver | None = None
+        self.marking_menu: MarkingMenu | None = None
+        # Actions run one at a time, in selection order, off the GUI thread
+        self.action_executor = ActionExecutor()
+        # The out-of-process host only makes sense with the native Win32 hook
+        use_host = self.settings.out_of_process_hook and sys.platform == "win32"
+        hook_manager_cls = OutOfProcessHookManager if use_host else HookManager
+        self.hook_manager = hook_manager_cls(
             on_trigger_press=self.on_trigger_press, on_trigger_release=self.on_trigger_release
         )
 
@@ -81,14 +119,20 @@ class MixedBerryPieApp(QObject):
         self.pending_profile: MenuProfile | None = None
 
         self.setup_tray()
+        startup_profile.mark(startup_profile.TRAY_READY)
         self.setup_signals()
         self.setup_shutdown_handlers()
 
         self.is_menu_visible = False
 
         # Start Hook for all profiles
-        trigger_keys = [p.trigger_key for p in self.profiles if p.trigger_key]
-        self.hook_manager.start_hook(trigger_keys)
+        self.hook_manager.start_hook(self.hook_trigger_keys(), self.sequence_timeouts())
+        startup_profile.mark(startup_profile.HOOK_INSTALLED)
+        self.apply_hook_recording()
+        self.apply_profile_preresolution()
+        self.apply_expert_mode()
+        self.config_store.subscribe(self._on_config_changed)
+        startup_profile.mark(startup_profile.APP_INITIALIZED)
         app_logger.info("Application initialized successfully")
 
         # Check for first run
@@ -101,13 +145,14 @@ class MixedBerryPieApp(QObject):
 
     def show_welcome_dialog(self) -> None:
         """Show the welcome dialog and update first_run flag."""
+        from src.ui.welcome_dialog import WelcomeDialog
+
         app_logger.info("First run detected, showing welcome dialog")
         dialog = WelcomeDialog()
         dialog.exec()
 
         # Update flag
-        self.settings.first_run = False
-        config.save_config(self.profiles, self.settings)
+        self.config_store.update_settings(first_run=False)
 
     def setup_shutdown_handlers(self) -> None:
         """Setup graceful shutdown handlers for signals and exit."""
@@ -144,6 +189,7 @@ class MixedBerryPieApp(QObject):
         self.key_signal.do_show_signal.connect(  # type: ignore
             self._do_show_overlay_dynamic, Qt.ConnectionType.QueuedConnection
         )
+        self.long_press_timer.timeout.connect(self._on_long_press_timeout)
 
         # Overlay signals
         self.overlay.action_selected.connect(self._on_action_selected)
@@ -192,33 +238,40 @@ class MixedBerryPieApp(QObject):
         """Open the settings configuration window."""
         app_logger.info("Opening settings window")
         if not self.settings_window:
+            from src.ui.settings_ui import SettingsWindow
+
             self.settings_window = SettingsWindow(
                 on_save_callback=self.save_settings,
                 on_suspend_hooks=self.suspend_hooks_for_recording,
                 on_resume_hooks=self.resume_hooks_after_recording,
+                store=self.config_store,
             )
         self.settings_window.show()
         self.settings_window.activateWindow()
 
     def suspend_hooks_for_recording(self) -> None:
-        """Temporarily stop hooks to allow key recording."""
-        self.hook_manager.stop_hook()
+        """Let all keys through to the settings window while a shortcut is recorded."""
+        self.hook_manager.set_recording_mode(True)
 
     def resume_hooks_after_recording(self) -> None:
-        """Resume hooks after recording."""
-        self.update_hooks()
+        """Resume trigger handling after recording."""
+        self.hook_manager.set_recording_mode(False)
 
     def save_settings(self) -> None:
         """Callback from settings window when settings are saved."""
-        self.reload_config()
+        # Commits to the shared store were already applied through change
+        # events; this only reloads if the file was written some other way
+        self.config_store.refresh()
         if self.settings_window:
             self.settings_window.raise_()
             self.settings_window.activateWindow()
 
     def open_help(self) -> None:
         """Open help dialog."""
+        from src.ui.help_dialog import HelpDialog
+
         app_logger.info("Opening help dialog")
-        help_dialog = HelpDialog(None)
+        help_dialog = HelpDialog(None, store=self.config_store)
         help_dialog.exec()
 
     def open_logs(self) -> None:
@@ -231,27 +284,145 @@ class MixedBerryPieApp(QObject):
             QMessageBox.warning(None, "Error", self.tr("Logs directory not found."))
 
     def update_hooks(self) -> None:
-        """Re-calculate and start hooks based on current profiles."""
-        triggers = {p.trigger_key for p in self.profiles if p.trigger_key}
-        self.hook_manager.start_hook(list(triggers))
+        """Re-calculate triggers from current profiles and apply them to the running hook."""
+        self.hook_manager.update_triggers(self.hook_trigger_keys(), self.sequence_timeouts())
+
+    def hook_trigger_keys(self) -> list[str]:
+        """Menu triggers followed by direct hotkeys and repeat keys, without duplicates."""
+        triggers = [p.trigger_key for p in self.profiles if p.trigger_key]
+        return list(dict.fromkeys([*triggers, *self.direct_actions.keys]))
+
+    def sequence_timeouts(self) -> dict[str, float]:
+        """Seconds allowed between strokes, per trigger (profile override or app default)."""
+        default_ms = self.settings.sequence_timeout_ms
+        timeouts = dict.fromkeys(self.direct_actions.keys, default_ms / 1000)
+        timeouts.update(
+            (p.trigger_key, (p.sequence_timeout_ms or default_ms) / 1000)
+            for p in self.profiles
+            if p.trigger_key
+        )
+        return timeouts
+
+    def apply_hook_recording(self) -> None:
+        """Start a fresh hook event recording or stop it, per settings."""
+        if self.settings.record_hook_events:
+            self.hook_manager.start_recording(default_recording_path())
+        elif self.hook_manager.is_recording:
+            self.hook_manager.stop_recording()
+
+    def apply_profile_preresolution(self) -> None:
+        """Start, refresh or stop focus-driven profile pre-resolution, per settings."""
+        if not self.settings.preresolve_profiles:
+            if self.preresolver is not None:
+                self.preresolver.stop()
+                self.preresolver = None
+            return
+        if self.preresolver is not None:
+            self.preresolver.refresh()
+            return
+        source = create_default_focus_source()
+        if source is None:
+            app_logger.info("Profile pre-resolution is not supported on this platform")
+            return
+        self.preresolver = ProfilePreResolver(
+            source, self.window_info, lambda: self.profile_resolver
+        )
+        self.preresolver.start()
+
+    def apply_expert_mode(self) -> None:
+        """Create or drop the marking-menu stroke recognizer, per settings."""
+        if not self.settings.expert_mode:
+            if self.marking_menu is not None:
+                app_logger.info(f"Expert mode: {self.marking_menu.stats.summary()}")
+                self.marking_menu = None
+            return
+        if self.marking_menu is None:
+            source = create_default_cursor_source()
+            if source is None:
+                app_logger.info("Expert mode is not supported on this platform")
+                return
+            self.marking_menu = MarkingMenu(source)
+        self.marking_menu.min_stroke_px = self.settings.expert_min_stroke_px
+
+    @property
+    def profile_resolver(self) -> ProfileResolver:
+        """Compiled trigger → profile rules for the current configuration."""
+        if self._profile_resolver is None:
+            self._profile_resolver = ProfileResolver(self.profiles)
+        return self._profile_resolver
+
+    def compile_actions(self) -> None:
+        """Compile every slice action and direct key; problems are reported here, not on use."""
+        try:
+            self.action_plans.rebuild(self.profiles)
+        except Exception as e:
+            # Plans are then compiled on first use instead
+            app_logger.error(f"Failed to compile actions: {e}", exc_info=True)
+        try:
+            self.direct_actions = DirectActionTable(self.profiles)
+        except Exception as e:
+            app_logger.error(f"Failed to compile direct keys: {e}", exc_info=True)
+            self.direct_actions = DirectActionTable([])
+
+    @property
+    def profiles(self) -> tuple[MenuProfile, ...]:
+        return self.config_store.profiles
+
+    @property
+    def settings(self) -> AppSettings:
+        return self.config_store.settings
 
     def reload_config(self) -> None:
-        """Reload configuration from disk and update components."""
+        """Reload configuration from disk; components update through change events."""
         app_logger.info("Reloading configuration")
-        self.profiles, self.settings = config.load_config()
-        set_file_logging(self.settings.enable_file_logging)
-        self.overlay.update_settings(self.settings)
-        self.update_hooks()
-        app_logger.info("Config reloaded successfully")
+        changes = self.config_store.load()
+        app_logger.info(f"Config reloaded successfully ({len(changes)} change(s))")
+
+    def _on_config_changed(self, changes: list[ConfigChange]) -> None:
+        """Update only the components affected by a batch of config changes."""
+        fields = {c.name for c in changes if c.kind == SETTING_CHANGED}
+        profiles_changed = any(c.kind != SETTING_CHANGED for c in changes)
+
+        if "enable_file_logging" in fields:
+            set_file_logging(self.settings.enable_file_logging)
+        if profiles_changed:
+            self._profile_resolver = None
+            self.compile_actions()
+        if fields:
+            self.overlay.update_settings(self.settings)
+        if profiles_changed or "sequence_timeout_ms" in fields:
+            self.update_hooks()
+        if "record_hook_events" in fields:
+            self.apply_hook_recording()
+        if profiles_changed or "preresolve_profiles" in fields:
+            self.apply_profile_preresolution()
+        if fields & {"expert_mode", "expert_min_stroke_px"}:
+            self.apply_expert_mode()
+        if fields & {"language", "out_of_process_hook"}:
+            app_logger.info("Language and hook process changes apply after a restart")
 
     def cleanup(self) -> None:
         """Cleanup resources before exit."""
         app_logger.info("Cleaning up resources")
         try:
+            self.hook_manager.stop_recording()
             self.hook_manager.unhook_all()
             app_logger.info("Hooks cleaned up successfully")
+            self.action_executor.shutdown()
+            if default_scheduler.recent:
+                app_logger.info(f"Key sequence pacing: {default_scheduler.summary()}")
+            if self.preresolver is not None:
+                self.preresolver.stop()
+            if self.marking_menu is not None and self.marking_menu.stats.presses:
+                app_logger.info(f"Expert mode: {self.marking_menu.stats.summary()}")
+            if self.window_info.stats.lookups:
+                app_logger.info(f"Window info cache: {self.window_info.stats.summary()}")
+            self.window_info.clear()
         except Exception as e:
             app_logger.error(f"Error during cleanup: {e}")
+        # Pending config and icon history changes are written even if the steps above failed
+        self.config_store.close()
+        icon_history().close()
 
     def exit_app(self) -> None:
         """Terminate the application."""
@@ -259,48 +430,52 @@ class MixedBerryPieApp(QObject):
         self.cleanup()
         self.app.quit()
 
+    def resolve_profile(self, trigger_key: str) -> MenuProfile | None:
+        """Profile to open for a trigger in the foreground application."""
+        found, profile = self.preresolver.lookup(trigger_key) if self.preresolver else (False, None)
+        if not found:
+            active_exe, active_title = self.window_info.get_active_window_info()
+            app_logger.debug(f"Active App: {active_exe}, Title: {active_title}")
+            profile = self.profile_resolver.resolve(trigger_key, active_exe, active_title)
+        return profile
+
     def on_trigger_press(self, trigger_key: str) -> None:
         """Handle trigger key press event."""
         app_logger.info(f"App: Trigger press callback for '{trigger_key}'")
+        if trigger_key in self.direct_actions:
+            self._direct_consumed[trigger_key] = self._run_direct_action(trigger_key)
+            return
         if not self.is_menu_visible and not self.pending_profile:
-            active_exe, active_title = get_active_window_info()
-            app_logger.debug(f"Active App: {active_exe}, Title: {active_title}")
-
-            matches = [p for p in self.profiles if p.trigger_key == trigger_key]
-            if not matches:
-                return
-
-            selected_profile: MenuProfile | None = None
-            if active_exe:
-                for p in matches:
-                    if p.target_apps:
-                        is_match = False
-                        for target in p.target_apps:
-                            target = target.lower()
-                            if target in active_exe or (
-                                active_title and target in active_title.lower()
-                            ):
-                                is_match = True
-                                break
-                        if is_match:
-                            selected_profile = p
-                            break
-            if not selected_profile:
-                selected_profile = next((p for p in matches if not p.target_apps), None)
-
+            selected_profile = self.resolve_profile(trigger_key)
             if selected_profile:
                 app_logger.info(f"App: Matching profile found: {selected_profile.name}")
                 delay = self.settings.long_press_delay_ms
+                if self.marking_menu is not None:
+                    # Strokes are recognized until the menu would appear
+                    self.marking_menu.begin()
+                    delay = max(delay, self.settings.expert_timeout_ms)
                 if delay <= 0:
                     self.key_signal.do_show_signal.emit(selected_profile)
                 else:
                     self.pending_profile = selected_profile
                     self.key_signal.timer_start_signal.emit(delay)
 
+    def _on_long_press_timeout(self) -> None:
+        """Trigger held past the long-press delay (or expert timeout): show the menu."""
+        profile, self.pending_profile = self.pending_profile, None
+        if profile is None:
+            return
+        if self.marking_menu is not None:
+            self.marking_menu.fall_back_to_menu()
+        self._do_show_overlay_dynamic(profile)
+
     def _do_show_overlay_dynamic(self, payload: Any) -> None:
         """Actually show the overlay using a profile or direct list of items."""
         if isinstance(payload, MenuProfile):
             app_logger.info(f"App: _do_show_overlay called for profile: {payload.name}")
+            # A new menu supersedes actions still waiting for their delay
+            self.action_executor.cancel_pending()
+            self.menu_profile = payload
             self.overlay.menu_items = payload.items
         else:
             # Assumed to be list[PieSlice] for submenus
@@ -312,12 +487,46 @@ class MixedBerryPieApp(QObject):
         self.is_menu_visible = True
         self.key_signal.show_signal.emit()
 
+    def _run_direct_action(self, key: str) -> bool:
+        """Run the action bound to a direct key. Returns False if nothing applied."""
+        binding = self.direct_actions.resolve(key, *self.window_info.get_active_window_info())
+        if binding is None:
+            app_logger.debug(f"Direct key '{key}' has no binding for the active app")
+            return False
+        if binding.item is not None:
+            action = (binding.item.key, binding.item.action_type)
+            label = f"hotkey:{binding.item.key}"
+        else:
+            last = self.last_actions.get(binding.profile.name)
+            if last is None:
+                app_logger.info(f"Repeat key '{key}': no action chosen yet")
+                return False
+            action = last
+            label = f"repeat:{last[0]}"
+        # No overlay to hide, so no action_delay_ms either
+        self._queue_action(binding.profile, *action, delay_s=0.0, label=label)
+        return True
+
     def on_trigger_release(self, trigger_key: str) -> bool:
         """Handle trigger key release."""
+        if trigger_key in self._direct_consumed:
+            return self._direct_consumed.pop(trigger_key)
         self.key_signal.timer_stop_signal.emit()
         if self.pending_profile:
             app_logger.debug(f"Trigger {trigger_key} released BEFORE long press delay")
-            self.pending_profile = None
+            profile, self.pending_profile = self.pending_profile, None
+            if self.marking_menu is not None:
+                item = self.marking_menu.finish(profile.items)
+                if item is not None:
+                    # No overlay to hide, so no action_delay_ms either
+                    self._queue_action(
+                        profile,
+                        item.key,
+                        item.action_type,
+                        delay_s=0.0,
+                        label=f"stroke:{item.key}",
+                    )
+                    return True
             return not self.settings.replay_unselected
 
         if self.is_menu_visible:
@@ -332,14 +541,30 @@ class MixedBerryPieApp(QObject):
         return False
 
     def _on_action_selected(self, item_key: str, action_type: str, item: Any = None) -> None:
-        """Execute the selected action after a brief delay."""
+        """Queue the selected action; it runs after action_delay_ms, in order."""
+        self._queue_action(
+            self.menu_profile,
+            item_key,
+            action_type,
+            delay_s=self.settings.action_delay_ms / 1000,
+            label=item_key,
+        )
+
+    def _queue_action(
+        self,
+        profile: MenuProfile | None,
+        item_key: str,
+        action_type: str,
+        *,
+        delay_s: float,
+        label: str,
+    ) -> None:
+        """Submit an action to the executor and remember it for the profile's repeat key."""
         app_logger.info(f"Queuing action: {item_key} (type: {action_type})")
-        delay_ms = self.settings.action_delay_ms
-        QTimer.singleShot(
-            delay_ms,
-            lambda: threading.Thread(
-                target=self._do_execute, args=(item_key, action_type), daemon=True
-            ).start(),
+        if profile is not None:
+            self.last_actions[profile.name] = (item_key, action_type)
+        self.action_executor.submit(
+            self._do_execute, item_key, action_type, delay_s=delay_s, label=label
         )
 
     def _on_center_hovered(self) -> None:
@@ -359,35 +584,35 @@ class MixedBerryPieApp(QObject):
             app_logger.info("Empty action value, skipping execution.")
             return
 
+        plan = self.action_plans.get(value, action_type)
+        if not plan.valid:
+            app_logger.warning(f"Skipping invalid action '{value}': {plan.error}")
+            return
+
         try:
             if action_type == "url":
                 webbrowser.open(value)
             elif action_type == "cmd":
-                args = shlex.split(value)
-                if not args:
-                    app_logger.warning("Empty command value, skipping execution")
-                    return
-                subprocess.Popen(args, shell=False)
+                subprocess.Popen(plan.argv, shell=False)
+            elif action_type == "text":
+                # Held modifiers would turn typed characters into shortcuts
+                self.hook_manager.release_all_modifiers()
+                if plan.inputs is not None:
+                    send_input_chunks(plan.inputs)
+                else:
+                    send_text(value)
             else:
                 # Release modifiers to prevent leakage
                 self.hook_manager.release_all_modifiers()
+                app_logger.debug(f"Sending keys: {plan.keys}")
 
-                parts = value.lower().split("+")
-                keys_to_press = [_parse_key(p) for p in parts]
-                app_logger.debug(f"Sending keys: {parts} (parsed: {keys_to_press})")
-
-                # Sequential key handling with safety delays
+                # One SendInput batch, or per-key sends with safety delays
                 delay_sec = self.settings.key_sequence_delay_ms / 1000.0
-                for k in keys_to_press:
-                    send_pynput_key_safely(k, True)
-                    if delay_sec > 0:
-                        time.sleep(delay_sec)
-                for k in reversed(keys_to_press):
-                    send_pynput_key_safely(k, False)
-                    if delay_sec > 0:
-                        time.sleep(delay_sec)
-                if delay_sec > 0:
-                    time.sleep(delay_sec)
+                if plan.inputs is not None:
+                    send_compiled_plan(plan.inputs, delay_s=delay_sec)
+                else:
+                    send_key_plan(chord_plan(list(plan.keys)), delay_s=delay_sec)
+                default_scheduler.wait(delay_sec)
 
             app_logger.info(f"Action executed successfully: {value}")
         except Exception as e:
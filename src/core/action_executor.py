@@ -0,0 +1,228 @@
+"""Ordered execution of menu actions on one persistent worker thread.
+
+Actions used to run on a fresh thread each, after a QTimer delay. Two quick
+selections could then interleave their SendInput calls and leave modifiers
+stuck. ``ActionExecutor`` runs them strictly one after another, in
+submission order, on a single worker thread:
+
+- each action becomes due ``delay_s`` after submission (``action_delay_ms``);
+  the worker sleeps on a condition variable and spins for the last couple
+  of milliseconds so the delay is not stretched by timer granularity,
+- the backlog is bounded; when full, either the new action or the oldest
+  pending one is dropped,
+- pending actions can be cancelled (e.g. when a new menu opens),
+- per-action lateness and run time are recorded.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+DEFAULT_MAX_PENDING = 16
+_SPIN_THRESHOLD_S = 0.002  # Busy-wait the final stretch before a due time
+_TIMING_HISTORY = 100
+
+
+@dataclass
+class _Job:
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    label: str
+    submitted: float
+    due: float
+
+
+@dataclass
+class ActionTiming:
+    """Timing of one executed action (seconds on the executor clock)."""
+
+    label: str
+    due: float
+    started: float
+    finished: float
+
+    @property
+    def late_ms(self) -> float:
+        """How much later than its due time the action started."""
+        return (self.started - self.due) * 1000
+
+    @property
+    def run_ms(self) -> float:
+        return (self.finished - self.started) * 1000
+
+
+@dataclass
+class ExecutorStats:
+    executed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    cancelled: int = 0
+    recent: deque[ActionTiming] = field(default_factory=lambda: deque(maxlen=_TIMING_HISTORY))
+
+    def summary(self) -> str:
+        text = (
+            f"executed={self.executed} failed={self.failed} "
+            f"dropped={self.dropped} cancelled={self.cancelled}"
+        )
+        if self.recent:
+            worst_late = max(t.late_ms for t in self.recent)
+            mean_run = sum(t.run_ms for t in self.recent) / len(self.recent)
+            text += f" worst_late={worst_late:.2f}ms mean_run={mean_run:.2f}ms"
+        return text
+
+
+class ActionExecutor:
+    """FIFO action queue served by a single worker thread."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        *,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        drop_policy: str = DROP_NEWEST,
+    ) -> None:
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self._clock = clock
+        self.max_pending = max_pending
+        self.drop_policy = drop_policy
+        self.stats = ExecutorStats()
+
+        self._queue: deque[_Job] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._busy = False
+
+    def submit(
+        self, func: Callable[..., Any], *args: Any, delay_s: float = 0.0, label: str = ""
+    ) -> bool:
+        """Queue ``func(*args)`` to run ``delay_s`` from now, after earlier actions.
+
+        Returns:
+            False if the action was dropped because the backlog is full.
+        """
+        now = self._clock()
+        job = _Job(func, args, label or getattr(func, "__name__", "action"), now, now + delay_s)
+        with self._cond:
+            if len(self._queue) >= self.max_pending:
+                self.stats.dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    logger.warning(f"Action backlog full; dropping new action '{job.label}'")
+                    return False
+                dropped = self._queue.popleft()
+                logger.warning(f"Action backlog full; dropping oldest action '{dropped.label}'")
+            self._queue.append(job)
+            self._ensure_worker()
+            self._cond.notify_all()
+        return True
+
+    def cancel_pending(self) -> int:
+        """Drop every action that has not started yet. Returns how many were dropped."""
+        with self._cond:
+            count = len(self._queue)
+            self._queue.clear()
+            self.stats.cancelled += count
+            self._cond.notify_all()
+        if count:
+            logger.info(f"Cancelled {count} pending action(s)")
+        return count
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until the queue is empty and no action is running."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """Cancel pending actions and stop the worker thread."""
+        with self._cond:
+            self._running = False
+            self.stats.cancelled += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self.stats.executed or self.stats.dropped:
+            logger.info(f"Action executor: {self.stats.summary()}")
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        """Start the worker on first use (caller holds the condition)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="ActionExecutor", daemon=True)
+            self._thread.start()
+
+    def _next_due_job(self) -> _Job | None:
+        """Wait for the head job's due time and pop it; None when shutting down."""
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._queue:
+                        self._cond.wait()
+                        continue
+                    remaining = self._queue[0].due - self._clock()
+                    if remaining <= _SPIN_THRESHOLD_S:
+                        break
+                    # Woken early by submit/cancel: re-check the (possibly new) head
+                    self._cond.wait(remaining - _SPIN_THRESHOLD_S)
+                if not self._running:
+                    return None
+                job = self._queue[0]
+
+            while self._clock() < job.due:
+                time.sleep(0)  # Yield the GIL while spinning
+
+            with self._cond:
+                # The job may have been cancelled while spinning
+                if self._queue and self._queue[0] is job:
+                    self._queue.popleft()
+                    self._busy = True
+                    return job
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_due_job()
+            if job is None:
+                return
+            started = self._clock()
+            try:
+                job.func(*job.args)
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"Action '{job.label}' failed: {e}", exc_info=True)
+            finished = self._clock()
+
+            timing = ActionTiming(job.label, job.due, started, finished)
+            self.stats.executed += 1
+            self.stats.recent.append(timing)
+            logger.debug(
+                f"Action '{job.label}' ran {timing.run_ms:.2f} ms, "
+                f"started {timing.late_ms:.2f} ms after due"
+            )
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
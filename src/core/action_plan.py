@@ -0,0 +1,152 @@
+"""Slice actions compiled into immutable execution plans.
+
+Executing a key action used to re-split the shortcut string, re-parse
+every key name and let pynput re-derive VK/scan codes on each run; cmd
+actions were re-tokenized with shlex every time. ``compile_action`` does
+that work once, when the configuration is loaded:
+
+- key actions become a parsed key tuple plus, on Windows, the pre-resolved
+  INPUT records of the whole press/release chord,
+- text actions become, on Windows, the chunked KEYEVENTF_UNICODE INPUT
+  records typing the whole string,
+- cmd actions become a pre-tokenized argv tuple,
+- url actions are validated (non-empty).
+
+Problems are found at load time: an ``ActionPlan`` with ``error`` set is
+not executable, ``warnings`` flag suspicious but runnable actions (e.g. an
+unknown key name that falls back to its first character).
+``ActionPlanCache`` holds the plans of every slice of every profile.
+"""
+
+import shlex
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.config import MenuProfile, PieSlice
+from src.core.key_names import is_known_key_name, parse_key
+from src.core.logger import get_logger
+from src.core.win32_input import CompiledKeyPlan, chord_plan, compile_key_plan, compile_text
+
+logger = get_logger(__name__)
+
+# Slice types that do not execute anything themselves
+_NAVIGATION_TYPES = frozenset({"submenu", "back"})
+
+
+@dataclass(frozen=True, slots=True)
+class ActionPlan:
+    """Everything needed to execute one action, resolved ahead of time."""
+
+    action_type: str
+    value: str
+    # key: parsed pynput keys, in press order
+    keys: tuple[Any, ...] = ()
+    # key: INPUT records per event of the press/release chord;
+    # text: INPUT records per SendInput chunk (Windows only)
+    inputs: CompiledKeyPlan | None = None
+    # cmd: argv for subprocess.Popen
+    argv: tuple[str, ...] = ()
+    error: str | None = None
+    warnings: tuple[str, ...] = ()
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+def compile_action(value: str, action_type: str, *, api: Any = None) -> ActionPlan:
+    """Compile one action value into a plan.
+
+    Args:
+        value: The slice's action value (shortcut, text, URL or command line)
+        action_type: 'key', 'text', 'url' or 'cmd'; anything else is treated as 'key'
+        api: user32-like object for VK/scan resolution (see compile_key_plan)
+    """
+    if not value:
+        return ActionPlan(action_type, value, error="empty action value")
+
+    if action_type == "url":
+        return ActionPlan(action_type, value)
+
+    if action_type == "text":
+        return ActionPlan(action_type, value, inputs=compile_text(value, api))
+
+    if action_type == "cmd":
+        try:
+            argv = tuple(shlex.split(value))
+        except ValueError as e:
+            return ActionPlan(action_type, value, error=f"cannot parse command: {e}")
+        if not argv:
+            return ActionPlan(action_type, value, error="empty command")
+        return ActionPlan(action_type, value, argv=argv)
+
+    names = value.lower().split("+")
+    if not all(names):
+        return ActionPlan(action_type, value, error=f"empty key name in '{value}'")
+    warnings = tuple(
+        f"unknown key '{name}', sending '{name[0]}'"
+        for name in names
+        if not is_known_key_name(name)
+    )
+    keys = tuple(parse_key(name) for name in names)
+    try:
+        inputs = compile_key_plan(chord_plan(list(keys)), api)
+    except ValueError as e:
+        return ActionPlan(action_type, value, keys=keys, error=str(e), warnings=warnings)
+    return ActionPlan(action_type, value, keys=keys, inputs=inputs, warnings=warnings)
+
+
+def _iter_slices(items: Iterable[PieSlice]) -> Iterable[PieSlice]:
+    for item in items:
+        yield item
+        yield from _iter_slices(item.submenu_items)
+
+
+class ActionPlanCache:
+    """Compiled plans keyed by (action value, action type)."""
+
+    def __init__(self, *, api: Any = None) -> None:
+        self._api = api
+        self._plans: dict[tuple[str, str], ActionPlan] = {}
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def rebuild(self, profiles: Sequence[MenuProfile]) -> list[ActionPlan]:
+        """Compile every action of every profile, replacing the old plans.
+
+        Returns:
+            The plans that have an error or warnings (already logged).
+        """
+        plans: dict[tuple[str, str], ActionPlan] = {}
+        problems: list[ActionPlan] = []
+        for profile in profiles:
+            for item in _iter_slices(profile.items):
+                if item.action_type in _NAVIGATION_TYPES:
+                    continue
+                cache_key = (item.key, item.action_type)
+                if cache_key in plans:
+                    continue
+                plan = compile_action(item.key, item.action_type, api=self._api)
+                plans[cache_key] = plan
+                if plan.error:
+                    logger.warning(
+                        f"Profile '{profile.name}', slice '{item.label}': "
+                        f"invalid {item.action_type} action: {plan.error}"
+                    )
+                for warning in plan.warnings:
+                    logger.warning(f"Profile '{profile.name}', slice '{item.label}': {warning}")
+                if plan.error or plan.warnings:
+                    problems.append(plan)
+        self._plans = plans
+        logger.info(f"Compiled {len(plans)} action plan(s), {len(problems)} with problems")
+        return problems
+
+    def get(self, value: str, action_type: str) -> ActionPlan:
+        """Return the plan for an action, compiling (and keeping) it on a miss."""
+        plan = self._plans.get((value, action_type))
+        if plan is None:
+            plan = compile_action(value, action_type, api=self._api)
+            self._plans[(value, action_type)] = plan
+        return plan
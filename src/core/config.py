@@ -7,11 +7,18 @@ and provides functions to persist them to disk.
 
 import hashlib
 import json
+import marshal
 import os
-import shutil
+import sys
 import tempfile
-from dataclasses import asdict, dataclass, field
-
+import time
+from collections.abc import Callable
+from dataclasses import MISSING, asdict, dataclass, field, fields
+from functools import partial
+from typing import Any
+
+from src.core.icon_history import IconHistory
+from src.core.icon_store import IconStore
 from src.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,7 +31,8 @@ CONFIG_FILE = os.path.join(CONFIG_DIR, "menu_config.json")
 ICON_HISTORY_FILE = os.path.join(CONFIG_DIR, "icon_history.json")
 USER_ICONS_DIR = os.path.join(CONFIG_DIR, "user_icons")
 ICON_HISTORY_MAX = 100
-_HASH_CHUNK_SIZE = 65536  # Chunk size for SHA-256 file hashing (bytes)
+_icon_stores: dict[str, IconStore] = {}  # By directory
+_icon_histories: dict[str, IconHistory] = {}  # By file
 
 
 def _ensure_config_dir() -> None:
@@ -41,75 +49,51 @@ def _ensure_config_dir() -> None:
             logger.error(f"Failed to create config directory: {e}")
 
 
+def icon_history() -> IconHistory:
+    """In-memory icon history backed by ICON_HISTORY_FILE."""
+    history = _icon_histories.get(ICON_HISTORY_FILE)
+    if history is None:
+        history = _icon_histories[ICON_HISTORY_FILE] = IconHistory(
+            ICON_HISTORY_FILE, key=_icon_path_to_abs, max_entries=ICON_HISTORY_MAX
+        )
+    return history
+
+
 def load_icon_history() -> list[str]:
-    """Load the icon usage history from disk.
+    """Return the icon usage history (read from disk on first use only).
 
     Returns:
-        List of absolute icon paths, most recent first. Empty list on error.
+        List of icon paths, most recent first. Empty list on error.
     """
-    _ensure_config_dir()
-    if not os.path.exists(ICON_HISTORY_FILE):
-        return []
-    try:
-        with open(ICON_HISTORY_FILE, encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return [p for p in data if isinstance(p, str)]
-    except Exception as e:
-        logger.warning(f"Could not load icon history: {e}")
-    return []
+    return icon_history().paths()
 
 
 def save_icon_history(paths: list[str]) -> None:
-    """Persist the icon history list to disk (capped at ICON_HISTORY_MAX)."""
-    _ensure_config_dir()
-    try:
-        with open(ICON_HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(paths[:ICON_HISTORY_MAX], f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        logger.warning(f"Could not save icon history: {e}")
-
-
-def _hash_file(path: str) -> str:
-    """Compute SHA-256 hash of a file using chunked reads."""
-    sha = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
-            sha.update(chunk)
-    return sha.hexdigest()
-
+    """Replace the icon history; written to disk in the background (capped at ICON_HISTORY_MAX)."""
+    icon_history().replace(paths)
 
-def _find_duplicate_in_dir(directory: str, src_hash: str) -> str | None:
-    """Find an existing file in directory with the same content hash."""
-    for name in os.listdir(directory):
-        file_path = os.path.join(directory, name)
-        if os.path.isfile(file_path):
-            with open(file_path, "rb") as f:
-                if hashlib.sha256(f.read()).hexdigest() == src_hash:
-                    return file_path
-    return None
 
+def icon_store() -> IconStore:
+    """Content-addressed store for USER_ICONS_DIR."""
+    store = _icon_stores.get(USER_ICONS_DIR)
+    if store is None:
+        store = _icon_stores[USER_ICONS_DIR] = IconStore(USER_ICONS_DIR)
+    return store
 
-def _copy_with_collision_handling(src: str, dest_dir: str) -> str:
-    """Copy a file to dest_dir, renaming on name collision."""
-    base_name = os.path.basename(src)
-    dest_path = os.path.join(dest_dir, base_name)
 
-    if os.path.exists(dest_path):
-        name, ext = os.path.splitext(base_name)
-        counter = 1
-        while os.path.exists(os.path.join(dest_dir, f"{name}_{counter}{ext}")):
-            counter += 1
-        dest_path = os.path.join(dest_dir, f"{name}_{counter}{ext}")
+def icon_display_name(path: str) -> str:
+    """Name to show for an icon: its original name if it was imported into the store."""
+    name = None
+    if os.path.abspath(path).startswith(os.path.abspath(USER_ICONS_DIR) + os.sep):
+        name = icon_store().original_name(path)
+    return os.path.splitext(name or os.path.basename(path))[0]
 
-    if os.path.abspath(src) != os.path.abspath(dest_path):
-        shutil.copy2(src, dest_path)
-        logger.info(f"Assetized icon: {src} -> {dest_path}")
-    return dest_path
 
+def normalize_icon_path(path: str) -> str:
+    """Convert an absolute path inside USER_ICONS_DIR to a relative path.
 
-def _normalize_icon_path(path: str) -> str:
-    """Convert an absolute path inside USER_ICONS_DIR to a relative path."""
+    This is the form the icon history stores; other paths are returned as is.
+    """
     abs_prefix = os.path.abspath(USER_ICONS_DIR) + os.sep
     if os.path.abspath(path).startswith(abs_prefix):
         return os.path.relpath(path, CONFIG_DIR).replace("\\", "/")
@@ -126,7 +110,8 @@ def _icon_path_to_abs(path: str) -> str:
 def add_to_icon_history(path: str) -> list[str]:
     """Assetize icon and prepend to history.
 
-    If the icon is external, it's copied to the user_icons directory.
+    If the icon is external, it's added to the content-addressed store in
+    the user_icons directory (reusing an identical icon already there).
     Deduplicates and persists to disk.
 
     Args:
@@ -147,72 +132,61 @@ def add_to_icon_history(path: str) -> list[str]:
     abs_prefix = os.path.abspath(USER_ICONS_DIR) + os.sep
     if not os.path.abspath(path).startswith(abs_prefix):
         try:
-            src_hash = _hash_file(path)
-            duplicate = _find_duplicate_in_dir(USER_ICONS_DIR, src_hash)
-            if duplicate:
-                logger.info(f"Duplicate content found, reusing: {duplicate}")
-                final_path = duplicate
-            else:
-                final_path = _copy_with_collision_handling(path, USER_ICONS_DIR)
+            final_path = icon_store().add(path)
         except Exception as e:
             logger.error(f"Failed to assetize icon: {e}")
 
-    final_path = _normalize_icon_path(final_path)
+    final_path = normalize_icon_path(final_path)
 
-    # Deduplicate history entries
-    target_abs = _icon_path_to_abs(final_path)
-    history = [p for p in load_icon_history() if _icon_path_to_abs(p) != target_abs]
-    history.insert(0, final_path)
-    history = history[:ICON_HISTORY_MAX]
-    save_icon_history(history)
-    return history
+    return icon_history().add(final_path)
 
 
 def remove_from_icon_history(path: str) -> list[str]:
     """Remove an icon from history and delete its file if it's in user_icons.
 
     Args:
-        path: Absolute path to the icon to remove.
+        path: Path to the icon to remove, absolute or as stored in the history.
 
     Returns:
         Updated history list.
     """
-    history = load_icon_history()
-    new_history = [p for p in history if os.path.abspath(p) != os.path.abspath(path)]
-
-    if len(new_history) != len(history):
-        save_icon_history(new_history)
+    target_abs = _icon_path_to_abs(path)
+    if icon_history().remove(path):
         # If the file is in our managed directory, delete it
         _user_icons_abs = os.path.abspath(USER_ICONS_DIR) + os.sep
-        if os.path.abspath(path).startswith(_user_icons_abs):
+        if target_abs.startswith(_user_icons_abs):
             try:
-                if os.path.exists(path):
-                    os.remove(path)
-                    logger.info(f"Deleted user icon asset: {path}")
+                icon_store().remove(target_abs)
             except Exception as e:
                 logger.error(f"Failed to delete icon asset: {e}")
 
-    return new_history
+    return icon_history().paths()
 
 
-@dataclass
+@dataclass(slots=True)
 class PieSlice:
     """Represents a single item in the pie menu.
 
+    Slotted (no per-instance ``__dict__``): configurations can hold tens of
+    thousands of slices.
+
     Attributes:
         label: Display text for the menu item
         key: Keyboard shortcut or action value
         color: Hex color code for the item (e.g., '#FF5555')
-        action_type: Type of action ('key', 'url', or 'cmd')
+        action_type: Type of action ('key', 'text', 'url', or 'cmd')
         icon_path: Optional path to an icon file
+        submenu_items: Child slices of a 'submenu' item
+        hotkey: Optional direct hotkey running this action without the menu
     """
 
     label: str
     key: str
     color: str
-    action_type: str = "key"  # 'key', 'url', 'cmd', 'submenu', 'back'
+    action_type: str = "key"  # 'key', 'text', 'url', 'cmd', 'submenu', 'back'
     icon_path: str | None = None
     submenu_items: list["PieSlice"] = field(default_factory=list)
+    hotkey: str = ""
 
 
 # Beautiful thematic color palettes for the "Preset" mode
@@ -243,6 +217,17 @@ class AppSettings:
         text_size: Font size for menu item labels in points
         auto_scale_with_menu: Whether icon/text sizes scale automatically with menu size
         first_run: Whether this is the first run (shows welcome dialog)
+        record_hook_events: Record raw keyboard hook events to the logs directory
+        out_of_process_hook: Run the keyboard hook in a separate process (Windows, restart required)
+        sequence_timeout_ms: Default time allowed between strokes of a sequence trigger ("ctrl+k, p")
+        preresolve_profiles: Re-resolve trigger profiles on focus changes instead of on press
+        expert_mode: Select by flicking the mouse and releasing the trigger quickly,
+            without showing the overlay (marking-menu style, Windows)
+        expert_timeout_ms: Releases within this time of the press are resolved as strokes;
+            holding longer shows the menu
+        expert_min_stroke_px: Minimum length of a stroke segment in pixels
+        compact_config: Save the config file without default values and with shared
+            color/icon tables (smaller and faster to load, less readable)
     """
 
     action_delay_ms: int = 0
@@ -266,9 +251,17 @@ class AppSettings:
     custom_presets: dict[str, list[str]] = field(default_factory=dict)
     first_run: bool = True
     enable_file_logging: bool = False
+    record_hook_events: bool = False
+    out_of_process_hook: bool = False
+    sequence_timeout_ms: int = 1000
+    preresolve_profiles: bool = False
+    expert_mode: bool = False
+    expert_timeout_ms: int = 250
+    expert_min_stroke_px: int = 30
+    compact_config: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class MenuProfile:
     """A collection of items triggered by a specific hotkey"""
 
@@ -278,6 +271,8 @@ class MenuProfile:
     target_apps: list[str] = field(
         default_factory=list
     )  # List of exe names or window titles. Empty = Global
+    sequence_timeout_ms: int = 0  # Between strokes of a sequence trigger. 0 = app default
+    repeat_key: str = ""  # Re-runs the last action chosen from this profile, without the menu
 
     def __post_init__(self):
         if self.target_apps is None:
@@ -286,17 +281,27 @@ class MenuProfile:
 
 def _parse_slice(data: dict) -> PieSlice:
     """Recursively parse a dictionary into a PieSlice object."""
-    submenu_data = data.get("submenu_items", [])
-    submenus = [_parse_slice(child) for child in submenu_data if isinstance(child, dict)]
-
-    return PieSlice(
-        label=data.get("label", ""),
-        key=data.get("key", ""),
-        color=data.get("color", "#CCCCCC"),
-        action_type=data.get("action_type", "key"),
-        icon_path=data.get("icon_path"),
-        submenu_items=submenus,
-    )
+    return _decode_slice(_slice_values(data))
+
+
+def _intern(value: Any) -> Any:
+    """Share repeated strings (colors, icon paths, action types) between slices."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _slice_values(data: dict) -> tuple:
+    """Snapshot form (see _encode_slice) of a stored slice, children included."""
+    submenu_data = data.get("submenu_items") or []
+    values = {
+        "label": data.get("label", ""),
+        "key": data.get("key", ""),
+        "color": _intern(data.get("color", "#CCCCCC")),
+        "action_type": _intern(data.get("action_type", "key")),
+        "icon_path": _intern(data.get("icon_path")),
+        "submenu_items": tuple(_slice_values(c) for c in submenu_data if isinstance(c, dict)),
+        "hotkey": data.get("hotkey", ""),
+    }
+    return tuple(values[name] for name in _SLICE_FIELDS)
 
 
 # Default configuration
@@ -314,6 +319,155 @@ DEFAULT_TRIGGER = "ctrl+space"
 DEFAULT_PROFILES = [MenuProfile(name="Default", trigger_key=DEFAULT_TRIGGER, items=DEFAULT_ITEMS)]
 
 
+# ── Config snapshot ───────────────────────────────────────────────────────────
+# The validated object graph of the last loaded/saved config, stored next to
+# the JSON as marshal-encoded tuples. It is only used while the JSON's size,
+# mtime and SHA-256 still match; the JSON stays the source of truth.
+
+_SNAPSHOT_FORMAT = 1
+# Objects are stored as tuples in dataclass field order and rebuilt positionally
+_SLICE_FIELDS = tuple(f.name for f in fields(PieSlice))
+_PROFILE_FIELDS = tuple(f.name for f in fields(MenuProfile))
+_CHILDREN_INDEX = _SLICE_FIELDS.index("submenu_items")
+_ITEMS_INDEX = _PROFILE_FIELDS.index("items")
+_INTERNED_INDEXES = tuple(_SLICE_FIELDS.index(n) for n in ("color", "action_type", "icon_path"))
+# Any change to the dataclasses (or the marshal format) invalidates old snapshots
+_SNAPSHOT_SCHEMA = (
+    _SNAPSHOT_FORMAT,
+    marshal.version,
+    _SLICE_FIELDS,
+    _PROFILE_FIELDS,
+    tuple(AppSettings.__dataclass_fields__),
+)
+
+SourceKey = tuple[int, int, str]
+
+
+def _snapshot_path() -> str:
+    """Snapshot file belonging to the current CONFIG_FILE."""
+    return os.path.splitext(CONFIG_FILE)[0] + ".snapshot"
+
+
+def _source_key(raw: bytes, stat: os.stat_result) -> SourceKey:
+    """Identify one version of the JSON file: (size, mtime_ns, sha256)."""
+    return (stat.st_size, stat.st_mtime_ns, hashlib.sha256(raw).hexdigest())
+
+
+def _read_source() -> tuple[bytes, SourceKey]:
+    """Read the raw JSON bytes together with their snapshot key."""
+    with open(CONFIG_FILE, "rb") as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+    return raw, _source_key(raw, stat)
+
+
+def source_key() -> SourceKey | None:
+    """Key of the config file as it is on disk now, or None if it is missing."""
+    from src.core import config_shards
+
+    if config_shards.is_sharded():
+        return config_shards.sharded_source_key()
+    try:
+        return _read_source()[1]
+    except FileNotFoundError:
+        return None
+
+
+def _encode_slice(item: PieSlice) -> tuple:
+    values = [getattr(item, name) for name in _SLICE_FIELDS]
+    values[_CHILDREN_INDEX] = tuple(_encode_slice(child) for child in item.submenu_items)
+    return tuple(values)
+
+
+def _decode_slice(data: tuple) -> PieSlice:
+    values = list(data)
+    for i in _INTERNED_INDEXES:
+        values[i] = _intern(values[i])
+    values[_CHILDREN_INDEX] = [_decode_slice(child) for child in values[_CHILDREN_INDEX]]
+    return PieSlice(*values)
+
+
+def _encode_profile(profile: MenuProfile) -> tuple:
+    # Lists (target_apps) are copied so the encoding shares nothing mutable
+    values = [
+        list(value) if isinstance(value, list) else value
+        for value in (getattr(profile, name) for name in _PROFILE_FIELDS)
+    ]
+    values[_ITEMS_INDEX] = tuple(_encode_slice(item) for item in profile.items)
+    return tuple(values)
+
+
+def _decode_profile(data: tuple) -> MenuProfile:
+    values = list(data)
+    values[_ITEMS_INDEX] = [_decode_slice(item) for item in values[_ITEMS_INDEX]]
+    return MenuProfile(*values)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenConfig:
+    """Profiles and settings encoded as tuples, sharing nothing with the live objects.
+
+    Produced by ``freeze_config`` on the caller's thread; can then be
+    serialized anywhere (see ``write_config``).
+    """
+
+    profiles: tuple[tuple, ...]
+    settings: tuple[tuple[str, Any], ...]
+
+
+def freeze_config(profiles: list[MenuProfile], settings: AppSettings | None = None) -> FrozenConfig:
+    """Take an immutable copy of the configuration for writing."""
+    return FrozenConfig(
+        tuple(_encode_profile(p) for p in profiles),
+        tuple(asdict(settings if settings is not None else AppSettings()).items()),
+    )
+
+
+def _write_snapshot(key: SourceKey, frozen: FrozenConfig) -> None:
+    """Store the object graph for the JSON version ``key``. Failures are only logged."""
+    payload = (_SNAPSHOT_SCHEMA, key, frozen.profiles, dict(frozen.settings))
+    try:
+        data = marshal.dumps(payload)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, _snapshot_path())
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.debug(f"Wrote config snapshot ({len(data)} bytes)")
+    except Exception as e:
+        logger.warning(f"Could not write config snapshot: {e}")
+
+
+def _read_snapshot(key: SourceKey) -> tuple[list[MenuProfile], AppSettings] | None:
+    """Return the snapshotted config if it was made from JSON version ``key``."""
+    try:
+        with open(_snapshot_path(), "rb") as f:
+            # One read; marshal.load() on a file reads in small pieces.
+            # The snapshot is our own file in the config directory, like the JSON.
+            payload = marshal.loads(f.read())  # noqa: S302
+        schema, snapshot_key, profiles_data, settings_data = payload
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable config snapshot: {e}")
+        return None
+
+    if schema != _SNAPSHOT_SCHEMA or tuple(snapshot_key) != key:
+        logger.debug("Config snapshot is stale")
+        return None
+    try:
+        profiles = [_decode_profile(p) for p in profiles_data]
+        settings = AppSettings(**settings_data)
+    except Exception as e:
+        logger.warning(f"Ignoring invalid config snapshot: {e}")
+        return None
+    return profiles, settings
+
+
 def _validate_setting_type(value: object, default: object) -> bool:
     """Validate that a config value matches the expected type of its default.
 
@@ -329,6 +483,126 @@ def _validate_setting_type(value: object, default: object) -> bool:
     return isinstance(value, type(default))
 
 
+# ── Compact encoding ──────────────────────────────────────────────────────────
+# With the compact_config setting the file omits slice and profile fields
+# that have their default value (including empty submenus), and stores
+# colors and icon paths once in the "colors"/"icons" tables, referenced by
+# index. Loading fills the defaults back in, so the round trip is exact.
+
+COMPACT_ENCODING = "compact"
+_SLICE_DEFAULTS = {
+    f.name: f.default for f in fields(PieSlice) if f.init and f.default is not MISSING
+}
+_PROFILE_DEFAULTS = {
+    f.name: f.default_factory() if f.default_factory is not MISSING else f.default
+    for f in fields(MenuProfile)
+    if f.default is not MISSING or f.default_factory is not MISSING
+}
+_Tables = tuple[list, list]  # (colors, icons)
+
+
+def _compact_slice(data: tuple, colors: dict, icons: dict) -> dict:
+    """Compact form of an encoded slice; colors/icons collect the tables."""
+    item: dict[str, Any] = {}
+    for name, value in zip(_SLICE_FIELDS, data, strict=True):
+        if name == "submenu_items":
+            if value:
+                item[name] = [_compact_slice(child, colors, icons) for child in value]
+        elif name == "color":
+            item[name] = colors.setdefault(value, len(colors))
+        elif name == "icon_path":
+            if value is not None:
+                item[name] = icons.setdefault(value, len(icons))
+        elif name not in _SLICE_DEFAULTS or value != _SLICE_DEFAULTS[name]:
+            item[name] = value
+    return item
+
+
+def _compact_config_json(frozen: FrozenConfig) -> str:
+    colors: dict[str, int] = {}
+    icons: dict[str, int] = {}
+    profiles = []
+    for data in frozen.profiles:
+        profile = {
+            name: value
+            for name, value in zip(_PROFILE_FIELDS, data, strict=True)
+            if name != "items"
+            and (name not in _PROFILE_DEFAULTS or value != _PROFILE_DEFAULTS[name])
+        }
+        profile["items"] = [_compact_slice(item, colors, icons) for item in data[_ITEMS_INDEX]]
+        profiles.append(profile)
+    document = {
+        "schema_version": 5,
+        "encoding": COMPACT_ENCODING,
+        "colors": list(colors),
+        "icons": list(icons),
+        "profiles": profiles,
+        "settings": dict(frozen.settings),
+    }
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+
+
+def _table_value(table: list, index: object, default: Any) -> Any:
+    if isinstance(index, int) and not isinstance(index, bool) and 0 <= index < len(table):
+        return table[index]
+    logger.warning(f"Invalid table index in compact config: {index!r}")
+    return default
+
+
+def _compact_slice_values(data: dict, tables: _Tables) -> tuple:
+    """Snapshot form of a compact slice, with the defaults and table values filled in."""
+    colors, icons = tables
+    icon = data.get("icon_path")
+    submenu_data = data.get("submenu_items") or []
+    values = {
+        "label": data.get("label", ""),
+        "key": data.get("key", ""),
+        "color": _table_value(colors, data.get("color"), "#CCCCCC"),
+        "action_type": _intern(data.get("action_type", "key")),
+        "icon_path": None if icon is None else _table_value(icons, icon, None),
+        "submenu_items": tuple(
+            _compact_slice_values(c, tables) for c in submenu_data if isinstance(c, dict)
+        ),
+        "hotkey": data.get("hotkey", ""),
+    }
+    return tuple(values[name] for name in _SLICE_FIELDS)
+
+
+def _parse_settings(settings_data: dict) -> AppSettings:
+    """Build AppSettings from stored values, keeping only known fields of the right type."""
+    valid_fields = {}
+    default_settings = AppSettings()
+    for k, v in settings_data.items():
+        if k in AppSettings.__dataclass_fields__:
+            default_v = getattr(default_settings, k)
+            if _validate_setting_type(v, default_v):
+                valid_fields[k] = v
+            else:
+                logger.warning(
+                    f"Setting '{k}' has invalid type {type(v)}, using default {type(default_v)}"
+                )
+    return AppSettings(**valid_fields)
+
+
+def _parse_profile(
+    p_data: dict, slice_values: Callable[[dict], tuple] = _slice_values
+) -> MenuProfile:
+    """Parse one stored profile (schema version 3 and later).
+
+    Slices go through their snapshot form (see _slice_values), which every
+    loader shares.
+    """
+    items = [_decode_slice(slice_values(i)) for i in p_data.get("items", [])]
+    return MenuProfile(
+        name=p_data.get("name", "Unnamed Profile"),
+        trigger_key=p_data.get("trigger_key", DEFAULT_TRIGGER),
+        items=items,
+        target_apps=p_data.get("target_apps", []),
+        sequence_timeout_ms=p_data.get("sequence_timeout_ms", 0),
+        repeat_key=p_data.get("repeat_key", ""),
+    )
+
+
 def load_config() -> tuple[list[MenuProfile], AppSettings]:
     """Load configuration from file.
 
@@ -341,6 +615,11 @@ def load_config() -> tuple[list[MenuProfile], AppSettings]:
 
     _ensure_config_dir()
 
+    from src.core import config_shards
+
+    if config_shards.is_sharded():
+        return config_shards.load_sharded()
+
     if not os.path.exists(CONFIG_FILE):
         logger.info("Config file not found, creating default configuration")
         default_settings = AppSettings()
@@ -348,8 +627,13 @@ def load_config() -> tuple[list[MenuProfile], AppSettings]:
         return DEFAULT_PROFILES, default_settings
 
     try:
-        with open(CONFIG_FILE, encoding="utf-8") as f:
-            data = json.load(f)
+        raw, source_key = _read_source()
+        cached = _read_snapshot(source_key)
+        if cached is not None:
+            logger.info("Loaded configuration from snapshot")
+            return cached
+
+        data = json.loads(raw)
 
         if isinstance(data, list):
             # Very old format migration
@@ -363,20 +647,7 @@ def load_config() -> tuple[list[MenuProfile], AppSettings]:
             schema_version = data.get("schema_version", 1)
 
             # Load app settings first
-            settings_data = data.get("settings", {})
-            # Only keep valid fields and validate types
-            valid_fields = {}
-            default_settings = AppSettings()
-            for k, v in settings_data.items():
-                if k in AppSettings.__dataclass_fields__:
-                    default_v = getattr(default_settings, k)
-                    if _validate_setting_type(v, default_v):
-                        valid_fields[k] = v
-                    else:
-                        logger.warning(
-                            f"Setting '{k}' has invalid type {type(v)}, using default {type(default_v)}"
-                        )
-            settings = AppSettings(**valid_fields)
+            settings = _parse_settings(data.get("settings", {}))
             logger.info(f"Loaded validated settings: {settings}")
 
             profiles = []
@@ -389,20 +660,18 @@ def load_config() -> tuple[list[MenuProfile], AppSettings]:
                 profiles.append(MenuProfile(name="Default", trigger_key=trigger_key, items=items))
             else:
                 # Load existing profiles
-                for p_data in data.get("profiles", []):
-                    items = [_parse_slice(i) for i in p_data.get("items", [])]
-                    profiles.append(
-                        MenuProfile(
-                            name=p_data.get("name", "Unnamed Profile"),
-                            trigger_key=p_data.get("trigger_key", DEFAULT_TRIGGER),
-                            items=items,
-                            target_apps=p_data.get("target_apps", []),
-                        )
-                    )
+                slice_values = _slice_values
+                if data.get("encoding") == COMPACT_ENCODING:
+                    tables = (data.get("colors", []), data.get("icons", []))
+                    slice_values = partial(_compact_slice_values, tables=tables)
+                profiles.extend(
+                    _parse_profile(p_data, slice_values) for p_data in data.get("profiles", [])
+                )
 
             if not profiles:
                 profiles = DEFAULT_PROFILES
 
+            _write_snapshot(source_key, freeze_config(profiles, settings))
             return profiles, settings
         else:
             logger.warning(f"Unexpected config format: {type(data)}")
@@ -426,8 +695,104 @@ def load_config() -> tuple[list[MenuProfile], AppSettings]:
         return DEFAULT_PROFILES, AppSettings()
 
 
+@dataclass(frozen=True)
+class WriteTiming:
+    """Cost of one config write."""
+
+    size: int  # Bytes on disk
+    serialize_ms: float
+    write_ms: float
+    fsync_ms: float
+    key: SourceKey
+
+    def summary(self) -> str:
+        return (
+            f"{self.size / 1024:.1f} KB, serialize {self.serialize_ms:.1f} ms, "
+            f"write {self.write_ms:.1f} ms, fsync {self.fsync_ms:.1f} ms"
+        )
+
+
+def _slice_json(data: tuple) -> dict:
+    item = dict(zip(_SLICE_FIELDS, data, strict=True))
+    item["submenu_items"] = [_slice_json(child) for child in data[_CHILDREN_INDEX]]
+    return item
+
+
+def _profile_json(data: tuple) -> dict:
+    profile = dict(zip(_PROFILE_FIELDS, data, strict=True))
+    # Items go last, after the profile's own fields
+    items = profile.pop("items")
+    profile["items"] = [_slice_json(item) for item in items]
+    return profile
+
+
+def _config_json(frozen: FrozenConfig, *, compact: bool = False) -> str:
+    """The single-file (schema version 5) JSON text of a frozen configuration."""
+    if compact:
+        return _compact_config_json(frozen)
+    data = {
+        "schema_version": 5,  # Upgrade to version 5 (Nested Slices)
+        "profiles": [_profile_json(p) for p in frozen.profiles],
+        "settings": dict(frozen.settings),
+    }
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _atomic_write(path: str, data: bytes) -> tuple[float, float]:
+    """Replace ``path`` with ``data`` via an fsynced temporary file.
+
+    A crash leaves either the old or the new file. Raises on failure.
+
+    Returns:
+        (write_ms, fsync_ms)
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            start = time.perf_counter()
+            f.write(data)
+            f.flush()
+            written = time.perf_counter()
+            os.fsync(f.fileno())
+        synced = time.perf_counter()
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return (written - start) * 1000, (synced - written) * 1000
+
+
+def write_config(frozen: FrozenConfig) -> WriteTiming:
+    """Serialize a frozen configuration and atomically replace the config file.
+
+    The JSON goes to a temporary file that is fsynced before it replaces
+    CONFIG_FILE, so a crash leaves either the old or the new file. The
+    binary snapshot is refreshed afterwards. With the sharded layout only
+    changed profile files and the manifest are written instead (see
+    ``config_shards``). Safe to call from any thread; raises on failure.
+    """
+    from src.core import config_shards
+
+    if config_shards.is_sharded():
+        return config_shards.write_sharded(frozen)
+
+    start = time.perf_counter()
+    compact = dict(frozen.settings).get("compact_config", False)
+    data = _config_json(frozen, compact=compact).encode("utf-8")
+    serialize_ms = (time.perf_counter() - start) * 1000
+    write_ms, fsync_ms = _atomic_write(CONFIG_FILE, data)
+
+    # The next load can skip parsing what was just written
+    key = _read_source()[1]
+    _write_snapshot(key, frozen)
+    return WriteTiming(
+        size=key[0], serialize_ms=serialize_ms, write_ms=write_ms, fsync_ms=fsync_ms, key=key
+    )
+
+
 def save_config(profiles: list[MenuProfile], settings: AppSettings | None = None) -> bool:
-    """Save configuration to file.
+    """Save configuration to file, synchronously.
 
     Args:
         profiles: List of menu profiles to save
@@ -438,35 +803,8 @@ def save_config(profiles: list[MenuProfile], settings: AppSettings | None = None
     """
     logger.info(f"Saving configuration: {len(profiles)} profiles")
     try:
-        if settings is None:
-            settings = AppSettings()
-
-        data = {
-            "schema_version": 5,  # Upgrade to version 5 (Nested Slices)
-            "profiles": [
-                {
-                    "name": p.name,
-                    "trigger_key": p.trigger_key,
-                    "target_apps": p.target_apps,
-                    "items": [asdict(item) for item in p.items],
-                }
-                for p in profiles
-            ],
-            "settings": asdict(settings),
-        }
-        # Atomic write using a temporary file
-        fd, temp_path = tempfile.mkstemp(dir=CONFIG_DIR, text=True)
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            # Atomic replace
-            os.replace(temp_path, CONFIG_FILE)
-        except Exception as e:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            raise e
-
-        logger.info("Configuration saved successfully")
+        timing = write_config(freeze_config(profiles, settings))
+        logger.info(f"Configuration saved successfully ({timing.summary()})")
         return True
     except Exception as e:
         logger.error(f"Error saving config: {e}")
@@ -0,0 +1,434 @@
+"""Sharded configuration layout: a manifest plus one file per profile.
+
+The single ``menu_config.json`` is rewritten and re-parsed in full for any
+change, and conflicts whenever two people change different profiles of a
+distributed configuration. The optional sharded layout stores instead:
+
+- ``menu_config.manifest.json``: schema version, settings and the profile
+  order, each profile as ``{"name", "file", "sha256"}``,
+- ``profiles/<name>.json``: one profile, exactly as it appears in the
+  ``profiles`` list of the single-file schema version 5.
+
+The layout is in use while the manifest exists (``migrate_to_shards`` and
+``migrate_to_single_file`` convert losslessly in both directions). Parsed
+profiles are cached per shard together with the shard's size, mtime and
+hash, in memory and in ``profiles/.cache``, so a load only parses shards
+that changed and a save only writes shards whose profile changed (plus
+the manifest). A shard edited without updating the manifest (a merge, a
+hand edit) or listed without a hash is still used; the mismatch is logged
+and the next save records the new hash. A save only deletes shards of
+profiles it knows were removed: shards that were never loaded (because
+loading failed) are left on disk.
+"""
+
+import contextlib
+import hashlib
+import json
+import marshal
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+
+from src.core import config
+from src.core.config import AppSettings, FrozenConfig, MenuProfile, SourceKey, WriteTiming
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_LAYOUT = "sharded"
+SHARD_DIR_NAME = "profiles"
+_CACHE_NAME = ".cache"
+_MAX_SLUG_LENGTH = 40
+
+
+@dataclass(frozen=True)
+class _Shard:
+    """What is known about one shard file."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+    profile: tuple  # config._encode_profile() form
+
+
+# Shards by file name, for the shard directory in _cache_dir
+_cache: dict[str, _Shard] = {}
+_cache_dir: str | None = None
+# Shard files whose profile was loaded or written (the only ones a save may delete)
+_known: set[str] = set()
+_lock = threading.Lock()
+
+
+def manifest_path() -> str:
+    """Manifest belonging to the current CONFIG_FILE."""
+    return os.path.splitext(config.CONFIG_FILE)[0] + ".manifest.json"
+
+
+def shard_dir() -> str:
+    return os.path.join(os.path.dirname(config.CONFIG_FILE), SHARD_DIR_NAME)
+
+
+def is_sharded() -> bool:
+    """Whether the configuration is stored in the sharded layout."""
+    return os.path.exists(manifest_path())
+
+
+def shard_file_names(names: list[str]) -> list[str]:
+    """Stable, unique shard file names for profile names (in order)."""
+    files = []
+    used: set[str] = set()
+    for name in names:
+        # Lowercased: names differing only in case collide on Windows
+        slug = re.sub(r"[^\w\-]+", "_", name).strip("_").lower()[:_MAX_SLUG_LENGTH] or "profile"
+        candidate, counter = slug, 1
+        while candidate in used:
+            counter += 1
+            candidate = f"{slug}-{counter}"
+        used.add(candidate)
+        files.append(f"{candidate}.json")
+    return files
+
+
+# ── Shard cache ──────────────────────────────────────────────────────────────
+
+
+def _use_cache_for(directory: str) -> None:
+    """Switch the in-memory cache to ``directory``, seeding it from disk (lock held)."""
+    global _cache_dir
+    if _cache_dir == directory:
+        return
+    _cache.clear()
+    _known.clear()
+    _cache_dir = directory
+    try:
+        with open(os.path.join(directory, _CACHE_NAME), "rb") as f:
+            # Our own file in the config directory, like the snapshot
+            schema, entries = marshal.loads(f.read())  # noqa: S302
+        if schema == config._SNAPSHOT_SCHEMA:
+            _cache.update((name, _Shard(*entry)) for name, entry in entries.items())
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable profile shard cache: {e}")
+
+
+def _save_cache(directory: str) -> None:
+    """Persist the shard cache. Failures are only logged (lock held)."""
+    entries = {name: (s.size, s.mtime_ns, s.sha256, s.profile) for name, s in _cache.items()}
+    try:
+        config._atomic_write(
+            os.path.join(directory, _CACHE_NAME),
+            marshal.dumps((config._SNAPSHOT_SCHEMA, entries)),
+        )
+    except Exception as e:
+        logger.warning(f"Could not write profile shard cache: {e}")
+
+
+def _reset_cache() -> None:
+    global _cache_dir
+    with _lock:
+        _cache.clear()
+        _known.clear()
+        _cache_dir = None
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+
+def _read_manifest() -> tuple[bytes, dict]:
+    with open(manifest_path(), "rb") as f:
+        raw = f.read()
+    manifest = json.loads(raw)
+    if not isinstance(manifest, dict) or manifest.get("layout") != MANIFEST_LAYOUT:
+        raise ValueError("not a sharded config manifest")
+    return raw, manifest
+
+
+def _load_shard(directory: str, file: str, expected_sha: str | None) -> tuple | None:
+    """Encoded profile of one shard, parsing it only if it changed (lock held).
+
+    A shard without a manifest hash is parsed like one whose hash does not
+    match.
+    """
+    path = os.path.join(directory, file)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        logger.error(f"Profile shard is missing: {path}")
+        return None
+    cached = _cache.get(file)
+    if (
+        cached is not None
+        and (cached.size, cached.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+        and cached.sha256 == expected_sha
+    ):
+        return cached.profile
+
+    with open(path, "rb") as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+    sha = hashlib.sha256(raw).hexdigest()
+    if expected_sha is None:
+        logger.warning(f"Profile shard {file} has no hash in the manifest")
+    elif sha != expected_sha:
+        logger.warning(f"Profile shard {file} changed outside the manifest")
+    try:
+        profile = config._parse_profile(json.loads(raw))
+    except Exception as e:
+        logger.error(f"Profile shard {file} is corrupted: {e}")
+        _keep_backup(path)
+        return None
+    encoded = config._encode_profile(profile)
+    _cache[file] = _Shard(stat.st_size, stat.st_mtime_ns, sha, encoded)
+    return encoded
+
+
+def _keep_backup(path: str) -> None:
+    # Keep the broken file for the user; the next save writes a new shard
+    shutil.copy(path, path + ".backup")
+
+
+def load_sharded() -> tuple[list[MenuProfile], AppSettings]:
+    """Load the sharded configuration, parsing only shards that changed."""
+    directory = shard_dir()
+    try:
+        _, manifest = _read_manifest()
+        settings = config._parse_settings(manifest.get("settings", {}))
+        entries = [e for e in manifest.get("profiles", []) if isinstance(e, dict)]
+        profiles = []
+        with _lock:
+            _use_cache_for(directory)
+            _known.clear()
+            before = dict(_cache)
+            for entry in entries:
+                file, sha = entry.get("file"), entry.get("sha256")
+                if not isinstance(file, str) or not file:
+                    logger.error(f"Config manifest entry has no shard file: {entry}")
+                    continue
+                encoded = _load_shard(directory, file, sha if isinstance(sha, str) else None)
+                if encoded is not None:
+                    profiles.append(config._decode_profile(encoded))
+                    _known.add(file)
+            parsed = sum(1 for name, s in _cache.items() if before.get(name) is not s)
+            if parsed:
+                _save_cache(directory)
+        logger.info(f"Loaded {len(profiles)} profile shard(s), {parsed} parsed")
+        return profiles or config.DEFAULT_PROFILES, settings
+    except Exception as e:
+        logger.error(f"Error loading sharded config: {e}")
+        with _lock:
+            _known.clear()  # Nothing was loaded, so a save must not delete any shard
+        return config.DEFAULT_PROFILES, AppSettings()
+
+
+def sharded_source_key() -> SourceKey | None:
+    """Identify the sharded configuration on disk: the manifest and every shard's stat."""
+    try:
+        raw, manifest = _read_manifest()
+        stat = os.stat(manifest_path())
+        sha = hashlib.sha256(raw)
+        directory = shard_dir()
+        for entry in manifest.get("profiles", []):
+            try:
+                shard = os.stat(os.path.join(directory, str(entry.get("file", ""))))
+            except (FileNotFoundError, AttributeError):
+                continue
+            sha.update(f"|{shard.st_size}:{shard.st_mtime_ns}".encode())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not read config manifest: {e}")
+        return None
+    return (stat.st_size, stat.st_mtime_ns, sha.hexdigest())
+
+
+# ── Saving ───────────────────────────────────────────────────────────────────
+
+
+def _old_shard_files() -> set[str]:
+    try:
+        _, manifest = _read_manifest()
+        return {str(e.get("file")) for e in manifest.get("profiles", []) if isinstance(e, dict)}
+    except FileNotFoundError:
+        return set()
+    except Exception as e:
+        logger.warning(f"Could not read previous config manifest: {e}")
+        return set()
+
+
+def _unchanged_on_disk(file: str) -> bool:
+    """Whether the shard file is still the one in the cache (lock held)."""
+    cached = _cache[file]
+    try:
+        stat = os.stat(os.path.join(shard_dir(), file))
+    except FileNotFoundError:
+        return False
+    return (stat.st_size, stat.st_mtime_ns) == (cached.size, cached.mtime_ns)
+
+
+def write_sharded(frozen: FrozenConfig) -> WriteTiming:
+    """Write the changed profile shards, then the manifest.
+
+    Every shard is replaced atomically and the manifest last, so a crash
+    leaves the previous manifest pointing at complete files. Shards of
+    removed profiles are deleted only if their profile was loaded. Raises
+    on failure.
+    """
+    directory = shard_dir()
+    os.makedirs(directory, exist_ok=True)
+    name_index = config._PROFILE_FIELDS.index("name")
+    files = shard_file_names([p[name_index] for p in frozen.profiles])
+    write_ms = fsync_ms = 0.0
+    size = 0
+
+    with _lock:
+        _use_cache_for(directory)
+        old_files = _old_shard_files()
+        start = time.perf_counter()
+        entries = []
+        dirty: list[tuple[str, bytes, str, tuple]] = []
+        for encoded, file in zip(frozen.profiles, files, strict=True):
+            cached = _cache.get(file)
+            if cached is not None and cached.profile == encoded and _unchanged_on_disk(file):
+                sha = cached.sha256
+            else:
+                raw = json.dumps(config._profile_json(encoded), indent=2, ensure_ascii=False)
+                data = raw.encode("utf-8")
+                sha = hashlib.sha256(data).hexdigest()
+                dirty.append((file, data, sha, encoded))
+            entries.append({"name": encoded[name_index], "file": file, "sha256": sha})
+        manifest = {
+            "schema_version": 5,
+            "layout": MANIFEST_LAYOUT,
+            "profiles": entries,
+            "settings": dict(frozen.settings),
+        }
+        manifest_data = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+        serialize_ms = (time.perf_counter() - start) * 1000
+
+        for file, data, sha, encoded in dirty:
+            path = os.path.join(directory, file)
+            w, s = config._atomic_write(path, data)
+            write_ms, fsync_ms = write_ms + w, fsync_ms + s
+            size += len(data)
+            stat = os.stat(path)
+            _cache[file] = _Shard(stat.st_size, stat.st_mtime_ns, sha, encoded)
+        w, s = config._atomic_write(manifest_path(), manifest_data)
+        write_ms, fsync_ms = write_ms + w, fsync_ms + s
+        size += len(manifest_data)
+
+        for file in (old_files - set(files)) & _known:
+            _cache.pop(file, None)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(directory, file))
+        _known.difference_update(old_files)
+        _known.update(files)
+        _save_cache(directory)
+
+    logger.info(f"Wrote {len(dirty)} of {len(files)} profile shard(s)")
+    key = sharded_source_key()
+    if key is None:
+        raise OSError("config manifest disappeared after writing it")
+    return WriteTiming(
+        size=size, serialize_ms=serialize_ms, write_ms=write_ms, fsync_ms=fsync_ms, key=key
+    )
+
+
+# ── Migration ────────────────────────────────────────────────────────────────
+
+
+def _same_config(
+    a: tuple[list[MenuProfile], AppSettings], b: tuple[list[MenuProfile], AppSettings]
+) -> bool:
+    return config.freeze_config(*a) == config.freeze_config(*b)
+
+
+def migrate_to_shards() -> bool:
+    """Convert the single-file configuration to the sharded layout.
+
+    The single file is removed only after the sharded copy loads back
+    identical.
+
+    Returns:
+        False if the configuration is already sharded or the conversion
+        could not be verified (the single file is kept then).
+    """
+    if is_sharded():
+        logger.info("Configuration is already sharded")
+        return False
+    original = config.load_config()
+    try:
+        write_sharded(config.freeze_config(*original))
+        _reset_cache()  # Verify from disk, not from what was just cached
+        if not _same_config(load_sharded(), original):
+            raise ValueError("sharded copy differs from the original")
+    except Exception as e:
+        logger.error(f"Migration to sharded config failed: {e}")
+        _remove_sharded()
+        return False
+    for path in (config.CONFIG_FILE, config._snapshot_path()):
+        if os.path.exists(path):
+            os.remove(path)
+    logger.info(f"Migrated configuration to {len(original[0])} profile shard(s)")
+    return True
+
+
+def migrate_to_single_file() -> bool:
+    """Convert the sharded layout back to the single-file schema version 5.
+
+    Returns:
+        False if the configuration is not sharded or the conversion failed
+        (the shards are kept then).
+    """
+    if not is_sharded():
+        logger.info("Configuration is not sharded")
+        return False
+    original = load_sharded()
+    data = config._config_json(config.freeze_config(*original)).encode("utf-8")
+    stored = json.loads(data)
+    copy = (
+        [config._parse_profile(p) for p in stored["profiles"]],
+        config._parse_settings(stored["settings"]),
+    )
+    if not _same_config(copy, original):
+        logger.error("Single-file config would differ from the sharded original")
+        return False
+    try:
+        config._atomic_write(config.CONFIG_FILE, data)
+    except Exception as e:
+        logger.error(f"Migration to single-file config failed: {e}")
+        return False
+    _remove_sharded()
+    logger.info("Migrated configuration to a single file")
+    return True
+
+
+def export_single_file(path: str) -> None:
+    """Write the sharded configuration to ``path`` as one schema version 5 file."""
+    data = config._config_json(config.freeze_config(*load_sharded()))
+    config._atomic_write(path, data.encode("utf-8"))
+
+
+def import_single_file(path: str) -> bool:
+    """Replace the sharded configuration with a single-file one, keeping the layout."""
+    shutil.copy(path, config.CONFIG_FILE)
+    _remove_sharded()
+    return migrate_to_shards()
+
+
+def _remove_sharded() -> None:
+    """Delete the manifest and the shards it lists (other files are left alone)."""
+    directory = shard_dir()
+    files = _old_shard_files()
+    if os.path.exists(manifest_path()):
+        os.remove(manifest_path())
+    for file in (*files, _CACHE_NAME):
+        path = os.path.join(directory, file)
+        if os.path.exists(path):
+            os.remove(path)
+    if os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+    _reset_cache()
@@ -0,0 +1,317 @@
+"""Process-wide owner of the loaded configuration.
+
+The app, the settings window and the help dialog used to call
+``config.load_config`` independently, each building its own object graph,
+and every save went through a full reload of the file. ``ConfigStore``
+holds the one in-memory copy instead:
+
+- readers get ``profiles`` (a tuple view) and ``settings`` (one shared
+  ``AppSettings`` instance whose identity never changes; changed fields
+  are updated in place),
+- editors work on a deep copy from ``checkout()`` and hand it back with
+  ``commit()``, which saves the file,
+- every load/commit/update is diffed against the previous state and
+  published to subscribers as a batch of ``ConfigChange`` events (profile
+  added/removed/changed/reordered, settings field changed), so consumers
+  redo only the work a change requires,
+- ``refresh()`` re-reads the file only if it changed on disk since the
+  store last read or wrote it.
+
+With a ``ConfigWriter`` the store saves write-behind: commits and setting
+updates change the in-memory state and publish immediately, and the file
+is written on the writer's thread once a burst of saves settles. Call
+``flush()`` before reading the file directly and ``close()`` on shutdown;
+both return False while changes are not on disk. A write that fails later
+is reported to the ``subscribe_save_failures`` listeners (and retried by
+the writer).
+
+The store is used from the GUI thread.
+"""
+
+import copy
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, fields
+from typing import Any
+
+from src.core import config
+from src.core.config import AppSettings, MenuProfile
+from src.core.config_writer import ConfigWriter
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_ADDED = "profile_added"
+PROFILE_REMOVED = "profile_removed"
+PROFILE_CHANGED = "profile_changed"
+PROFILES_REORDERED = "profiles_reordered"
+SETTING_CHANGED = "setting_changed"
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """One change to the configuration.
+
+    ``name`` is the profile name, or the settings field for SETTING_CHANGED
+    (empty for PROFILES_REORDERED). ``old``/``new`` are the previous and
+    current profile or field value (None where not applicable).
+    """
+
+    kind: str
+    name: str = ""
+    old: Any = None
+    new: Any = None
+
+
+ChangeListener = Callable[[list[ConfigChange]], None]
+SaveFailureListener = Callable[[Exception], None]
+
+
+def diff_profiles(old: Sequence[MenuProfile], new: Sequence[MenuProfile]) -> list[ConfigChange]:
+    """Profile-level differences between two profile lists, matched by name."""
+    old_by_name: dict[str, list[MenuProfile]] = defaultdict(list)
+    new_by_name: dict[str, list[MenuProfile]] = defaultdict(list)
+    for p in old:
+        old_by_name[p.name].append(p)
+    for p in new:
+        new_by_name[p.name].append(p)
+
+    changes = []
+    for name, profiles in new_by_name.items():
+        if name not in old_by_name:
+            changes.append(ConfigChange(PROFILE_ADDED, name, None, profiles[0]))
+        elif old_by_name[name] != profiles:
+            changes.append(ConfigChange(PROFILE_CHANGED, name, old_by_name[name][0], profiles[0]))
+    changes.extend(
+        ConfigChange(PROFILE_REMOVED, name, profiles[0], None)
+        for name, profiles in old_by_name.items()
+        if name not in new_by_name
+    )
+
+    kept_old = [p.name for p in old if p.name in new_by_name]
+    kept_new = [p.name for p in new if p.name in old_by_name]
+    if kept_old != kept_new:
+        changes.append(ConfigChange(PROFILES_REORDERED))
+    return changes
+
+
+def diff_settings(old: AppSettings, new: AppSettings) -> list[ConfigChange]:
+    """One SETTING_CHANGED event per field that differs."""
+    changes = []
+    for f in fields(AppSettings):
+        old_value, new_value = getattr(old, f.name), getattr(new, f.name)
+        if old_value != new_value:
+            changes.append(ConfigChange(SETTING_CHANGED, f.name, old_value, new_value))
+    return changes
+
+
+class ConfigStore:
+    """The loaded profiles and settings, with change notifications."""
+
+    def __init__(self, writer: ConfigWriter | None = None) -> None:
+        self._writer = writer
+        if writer is not None:
+            writer.on_written = self._on_written
+            writer.on_failed = self._on_write_failed
+        self._profiles: list[MenuProfile] = []
+        self._view: tuple[MenuProfile, ...] = ()
+        self._settings = AppSettings()
+        self._loaded = False
+        self._source_key: config.SourceKey | None = None
+        self._listeners: list[ChangeListener] = []
+        self._failure_listeners: list[SaveFailureListener] = []
+
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def profiles(self) -> tuple[MenuProfile, ...]:
+        """Read-only view of the profiles. Edit through checkout()/commit()."""
+        return self._view
+
+    @property
+    def settings(self) -> AppSettings:
+        """The shared settings. Edit through update_settings() or commit()."""
+        return self._settings
+
+    def checkout(self) -> tuple[list[MenuProfile], AppSettings]:
+        """Deep copies of the profiles and settings for an editor."""
+        return copy.deepcopy(self._profiles), copy.deepcopy(self._settings)
+
+    # ── Changing ──────────────────────────────────────────────────────────
+
+    def load(self) -> list[ConfigChange]:
+        """(Re)read the configuration file and publish what changed."""
+        # Scheduled writes would otherwise be lost, or overwrite what is read
+        self.flush()
+        profiles, settings = config.load_config()
+        key = config.source_key()
+        if not self._loaded:
+            # First load: adopt the graph as is, there is nothing to diff against
+            self._loaded = True
+            self._settings = settings
+            self._set_profiles(profiles)
+            self._source_key = key
+            logger.info(f"Config store loaded {len(profiles)} profile(s)")
+            return []
+        changes = self._apply(profiles, settings)
+        self._source_key = key
+        return self._publish(changes)
+
+    def refresh(self) -> list[ConfigChange]:
+        """Reload only if the file changed since the store last read or wrote it."""
+        if self._loaded and self._writer is not None and self._writer.pending:
+            # The file is about to be overwritten with the in-memory state
+            return []
+        if self._loaded and config.source_key() == self._source_key:
+            return []
+        return self.load()
+
+    def commit(self, profiles: list[MenuProfile], settings: AppSettings) -> bool:
+        """Save an editor's copy and make it the current configuration.
+
+        The store keeps its own copies, so the editor can continue to
+        modify the objects it passed in.
+
+        Returns:
+            False if the file could not be saved (nothing is changed then).
+            With a writer the save is only scheduled, so this is True; a
+            failed write is reported to the save failure listeners.
+        """
+        profiles, new_settings = copy.deepcopy(profiles), copy.deepcopy(settings)
+        if self._writer is not None:
+            self._writer.schedule(profiles, new_settings)
+        elif not config.save_config(profiles, new_settings):
+            return False
+        changes = self._apply(profiles, new_settings)
+        if self._writer is None:
+            self._source_key = config.source_key()
+        self._publish(changes)
+        return True
+
+    def update_settings(self, **values: Any) -> bool:
+        """Change settings fields, save the file and publish the changes.
+
+        Returns:
+            False if the file could not be saved (the in-memory values are
+            kept either way).
+        """
+        unknown = set(values) - set(AppSettings.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        changes = []
+        for name, value in values.items():
+            old_value = getattr(self._settings, name)
+            if old_value != value:
+                setattr(self._settings, name, value)
+                changes.append(ConfigChange(SETTING_CHANGED, name, old_value, value))
+        if self._writer is not None:
+            self._writer.schedule(self._profiles, self._settings)
+            saved = True
+        else:
+            saved = config.save_config(self._profiles, self._settings)
+            if saved:
+                self._source_key = config.source_key()
+        self._publish(changes)
+        return saved
+
+    # ── Persistence ───────────────────────────────────────────────────────
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until scheduled writes are on disk (no-op without a writer).
+
+        Returns:
+            False if changes are still unsaved.
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> bool:
+        """Write pending changes and stop the writer.
+
+        Returns:
+            False if changes were left unsaved.
+        """
+        if self._writer is None:
+            return True
+        return self._writer.shutdown()
+
+    def _on_written(self, key: config.SourceKey) -> None:
+        # Worker thread: a plain assignment, read by refresh() on the GUI thread
+        self._source_key = key
+
+    def _on_write_failed(self, error: Exception) -> None:
+        # Worker thread: listeners hand the error over to their own thread
+        for listener in list(self._failure_listeners):
+            try:
+                listener(error)
+            except Exception as e:
+                logger.error(f"Save failure listener failed: {e}", exc_info=True)
+
+    # ── Notifications ─────────────────────────────────────────────────────
+
+    def subscribe(self, listener: ChangeListener) -> Callable[[], None]:
+        """Call ``listener`` with every non-empty batch of changes.
+
+        Returns:
+            A function that unsubscribes the listener.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def subscribe_save_failures(self, listener: SaveFailureListener) -> Callable[[], None]:
+        """Call ``listener`` with the error of every failed write-behind save.
+
+        The listener runs on the writer's thread.
+
+        Returns:
+            A function that unsubscribes the listener.
+        """
+        self._failure_listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._failure_listeners:
+                self._failure_listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(self, changes: list[ConfigChange]) -> list[ConfigChange]:
+        if not changes:
+            return changes
+        logger.info(f"Config changed: {', '.join(f'{c.kind}:{c.name}' for c in changes)}")
+        for listener in list(self._listeners):
+            try:
+                listener(changes)
+            except Exception as e:
+                logger.error(f"Config change listener failed: {e}", exc_info=True)
+        return changes
+
+    def _apply(self, profiles: list[MenuProfile], settings: AppSettings) -> list[ConfigChange]:
+        """Diff against the new state and adopt it; settings are updated in place."""
+        changes = diff_profiles(self._profiles, profiles) + diff_settings(self._settings, settings)
+        for change in changes:
+            if change.kind == SETTING_CHANGED:
+                setattr(self._settings, change.name, change.new)
+        # Unchanged profiles keep their identity (consumers may hold references)
+        unchanged: dict[str, MenuProfile] = {}
+        for p in self._profiles:
+            unchanged.setdefault(p.name, p)
+        merged = []
+        for p in profiles:
+            old = unchanged.pop(p.name, None)
+            merged.append(old if old is not None and old == p else p)
+        self._set_profiles(merged)
+        return changes
+
+    def _set_profiles(self, profiles: list[MenuProfile]) -> None:
+        self._profiles = profiles
+        self._view = tuple(profiles)
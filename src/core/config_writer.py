@@ -0,0 +1,147 @@
+"""Write-behind persistence of the configuration.
+
+``save_config`` serializes the whole configuration (``indent=2``, deep
+``asdict`` copies) and writes it on the calling thread, which freezes the
+UI for large configurations. ``ConfigWriter`` instead takes a cheap
+immutable copy (``config.freeze_config``) on the caller's thread and
+serializes it on a worker thread:
+
+- saves are debounced: a save becomes due ``debounce_s`` after the last
+  request, but never later than ``max_delay_s`` after the first unwritten
+  one, and a burst of saves writes only the latest state,
+- each write keeps the atomic tempfile + fsync + replace guarantee of
+  ``config.write_config``,
+- ``flush()`` writes pending state immediately and waits for it (before
+  exporting the file, and from the app's cleanup on shutdown),
+- a failed write is reported through ``on_failed`` and retried after
+  ``retry_s`` unless newer state supersedes it; until a write succeeds
+  ``flush()`` and ``shutdown()`` report the state as unsaved,
+- serialization, write and fsync times are recorded per write.
+
+The debounce/flush/retry loop is ``debounced_writer.DebouncedWriter``.
+"""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from src.core import config
+from src.core.config import AppSettings, FrozenConfig, MenuProfile, SourceKey, WriteTiming
+from src.core.debounced_writer import DebouncedWriter
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DEBOUNCE_S = 0.3
+DEFAULT_MAX_DELAY_S = 2.0
+DEFAULT_RETRY_S = 5.0
+_TIMING_HISTORY = 50
+
+
+@dataclass
+class WriterStats:
+    requests: int = 0
+    writes: int = 0
+    coalesced: int = 0  # Requests superseded by a later one before being written
+    failed: int = 0
+    recent: deque[WriteTiming] = field(default_factory=lambda: deque(maxlen=_TIMING_HISTORY))
+
+    def summary(self) -> str:
+        text = (
+            f"requests={self.requests} writes={self.writes} "
+            f"coalesced={self.coalesced} failed={self.failed}"
+        )
+        if self.recent:
+            n = len(self.recent)
+            text += (
+                f" mean_serialize={sum(t.serialize_ms for t in self.recent) / n:.1f}ms"
+                f" max_serialize={max(t.serialize_ms for t in self.recent):.1f}ms"
+                f" mean_fsync={sum(t.fsync_ms for t in self.recent) / n:.1f}ms"
+                f" max_fsync={max(t.fsync_ms for t in self.recent):.1f}ms"
+            )
+        return text
+
+
+class ConfigWriter:
+    """Debounced, coalescing config writer with one worker thread."""
+
+    def __init__(
+        self,
+        *,
+        debounce_s: float = DEFAULT_DEBOUNCE_S,
+        max_delay_s: float = DEFAULT_MAX_DELAY_S,
+        retry_s: float = DEFAULT_RETRY_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.stats = WriterStats()
+        # Called on the worker thread with the key of each file written
+        self.on_written: Callable[[SourceKey], None] | None = None
+        # Called on the worker thread with the error of each failed write
+        self.on_failed: Callable[[Exception], None] | None = None
+        self._writer = DebouncedWriter(
+            self._write,
+            name="ConfigWriter",
+            debounce_s=debounce_s,
+            max_delay_s=max_delay_s,
+            retry_s=retry_s,
+            clock=clock,
+        )
+        self._writer.on_failed = self._on_failed
+
+    @property
+    def pending(self) -> bool:
+        """Whether state is waiting to be written (or being written)."""
+        return self._writer.pending
+
+    @property
+    def last_error(self) -> Exception | None:
+        """Why the latest write failed, or None if it succeeded."""
+        return self._writer.last_error
+
+    def schedule(self, profiles: list[MenuProfile], settings: AppSettings) -> None:
+        """Freeze the configuration now and write it once the burst settles."""
+        self.stats.requests += 1
+        if self._writer.schedule(config.freeze_config(profiles, settings)):
+            self.stats.coalesced += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write pending state now and wait until it is on disk.
+
+        Returns:
+            False if the state is not on disk: the write failed or did not
+            finish within ``timeout``.
+        """
+        return self._writer.flush(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        """Flush pending state and stop the worker thread.
+
+        Returns:
+            False if changes were left unsaved.
+        """
+        saved = self._writer.shutdown(timeout)
+        if not saved:
+            logger.error("Pending configuration changes could not be written before shutdown")
+        if self.stats.requests:
+            logger.info(f"Config writer: {self.stats.summary()}")
+        return saved
+
+    # ── Worker thread ─────────────────────────────────────────────────────
+
+    def _write(self, frozen: FrozenConfig) -> None:
+        try:
+            timing = config.write_config(frozen)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Error saving config: {e}", exc_info=True)
+            raise
+        self.stats.writes += 1
+        self.stats.recent.append(timing)
+        logger.info(f"Configuration saved ({timing.summary()})")
+        if self.on_written is not None:
+            self.on_written(timing.key)
+
+    def _on_failed(self, error: Exception) -> None:
+        if self.on_failed is not None:
+            self.on_failed(error)
@@ -0,0 +1,195 @@
+"""Debounced write-behind of the latest state on one worker thread.
+
+The configuration and the icon history both change in bursts and used to
+be rewritten on the calling thread for every change. ``DebouncedWriter``
+holds the latest scheduled state and hands it to a write function on its
+own thread instead:
+
+- a write becomes due ``debounce_s`` after the last ``schedule()``, but
+  never later than ``max_delay_s`` after the first unwritten state (if
+  set), and a burst writes only the latest state,
+- ``flush()`` writes pending state immediately and waits for it,
+- a write function that raises is reported through ``on_failed``; with
+  ``retry_s`` its state is written again after that long unless newer
+  state supersedes it. Until a write succeeds, ``flush()`` and
+  ``shutdown()`` report the state as unsaved.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DebouncedWriter[T]:
+    """Writes the latest scheduled state once a burst settles."""
+
+    def __init__(
+        self,
+        write: Callable[[T], None],
+        *,
+        name: str,
+        debounce_s: float,
+        max_delay_s: float | None = None,
+        retry_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the writer; its thread starts on the first ``schedule()``.
+
+        Args:
+            write: Persists one state; raises on failure. Runs on the worker thread.
+            name: Name of the worker thread.
+            debounce_s: Quiet time before pending state is written.
+            max_delay_s: Longest a burst may postpone the write (None: no bound).
+            retry_s: Delay before a failed state is written again (None: dropped).
+            clock: Monotonic time source for the due times.
+        """
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self.retry_s = retry_s
+        self._write = write
+        self._name = name
+        self._clock = clock
+        # Called on the worker thread with the error of each failed write
+        self.on_failed: Callable[[Exception], None] | None = None
+
+        self._cond = threading.Condition()
+        self._pending: T | None = None
+        self._first_request = 0.0
+        self._due = 0.0
+        self._writing = False
+        self._running = False
+        self._thread: threading.Thread | None = None
+        # Error of the latest write (None once a write succeeds), write attempts so far
+        self._error: Exception | None = None
+        self._attempts = 0
+
+    @property
+    def pending(self) -> bool:
+        """Whether state is waiting to be written (or being written)."""
+        with self._cond:
+            return self._pending is not None or self._writing
+
+    @property
+    def last_error(self) -> Exception | None:
+        """Why the latest write failed, or None if it succeeded."""
+        with self._cond:
+            return self._error
+
+    def schedule(self, state: T) -> bool:
+        """Write ``state`` once the burst settles.
+
+        Returns:
+            True if it superseded state that was not written yet.
+        """
+        now = self._clock()
+        with self._cond:
+            superseded = self._pending is not None
+            if not superseded:
+                self._first_request = now
+            self._pending = state
+            self._due = now + self.debounce_s
+            if self.max_delay_s is not None:
+                self._due = min(self._due, self._first_request + self.max_delay_s)
+            self._ensure_worker()
+            self._cond.notify_all()
+        return superseded
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write pending state now and wait until it is written.
+
+        Returns:
+            False if the state is unsaved: the write failed or did not
+            finish within ``timeout``.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            attempts = self._attempts
+            if self._pending is not None:
+                self._due = self._clock()
+                self._cond.notify_all()
+            while self._pending is not None or self._writing:
+                if self._error is not None and self._attempts > attempts and not self._writing:
+                    return False  # Tried since the flush began; the retry is not waited for
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._cond.wait(remaining)
+            return self._error is None
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        """Flush pending state and stop the worker thread.
+
+        Returns:
+            False if state was left unsaved.
+        """
+        saved = self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return saved
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        """Start the worker on first use (caller holds the condition)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _next_write(self) -> T | None:
+        """Wait until pending state is due and take it; None when shutting down."""
+        with self._cond:
+            while self._running:
+                if self._pending is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._due - self._clock()
+                if remaining <= 0:
+                    break
+                # Woken early by schedule/flush: re-check the (possibly new) due time
+                self._cond.wait(remaining)
+            if self._pending is None:
+                return None
+            state, self._pending = self._pending, None
+            self._writing = True
+            return state
+
+    def _run(self) -> None:
+        while True:
+            state = self._next_write()
+            if state is None:
+                return
+            try:
+                self._write(state)
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    if self._pending is None and self._running and self.retry_s is not None:
+                        # Nothing newer to write: try this state again later
+                        self._pending = state
+                        self._first_request = self._clock()
+                        self._due = self._first_request + self.retry_s
+                if self.on_failed is not None:
+                    try:
+                        self.on_failed(e)
+                    except Exception as callback_error:
+                        logger.error(
+                            f"{self._name}: failure callback failed: {callback_error}",
+                            exc_info=True,
+                        )
+            else:
+                with self._cond:
+                    self._error = None
+            finally:
+                with self._cond:
+                    self._attempts += 1
+                    self._writing = False
+                    self._cond.notify_all()
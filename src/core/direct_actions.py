@@ -0,0 +1,147 @@
+"""Overlay-free actions: direct slice hotkeys and per-profile repeat keys.
+
+A slice with a ``hotkey`` runs its action as soon as the hotkey goes down;
+a profile's ``repeat_key`` re-runs the last action chosen from that
+profile. Neither shows the overlay. Their keys are registered with the
+HookManager alongside the menu triggers.
+
+Bindings are scoped like menu profiles: a binding of a profile with
+``target_apps`` applies while a target is contained in the foreground exe
+name or window title and takes precedence over bindings of profiles
+without ``target_apps``, which apply everywhere. A profile needs no
+trigger key for this, so a profile of direct hotkeys only works too.
+Menu triggers take precedence: a hotkey equal to a trigger key is ignored.
+
+Keys are compared by their parsed chords, so "Shift+Ctrl+A" and
+"ctrl+shift+a" (or "control"/"ctrl", "win"/"windows", "esc"/"escape") are
+the same key.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from src.core.config import MenuProfile, PieSlice
+from src.core.logger import get_logger
+from src.core.trigger_table import Chord, parse_trigger
+
+logger = get_logger(__name__)
+
+# Slice types that cannot run without the menu
+_NAVIGATION_TYPES = frozenset({"submenu", "back"})
+
+
+@dataclass(frozen=True)
+class DirectBinding:
+    """One hotkey → action binding; ``item`` is None for a repeat key."""
+
+    profile: MenuProfile
+    item: PieSlice | None = None
+
+    @property
+    def is_repeat(self) -> bool:
+        return self.item is None
+
+
+class DirectActionTable:
+    """Direct hotkeys and repeat keys of every profile, in config order."""
+
+    def __init__(self, profiles: Sequence[MenuProfile]) -> None:
+        # Parsed chords -> menu trigger / first spelling of a direct key
+        self._triggers = {
+            parse_trigger(p.trigger_key): p.trigger_key for p in profiles if p.trigger_key
+        }
+        self._spellings: dict[tuple[Chord, ...], str] = {}
+        # Keyed by the spelling registered with the hook
+        self._bindings: dict[str, list[DirectBinding]] = {}
+
+        def bind(key: str, binding: DirectBinding) -> None:
+            chords = parse_trigger(key)
+            if chords in self._triggers:
+                logger.warning(
+                    f"Profile '{binding.profile.name}': '{key}' is a menu trigger, "
+                    "ignoring it as a direct key"
+                )
+                return
+            spelling = self._spellings.setdefault(chords, key)
+            self._bindings.setdefault(spelling, []).append(binding)
+
+        for profile in profiles:
+            if profile.repeat_key:
+                bind(profile.repeat_key, DirectBinding(profile))
+            for item in _iter_hotkey_slices(profile.items):
+                if item.action_type in _NAVIGATION_TYPES:
+                    logger.warning(
+                        f"Profile '{profile.name}': slice '{item.label}' "
+                        f"({item.action_type}) cannot have a direct hotkey"
+                    )
+                    continue
+                bind(item.hotkey, DirectBinding(profile, item))
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and bool(self._bindings_for(key))
+
+    @property
+    def keys(self) -> list[str]:
+        """Every direct key, to register with the hook."""
+        return list(self._bindings)
+
+    def resolve(self, key: str, exe: str | None, title: str | None) -> DirectBinding | None:
+        """Binding of ``key`` that applies to the foreground window, or None.
+
+        Args:
+            key: The direct key that was pressed
+            exe: Lower-case executable name of the foreground window, if known
+            title: Foreground window title, if known
+        """
+        fallback = None
+        title_lower = title.lower() if title else ""
+        for binding in self._bindings_for(key):
+            scope = _scope(binding.profile)
+            if not scope:
+                if fallback is None:
+                    fallback = binding
+            elif exe and any(t in exe or t in title_lower for t in scope):
+                return binding
+        return fallback
+
+    def trigger_for(self, key: str) -> str | None:
+        """The menu trigger that ``key`` is the same key as, or None."""
+        return self._triggers.get(parse_trigger(key))
+
+    def clashes(
+        self, key: str, profile: MenuProfile | None, item: PieSlice | None = None
+    ) -> list[DirectBinding]:
+        """Existing bindings that ``key`` would collide with as a hotkey of ``profile``.
+
+        Bindings of profiles scoped to other target apps do not collide
+        (only one of them applies at a time); ``item``'s own binding is
+        skipped. Without a profile, every other binding of the key counts.
+        """
+        scope = None if profile is None else _scope(profile)
+        return [
+            binding
+            for binding in self._bindings_for(key)
+            if (item is None or binding.item is not item)
+            and (scope is None or _scope(binding.profile) == scope)
+        ]
+
+    def _bindings_for(self, key: str) -> list[DirectBinding]:
+        # The hook reports the registered spelling; other spellings are parsed
+        bindings = self._bindings.get(key)
+        if bindings is None:
+            spelling = self._spellings.get(parse_trigger(key))
+            bindings = self._bindings.get(spelling, []) if spelling is not None else []
+        return bindings
+
+
+def _scope(profile: MenuProfile) -> frozenset[str]:
+    return frozenset(app.lower() for app in profile.target_apps)
+
+
+def _iter_hotkey_slices(items: list[PieSlice]) -> list[PieSlice]:
+    found = []
+    for item in items:
+        if item.hotkey:
+            found.append(item)
+        found.extend(_iter_hotkey_slices(item.submenu_items))
+    return found
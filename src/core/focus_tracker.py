@@ -0,0 +1,242 @@
+"""Foreground-change driven profile pre-resolution.
+
+Instead of querying the active window and matching profiles after a
+trigger goes down, ``ProfilePreResolver`` listens for foreground window
+changes (and title changes of the foreground window) and re-resolves the
+effective profile of every trigger in the background. A trigger press then
+reads the precomputed map, after one cheap check that the foreground
+window is still the one the map was built for.
+
+Focus events come from a ``FocusEventSource``: ``Win32FocusEventSource``
+(SetWinEventHook) in the app, ``ManualFocusEventSource`` in tests.
+"""
+
+import sys
+import threading
+from collections.abc import Callable
+from typing import Any, Protocol
+
+from src.core.config import MenuProfile
+from src.core.logger import get_logger
+from src.core.profile_resolver import ProfileResolver
+from src.core.window_info import WindowInfoProvider
+
+logger = get_logger(__name__)
+
+
+class FocusEventSource(Protocol):
+    """Calls ``on_change`` whenever the foreground window (or its title) changes."""
+
+    def start(self, on_change: Callable[[], None]) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class ManualFocusEventSource:
+    """Focus source driven by explicit ``emit()`` calls (tests, benchmarks)."""
+
+    def __init__(self) -> None:
+        self._on_change: Callable[[], None] | None = None
+
+    def start(self, on_change: Callable[[], None]) -> None:
+        self._on_change = on_change
+
+    def stop(self) -> None:
+        self._on_change = None
+
+    def emit(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
+
+
+class ProfilePreResolver:
+    """Keeps trigger → profile resolved for the current foreground window."""
+
+    def __init__(
+        self,
+        source: FocusEventSource,
+        window_info: WindowInfoProvider,
+        resolver: Callable[[], ProfileResolver],
+    ) -> None:
+        self._source = source
+        self._window_info = window_info
+        self._resolver = resolver
+        self._refresh_lock = threading.Lock()
+        # (hwnd, resolver, {trigger: profile}); replaced atomically
+        self._snapshot: tuple[int, ProfileResolver | None, dict[str, MenuProfile | None]] = (
+            0,
+            None,
+            {},
+        )
+        self.refresh_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> None:
+        self.refresh()
+        self._source.start(self.refresh)
+
+    def stop(self) -> None:
+        self._source.stop()
+        self._snapshot = (0, None, {})
+
+    def refresh(self) -> None:
+        """Re-resolve every trigger for the current foreground window."""
+        with self._refresh_lock:
+            try:
+                # Title events must be seen even inside the title cache TTL
+                self._window_info.invalidate_title()
+                hwnd, exe, title = self._window_info.get_foreground_info()
+                resolver = self._resolver()
+                profiles = {t: resolver.resolve(t, exe, title) for t in resolver.trigger_keys}
+            except Exception as e:
+                logger.error(f"Profile pre-resolution failed: {e}", exc_info=True)
+                self._snapshot = (0, None, {})
+                return
+            self._snapshot = (hwnd, resolver, profiles)
+            self.refresh_count += 1
+
+    def lookup(self, trigger_key: str) -> tuple[bool, MenuProfile | None]:
+        """Return (found, profile) from the precomputed map.
+
+        ``found`` is False when the map may be stale (focus moved before
+        the change event was processed, or the configuration was reloaded);
+        the caller should then resolve directly.
+        """
+        hwnd, resolver, profiles = self._snapshot
+        if (
+            not hwnd
+            or resolver is not self._resolver()
+            or hwnd != self._window_info.foreground_window()
+        ):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, profiles.get(trigger_key)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.HWND,
+        wintypes.LONG,
+        wintypes.LONG,
+        wintypes.DWORD,
+        wintypes.DWORD,
+    )
+
+    _user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.HMODULE,
+        WinEventProc,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.DWORD,
+    )
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+    _user32.PostThreadMessageW.argtypes = (
+        wintypes.DWORD,
+        wintypes.UINT,
+        wintypes.WPARAM,
+        wintypes.LPARAM,
+    )
+
+    class Win32FocusEventSource:
+        """SetWinEventHook based focus source with its own message loop thread.
+
+        Our own process is skipped: focusing the overlay must not change
+        the profile resolved for the application underneath.
+        """
+
+        def __init__(self) -> None:
+            self._on_change: Callable[[], None] | None = None
+            self._thread: threading.Thread | None = None
+            self._thread_id = 0
+            # Keep a reference so the callback is not garbage collected
+            self._proc: Any = None
+
+        def start(self, on_change: Callable[[], None]) -> None:
+            self._on_change = on_change
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(ready,), name="FocusEvents", daemon=True
+            )
+            self._thread.start()
+            ready.wait(timeout=1.0)
+
+        def stop(self) -> None:
+            if self._thread_id:
+                _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                thread.join(timeout=1.0)
+            self._thread_id = 0
+
+        def _run(self, ready: threading.Event) -> None:
+            self._thread_id = _kernel32.GetCurrentThreadId()
+            self._proc = WinEventProc(self._callback)
+            flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+            hooks = [
+                _user32.SetWinEventHook(event, event, None, self._proc, 0, 0, flags)
+                for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE)
+            ]
+            if not all(hooks):
+                logger.error(f"SetWinEventHook failed: {ctypes.get_last_error()}")
+            ready.set()
+
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+
+            for hook in hooks:
+                if hook:
+                    _user32.UnhookWinEvent(hook)
+
+        def _callback(
+            self,
+            _hook: Any,
+            event: int,
+            hwnd: Any,
+            id_object: int,
+            _id_child: int,
+            _thread: int,
+            _time: int,
+        ) -> None:
+            # Title changes only matter for the foreground window itself
+            if event == EVENT_OBJECT_NAMECHANGE and (
+                id_object != OBJID_WINDOW or hwnd != _user32.GetForegroundWindow()
+            ):
+                return
+            on_change = self._on_change
+            if on_change is None:
+                return
+            try:
+                on_change()
+            except Exception as e:
+                logger.error(f"Focus change handler failed: {e}", exc_info=True)
+
+
+def create_default_focus_source() -> FocusEventSource | None:
+    """Return the platform focus event source, or None where unsupported."""
+    if sys.platform == "win32":
+        return Win32FocusEventSource()
+    return None
@@ -0,0 +1,163 @@
+"""Out-of-process keyboard hook host.
+
+The low-level hook callback is Python code, so in-process it competes for
+the GIL with the Qt GUI thread: while the overlay paints or the settings
+window rebuilds its item list, every keystroke on the system waits. The
+host runs the native hook and the trigger table in a minimal child process
+(no pynput, no Qt) and reports trigger presses/releases and modifier state
+to the GUI process over a ``multiprocessing`` pipe.
+
+Keep imports here light: this module is the child's entry point.
+
+Protocol (tuples pickled over the pipe):
+    parent -> host: ("triggers", [keys], {key: timeout_s}), ("recording_mode", bool),
+                    ("benchmark", count, interval_s), ("stop",)
+    host -> parent: ("ready",), ("trigger", (kind, trigger, key_name)),
+                    ("modifiers", [names]), ("benchmark_result", [latency_ns])
+"""
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from src.core.logger import get_logger
+from src.core.trigger_table import ALL_MOD_VKS, WM_KEYDOWN, WM_KEYUP, TriggerTable
+
+logger = get_logger(__name__)
+
+CMD_TRIGGERS = "triggers"
+CMD_RECORDING_MODE = "recording_mode"
+CMD_BENCHMARK = "benchmark"
+CMD_STOP = "stop"
+
+MSG_READY = "ready"
+MSG_TRIGGER = "trigger"
+MSG_MODIFIERS = "modifiers"
+MSG_BENCHMARK = "benchmark_result"
+
+_BENCHMARK_VK = 0x41  # 'A' — an ordinary key that only exercises the filter path
+
+
+def measure_event_latency(
+    filter_func: Callable[[int, Any], bool | None],
+    count: int,
+    interval_s: float,
+    clock: Callable[[], int] = time.perf_counter_ns,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[int]:
+    """Feed synthetic key events on a fixed schedule and time each decision.
+
+    Each latency is measured from the event's scheduled arrival to the end
+    of the filter call, so it includes the time the calling thread waited
+    to get the GIL back — the delay a real hook callback would see.
+    """
+    data = SimpleNamespace(vkCode=_BENCHMARK_VK, scanCode=0, flags=0, time=0)
+    interval_ns = int(interval_s * 1e9)
+    latencies: list[int] = []
+    start = clock()
+    for i in range(count):
+        due = start + (i + 1) * interval_ns
+        remaining = due - clock()
+        if remaining > 0:
+            sleep(remaining / 1e9)
+        filter_func(WM_KEYDOWN if i % 2 == 0 else WM_KEYUP, data)
+        latencies.append(clock() - due)
+    return latencies
+
+
+class HookHost:
+    """Child-process side: native hook + trigger table + pipe to the GUI."""
+
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+        self._send_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self.table = TriggerTable()
+        self._hook: Any = None
+        self._sent_modifiers: frozenset[str] = frozenset()
+
+    def filter_event(self, msg: int, data: Any) -> bool:
+        """Hook filter: decide synchronously, notify the GUI asynchronously."""
+        vk = data.vkCode
+        with self._state_lock:
+            allow, event = self.table.process(msg, vk)
+            modifiers = frozenset(self.table.held_modifiers) if vk in ALL_MOD_VKS else None
+
+        if modifiers is not None and modifiers != self._sent_modifiers:
+            self._sent_modifiers = modifiers
+            self._send((MSG_MODIFIERS, sorted(modifiers)))
+        if event is not None:
+            self._send((MSG_TRIGGER, event))
+        return allow
+
+    def handle_command(self, command: tuple[Any, ...]) -> bool:
+        """Apply one parent command. Returns False when the host should exit."""
+        name = command[0]
+        if name == CMD_TRIGGERS:
+            with self._state_lock:
+                self.table.set_triggers(list(command[1]), command[2])
+        elif name == CMD_RECORDING_MODE:
+            self.table.recording_mode = bool(command[1])
+        elif name == CMD_BENCHMARK:
+            threading.Thread(target=self._run_benchmark, args=command[1:], daemon=True).start()
+        elif name == CMD_STOP:
+            return False
+        else:
+            logger.warning(f"Hook host: unknown command {name!r}")
+        return True
+
+    def start_hook(self) -> None:
+        if sys.platform != "win32":
+            logger.warning("Hook host: native hook is only available on Windows")
+            return
+        from src.core.native_hook import _NativeWin32Hook
+
+        self._hook = _NativeWin32Hook(filter_func=self.filter_event)
+        self._hook.start()
+
+    def stop_hook(self) -> None:
+        if self._hook is not None:
+            self._hook.stop()
+            self._hook = None
+
+    def serve(self) -> None:
+        """Process parent commands until told to stop or the parent goes away."""
+        self._send((MSG_READY,))
+        while True:
+            try:
+                command = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if not self.handle_command(command):
+                break
+
+    def _run_benchmark(self, count: int, interval_s: float) -> None:
+        self._send((MSG_BENCHMARK, measure_event_latency(self.filter_event, count, interval_s)))
+
+    def _send(self, message: tuple[Any, ...]) -> None:
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Hook host: could not send {message[0]}: {e}")
+
+
+def run_host(
+    conn: Any,
+    trigger_keys: list[str],
+    sequence_timeouts: dict[str, float] | None = None,
+    recording_mode: bool = False,
+) -> None:
+    """Child process entry point."""
+    host = HookHost(conn)
+    host.table.set_triggers(trigger_keys, sequence_timeouts)
+    host.table.recording_mode = recording_mode
+    host.start_hook()
+    try:
+        host.serve()
+    finally:
+        host.stop_hook()
+        conn.close()
@@ -9,19 +9,35 @@ Key insight: suppressed events do NOT reach on_press/on_release callbacks,
 so all trigger logic must live inside win32_event_filter itself.
 """
 
+import contextlib
+import multiprocessing
 import sys as _sys
 import threading
 import time
 from collections.abc import Callable
-from typing import Any, ClassVar
+from typing import Any
 
 from pynput import keyboard as pynput_keyboard
 
+from src.core import hook_host
+from src.core.hook_recorder import HookEventRecorder
+from src.core.hook_watchdog import HookWatchdog, create_default_backend
+from src.core.key_names import parse_key
 from src.core.logger import get_logger
-from src.core.win32_input import MAGIC_EXTRA_INFO, send_pynput_key_safely
+from src.core.trigger_table import (
+    EVENT_PRESS,
+    TriggerConfigs,
+    TriggerEvent,
+    TriggerMatcher,
+    TriggerTable,
+)
+from src.core.win32_input import send_key_plan
 
 logger = get_logger(__name__)
 
+# Longest a release callback waits for its press callback to finish
+_PRESS_WAIT_S = 1.0
+
 # Map from string modifier name (from trigger config) to Windows VK codes
 _MOD_VK: dict[str, set[int]] = {
     "ctrl": {0xA2, 0xA3},  # VK_LCONTROL, VK_RCONTROL
@@ -31,46 +47,6 @@ _MOD_VK: dict[str, set[int]] = {
     "win": {0x5B, 0x5C},
 }
 
-# Windows Message Constants
-WM_KEYDOWN = 0x100
-WM_KEYUP = 0x101
-WM_SYSKEYDOWN = 0x104
-WM_SYSKEYUP = 0x105
-
-# All modifier VKs (to track held state)
-_ALL_MOD_VKS: dict[int, str] = {
-    0xA2: "ctrl",
-    0xA3: "ctrl",
-    0xA4: "alt",
-    0xA5: "alt",
-    0xA0: "shift",
-    0xA1: "shift",
-    0x5B: "windows",
-    0x5C: "windows",
-}
-
-# VK → primary key name mapping
-_VK_TO_NAME: dict[int, str] = {
-    0x20: "space",
-    0x0D: "enter",
-    0x09: "tab",
-    0x1B: "escape",
-    0x08: "backspace",
-    0x2E: "delete",
-    0x2D: "insert",
-    0x24: "home",
-    0x23: "end",
-    0x21: "page_up",
-    0x22: "page_down",
-    0x26: "up",
-    0x28: "down",
-    0x25: "left",
-    0x27: "right",
-    **{0x70 + i: f"f{i + 1}" for i in range(12)},  # F1-F12
-    **{0x41 + i: chr(ord("a") + i) for i in range(26)},  # A-Z → a-z
-    **{0x30 + i: str(i) for i in range(10)},  # 0-9
-}
-
 # pynput Key → modifier name (for release_all_modifiers)
 _PYNPUT_MOD_MAP: dict[Any, str] = {
     pynput_keyboard.Key.ctrl: "ctrl",
@@ -88,178 +64,8 @@ _PYNPUT_MOD_MAP: dict[Any, str] = {
 }
 
 
-def _parse_key(name: str) -> pynput_keyboard.Key | pynput_keyboard.KeyCode:
-    """Parse a key name string into a pynput key object."""
-    try:
-        return pynput_keyboard.Key[name]
-    except KeyError:
-        pass
-    aliases = {
-        "space": pynput_keyboard.Key.space,
-        "enter": pynput_keyboard.Key.enter,
-        "tab": pynput_keyboard.Key.tab,
-        "esc": pynput_keyboard.Key.esc,
-        "escape": pynput_keyboard.Key.esc,
-        "backspace": pynput_keyboard.Key.backspace,
-        "delete": pynput_keyboard.Key.delete,
-        "insert": pynput_keyboard.Key.insert,
-        "home": pynput_keyboard.Key.home,
-        "end": pynput_keyboard.Key.end,
-        "page_up": pynput_keyboard.Key.page_up,
-        "page_down": pynput_keyboard.Key.page_down,
-        "up": pynput_keyboard.Key.up,
-        "down": pynput_keyboard.Key.down,
-        "left": pynput_keyboard.Key.left,
-        "right": pynput_keyboard.Key.right,
-        **{f"f{i}": getattr(pynput_keyboard.Key, f"f{i}") for i in range(1, 13)},
-    }
-    if name in aliases:
-        from typing import cast
-
-        return cast(pynput_keyboard.Key | pynput_keyboard.KeyCode, aliases[name])
-    if len(name) == 1:
-        return pynput_keyboard.KeyCode.from_char(name)
-    return pynput_keyboard.KeyCode.from_char(name[0])
-
-
-# ──────────────────────────────────────────────────────────────────────────
-# Windows Native Hook Implementation
-# ──────────────────────────────────────────────────────────────────────────
-
 if _sys.platform == "win32":
-    import ctypes
-    from ctypes import wintypes
-
-    user32 = ctypes.windll.user32
-    kernel32 = ctypes.windll.kernel32
-
-    WH_KEYBOARD_LL = 13
-    HC_ACTION = 0
-
-    class KBDLLHOOKSTRUCT(ctypes.Structure):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [
-            ("vkCode", wintypes.DWORD),
-            ("scanCode", wintypes.DWORD),
-            ("flags", wintypes.DWORD),
-            ("time", wintypes.DWORD),
-            ("dwExtraInfo", ctypes.c_void_p),
-        ]
-
-    LowLevelKeyboardProc = ctypes.WINFUNCTYPE(
-        ctypes.c_long, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
-    )
-
-    user32.SetWindowsHookExW.argtypes = (
-        ctypes.c_int,
-        LowLevelKeyboardProc,
-        wintypes.HINSTANCE,
-        wintypes.DWORD,
-    )
-    user32.SetWindowsHookExW.restype = wintypes.HHOOK
-
-    user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
-    user32.UnhookWindowsHookEx.restype = wintypes.BOOL
-
-    user32.CallNextHookEx.argtypes = (
-        wintypes.HHOOK,
-        ctypes.c_int,
-        wintypes.WPARAM,
-        wintypes.LPARAM,
-    )
-    user32.CallNextHookEx.restype = wintypes.LPARAM
-
-    kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
-    kernel32.GetModuleHandleW.restype = wintypes.HINSTANCE
-
-    class _NativeWin32Hook:
-        """A native WH_KEYBOARD_LL hook for Windows.
-
-        This is needed because pynput's listener does not allow for safe,
-        synchronous event suppression without causing threading deadlocks or
-        ignoring the underlying OS message queue.
-        """
-
-        def __init__(self, filter_func: Callable[[int, Any], bool | None]):
-            self.filter_func = filter_func
-            self.hook_id: Any = None
-            self.thread_id: Any = None
-            self._thread: threading.Thread | None = None
-            self._running = False
-            self._hook_proc = LowLevelKeyboardProc(self._hook_callback)
-
-        def _hook_callback(self, n_code: int, w_param: Any, l_param: Any) -> int:
-            if n_code == HC_ACTION:
-                kb_struct = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-
-                # Extract the dwExtraInfo value safely
-                extra_info = kb_struct.dwExtraInfo
-                is_our_event = False
-                if extra_info is not None:
-                    # Depending on python/ctypes version, extra_info might be int or void_p object
-                    val = (
-                        extra_info
-                        if isinstance(extra_info, int)
-                        else getattr(extra_info, "value", 0)
-                    )
-                    if val == MAGIC_EXTRA_INFO:
-                        is_our_event = True
-
-                # Ignore events injected by our own application so we don't trap our own simulated keypresses
-                # We NO LONGER check (kb_struct.flags & 0x10) because left-hand devices use it too!
-                if not is_our_event and self.filter_func(w_param, kb_struct) is False:
-                    # filter_func returns False to suppress the event
-                    # Return non-zero to prevent the system from passing the
-                    # message to the rest of the hook chain or to the target window.
-                    return 1
-
-            return int(user32.CallNextHookEx(self.hook_id, n_code, w_param, l_param))
-
-        def start(self) -> None:
-            self._running = True
-            self._thread = threading.Thread(target=self._run_message_loop, daemon=True)
-            self._thread.start()
-
-        def _run_message_loop(self) -> None:
-            self.thread_id = kernel32.GetCurrentThreadId()
-
-            # Install the hook
-            self.hook_id = user32.SetWindowsHookExW(
-                WH_KEYBOARD_LL, self._hook_proc, kernel32.GetModuleHandleW(None), 0
-            )
-
-            if not self.hook_id:
-                logger.error("Failed to install native keyboard hook!")
-                return
-
-            logger.info("Native Windows keyboard hook installed.")
-
-            # Pump messages so the hook stays alive and responsive
-            msg = wintypes.MSG()
-            while self._running:
-                # Use PeekMessage to not block indefinitely, allowing clean shutdown
-                # PM_REMOVE = 0x0001
-                if user32.PeekMessageW(ctypes.byref(msg), 0, 0, 0, 1):
-                    user32.TranslateMessage(ctypes.byref(msg))
-                    user32.DispatchMessageW(ctypes.byref(msg))
-                else:
-                    time.sleep(0.01)
-
-            # Cleanup
-            user32.UnhookWindowsHookEx(self.hook_id)
-            self.hook_id = None
-            logger.info("Native Windows keyboard hook removed.")
-
-        def stop(self) -> None:
-            self._running = False
-            if self._thread and self._thread.is_alive():
-                # On Windows, threads pumping messages might need a nudge to wake up
-                if self.thread_id:
-                    # WM_QUIT = 0x0012
-                    user32.PostThreadMessageW(self.thread_id, 0x0012, 0, 0)
-                self._thread.join(timeout=1.0)
-
-        def is_alive(self) -> bool:
-            return self._thread is not None and self._thread.is_alive()
+    from src.core.native_hook import HC_ACTION, KBDLLHOOKSTRUCT, _NativeWin32Hook  # noqa: F401
 
 
 class HookManager:
@@ -283,36 +89,69 @@ class HookManager:
         self._listener: Any = None
         self._state_lock = threading.Lock()
 
-        # {primary_key_name: [(sorted_modifier_tuple, full_trigger_str), ...]}
-        self._trigger_configs: dict[str, list[tuple[tuple[str, ...], str]]] = {}
+        # Trigger configuration + live key state; guarded by _state_lock
+        self._table = TriggerTable()
+
+        # Per trigger: set once its press callback has returned. Only the
+        # dispatching thread (hook or host reader) touches the dict.
+        self._press_done: dict[str, threading.Event] = {}
+
+        # Opt-in raw event recorder (see src.core.hook_recorder)
+        self._recorder: HookEventRecorder | None = None
 
-        # Currently suppressed primary keys: {key_name: full_trigger_str}
-        self._active_suppressions: dict[str, str] = {}
+        # Callback latency histogram + reinstall on silent hook removal
+        self._watchdog = HookWatchdog(
+            reinstall=self._reinstall_listener, backend=create_default_backend()
+        )
+
+    # Views onto the trigger table (kept for callers and tests)
+
+    @property
+    def _trigger_configs(self) -> TriggerConfigs:
+        return self._table.trigger_configs
+
+    @property
+    def _trigger_keys(self) -> list[str]:
+        return self._table.trigger_keys
+
+    @property
+    def _active_suppressions(self) -> dict[str, str]:
+        return self._table.active_suppressions
+
+    @_active_suppressions.setter
+    def _active_suppressions(self, value: dict[str, str]) -> None:
+        self._table.active_suppressions = value
 
-        # Currently held modifier names (tracked via VK in win32_event_filter)
-        self._held_modifiers: set[str] = set()
+    @property
+    def _held_modifiers(self) -> set[str]:
+        return self._table.held_modifiers
+
+    @_held_modifiers.setter
+    def _held_modifiers(self, value: set[str]) -> None:
+        self._table.held_modifiers = value
 
     # ──────────────────────────────────────────────────────────────────────
     # Public API
     # ──────────────────────────────────────────────────────────────────────
 
-    def start_hook(self, trigger_keys: list[str]) -> None:
-        """Start hooking the given trigger key combinations."""
+    def start_hook(
+        self, trigger_keys: list[str], sequence_timeouts: dict[str, float] | None = None
+    ) -> None:
+        """Start hooking the given trigger key combinations.
+
+        Args:
+            trigger_keys: Trigger strings; strokes of a sequence are separated
+                by commas (e.g. "ctrl+k, p").
+            sequence_timeouts: Optional per-trigger seconds allowed between
+                the strokes of a sequence.
+        """
         logger.info(f"HookManager: Starting hook with triggers: {trigger_keys}")
+        matcher = TriggerMatcher(trigger_keys, sequence_timeouts)
         with self._state_lock:
             self._stop_listener_unsafe()
-            self._trigger_configs = {}
-            self._active_suppressions = {}
-            self._held_modifiers = set()
-
-            for full_key in trigger_keys:
-                parts = full_key.lower().split("+")
-                primary = parts[-1]
-                modifiers = tuple(sorted(parts[:-1]))
-                self._trigger_configs.setdefault(primary, []).append((modifiers, full_key))
-                logger.debug(
-                    f"Registered trigger: {primary} with modifiers {modifiers} (full: {full_key})"
-                )
+            self._table.use_matcher(matcher)
+            self._table.reset_state()
+        self._record_trigger_update()
 
         try:
             logger.info("HookManager: Calling _start_listener...")
@@ -323,22 +162,88 @@ class HookManager:
         except Exception as e:
             logger.error(f"HookManager: Failed to start listener: {e}", exc_info=True)
 
+        self._watchdog.start()
         logger.info(
             f"HookManager: Hooked {len(self._trigger_configs)} primary keys "
             f"for {len(trigger_keys)} menus. Listener: {self._listener}"
         )
 
+    def update_triggers(
+        self, trigger_keys: list[str], sequence_timeouts: dict[str, float] | None = None
+    ) -> None:
+        """Apply a new trigger list to the running hook in place.
+
+        Unlike start_hook, the listener thread and the installed native hook
+        stay alive; only the compiled trigger matcher is swapped, so reloads
+        are cheap and no keystrokes are dropped. Falls back to start_hook
+        when no listener is running.
+        """
+        listener = self._listener
+        if listener is None or not listener.is_alive():
+            self.start_hook(trigger_keys, sequence_timeouts)
+            return
+
+        # Compile outside the lock; the hook only waits for the swap
+        matcher = TriggerMatcher(trigger_keys, sequence_timeouts)
+        with self._state_lock:
+            self._table.use_matcher(matcher)
+        self._record_trigger_update()
+        logger.info(f"HookManager: Triggers updated in place: {trigger_keys}")
+
+    def set_recording_mode(self, enabled: bool) -> None:
+        """Let every key pass through while the settings window records a shortcut.
+
+        Modifier tracking and in-flight trigger releases keep working, so
+        leaving recording mode needs no hook restart.
+        """
+        self._table.recording_mode = enabled
+        logger.info(f"HookManager: Recording mode {'on' if enabled else 'off'}")
+
     def stop_hook(self) -> None:
         """Stop all hooks."""
+        # Stop the watchdog outside the lock: it may be mid-reinstall
+        self._watchdog.stop()
         with self._state_lock:
             self._stop_listener_unsafe()
-            self._active_suppressions.clear()
-            self._held_modifiers.clear()
+            self._table.reset_state()
 
     def unhook_all(self) -> None:
         """Unhook everything (alias for stop_hook)."""
         self.stop_hook()
 
+    def start_recording(self, path: str) -> None:
+        """Record every raw hook event and filter verdict to ``path``.
+
+        Any recording already in progress is closed first. The current
+        triggers and sequence timeouts are stored in the file header, and
+        every later trigger update is written into the stream, so replays
+        follow the same configuration.
+        """
+        self.stop_recording()
+        try:
+            self._recorder = HookEventRecorder(path, metadata=self._trigger_metadata())
+        except OSError as e:
+            logger.error(f"HookManager: Could not start event recording: {e}")
+
+    def stop_recording(self) -> None:
+        """Stop the event recording, if any."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    @property
+    def is_recording(self) -> bool:
+        return self._recorder is not None
+
+    def _trigger_metadata(self) -> dict[str, Any]:
+        matcher = self._table.matcher
+        return {"triggers": list(matcher.trigger_keys), "sequence_timeouts": dict(matcher.timeouts)}
+
+    def _record_trigger_update(self) -> None:
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record_trigger_update(self._trigger_metadata())
+
     def release_all_modifiers(self) -> None:
         """Release any modifier keys currently tracked as held.
 
@@ -354,14 +259,14 @@ class HookManager:
             "windows": pynput_keyboard.Key.cmd,
         }
 
-        for mod_name in held:
-            key = mod_to_pynput.get(mod_name)
-            if key:
-                try:
-                    send_pynput_key_safely(key, False)
-                    logger.debug(f"Released held modifier: {mod_name}")
-                except Exception as exc:
-                    logger.debug(f"Could not release {mod_name}: {exc}")
+        plan = [(mod_to_pynput[m], False) for m in sorted(held) if m in mod_to_pynput]
+        if not plan:
+            return
+        try:
+            send_key_plan(plan)
+            logger.debug(f"Released held modifiers: {sorted(held)}")
+        except Exception as exc:
+            logger.debug(f"Could not release modifiers {sorted(held)}: {exc}")
 
     # ──────────────────────────────────────────────────────────────────────
     # Listener lifecycle
@@ -376,6 +281,7 @@ class HookManager:
                 logger.info("HookManager: Creating Windows native listener...")
                 self._listener = _NativeWin32Hook(
                     filter_func=self._win32_event_filter,
+                    on_event=self._on_hook_event,
                 )
             else:
                 logger.info(f"HookManager: Creating {_sys.platform} pynput listener...")
@@ -390,6 +296,14 @@ class HookManager:
             logger.error(f"HookManager: Error in _start_listener: {e}", exc_info=True)
             raise
 
+    def _reinstall_listener(self) -> None:
+        """Replace a hook that Windows removed silently (called by the watchdog)."""
+        with self._state_lock:
+            self._stop_listener_unsafe()
+            # Key-up events may have been lost while the hook was dead
+            self._table.reset_state()
+        self._start_listener()
+
     def _stop_listener_unsafe(self) -> None:
         """Stop listener without acquiring lock (caller must hold lock)."""
         if self._listener is not None:
@@ -415,89 +329,57 @@ class HookManager:
             WM_SYSKEYDOWN = 0x104
             WM_SYSKEYUP   = 0x105
         """
-        vk = data.vkCode
-        is_press = msg in (WM_KEYDOWN, WM_SYSKEYDOWN)
-        is_release = msg in (WM_KEYUP, WM_SYSKEYUP)
-
-        # ── Track modifier state ──────────────────────────────────────────
-        mod_name = _ALL_MOD_VKS.get(vk)
-        if mod_name:
-            with self._state_lock:
-                if is_press and mod_name not in self._held_modifiers:
-                    self._held_modifiers.add(mod_name)
-                    logger.info(f"MODIFIER ADDED: {mod_name} (Current: {self._held_modifiers})")
-                elif is_release and mod_name in self._held_modifiers:
-                    self._held_modifiers.discard(mod_name)
-                    logger.info(f"MODIFIER REMOVED: {mod_name} (Current: {self._held_modifiers})")
-                # Modifier keys ALSO need to be checked as primary trigger keys
-                # (e.g. if trigger is 'ctrl' alone) — check inside the same lock!
-                is_also_trigger = mod_name in self._trigger_configs
-            if not is_also_trigger:
-                return True  # Just a modifier, pass through
-            # else: fall through to primary key logic below
-
-        # ── Resolve primary key name ──────────────────────────────────────
-        key_name = _VK_TO_NAME.get(vk) or _ALL_MOD_VKS.get(vk)
-        if key_name is None:
-            return True  # Unknown key — pass through
-
-        # ── Check if this key is currently suppressed (release phase) ─────
+        # Decide while holding the lock to avoid having to resolve race
+        # conditions later; callbacks run outside it.
         with self._state_lock:
-            suppressed_trigger = self._active_suppressions.get(key_name)
+            allow, event = self._table.process(msg, data.vkCode)
+        if event is not None:
+            self._dispatch_trigger_event(event)
+        return allow
 
-        if is_release and suppressed_trigger is not None:
-            # Suppress the release and fire the release callback
-            with self._state_lock:
-                self._active_suppressions.pop(key_name, None)
+    def _dispatch_trigger_event(self, event: TriggerEvent) -> None:
+        """Run trigger callbacks in threads so the hook is never blocked.
 
-            # Call release callback in a thread to avoid blocking the hook
-            threading.Thread(
-                target=self._handle_release,
-                args=(suppressed_trigger, key_name),
-                daemon=True,
-            ).start()
-            return False
+        The release callback waits for the press callback of the same
+        trigger, so a quick tap cannot see the release before the press.
+        """
+        kind, trigger, key_name = event
+        if kind == EVENT_PRESS:
+            logger.info(f"Trigger MATCH: {trigger}. Suppressing {key_name}.")
+            press_done = self._press_done[trigger] = threading.Event()
+            target: Callable[..., Any] = self._handle_press
+            args: tuple[Any, ...] = (trigger, press_done)
+        else:
+            # Suppressed release: fire the release callback (may replay the key)
+            target = self._handle_release
+            args = (trigger, key_name, self._press_done.pop(trigger, None))
+        try:
+            threading.Thread(target=target, args=args, daemon=True).start()
+        except Exception as e:
+            logger.error(f"HookManager: Failed to spawn thread: {e}", exc_info=True)
 
-        if is_press:
-            with self._state_lock:
-                if key_name in self._active_suppressions:
-                    return False
-
-                configs = self._trigger_configs.get(key_name, [])
-                held_tuple = tuple(sorted(self._held_modifiers))
-
-                # Check for matches immediately while we hold the lock to avoid
-                # having to resolve race conditions later
-                matched_trigger = None
-                if configs:
-                    for mod_tuple, full_key in configs:
-                        if mod_tuple == held_tuple:
-                            matched_trigger = full_key
-                            break
-
-                if matched_trigger:
-                    logger.info(f"Trigger MATCH: {matched_trigger}. Suppressing {key_name}.")
-                    self._active_suppressions[key_name] = matched_trigger
-
-                    try:
-                        logger.info(
-                            f"HookManager: Spawning thread for press callback: {matched_trigger}"
-                        )
-                        t = threading.Thread(
-                            target=self.on_trigger_press_callback,
-                            args=(matched_trigger,),
-                            daemon=True,
-                        )
-                        t.start()
-                    except Exception as e:
-                        logger.error(f"HookManager: Failed to spawn thread: {e}", exc_info=True)
-
-                    return False
-
-        return True  # Pass through
-
-    def _handle_release(self, trigger: str, key_name: str) -> None:
+    def _on_hook_event(
+        self, msg: int, data: Any, injected: bool, verdict: bool | None, latency_ns: int
+    ) -> None:
+        """Observer called by the native hook for every event (watchdog, recording)."""
+        self._watchdog.observe(None if injected else latency_ns)
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record(msg, data, injected, verdict, latency_ns)
+
+    def _handle_press(self, trigger: str, press_done: threading.Event) -> None:
+        """Handle trigger press: call callback, then let the release proceed."""
+        try:
+            self.on_trigger_press_callback(trigger)
+        finally:
+            press_done.set()
+
+    def _handle_release(
+        self, trigger: str, key_name: str, press_done: threading.Event | None = None
+    ) -> None:
         """Handle trigger release: call callback and replay if not consumed."""
+        if press_done is not None and not press_done.wait(_PRESS_WAIT_S):
+            logger.warning(f"Press callback for '{trigger}' still running; releasing anyway")
         consumed = self.on_trigger_release_callback(trigger)
         if not consumed:
             self._replay_key(key_name)
@@ -535,9 +417,172 @@ class HookManager:
     def _replay_key(self, key_name: str) -> None:
         """Replay a key press+release using the custom injector."""
         try:
-            key = _parse_key(key_name)
-            send_pynput_key_safely(key, True)  # Press
-            send_pynput_key_safely(key, False)  # Release
+            key = parse_key(key_name)
+            send_key_plan([(key, True), (key, False)])
             logger.debug(f"Replayed key: {key_name}")
         except Exception as exc:
             logger.warning(f"Failed to replay key '{key_name}': {exc}")
+
+
+class OutOfProcessHookManager(HookManager):
+    """HookManager whose native hook runs in a separate host process.
+
+    The hook callback in the child (see src.core.hook_host) never waits on
+    this process's GIL, so painting the overlay or rebuilding the settings
+    window cannot delay system-wide keystrokes. Trigger events arrive over
+    a pipe and are dispatched exactly like in-process ones. If the host
+    dies unexpectedly it is respawned with the current configuration.
+    """
+
+    _RESPAWN_DELAY_S = 1.0
+
+    def __init__(
+        self,
+        on_trigger_press: Callable[[str], None],
+        on_trigger_release: Callable[[str], bool],
+    ) -> None:
+        super().__init__(on_trigger_press, on_trigger_release)
+        self._process: Any = None
+        self._conn: Any = None
+        self._send_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._benchmark_done = threading.Event()
+        self._benchmark_result: list[int] | None = None
+        self._sequence_timeouts: dict[str, float] = {}
+
+    def start_hook(
+        self, trigger_keys: list[str], sequence_timeouts: dict[str, float] | None = None
+    ) -> None:
+        logger.info(f"HookManager: Starting hook host with triggers: {trigger_keys}")
+        self.stop_hook()
+        self._sequence_timeouts = dict(sequence_timeouts or {})
+        with self._state_lock:
+            self._table.set_triggers(trigger_keys, sequence_timeouts)
+        try:
+            self._spawn_host()
+        except Exception as e:
+            logger.error(f"HookManager: Failed to start hook host: {e}", exc_info=True)
+
+    def update_triggers(
+        self, trigger_keys: list[str], sequence_timeouts: dict[str, float] | None = None
+    ) -> None:
+        if not self.is_host_alive():
+            self.start_hook(trigger_keys, sequence_timeouts)
+            return
+        self._sequence_timeouts = dict(sequence_timeouts or {})
+        with self._state_lock:
+            self._table.set_triggers(trigger_keys, sequence_timeouts)
+        self._send((hook_host.CMD_TRIGGERS, list(trigger_keys), self._sequence_timeouts))
+        logger.info(f"HookManager: Triggers updated in place: {trigger_keys}")
+
+    def set_recording_mode(self, enabled: bool) -> None:
+        super().set_recording_mode(enabled)
+        self._send((hook_host.CMD_RECORDING_MODE, enabled))
+
+    def stop_hook(self) -> None:
+        conn, process = self._conn, self._process
+        # Clearing _conn first tells the reader thread the EOF is expected
+        self._conn = self._process = None
+        if conn is not None:
+            with contextlib.suppress(OSError, ValueError):
+                conn.send((hook_host.CMD_STOP,))
+        if process is not None:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        if conn is not None:
+            conn.close()
+        with self._state_lock:
+            self._table.reset_state()
+
+    def start_recording(self, path: str) -> None:
+        logger.warning("HookManager: Event recording is not available with the out-of-process hook")
+
+    def is_host_alive(self) -> bool:
+        process = self._process
+        return process is not None and process.is_alive()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Block until the host reported that its hook is installed."""
+        return self._ready.wait(timeout)
+
+    def run_benchmark(self, count: int, interval_s: float, timeout: float) -> list[int] | None:
+        """Have the host time ``count`` synthetic events through its filter.
+
+        Returns:
+            Per-event latencies in nanoseconds, or None on timeout.
+        """
+        self._benchmark_done.clear()
+        self._benchmark_result = None
+        self._send((hook_host.CMD_BENCHMARK, count, interval_s))
+        if not self._benchmark_done.wait(timeout):
+            return None
+        return self._benchmark_result
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Host process plumbing
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _spawn_host(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=True)
+        self._ready.clear()
+        process = ctx.Process(
+            target=hook_host.run_host,
+            args=(
+                child_conn,
+                list(self._trigger_keys),
+                self._sequence_timeouts,
+                self._table.recording_mode,
+            ),
+            name="MixedBerryPieHookHost",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        threading.Thread(
+            target=self._read_loop, args=(parent_conn,), name="HookHostReader", daemon=True
+        ).start()
+        logger.info(f"HookManager: Hook host started (pid {process.pid})")
+
+    def _send(self, message: tuple[Any, ...]) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        with self._send_lock:
+            try:
+                conn.send(message)
+            except (OSError, ValueError) as e:
+                logger.warning(f"HookManager: Could not reach hook host: {e}")
+
+    def _read_loop(self, conn: Any) -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            try:
+                self._handle_host_message(message)
+            except Exception as e:
+                logger.error(f"HookManager: Bad message from hook host: {e}", exc_info=True)
+
+        if conn is not self._conn:
+            return  # Stopped or replaced on purpose
+        logger.error("HookManager: Hook host exited unexpectedly; restarting it")
+        time.sleep(self._RESPAWN_DELAY_S)
+        if conn is self._conn:
+            self.start_hook(list(self._trigger_keys), self._sequence_timeouts)
+
+    def _handle_host_message(self, message: tuple[Any, ...]) -> None:
+        kind = message[0]
+        if kind == hook_host.MSG_TRIGGER:
+            self._dispatch_trigger_event(message[1])
+        elif kind == hook_host.MSG_MODIFIERS:
+            with self._state_lock:
+                self._table.held_modifiers = set(message[1])
+        elif kind == hook_host.MSG_READY:
+            self._ready.set()
+        elif kind == hook_host.MSG_BENCHMARK:
+            self._benchmark_result = message[1]
+            self._benchmark_done.set()
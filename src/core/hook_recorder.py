@@ -0,0 +1,343 @@
+"""Raw keyboard hook event recording and replay.
+
+Captures the exact event stream seen by the low-level keyboard hook
+(vk, scanCode, flags, time, message, injected marker) together with the
+filter's verdict and latency into a compact binary file. The replay side
+drives a ``HookManager`` filter with the recorded events so that timing
+related bugs ("the menu sometimes doesn't open", "keys get stuck") can be
+reproduced and performance regressions measured offline.
+
+File layout (little endian)::
+
+    b"MBPHOOK2"                 magic
+    uint32                      length of the JSON metadata block
+    bytes                       JSON metadata: the trigger configuration at
+                                start ({"triggers": [...], "sequence_timeouts":
+                                {...}})
+    record*                     fixed-size event records (see _RECORD)
+
+A trigger reload during the recording is written as a record whose msg is
+``MSG_TRIGGER_UPDATE`` and whose vk holds the length of the JSON trigger
+configuration that directly follows it. ``MBPHOOK1`` files (no updates, no
+timeouts) are still read.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, BinaryIO, NamedTuple
+
+from src.core.logger import LOGS_DIR, get_logger
+
+logger = get_logger(__name__)
+
+RECORDING_MAGIC = b"MBPHOOK2"
+_LEGACY_MAGICS = (b"MBPHOOK1",)
+RECORDING_SUFFIX = ".mbph"
+
+# t_ns, msg, vk, scan_code, flags, time, injected, verdict, latency_ns
+_RECORD = struct.Struct("<QHIIIIBbI")
+_HEADER_LEN = struct.Struct("<I")
+
+# Verdict encoding in the record
+VERDICT_PASS = 1
+VERDICT_SUPPRESS = 0
+VERDICT_UNFILTERED = -1  # Injected events never reach the filter
+
+# Record msg marking a trigger configuration update (real WM_* codes are < 0x200)
+MSG_TRIGGER_UPDATE = 0xFFFF
+
+_MAX_U32 = 0xFFFFFFFF
+
+
+class HookEvent(NamedTuple):
+    """A single recorded low-level keyboard event."""
+
+    t_ns: int  # Nanoseconds since the recording started
+    msg: int
+    vk: int
+    scan_code: int
+    flags: int
+    time: int  # Event timestamp reported by Windows (ms)
+    injected: bool  # True if the event carried our MAGIC_EXTRA_INFO marker
+    verdict: int  # VERDICT_PASS / VERDICT_SUPPRESS / VERDICT_UNFILTERED
+    latency_ns: int  # Time spent in the filter function
+
+
+class TriggerUpdate(NamedTuple):
+    """Trigger configuration applied while recording."""
+
+    t_ns: int  # Nanoseconds since the recording started
+    event_index: int  # Number of events recorded before the update
+    config: dict[str, Any]  # Same shape as the header metadata
+
+
+def encode_verdict(result: bool | None, injected: bool) -> int:
+    """Convert a filter return value into its on-disk verdict code."""
+    if injected:
+        return VERDICT_UNFILTERED
+    return VERDICT_SUPPRESS if result is False else VERDICT_PASS
+
+
+def default_recording_path() -> str:
+    """Return a timestamped recording path inside the logs directory."""
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.fspath(LOGS_DIR / f"hook_events_{stamp}{RECORDING_SUFFIX}")
+
+
+class HookEventRecorder:
+    """Append-only writer for raw hook events.
+
+    ``record`` is called from the hook thread and only packs a fixed-size
+    struct into a buffered file, so it is cheap enough for the hook path.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        metadata: dict[str, Any] | None = None,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file: BinaryIO | None = open(path, "wb")  # noqa: SIM115
+        self._start_ns = clock()
+        self.count = 0
+
+        meta = _encode_json(metadata or {})
+        self._file.write(RECORDING_MAGIC)
+        self._file.write(_HEADER_LEN.pack(len(meta)))
+        self._file.write(meta)
+        logger.info(f"Hook event recording started: {path}")
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def record(
+        self, msg: int, data: Any, injected: bool, result: bool | None, latency_ns: int
+    ) -> None:
+        """Append one event. ``data`` is a KBDLLHOOKSTRUCT-like object."""
+        packed = _RECORD.pack(
+            self._clock() - self._start_ns,
+            int(msg) & 0xFFFF,
+            int(data.vkCode) & _MAX_U32,
+            int(getattr(data, "scanCode", 0)) & _MAX_U32,
+            int(getattr(data, "flags", 0)) & _MAX_U32,
+            int(getattr(data, "time", 0)) & _MAX_U32,
+            1 if injected else 0,
+            encode_verdict(result, injected),
+            min(max(latency_ns, 0), _MAX_U32),
+        )
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(packed)
+            self.count += 1
+
+    def record_trigger_update(self, config: dict[str, Any]) -> None:
+        """Append a trigger configuration change (same shape as the header metadata)."""
+        payload = _encode_json(config)
+        packed = _RECORD.pack(
+            self._clock() - self._start_ns, MSG_TRIGGER_UPDATE, len(payload), 0, 0, 0, 0, 0, 0
+        )
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(packed)
+            self._file.write(payload)
+
+    def close(self) -> None:
+        """Flush and close the recording file."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logger.info(f"Hook event recording stopped: {self.path} ({self.count} events)")
+
+
+def _encode_json(data: dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def read_recording(path: str) -> tuple[dict[str, Any], list[HookEvent]]:
+    """Read a recording file.
+
+    Returns:
+        Tuple of (metadata dict, list of HookEvent in recorded order). Trigger
+        reloads made while recording are listed under the metadata key
+        ``"trigger_updates"`` as TriggerUpdate tuples.
+
+    Raises:
+        ValueError: If the file is not a hook event recording.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RECORDING_MAGIC)) not in (RECORDING_MAGIC, *_LEGACY_MAGICS):
+            raise ValueError(f"Not a hook event recording: {path}")
+        (meta_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        metadata = json.loads(f.read(meta_len).decode("utf-8") or "{}")
+        body = f.read()
+
+    events: list[HookEvent] = []
+    updates: list[TriggerUpdate] = []
+    offset = 0
+    while offset + _RECORD.size <= len(body):
+        fields = _RECORD.unpack_from(body, offset)
+        offset += _RECORD.size
+        if fields[1] != MSG_TRIGGER_UPDATE:
+            events.append(_to_event(fields))
+            continue
+        payload = body[offset : offset + fields[2]]
+        offset += fields[2]
+        if len(payload) != fields[2]:
+            break
+        updates.append(TriggerUpdate(fields[0], len(events), json.loads(payload.decode("utf-8"))))
+    if offset != len(body):
+        logger.warning(f"Ignoring truncated trailing record in {path}")
+    metadata["trigger_updates"] = updates
+    return metadata, events
+
+
+def _to_event(fields: tuple[Any, ...]) -> HookEvent:
+    t_ns, msg, vk, scan, flags, ev_time, injected, verdict, latency = fields
+    return HookEvent(t_ns, msg, vk, scan, flags, ev_time, bool(injected), verdict, latency)
+
+
+@dataclass
+class ReplayReport:
+    """Result of replaying a recording through a filter function."""
+
+    total_events: int = 0
+    filtered_events: int = 0
+    elapsed_s: float = 0.0
+    # (event index, recorded verdict, replayed verdict)
+    mismatches: list[tuple[int, int, int]] = field(default_factory=list)
+    latencies_ns: list[int] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Filtered events per second."""
+        return self.filtered_events / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def latency_percentile(self, pct: float) -> int:
+        """Return the given filter latency percentile (0-100) in nanoseconds."""
+        if not self.latencies_ns:
+            return 0
+        ordered = sorted(self.latencies_ns)
+        idx = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[idx]
+
+    def summary(self) -> str:
+        """Human-readable multi-line summary."""
+        return "\n".join(
+            [
+                f"Events:      {self.total_events} ({self.filtered_events} filtered)",
+                f"Elapsed:     {self.elapsed_s * 1000:.2f} ms",
+                f"Throughput:  {self.throughput:,.0f} events/s",
+                f"Latency p50: {self.latency_percentile(50) / 1000:.1f} us",
+                f"Latency p99: {self.latency_percentile(99) / 1000:.1f} us",
+                f"Latency max: {self.latency_percentile(100) / 1000:.1f} us",
+                f"Verdict diffs: {len(self.mismatches)}",
+            ]
+        )
+
+
+class RecordedClock:
+    """Clock reading the recorded time of the event being replayed, in seconds.
+
+    Give it to the TriggerTable under replay so sequence timeouts expire as
+    they did while recording, however fast the events are replayed.
+    """
+
+    def __init__(self) -> None:
+        self.t_ns = 0
+
+    def __call__(self) -> float:
+        return self.t_ns / 1e9
+
+
+def _as_hook_struct(event: HookEvent) -> SimpleNamespace:
+    """Rebuild a KBDLLHOOKSTRUCT-like object from a recorded event."""
+    return SimpleNamespace(
+        vkCode=event.vk,
+        scanCode=event.scan_code,
+        flags=event.flags,
+        time=event.time,
+        dwExtraInfo=None,
+    )
+
+
+def _paced(
+    events: list[HookEvent],
+    realtime: bool,
+    clock: Callable[[], int],
+    sleep: Callable[[float], None],
+) -> Iterator[tuple[int, HookEvent]]:
+    """Yield events, sleeping to honour the recorded timing when ``realtime``."""
+    start = clock()
+    for idx, event in enumerate(events):
+        if realtime:
+            wait_ns = event.t_ns - (clock() - start)
+            if wait_ns > 0:
+                sleep(wait_ns / 1e9)
+        yield idx, event
+
+
+def replay_events(
+    filter_func: Callable[[int, Any], bool | None],
+    events: list[HookEvent],
+    realtime: bool = False,
+    clock: Callable[[], int] = time.perf_counter_ns,
+    sleep: Callable[[float], None] = time.sleep,
+    *,
+    trigger_updates: Sequence[TriggerUpdate] = (),
+    apply_triggers: Callable[[dict[str, Any]], None] | None = None,
+    event_clock: RecordedClock | None = None,
+) -> ReplayReport:
+    """Drive ``filter_func`` with recorded events and compare verdicts.
+
+    Injected events are skipped exactly like the native hook does.
+
+    Args:
+        filter_func: Usually ``HookManager._win32_event_filter``
+        events: Events from ``read_recording``
+        realtime: Reproduce the recorded inter-event timing instead of
+            replaying as fast as possible
+        trigger_updates: Trigger reloads from ``read_recording``; each is
+            passed to ``apply_triggers`` before the first event recorded
+            after it
+        event_clock: Advanced to each event's recorded time before it is
+            filtered
+    """
+    report = ReplayReport(total_events=len(events))
+    pending = deque(trigger_updates)
+    started = clock()
+    for idx, event in _paced(events, realtime, clock, sleep):
+        while pending and pending[0].event_index <= idx:
+            update = pending.popleft()
+            if apply_triggers is not None:
+                apply_triggers(update.config)
+        if event.injected:
+            continue
+        if event_clock is not None:
+            event_clock.t_ns = event.t_ns
+        data = _as_hook_struct(event)
+        t0 = clock()
+        result = filter_func(event.msg, data)
+        report.latencies_ns.append(clock() - t0)
+        report.filtered_events += 1
+
+        replayed = encode_verdict(result, False)
+        if event.verdict not in (VERDICT_UNFILTERED, replayed):
+            report.mismatches.append((idx, event.verdict, replayed))
+    report.elapsed_s = (clock() - started) / 1e9
+    return report
@@ -0,0 +1,225 @@
+"""Watchdog for the low-level keyboard hook.
+
+Windows silently removes a WH_KEYBOARD_LL hook whose callback exceeds
+LowLevelHooksTimeout; afterwards no trigger ever fires and nothing is
+logged. The watchdog:
+
+- collects per-call filter latency into a fixed-bucket histogram and warns
+  when a call gets close to the timeout,
+- periodically compares the key state (polled through a backend,
+  GetAsyncKeyState on Windows) against the last event the hook actually
+  received, and asks the owner to reinstall the hook when the hook has
+  clearly gone deaf: the key state changed, yet no event arrived for
+  ``stall_timeout_s``. A key that merely stays down (e.g. an injected
+  key-down without its key-up) does not count, and repeated reinstalls
+  without any event in between back off exponentially.
+
+Clock and backend are injectable so the logic is testable on any platform.
+"""
+
+import bisect
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Protocol
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Histogram bucket upper bounds in microseconds (last bucket is open-ended)
+LATENCY_BUCKETS_US: tuple[int, ...] = (50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 50_000)
+
+DEFAULT_WARN_THRESHOLD_MS = 50.0
+DEFAULT_STALL_TIMEOUT_S = 2.0
+DEFAULT_POLL_INTERVAL_S = 0.5
+MAX_REINSTALL_BACKOFF_S = 60.0
+_WARN_INTERVAL_S = 5.0  # Rate limit for slow-callback warnings
+
+
+class KeyStateBackend(Protocol):
+    """Reports which keyboard keys are held right now."""
+
+    def pressed_keys(self) -> frozenset[int]:
+        """Virtual-key codes currently down."""
+        ...
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cheap enough for the hook thread)."""
+
+    def __init__(self, bounds_us: tuple[int, ...] = LATENCY_BUCKETS_US) -> None:
+        self.bounds_us = bounds_us
+        self.counts = [0] * (len(bounds_us) + 1)
+        self.total = 0
+        self.max_ns = 0
+
+    def add(self, latency_ns: int) -> None:
+        self.counts[bisect.bisect_left(self.bounds_us, latency_ns / 1000)] += 1
+        self.total += 1
+        self.max_ns = max(self.max_ns, latency_ns)
+
+    def percentile_us(self, pct: float) -> int | None:
+        """Upper bucket bound containing the percentile (None = overflow bucket)."""
+        if not self.total:
+            return 0
+        target = pct / 100 * self.total
+        running = 0
+        for idx, count in enumerate(self.counts):
+            running += count
+            if running >= target and count:
+                return self.bounds_us[idx] if idx < len(self.bounds_us) else None
+        return None
+
+    def summary(self) -> str:
+        labels = [f"<={b}us" for b in self.bounds_us] + [f">{self.bounds_us[-1]}us"]
+        parts = [f"{label}:{count}" for label, count in zip(labels, self.counts, strict=True)]
+        return f"n={self.total} max={self.max_ns / 1000:.0f}us " + " ".join(parts)
+
+
+class HookWatchdog:
+    """Latency monitor and liveness check for the keyboard hook.
+
+    ``observe`` is called from the hook thread for every event. ``check``
+    is run periodically from the watchdog thread (or directly in tests).
+    """
+
+    def __init__(
+        self,
+        reinstall: Callable[[], None],
+        backend: KeyStateBackend | None,
+        clock: Callable[[], float] = time.monotonic,
+        *,
+        warn_threshold_ms: float = DEFAULT_WARN_THRESHOLD_MS,
+        stall_timeout_s: float = DEFAULT_STALL_TIMEOUT_S,
+        poll_interval_s: float = DEFAULT_POLL_INTERVAL_S,
+    ) -> None:
+        self._reinstall = reinstall
+        self._backend = backend
+        self._clock = clock
+        self.warn_threshold_ns = int(warn_threshold_ms * 1_000_000)
+        self.stall_timeout_s = stall_timeout_s
+        self.poll_interval_s = poll_interval_s
+
+        self.histogram = LatencyHistogram()
+        self.slow_calls = 0
+        self.reinstall_count = 0
+        self._last_event = clock()
+        self._last_keys: frozenset[int] = frozenset()
+        # Reinstalls since the hook last delivered an event, and when the latest was
+        self._failed_reinstalls = 0
+        self._last_reinstall = float("-inf")
+        self._last_warning = float("-inf")
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ── Hook thread side ─────────────────────────────────────────────────
+
+    def observe(self, latency_ns: int | None) -> None:
+        """Record that the hook received an event.
+
+        Args:
+            latency_ns: Filter latency, or None for events that skipped the
+                filter (our own injected input) and only prove liveness.
+        """
+        now = self._clock()
+        self._last_event = now
+        if latency_ns is None:
+            return
+        self.histogram.add(latency_ns)
+        if latency_ns >= self.warn_threshold_ns:
+            self.slow_calls += 1
+            if now - self._last_warning >= _WARN_INTERVAL_S:
+                self._last_warning = now
+                logger.warning(
+                    f"Slow keyboard hook callback: {latency_ns / 1_000_000:.1f} ms "
+                    f"({self.slow_calls} slow calls so far). Windows may remove the hook "
+                    "if this exceeds LowLevelHooksTimeout."
+                )
+
+    # ── Watchdog thread side ─────────────────────────────────────────────
+
+    def check(self) -> bool:
+        """Reinstall the hook if the key state changes but no events arrive.
+
+        Returns:
+            True if a reinstall was triggered.
+        """
+        if self._backend is None:
+            return False
+        keys = self._backend.pressed_keys()
+        changed, self._last_keys = keys != self._last_keys, keys
+        if not keys or not changed:
+            return False
+        now = self._clock()
+        if self._last_event > self._last_reinstall:
+            self._failed_reinstalls = 0  # The previous reinstall worked
+        silent_for = now - self._last_event
+        if silent_for < self.stall_timeout_s:
+            return False
+        backoff = min(
+            self.stall_timeout_s * 2 ** max(self._failed_reinstalls - 1, 0),
+            MAX_REINSTALL_BACKOFF_S,
+        )
+        if self._failed_reinstalls and now - self._last_reinstall < backoff:
+            return False
+
+        self.reinstall_count += 1
+        self._failed_reinstalls += 1
+        logger.error(
+            f"Keyboard hook received no events for {silent_for:.1f}s while keys are pressed; "
+            f"reinstalling (attempt {self.reinstall_count})"
+        )
+        # Give the new hook a full grace period before judging it again
+        self._last_event = self._last_reinstall = now
+        try:
+            self._reinstall()
+        except Exception as e:
+            logger.error(f"Hook reinstall failed: {e}", exc_info=True)
+        return True
+
+    def start(self) -> None:
+        """Start periodic health checks in a daemon thread."""
+        if self._backend is None or (self._thread and self._thread.is_alive()):
+            return
+        self._last_event = self._clock()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="HookWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if self.histogram.total:
+            logger.info(f"Hook latency: {self.histogram.summary()}")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.poll_interval_s):
+            self.check()
+
+
+if sys.platform == "win32":
+    import ctypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    # Skip mouse buttons (0x01-0x06) so mouse-only activity is not counted
+    _KEYBOARD_VKS = tuple(vk for vk in range(0x08, 0xFF) if vk not in (0x0A, 0x0B))
+
+    class Win32KeyStateBackend:
+        """GetAsyncKeyState based physical key state."""
+
+        def pressed_keys(self) -> frozenset[int]:
+            get_state = _user32.GetAsyncKeyState
+            return frozenset(vk for vk in _KEYBOARD_VKS if get_state(vk) & 0x8000)
+
+
+def create_default_backend() -> KeyStateBackend | None:
+    """Return the platform key state backend, or None where unsupported."""
+    if sys.platform == "win32":
+        return Win32KeyStateBackend()
+    return None
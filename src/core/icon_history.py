@@ -0,0 +1,165 @@
+"""In-memory icon history with write-behind persistence.
+
+The history used to be re-read and re-parsed from ``icon_history.json`` on
+every access, and adding or removing an icon resolved every entry to an
+absolute path to deduplicate before rewriting the whole file. ``IconHistory``
+reads the file once and keeps the entries in an ordered dict keyed by
+normalized absolute path, so deduplication and move-to-front are O(1).
+Changes are written by a ``DebouncedWriter`` thread once a burst of them
+settles (``debounce_s`` after the last one); ``flush()`` writes immediately.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from src.core.debounced_writer import DebouncedWriter
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DEBOUNCE_S = 0.5
+
+
+class IconHistory:
+    """Most-recent-first icon paths backed by one JSON file."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        key: Callable[[str], str] = os.path.abspath,
+        max_entries: int = 100,
+        debounce_s: float = DEFAULT_DEBOUNCE_S,
+    ) -> None:
+        """Create the history for ``path``; the file is read on first access.
+
+        Args:
+            path: The JSON file holding the list of paths.
+            key: Normalizes an entry to the identity used for deduplication.
+            max_entries: Oldest entries beyond this are dropped.
+            debounce_s: Quiet time before pending changes are written.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._key = key
+        self._entries: OrderedDict[str, str] | None = None  # key -> path as stored
+        self._lock = threading.Lock()
+        self._writer = DebouncedWriter(self._save, name="IconHistoryWriter", debounce_s=debounce_s)
+
+    def paths(self) -> list[str]:
+        """The history, most recent first."""
+        with self._lock:
+            return list(self._loaded().values())
+
+    def add(self, path: str) -> list[str]:
+        """Move ``path`` (or an equivalent entry) to the front.
+
+        Returns:
+            Updated history list.
+        """
+        return self.add_many([path])
+
+    def add_many(self, paths: list[str]) -> list[str]:
+        """Move ``paths`` to the front in one update, ``paths[0]`` becoming the most recent.
+
+        Returns:
+            Updated history list.
+        """
+        with self._lock:
+            entries = self._loaded()
+            for path in reversed(paths):
+                key = self._key(path)
+                entries.pop(key, None)
+                entries[key] = path
+                entries.move_to_end(key, last=False)
+            while len(entries) > self.max_entries:
+                entries.popitem()
+            if paths:
+                self._schedule()
+            return list(entries.values())
+
+    def remove(self, path: str) -> bool:
+        """Drop ``path`` from the history.
+
+        Returns:
+            Whether it was in the history.
+        """
+        with self._lock:
+            if self._loaded().pop(self._key(path), None) is None:
+                return False
+            self._schedule()
+            return True
+
+    def replace(self, paths: list[str]) -> None:
+        """Replace the whole history (deduplicated, capped at ``max_entries``)."""
+        with self._lock:
+            self._entries = self._deduplicated(paths)
+            self._schedule()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write pending changes now and wait until they are on disk.
+
+        Returns:
+            False if the write failed or did not finish within ``timeout``.
+        """
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending changes and stop the writer thread."""
+        if not self._writer.shutdown(timeout):
+            logger.error("Icon history changes could not be written before shutdown")
+
+    # ── Internals (lock held) ─────────────────────────────────────────────
+
+    def _deduplicated(self, paths: list[str]) -> OrderedDict[str, str]:
+        entries: OrderedDict[str, str] = OrderedDict()
+        for path in paths:
+            if len(entries) >= self.max_entries:
+                break
+            entries.setdefault(self._key(path), path)
+        return entries
+
+    def _loaded(self) -> OrderedDict[str, str]:
+        if self._entries is None:
+            paths: list[str] = []
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    paths = [p for p in data if isinstance(p, str)]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Could not load icon history: {e}")
+            self._entries = self._deduplicated(paths)
+        return self._entries
+
+    def _schedule(self) -> None:
+        self._writer.schedule(list(self._loaded().values()))
+
+    # ── Writer thread ─────────────────────────────────────────────────────
+
+    def _save(self, paths: list[str]) -> None:
+        try:
+            self._write(paths)
+        except Exception as e:
+            logger.warning(f"Could not save icon history: {e}")
+            raise
+
+    def _write(self, paths: list[str]) -> None:
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".icon_history")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(paths, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,192 @@
+"""Bulk import of icon files into the user icon library.
+
+``import_icons`` takes files and/or folders, and imports every icon found
+on a thread pool. Each file is validated, hashed, deduplicated against the
+content-addressed store, copied, and optionally passed to a ``prepare``
+callback (the UI renders its thumbnail there, off the GUI thread).
+Progress is reported per file from the calling thread. The history is
+updated, and the store index written, once at the end.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core import config
+from src.core.icon_store import hash_file
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ICON_EXTENSIONS = (".png", ".jpg", ".jpeg", ".ico", ".svg")
+MAX_ICON_BYTES = 10 * 2**20
+DEFAULT_WORKERS = 4
+
+# Leading bytes of each raster format, by extension
+_SIGNATURES = {
+    ".png": (b"\x89PNG\r\n\x1a\n",),
+    ".jpg": (b"\xff\xd8\xff",),
+    ".jpeg": (b"\xff\xd8\xff",),
+    ".ico": (b"\x00\x00\x01\x00",),
+}
+
+
+@dataclass
+class ImportedIcon:
+    """Outcome of importing one file."""
+
+    source: str
+    path: str | None = None  # As stored in the history ("user_icons/..."); None on failure
+    name: str = ""
+    duplicate: bool = False
+    error: str | None = None
+    thumbnail: Any = None  # Whatever ``prepare`` returned
+
+
+@dataclass
+class ImportSummary:
+    results: list[ImportedIcon] = field(default_factory=list)
+    cancelled: bool = False
+    elapsed_s: float = 0.0
+
+    @property
+    def imported(self) -> list[ImportedIcon]:
+        return [r for r in self.results if r.path is not None]
+
+    @property
+    def duplicates(self) -> int:
+        return sum(r.duplicate for r in self.results)
+
+    @property
+    def failed(self) -> list[ImportedIcon]:
+        return [r for r in self.results if r.error is not None]
+
+    def summary(self) -> str:
+        return (
+            f"files={len(self.results)} new={len(self.imported) - self.duplicates} "
+            f"duplicates={self.duplicates} failed={len(self.failed)} "
+            f"cancelled={self.cancelled} elapsed={self.elapsed_s * 1000:.0f}ms"
+        )
+
+
+def collect_icon_files(paths: Iterable[str]) -> list[str]:
+    """Expand folders (recursively) into their icon files; files are kept as given.
+
+    Returns:
+        Absolute paths without duplicates, in the order found (folder
+        contents sorted).
+    """
+    found: dict[str, None] = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(ICON_EXTENSIONS):
+                        found.setdefault(os.path.abspath(os.path.join(root, name)))
+        else:
+            found.setdefault(os.path.abspath(path))
+    return list(found)
+
+
+def validate_icon_file(path: str) -> None:
+    """Check that ``path`` looks like an icon we can display.
+
+    Raises:
+        ValueError: With a user-facing reason if it does not.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ICON_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {ext or '(none)'}")
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ValueError("File is empty")
+    if size > MAX_ICON_BYTES:
+        raise ValueError(f"File is larger than {MAX_ICON_BYTES // 2**20} MiB")
+    with open(path, "rb") as f:
+        head = f.read(512)
+    if ext == ".svg":
+        if b"<svg" not in head.lower() and b"<?xml" not in head.lower():
+            raise ValueError("Not an SVG document")
+    elif not head.startswith(_SIGNATURES[ext]):
+        raise ValueError(f"Content does not match the {ext} format")
+
+
+def _import_one(path: str, prepare: Callable[[str], Any] | None) -> ImportedIcon:
+    result = ImportedIcon(path, name=os.path.splitext(os.path.basename(path))[0])
+    try:
+        validate_icon_file(path)
+        stored, result.duplicate = config.icon_store().put(
+            path, digest=hash_file(path), save_index=False
+        )
+        if prepare is not None:
+            result.thumbnail = prepare(stored)
+        result.path = config.normalize_icon_path(stored)
+    except Exception as e:
+        result.error = str(e)
+        logger.warning(f"Could not import icon {path}: {e}")
+    return result
+
+
+def import_icons(
+    paths: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    prepare: Callable[[str], Any] | None = None,
+    on_progress: Callable[[int, int, ImportedIcon], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ImportSummary:
+    """Import icon files and folders into the user icon library.
+
+    Args:
+        paths: Files and/or folders (searched recursively for icon files).
+        max_workers: Size of the thread pool.
+        prepare: Called on a pool thread with each stored file's absolute
+            path; its return value is kept as the result's ``thumbnail``.
+        on_progress: Called on the calling thread after each file with
+            (done, total, result).
+        cancel: When set, files not yet started are skipped. Files already
+            imported are still added to the history.
+
+    Returns:
+        The per-file results, in input order.
+    """
+    started = time.perf_counter()
+    files = collect_icon_files(paths)
+    summary = ImportSummary()
+    results: dict[Future[ImportedIcon], int] = {}
+    done_count = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="IconImport") as pool:
+        pending = set()
+        for index, path in enumerate(files):
+            future = pool.submit(_import_one, path, prepare)
+            results[future] = index
+            pending.add(future)
+        while pending:
+            if cancel is not None and cancel.is_set():
+                summary.cancelled = True
+                for future in pending:
+                    future.cancel()
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future.cancelled():
+                    continue
+                done_count += 1
+                if on_progress is not None:
+                    on_progress(done_count, len(files), future.result())
+
+    ordered = sorted((results[f], f.result()) for f in results if f.done() and not f.cancelled())
+    summary.results = [result for _, result in ordered]
+    try:
+        config.icon_store().save_index()
+        imported = [r.path for r in summary.imported if r.path is not None]
+        if imported:
+            config.icon_history().add_many(imported)
+    finally:
+        summary.elapsed_s = time.perf_counter() - started
+        logger.info(f"Icon import: {summary.summary()}")
+    return summary
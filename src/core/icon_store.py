@@ -0,0 +1,249 @@
+"""Content-addressed store for user icons.
+
+Imported icons used to be copied under their own name, and deduplication
+hashed every file in ``user_icons`` on every import. The store instead
+names each file after the SHA-256 of its content (``<sha256><ext>``) and
+keeps a persistent index (``.index.json``) mapping the hash to the file,
+the icon's original name and its size/mtime. Deduplicating an import is
+then one hash of the incoming file plus a dictionary lookup.
+
+Index entries are verified lazily: only when an entry is used is its file
+stat'ed, and it is re-hashed only if size or mtime changed. Files found in
+the directory that the index does not know (icons imported before the
+store existed, or copied in by hand) are hashed once and added under
+their existing name.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_NAME = ".index.json"
+_COPY_PREFIX = ".iconstore-tmp-"  # In-progress copies; dotfiles are never indexed
+_INDEX_VERSION = 1
+_HASH_CHUNK_SIZE = 65536  # Chunk size for SHA-256 file hashing (bytes)
+
+
+def hash_file(path: str) -> str:
+    """Compute SHA-256 hash of a file using chunked reads."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+@dataclass
+class IconEntry:
+    """One stored icon."""
+
+    file: str  # Name inside the store directory
+    name: str  # Original file name
+    size: int
+    mtime_ns: int
+
+
+class IconStore:
+    """Icons of one directory, addressed by content hash."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._entries: dict[str, IconEntry] | None = None  # By SHA-256, loaded on first use
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_NAME)
+
+    def add(self, path: str) -> str:
+        """Store the icon at ``path`` unless its content is already stored.
+
+        Returns:
+            Absolute path of the stored file.
+        """
+        return self.put(path)[0]
+
+    def put(
+        self, path: str, *, digest: str | None = None, save_index: bool = True
+    ) -> tuple[str, bool]:
+        """Store the icon at ``path``; safe to call from several threads at once.
+
+        The copy runs outside the store's lock, so concurrent imports only
+        serialize on the index lookup and update.
+
+        Args:
+            path: The icon to import.
+            digest: Its SHA-256, if the caller already computed it.
+            save_index: Write the index now. Bulk imports pass False and
+                call ``save_index()`` once at the end.
+
+        Returns:
+            Absolute path of the stored file, and whether identical content
+            was already stored.
+        """
+        if digest is None:
+            digest = hash_file(path)
+        with self._lock:
+            existing = self._lookup(digest)
+        if existing is not None:
+            logger.info(f"Duplicate content found, reusing: {existing}")
+            return existing, True
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.basename(path)
+        file = digest + os.path.splitext(name)[1].lower()
+        dest = os.path.join(self.directory, file)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=_COPY_PREFIX)
+        os.close(fd)
+        try:
+            shutil.copyfile(path, temp_path)
+            with self._lock:
+                existing = self._lookup(digest)  # Imported by another thread meanwhile
+                if existing is None:
+                    os.replace(temp_path, dest)
+                    stat = os.stat(dest)
+                    entry = IconEntry(file, name, stat.st_size, stat.st_mtime_ns)
+                    self._entries_loaded()[digest] = entry
+                    if save_index:
+                        self._save()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_path)
+        if existing is not None:
+            return existing, True
+        logger.info(f"Assetized icon: {path} -> {dest}")
+        return dest, False
+
+    def save_index(self) -> None:
+        """Persist the index (after ``put(..., save_index=False)`` calls)."""
+        with self._lock:
+            if self._entries is not None:
+                self._save()
+
+    def lookup(self, digest: str) -> str | None:
+        """Absolute path of the stored icon with this content hash, if any."""
+        with self._lock:
+            return self._lookup(digest)
+
+    def original_name(self, path: str) -> str | None:
+        """Original file name of a stored icon, or None if ``path`` is not in the store."""
+        file = os.path.basename(path)
+        with self._lock:
+            for entry in self._entries_loaded().values():
+                if entry.file == file:
+                    return entry.name
+        return None
+
+    def remove(self, path: str) -> bool:
+        """Delete a stored icon and its index entry.
+
+        Returns:
+            Whether a file was deleted.
+        """
+        file = os.path.basename(path)
+        with self._lock:
+            entries = self._entries_loaded()
+            for digest in [d for d, e in entries.items() if e.file == file]:
+                del entries[digest]
+                self._save()
+            try:
+                os.remove(os.path.join(self.directory, file))
+            except FileNotFoundError:
+                return False
+        logger.info(f"Deleted user icon asset: {path}")
+        return True
+
+    # ── Index ─────────────────────────────────────────────────────────────
+
+    def _lookup(self, digest: str) -> str | None:
+        """Verify the entry for ``digest`` against its file (lock held)."""
+        entries = self._entries_loaded()
+        entry = entries.get(digest)
+        if entry is None:
+            return None
+        path = os.path.join(self.directory, entry.file)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            logger.info(f"Dropping index entry of deleted icon: {entry.file}")
+            del entries[digest]
+            self._save()
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (entry.size, entry.mtime_ns):
+            # Changed since indexed: trust only a fresh hash
+            del entries[digest]
+            actual = hash_file(path)
+            entries[actual] = IconEntry(entry.file, entry.name, stat.st_size, stat.st_mtime_ns)
+            self._save()
+            if actual != digest:
+                logger.info(f"Icon {entry.file} changed on disk, re-indexed")
+                return None
+        return path
+
+    def _entries_loaded(self) -> dict[str, IconEntry]:
+        """The index, loaded and completed with unindexed files on first use (lock held)."""
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, IconEntry] = {}
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _INDEX_VERSION:
+                entries = {d: IconEntry(**e) for d, e in data.get("entries", {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable icon index: {e}")
+        self._entries = entries
+
+        known = {e.file for e in entries.values()}
+        added = 0
+        with contextlib.suppress(FileNotFoundError):
+            for dir_entry in os.scandir(self.directory):
+                # Dotfiles: the index and interrupted copies (_COPY_PREFIX)
+                if (
+                    dir_entry.name in known
+                    or dir_entry.name.startswith(".")
+                    or not dir_entry.is_file()
+                ):
+                    continue
+                stat = dir_entry.stat()
+                digest = hash_file(dir_entry.path)
+                if digest not in entries:
+                    entries[digest] = IconEntry(
+                        dir_entry.name, dir_entry.name, stat.st_size, stat.st_mtime_ns
+                    )
+                    added += 1
+        if added:
+            logger.info(f"Indexed {added} existing user icon(s)")
+            self._save()
+        return entries
+
+    def _save(self) -> None:
+        """Persist the index. Failures are only logged (lock held)."""
+        data = {
+            "version": _INDEX_VERSION,
+            "entries": {d: asdict(e) for d, e in (self._entries or {}).items()},
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".index")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(temp_path, self.index_path)
+            except Exception:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(temp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Could not save icon index: {e}")
@@ -0,0 +1,46 @@
+"""Key names used in shortcut strings, mapped to pynput keys.
+
+Shared by the hook (trigger replay) and the action compiler, so parsing
+lives apart from either of them.
+"""
+
+from pynput import keyboard as pynput_keyboard
+
+# Key names accepted in shortcuts besides pynput's own Key member names
+_KEY_ALIASES: dict[str, pynput_keyboard.Key] = {
+    "space": pynput_keyboard.Key.space,
+    "enter": pynput_keyboard.Key.enter,
+    "tab": pynput_keyboard.Key.tab,
+    "esc": pynput_keyboard.Key.esc,
+    "escape": pynput_keyboard.Key.esc,
+    "backspace": pynput_keyboard.Key.backspace,
+    "delete": pynput_keyboard.Key.delete,
+    "insert": pynput_keyboard.Key.insert,
+    "home": pynput_keyboard.Key.home,
+    "end": pynput_keyboard.Key.end,
+    "page_up": pynput_keyboard.Key.page_up,
+    "page_down": pynput_keyboard.Key.page_down,
+    "up": pynput_keyboard.Key.up,
+    "down": pynput_keyboard.Key.down,
+    "left": pynput_keyboard.Key.left,
+    "right": pynput_keyboard.Key.right,
+    **{f"f{i}": getattr(pynput_keyboard.Key, f"f{i}") for i in range(1, 13)},
+}
+
+
+def is_known_key_name(name: str) -> bool:
+    """True if parse_key maps ``name`` exactly (not by its first character)."""
+    return name in pynput_keyboard.Key.__members__ or name in _KEY_ALIASES or len(name) == 1
+
+
+def parse_key(name: str) -> pynput_keyboard.Key | pynput_keyboard.KeyCode:
+    """Parse a key name string into a pynput key object."""
+    try:
+        return pynput_keyboard.Key[name]
+    except KeyError:
+        pass
+    if name in _KEY_ALIASES:
+        return _KEY_ALIASES[name]
+    if len(name) == 1:
+        return pynput_keyboard.KeyCode.from_char(name)
+    return pynput_keyboard.KeyCode.from_char(name[0])
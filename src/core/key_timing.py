@@ -0,0 +1,228 @@
+"""Deadline-based pacing of key sequences (``key_sequence_delay_ms``).
+
+Sleeping ``delay`` between events lets every timer overshoot add up; on
+Windows the default 15.6 ms timer tick turns a 2 ms request into ~15.6 ms.
+``KeySequenceScheduler`` instead schedules step *i* at ``start + i * interval``
+on a monotonic clock, sleeps until shortly before each deadline and spins
+the rest of the way. A late step therefore does not delay the ones after
+it, and each run records the achieved intervals so jitter can be reported.
+
+The clock, sleep and spin primitives come from a ``TimingEngine``:
+``RealTimingEngine`` in the app (raising the Windows timer resolution for
+the duration of a sequence), ``FakeTimingEngine`` to verify pacing on any
+platform without real sleeping.
+"""
+
+import contextlib
+import math
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SPIN_THRESHOLD_S = 0.002  # Sleep until this close to a deadline, then spin
+_TIMING_HISTORY = 50
+
+
+class TimingEngine(Protocol):
+    def now(self) -> float:
+        """Monotonic time in seconds."""
+        ...
+
+    def sleep(self, seconds: float) -> None: ...
+
+    def spin(self) -> None:
+        """One busy-wait iteration (should yield the GIL)."""
+        ...
+
+    def precise(self) -> contextlib.AbstractContextManager[None]:
+        """Context in which sleeps are as fine-grained as the platform allows."""
+        ...
+
+
+class RealTimingEngine:
+    """perf_counter/time.sleep; on Windows raises the timer resolution to 1 ms."""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def spin(self) -> None:
+        time.sleep(0)
+
+    @contextlib.contextmanager
+    def precise(self) -> Iterator[None]:
+        if sys.platform != "win32":
+            yield
+            return
+        raised = _winmm.timeBeginPeriod(1) == 0
+        try:
+            yield
+        finally:
+            if raised:
+                _winmm.timeEndPeriod(1)
+
+
+class FakeTimingEngine:
+    """Virtual clock whose sleeps round up to a timer tick, like Windows.
+
+    Args:
+        granularity_s: Timer tick; a sleep ends on the first tick at or
+            after the requested wake-up time (0 for exact sleeps)
+        precise_granularity_s: Timer tick inside ``precise()`` (what
+            timeBeginPeriod(1) gives)
+        spin_step_s: Clock advance per spin iteration
+    """
+
+    def __init__(
+        self,
+        granularity_s: float = 0.0156,
+        precise_granularity_s: float = 0.001,
+        spin_step_s: float = 0.00005,
+    ) -> None:
+        self.granularity_s = granularity_s
+        self.precise_granularity_s = precise_granularity_s
+        self.spin_step_s = spin_step_s
+        self.time = 0.0
+        self.sleeps = 0
+        self.spins = 0
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps += 1
+        wake = self.time + max(seconds, 0.0)
+        if self.granularity_s > 0:
+            # Tiny epsilon keeps exact multiples from rounding up a whole tick
+            wake = math.ceil(wake / self.granularity_s - 1e-9) * self.granularity_s
+        self.time = max(wake, self.time)
+
+    def spin(self) -> None:
+        self.spins += 1
+        self.time += self.spin_step_s
+
+    @contextlib.contextmanager
+    def precise(self) -> Iterator[None]:
+        coarse, self.granularity_s = self.granularity_s, self.precise_granularity_s
+        try:
+            yield
+        finally:
+            self.granularity_s = coarse
+
+
+@dataclass
+class SequenceTiming:
+    """Requested versus achieved pacing of one sequence."""
+
+    requested_s: float
+    # Start time of each step, relative to the first
+    offsets: list[float] = field(default_factory=list)
+
+    @property
+    def intervals_ms(self) -> list[float]:
+        return [(b - a) * 1000 for a, b in zip(self.offsets, self.offsets[1:], strict=False)]
+
+    @property
+    def mean_interval_ms(self) -> float:
+        intervals = self.intervals_ms
+        return sum(intervals) / len(intervals) if intervals else 0.0
+
+    @property
+    def jitter_ms(self) -> float:
+        """Largest deviation of an interval from the requested delay."""
+        requested_ms = self.requested_s * 1000
+        return max((abs(i - requested_ms) for i in self.intervals_ms), default=0.0)
+
+    def summary(self) -> str:
+        return (
+            f"steps={len(self.offsets)} requested={self.requested_s * 1000:.2f}ms "
+            f"achieved={self.mean_interval_ms:.2f}ms jitter={self.jitter_ms:.2f}ms"
+        )
+
+
+class KeySequenceScheduler:
+    """Runs steps at fixed intervals against absolute deadlines. Thread-safe."""
+
+    def __init__(
+        self,
+        engine: TimingEngine | None = None,
+        *,
+        spin_threshold_s: float = DEFAULT_SPIN_THRESHOLD_S,
+    ) -> None:
+        self.engine: TimingEngine = engine if engine is not None else RealTimingEngine()
+        self.spin_threshold_s = spin_threshold_s
+        self.recent: deque[SequenceTiming] = deque(maxlen=_TIMING_HISTORY)
+        self._lock = threading.Lock()
+
+    def run(self, steps: Sequence[Callable[[], object]], interval_s: float) -> SequenceTiming:
+        """Run ``steps`` ``interval_s`` apart, then wait one more interval.
+
+        Return values of the steps are ignored.
+
+        Step *i* starts at ``start + i * interval_s``; the sequence returns
+        at ``start + len(steps) * interval_s`` (the pause after the last
+        step that the per-event sleeps used to give).
+        """
+        timing = SequenceTiming(interval_s)
+        engine = self.engine
+        with engine.precise():
+            start = engine.now()
+            for i, step in enumerate(steps):
+                self._wait_until(start + i * interval_s)
+                timing.offsets.append(engine.now() - start)
+                step()
+            self._wait_until(start + len(steps) * interval_s)
+        with self._lock:
+            self.recent.append(timing)
+        logger.debug(f"Key sequence timing: {timing.summary()}")
+        return timing
+
+    def wait(self, seconds: float) -> None:
+        """Precise pause of ``seconds``."""
+        if seconds <= 0:
+            return
+        with self.engine.precise():
+            self._wait_until(self.engine.now() + seconds)
+
+    def summary(self) -> str:
+        """Aggregate achieved pacing over the recent sequences."""
+        with self._lock:
+            recent = [t for t in self.recent if len(t.offsets) > 1]
+        if not recent:
+            return "no paced sequences"
+        worst = max(t.jitter_ms for t in recent)
+        mean = sum(t.mean_interval_ms for t in recent) / len(recent)
+        requested = recent[-1].requested_s * 1000
+        return (
+            f"sequences={len(recent)} requested={requested:.2f}ms "
+            f"achieved={mean:.2f}ms worst_jitter={worst:.2f}ms"
+        )
+
+    def _wait_until(self, deadline: float) -> None:
+        engine = self.engine
+        remaining = deadline - engine.now()
+        if remaining > self.spin_threshold_s:
+            engine.sleep(remaining - self.spin_threshold_s)
+        while engine.now() < deadline:
+            engine.spin()
+
+
+_winmm: Any = None  # winmm.dll, loaded on Windows only
+if sys.platform == "win32":
+    import ctypes
+
+    _winmm = ctypes.WinDLL("winmm")
+
+
+# Shared by every key injection path of the app
+default_scheduler = KeySequenceScheduler()
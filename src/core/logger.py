@@ -1,6 +1,7 @@
 import logging
 import logging.handlers
 import os
+from collections import deque
 from pathlib import Path
 
 # Log storage: Use AppData on Windows to allow writing even when installed in Program Files
@@ -31,6 +32,25 @@ class SafeRotatingFileHandler(logging.handlers.RotatingFileHandler):
         super().doRollover()
 
 
+class _StartupBuffer(logging.Handler):
+    """Keeps INFO+ records logged before the settings say whether to log to file.
+
+    The configuration is loaded (and logs) before ``set_file_logging`` can
+    be called with its ``enable_file_logging`` setting; the first call
+    replays these records into the log file, or drops them.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        super().__init__(logging.INFO)
+        self.records: deque[logging.LogRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+_STARTUP_BUFFER: _StartupBuffer | None = None
+
+
 def setup_logger() -> None:
     """Initialize the base 'piemenu' logger with handlers.
 
@@ -39,6 +59,7 @@ def setup_logger() -> None:
     so only one file handle is ever open at a time — avoiding WinError 32
     on Windows when the rotating handler tries to rename the log file.
     """
+    global _STARTUP_BUFFER
     root = logging.getLogger(_ROOT_LOGGER)
 
     if root.handlers:
@@ -56,6 +77,10 @@ def setup_logger() -> None:
     console_handler.setLevel(logging.WARNING)
     root.addHandler(console_handler)
 
+    # Until set_file_logging knows whether records go to the log file
+    _STARTUP_BUFFER = _StartupBuffer()
+    root.addHandler(_STARTUP_BUFFER)
+
 
 _FILE_HANDLER = None
 
@@ -65,8 +90,9 @@ def set_file_logging(enable: bool) -> None:
 
     Adjusts the log level to INFO instead of DEBUG to reduce log volume.
     Decreases backupCount to 2 and maxBytes to 2MB to save space.
+    The first call also writes (or drops) the records logged before it.
     """
-    global _FILE_HANDLER
+    global _FILE_HANDLER, _STARTUP_BUFFER
     root = logging.getLogger(_ROOT_LOGGER)
 
     if enable:
@@ -85,6 +111,13 @@ def set_file_logging(enable: bool) -> None:
         _FILE_HANDLER.close()
         _FILE_HANDLER = None
 
+    if _STARTUP_BUFFER is not None:
+        root.removeHandler(_STARTUP_BUFFER)
+        if _FILE_HANDLER is not None:
+            for record in _STARTUP_BUFFER.records:
+                _FILE_HANDLER.handle(record)
+        _STARTUP_BUFFER = None
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a named child logger under the 'piemenu' namespace.
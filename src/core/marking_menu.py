@@ -0,0 +1,316 @@
+"""Marking-menu expert mode: selecting by a quick stroke, without the overlay.
+
+Users who know a menu's layout can press the trigger, flick the mouse in
+the direction of a slice and release before the overlay would appear.
+``MarkingMenu`` samples the cursor from the trigger press; if the trigger
+is released within ``expert_timeout_ms``, the recorded stroke is split
+into straight segments at its corners and resolved against the pie
+layout:
+
+- the first segment's direction picks the root slice (as the overlay
+  would for a cursor in that direction),
+- each further segment picks a child of the previous slice's submenu,
+  the one whose fan angle is closest to the segment's direction.
+
+Segments shorter than ``min_stroke_px`` are ignored, so a tap without
+motion selects nothing. Hesitating past the timeout shows the menu as
+usual. ``ExpertStats`` counts how often presses end in a stroke
+selection versus the menu.
+
+Cursor positions come from a callable: ``create_default_cursor_source``
+(GetCursorPos, callable from any thread) in the app, scripted positions
+in tests.
+"""
+
+import math
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from src.core.config import PieSlice
+from src.core.logger import get_logger
+from src.core.pie_geometry import ROOT_START_ANGLE_DEG, fan_span, slice_center_angle
+
+logger = get_logger(__name__)
+
+Point = tuple[float, float]
+CursorSource = Callable[[], tuple[int, int]]
+
+DEFAULT_MIN_STROKE_PX = 30
+DEFAULT_CORNER_DEG = 50.0  # Direction change that starts a new segment
+DEFAULT_CHILD_TOLERANCE_DEG = 45.0  # Accepted deviation from a child's center angle
+DEFAULT_SAMPLE_INTERVAL_S = 0.005
+_JITTER_PX = 3.0  # Cursor moves smaller than this are not direction changes
+_MAX_POINTS = 4096
+
+# Slice types that do not execute anything themselves
+_NAVIGATION_TYPES = frozenset({"submenu", "back"})
+
+
+@dataclass(frozen=True)
+class StrokeSegment:
+    """A straight part of a stroke; ``angle`` uses the pie layout's convention."""
+
+    angle: float
+    length: float
+
+
+def _angle(a: Point, b: Point) -> float:
+    # Screen y grows downwards, so this is clockwise like the renderer's angles
+    return math.degrees(math.atan2(b[1] - a[1], b[0] - a[0])) % 360
+
+
+def angle_difference(a: float, b: float) -> float:
+    """Smallest absolute difference between two angles, in degrees."""
+    diff = abs(a - b) % 360
+    return min(diff, 360 - diff)
+
+
+def segment_stroke(
+    points: Sequence[Point],
+    *,
+    min_segment_px: float = DEFAULT_MIN_STROKE_PX,
+    corner_deg: float = DEFAULT_CORNER_DEG,
+) -> list[StrokeSegment]:
+    """Split a cursor path into straight segments at its corners.
+
+    A corner is where the cursor's direction turns by more than
+    ``corner_deg`` from the current segment's direction, once that
+    segment is at least ``min_segment_px`` long. A trailing piece shorter
+    than ``min_segment_px`` (overshoot while releasing) is dropped.
+    """
+    kept: list[Point] = []
+    for point in points:
+        if not kept or math.dist(kept[-1], point) >= _JITTER_PX:
+            kept.append(point)
+    if len(kept) < 2:
+        return []
+
+    segments: list[StrokeSegment] = []
+    anchor = prev = kept[0]
+    for point in kept[1:]:
+        length = math.dist(anchor, prev)
+        if length >= min_segment_px:
+            direction = _angle(anchor, prev)
+            if angle_difference(direction, _angle(prev, point)) > corner_deg:
+                segments.append(StrokeSegment(direction, length))
+                anchor = prev
+        prev = point
+
+    length = math.dist(anchor, prev)
+    if length >= min_segment_px:
+        segments.append(StrokeSegment(_angle(anchor, prev), length))
+    return segments
+
+
+def recognize_stroke(
+    items: Sequence[PieSlice],
+    segments: Sequence[StrokeSegment],
+    *,
+    child_tolerance_deg: float = DEFAULT_CHILD_TOLERANCE_DEG,
+) -> list[int] | None:
+    """Resolve stroke segments to a path of slice indices.
+
+    Returns None when the stroke does not name an executable slice: no
+    segments, more segments than submenu levels, a direction outside a
+    submenu's fan, or a stroke that ends on a submenu slice.
+    """
+    if not items or not segments:
+        return None
+
+    span = 360.0 / len(items)
+    adj = (segments[0].angle - ROOT_START_ANGLE_DEG) % 360
+    path = [int(((adj + span / 2) % 360) // span)]
+    current = items[path[0]]
+
+    for segment in segments[1:]:
+        children = current.submenu_items
+        if not children:
+            return None
+        distances = [
+            angle_difference(segment.angle, slice_center_angle(items, len(path), [*path, j]))
+            for j in range(len(children))
+        ]
+        best = min(range(len(children)), key=distances.__getitem__)
+        slice_span = fan_span(len(children)) / len(children)
+        if distances[best] > max(slice_span / 2, child_tolerance_deg):
+            return None
+        path.append(best)
+        current = children[best]
+
+    if current.action_type in _NAVIGATION_TYPES:
+        return None
+    return path
+
+
+def item_at_path(items: Sequence[PieSlice], path: Sequence[int]) -> PieSlice | None:
+    """The slice a path of indices leads to, or None if the path is invalid."""
+    item = None
+    current = items
+    for idx in path:
+        if not 0 <= idx < len(current):
+            return None
+        item = current[idx]
+        current = item.submenu_items
+    return item
+
+
+@dataclass
+class ExpertStats:
+    """How expert-mode presses ended."""
+
+    selections: int = 0  # Released in time on a recognized stroke
+    menu_fallbacks: int = 0  # Held past the timeout; the overlay was shown
+    unrecognized: int = 0  # Released in time without a usable stroke
+
+    @property
+    def presses(self) -> int:
+        return self.selections + self.menu_fallbacks + self.unrecognized
+
+    @property
+    def expert_rate(self) -> float:
+        """Share of presses that selected an action without the overlay."""
+        return self.selections / self.presses if self.presses else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"presses={self.presses} selections={self.selections} "
+            f"menu_fallbacks={self.menu_fallbacks} unrecognized={self.unrecognized} "
+            f"expert_rate={self.expert_rate:.0%}"
+        )
+
+
+class StrokeSampler:
+    """Records cursor positions on a background thread between begin() and end()."""
+
+    def __init__(
+        self,
+        cursor: CursorSource,
+        *,
+        interval_s: float = DEFAULT_SAMPLE_INTERVAL_S,
+        max_points: int = _MAX_POINTS,
+    ) -> None:
+        self._cursor = cursor
+        self.interval_s = interval_s
+        self.max_points = max_points
+        self._points: list[Point] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def begin(self, *, threaded: bool = True) -> None:
+        """Start a new stroke at the current cursor position."""
+        self._stop_thread()
+        with self._lock:
+            self._points = []
+        self.sample()
+        if threaded:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="StrokeSampler", daemon=True)
+            self._thread.start()
+
+    def sample(self) -> None:
+        """Record the current cursor position."""
+        try:
+            x, y = self._cursor()
+        except Exception as e:
+            logger.debug(f"Cursor position unavailable: {e}")
+            return
+        with self._lock:
+            if len(self._points) < self.max_points:
+                self._points.append((float(x), float(y)))
+
+    def end(self) -> list[Point]:
+        """Stop sampling and return the stroke, including the final position."""
+        self._stop_thread()
+        self.sample()
+        with self._lock:
+            points, self._points = self._points, []
+        return points
+
+    def cancel(self) -> None:
+        """Stop sampling and discard the stroke."""
+        self._stop_thread()
+        with self._lock:
+            self._points = []
+
+    def _stop_thread(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            if thread is not threading.current_thread():
+                thread.join(timeout=0.1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+
+class MarkingMenu:
+    """Stroke sampling, recognition and statistics for one trigger press at a time."""
+
+    def __init__(
+        self,
+        cursor: CursorSource,
+        *,
+        min_stroke_px: float = DEFAULT_MIN_STROKE_PX,
+        corner_deg: float = DEFAULT_CORNER_DEG,
+        threaded: bool = True,
+    ) -> None:
+        self.sampler = StrokeSampler(cursor)
+        self.min_stroke_px = min_stroke_px
+        self.corner_deg = corner_deg
+        self.threaded = threaded
+        self.stats = ExpertStats()
+
+    def begin(self) -> None:
+        """Start recording a stroke (trigger pressed)."""
+        self.sampler.begin(threaded=self.threaded)
+
+    def fall_back_to_menu(self) -> None:
+        """The user hesitated: drop the stroke, the overlay takes over."""
+        self.sampler.cancel()
+        self.stats.menu_fallbacks += 1
+
+    def finish(self, items: Sequence[PieSlice]) -> PieSlice | None:
+        """Trigger released in time: resolve the stroke to a slice, or None."""
+        points = self.sampler.end()
+        segments = segment_stroke(
+            points, min_segment_px=self.min_stroke_px, corner_deg=self.corner_deg
+        )
+        path = recognize_stroke(items, segments)
+        item = item_at_path(items, path) if path is not None else None
+        if item is None:
+            self.stats.unrecognized += 1
+            logger.debug(f"Stroke not recognized ({len(points)} points, {len(segments)} segments)")
+            return None
+        self.stats.selections += 1
+        logger.info(f"Stroke selected '{item.label}' (path {path})")
+        return item
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.GetCursorPos.argtypes = (ctypes.POINTER(wintypes.POINT),)
+    _user32.GetCursorPos.restype = wintypes.BOOL
+
+    def _win32_cursor_pos() -> tuple[int, int]:
+        point = wintypes.POINT()
+        if not _user32.GetCursorPos(ctypes.byref(point)):
+            raise OSError(f"GetCursorPos failed: {ctypes.get_last_error()}")
+        return point.x, point.y
+
+
+def create_default_cursor_source() -> CursorSource | None:
+    """Return a thread-safe cursor position source, or None where unsupported."""
+    if sys.platform == "win32":
+        return _win32_cursor_pos
+    return None
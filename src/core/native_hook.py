@@ -0,0 +1,173 @@
+"""Native Windows low-level keyboard hook.
+
+Kept free of pynput and Qt imports so it can run inside the minimal
+out-of-process hook host (see src.core.hook_host) as well as in-process.
+"""
+
+import sys as _sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, ClassVar
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Magic extra info to identify our own injected events
+MAGIC_EXTRA_INFO = 0x31415926
+
+# ──────────────────────────────────────────────────────────────────────────
+# Windows Native Hook Implementation
+# ──────────────────────────────────────────────────────────────────────────
+
+if _sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+
+    WH_KEYBOARD_LL = 13
+    HC_ACTION = 0
+
+    class KBDLLHOOKSTRUCT(ctypes.Structure):
+        _fields_: ClassVar[list[tuple[str, Any]]] = [
+            ("vkCode", wintypes.DWORD),
+            ("scanCode", wintypes.DWORD),
+            ("flags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_void_p),
+        ]
+
+    LowLevelKeyboardProc = ctypes.WINFUNCTYPE(
+        ctypes.c_long, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
+    )
+
+    user32.SetWindowsHookExW.argtypes = (
+        ctypes.c_int,
+        LowLevelKeyboardProc,
+        wintypes.HINSTANCE,
+        wintypes.DWORD,
+    )
+    user32.SetWindowsHookExW.restype = wintypes.HHOOK
+
+    user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+    user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+
+    user32.CallNextHookEx.argtypes = (
+        wintypes.HHOOK,
+        ctypes.c_int,
+        wintypes.WPARAM,
+        wintypes.LPARAM,
+    )
+    user32.CallNextHookEx.restype = wintypes.LPARAM
+
+    kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+    kernel32.GetModuleHandleW.restype = wintypes.HINSTANCE
+
+    class _NativeWin32Hook:
+        """A native WH_KEYBOARD_LL hook for Windows.
+
+        This is needed because pynput's listener does not allow for safe,
+        synchronous event suppression without causing threading deadlocks or
+        ignoring the underlying OS message queue.
+        """
+
+        def __init__(
+            self,
+            filter_func: Callable[[int, Any], bool | None],
+            on_event: Callable[[int, Any, bool, bool | None, int], None] | None = None,
+        ):
+            self.filter_func = filter_func
+            # Optional observer (msg, data, injected, verdict, latency_ns) for recording
+            self.on_event = on_event
+            self.hook_id: Any = None
+            self.thread_id: Any = None
+            self._thread: threading.Thread | None = None
+            self._running = False
+            self._hook_proc = LowLevelKeyboardProc(self._hook_callback)
+
+        def _hook_callback(self, n_code: int, w_param: Any, l_param: Any) -> int:
+            if n_code == HC_ACTION:
+                kb_struct = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+
+                # Extract the dwExtraInfo value safely
+                extra_info = kb_struct.dwExtraInfo
+                is_our_event = False
+                if extra_info is not None:
+                    # Depending on python/ctypes version, extra_info might be int or void_p object
+                    val = (
+                        extra_info
+                        if isinstance(extra_info, int)
+                        else getattr(extra_info, "value", 0)
+                    )
+                    if val == MAGIC_EXTRA_INFO:
+                        is_our_event = True
+
+                # Ignore events injected by our own application so we don't trap our own simulated keypresses
+                # We NO LONGER check (kb_struct.flags & 0x10) because left-hand devices use it too!
+                verdict: bool | None = None
+                elapsed_ns = 0
+                if not is_our_event:
+                    started_ns = time.perf_counter_ns()
+                    verdict = self.filter_func(w_param, kb_struct)
+                    elapsed_ns = time.perf_counter_ns() - started_ns
+
+                if self.on_event is not None:
+                    self.on_event(w_param, kb_struct, is_our_event, verdict, elapsed_ns)
+
+                if verdict is False:
+                    # filter_func returns False to suppress the event
+                    # Return non-zero to prevent the system from passing the
+                    # message to the rest of the hook chain or to the target window.
+                    return 1
+
+            return int(user32.CallNextHookEx(self.hook_id, n_code, w_param, l_param))
+
+        def start(self) -> None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run_message_loop, daemon=True)
+            self._thread.start()
+
+        def _run_message_loop(self) -> None:
+            self.thread_id = kernel32.GetCurrentThreadId()
+
+            # Install the hook
+            self.hook_id = user32.SetWindowsHookExW(
+                WH_KEYBOARD_LL, self._hook_proc, kernel32.GetModuleHandleW(None), 0
+            )
+
+            if not self.hook_id:
+                logger.error("Failed to install native keyboard hook!")
+                return
+
+            logger.info("Native Windows keyboard hook installed.")
+
+            # Pump messages so the hook stays alive and responsive
+            msg = wintypes.MSG()
+            while self._running:
+                # Use PeekMessage to not block indefinitely, allowing clean shutdown
+                # PM_REMOVE = 0x0001
+                if user32.PeekMessageW(ctypes.byref(msg), 0, 0, 0, 1):
+                    user32.TranslateMessage(ctypes.byref(msg))
+                    user32.DispatchMessageW(ctypes.byref(msg))
+                else:
+                    time.sleep(0.01)
+
+            # Cleanup
+            user32.UnhookWindowsHookEx(self.hook_id)
+            self.hook_id = None
+            logger.info("Native Windows keyboard hook removed.")
+
+        def stop(self) -> None:
+            self._running = False
+            if self._thread and self._thread.is_alive():
+                # On Windows, threads pumping messages might need a nudge to wake up
+                if self.thread_id:
+                    # WM_QUIT = 0x0012
+                    user32.PostThreadMessageW(self.thread_id, 0x0012, 0, 0)
+                self._thread.join(timeout=1.0)
+
+        def is_alive(self) -> bool:
+            return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,52 @@
+"""Angular layout of the pie menu, shared by the renderer and stroke recognition.
+
+Angles are in degrees, measured like Qt's painter angles: 0 is "Right",
+increasing clockwise on screen, so the root layer starts at -90 ("Up").
+Submenu children fan out around their parent's center angle.
+"""
+
+from collections.abc import Sequence
+
+from src.core.config import PieSlice
+
+# ── Angle constants for pie layout ────────────────────────────────────────────
+MAX_FAN_SPAN_DEG = 180.0  # Maximum angular span for a submenu fan (degrees)
+FAN_SPAN_PER_ITEM_DEG = 60.0  # Angular span allocated per submenu child (degrees)
+ROOT_START_ANGLE_DEG = -90.0  # Root layer: first item centered at "Up" (degrees)
+
+
+def fan_span(num_items: int) -> float:
+    """Total angular span of a submenu fan with ``num_items`` children."""
+    return min(MAX_FAN_SPAN_DEG, FAN_SPAN_PER_ITEM_DEG * num_items)
+
+
+def slice_center_angle(root_items: Sequence[PieSlice], depth: int, path: Sequence[int]) -> float:
+    """Absolute center angle of the slice at ``depth`` along ``path``.
+
+    Works by traversing from root through submenu levels, computing each
+    level's fan span and child center angle. Returns 0.0 for an invalid
+    path.
+    """
+    if not root_items or not path or depth < 0 or depth >= len(path):
+        return 0.0
+
+    root_span = 360.0 / len(root_items)
+    center = ROOT_START_ANGLE_DEG + (path[0] * root_span)
+
+    if depth == 0:
+        return center
+
+    current_list = getattr(root_items[path[0]], "submenu_items", None) or []
+    for d in range(1, depth + 1):
+        if not current_list or d >= len(path):
+            break
+        n = len(current_list)
+        span = fan_span(n)
+        slice_span = span / n
+        idx = path[d]
+        start = center - span / 2
+        center = start + idx * slice_span + slice_span / 2
+        if idx < len(current_list):
+            current_list = getattr(current_list[idx], "submenu_items", None) or []
+
+    return center % 360
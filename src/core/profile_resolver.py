@@ -0,0 +1,109 @@
+"""Trigger → profile resolution for the foreground application.
+
+Several profiles may share a trigger key; app-specific profiles (with
+``target_apps``) take precedence over the global one. Precedence rules:
+
+1. With a known foreground executable, the first profile (in config order)
+   whose target list has an entry contained in the exe name, or in the
+   lower-cased window title, wins. Matching is case-insensitive substring
+   matching of the target.
+2. Otherwise the first profile without ``target_apps`` is used.
+3. If there is none, no menu is shown.
+
+``ProfileResolver`` compiles these rules once per configuration: per
+trigger, one regex per targeted profile plus a combined regex over all
+targets (a single search rules out every targeted profile at once), and a
+hash map of exact exe names. Results are memoized per (trigger, exe, title).
+"""
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from src.core.config import MenuProfile
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESOLVE_CACHE_SIZE = 512
+
+
+def _targets_pattern(targets: list[str]) -> re.Pattern[str]:
+    return re.compile("|".join(re.escape(t.lower()) for t in targets))
+
+
+@dataclass
+class _TriggerRules:
+    """Compiled resolution rules for one trigger key."""
+
+    # Profiles with target_apps, in precedence order, with their target regex
+    targeted: list[tuple[MenuProfile, re.Pattern[str]]] = field(default_factory=list)
+    # Alternation of every target of every targeted profile
+    any_target: re.Pattern[str] | None = None
+    # Exact exe name → index into ``targeted`` of its first profile
+    exact_exe: dict[str, int] = field(default_factory=dict)
+    # First profile without target_apps
+    fallback: MenuProfile | None = None
+
+
+class ProfileResolver:
+    """Resolves the profile to show for a trigger and the active window."""
+
+    def __init__(self, profiles: Sequence[MenuProfile]) -> None:
+        self._rules: dict[str, _TriggerRules] = {}
+        for profile in profiles:
+            rules = self._rules.setdefault(profile.trigger_key, _TriggerRules())
+            if profile.target_apps:
+                idx = len(rules.targeted)
+                rules.targeted.append((profile, _targets_pattern(profile.target_apps)))
+                for target in profile.target_apps:
+                    rules.exact_exe.setdefault(target.lower(), idx)
+            elif rules.fallback is None:
+                rules.fallback = profile
+
+        for rules in self._rules.values():
+            targets = [t for profile, _ in rules.targeted for t in profile.target_apps]
+            if targets:
+                rules.any_target = _targets_pattern(targets)
+
+        self.resolve = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._resolve)
+
+    @property
+    def trigger_keys(self) -> list[str]:
+        """Every trigger that has at least one profile."""
+        return list(self._rules)
+
+    def _resolve(self, trigger_key: str, exe: str | None, title: str | None) -> MenuProfile | None:
+        """Resolve a profile (see module docstring for the rules).
+
+        Args:
+            trigger_key: Trigger that was pressed
+            exe: Lower-case executable name of the foreground window, if known
+            title: Foreground window title, if known
+
+        Returns:
+            The profile to show, or None.
+        """
+        rules = self._rules.get(trigger_key)
+        if rules is None:
+            return None
+        if exe and rules.any_target is not None:
+            title_lower = title.lower() if title else ""
+
+            def matches(pattern: re.Pattern[str]) -> bool:
+                return bool(pattern.search(exe) or (title_lower and pattern.search(title_lower)))
+
+            # Exact exe hit: only profiles ahead of it can still take precedence
+            limit = rules.exact_exe.get(exe)
+            if limit is not None:
+                for profile, pattern in rules.targeted[:limit]:
+                    if matches(pattern):
+                        return profile
+                return rules.targeted[limit][0]
+
+            if matches(rules.any_target):
+                for profile, pattern in rules.targeted:
+                    if matches(pattern):
+                        return profile
+        return rules.fallback
@@ -0,0 +1,143 @@
+"""Startup timing for ``run.py --startup-profile``.
+
+Two things are recorded:
+
+- ``timeline``: named marks the launcher and the app set as startup
+  progresses (logging ready, app imported, config loaded, hook installed,
+  ...). Setting a mark is one ``perf_counter`` call, so the app always sets
+  them.
+- ``ImportTimer``: while installed, wraps ``builtins.__import__`` and
+  records inclusive and self time of every module imported for the first
+  time. Only the profiling launcher installs it.
+
+This module must stay cheap to import: the launcher imports it first.
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+LOGGING_READY = "logging ready"
+APP_IMPORTED = "app imported"
+QAPPLICATION = "qapplication"
+CONFIG_LOADED = "config loaded"
+ACTIONS_COMPILED = "actions compiled"
+OVERLAY_CREATED = "overlay created"
+TRAY_READY = "tray ready"
+HOOK_INSTALLED = "hook installed"
+APP_INITIALIZED = "app initialized"
+EVENT_LOOP = "event loop running"
+
+
+class StartupTimeline:
+    """Named marks, in milliseconds since ``start``."""
+
+    def __init__(self, start: float | None = None) -> None:
+        self.start = time.perf_counter() if start is None else start
+        self._marks: dict[str, float] = {}  # A repeated mark keeps its latest time
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = time.perf_counter()
+
+    def elapsed_ms(self, name: str) -> float | None:
+        """Milliseconds from ``start`` to the mark, or None if it was never set."""
+        at = self._marks.get(name)
+        return None if at is None else (at - self.start) * 1000
+
+    def phases(self) -> list[tuple[str, float, float]]:
+        """(name, ms since the previous mark, ms since start), in time order."""
+        result = []
+        previous = self.start
+        for name, at in sorted(self._marks.items(), key=lambda item: item[1]):
+            result.append((name, (at - previous) * 1000, (at - self.start) * 1000))
+            previous = at
+        return result
+
+
+timeline = StartupTimeline()
+
+
+def mark(name: str) -> None:
+    """Set a mark on the process-wide startup timeline."""
+    timeline.mark(name)
+
+
+class ImportTimer:
+    """Times first imports of modules while installed."""
+
+    def __init__(self) -> None:
+        self.records: list[tuple[str, float, float]] = []  # (module, inclusive_ms, self_ms)
+        self._original: Callable[..., Any] | None = None
+        self._child_ms: list[float] = []  # Time spent in nested imports, per open import
+
+    def install(self) -> None:
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
+        original = self._original or builtins.__import__
+        target = name
+        if level:
+            package = (globals or {}).get("__package__")
+            try:
+                target = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                target = ""
+        if not target or target in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._child_ms.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            inclusive = (time.perf_counter() - started) * 1000
+            children = self._child_ms.pop()
+            if self._child_ms:
+                self._child_ms[-1] += inclusive
+            self.records.append((target, inclusive, inclusive - children))
+
+    def by_package(self) -> list[tuple[str, float, int]]:
+        """(group, self ms, module count), slowest first.
+
+        ``src`` modules are grouped by their second component (``src.core``,
+        ``src.ui``, ``src.app``), everything else by its top-level package.
+        """
+        groups: dict[str, list[float]] = {}
+        for module, _, self_ms in self.records:
+            parts = module.split(".")
+            group = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+            groups.setdefault(group, []).append(self_ms)
+        return sorted(
+            ((group, sum(times), len(times)) for group, times in groups.items()),
+            key=lambda item: -item[1],
+        )
+
+
+def report(timeline: StartupTimeline, imports: ImportTimer | None = None, top: int = 15) -> str:
+    """Human-readable breakdown of init phases and (if recorded) import times."""
+    lines = ["Startup phases (ms):"]
+    for name, delta, total in timeline.phases():
+        lines.append(f"  {name:<22} +{delta:8.1f}   @{total:8.1f}")
+    hook_ms = timeline.elapsed_ms(HOOK_INSTALLED)
+    if hook_ms is not None:
+        lines.append(f"Time to hook installed: {hook_ms:.1f} ms")
+    if imports is not None and imports.records:
+        total_ms = sum(self_ms for _, _, self_ms in imports.records)
+        lines.append(f"Imports: {len(imports.records)} modules, {total_ms:.1f} ms")
+        for group, self_ms, count in imports.by_package()[:top]:
+            lines.append(f"  {group:<28} {self_ms:8.1f} ms  ({count} modules)")
+        lines.append(f"Slowest modules (self time, top {top}):")
+        slowest = sorted(imports.records, key=lambda record: -record[2])[:top]
+        for module, inclusive, self_ms in slowest:
+            lines.append(f"  {module:<40} {self_ms:8.1f} ms  (incl. {inclusive:.1f})")
+    return "\n".join(lines)
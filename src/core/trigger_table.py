@@ -0,0 +1,287 @@
+"""Trigger table and key-event decision logic.
+
+Pure, dependency-free part of the keyboard hook: tracks held modifiers,
+matches trigger chords and multi-stroke sequences ("ctrl+k, p") and
+decides whether an event is suppressed.
+A sequence prefix stroke is consumed for good, as with editor chord
+bindings: it is not replayed to the foreground app when the sequence times
+out or the next stroke does not match.
+It is shared by the in-process ``HookManager`` and the out-of-process hook
+host, so it must not import pynput or Qt.
+
+The table is not thread-safe by itself; callers serialize ``process``.
+"""
+
+import time
+from collections.abc import Callable
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Windows Message Constants
+WM_KEYDOWN = 0x100
+WM_KEYUP = 0x101
+WM_SYSKEYDOWN = 0x104
+WM_SYSKEYUP = 0x105
+
+# All modifier VKs (to track held state)
+ALL_MOD_VKS: dict[int, str] = {
+    0xA2: "ctrl",
+    0xA3: "ctrl",
+    0xA4: "alt",
+    0xA5: "alt",
+    0xA0: "shift",
+    0xA1: "shift",
+    0x5B: "windows",
+    0x5C: "windows",
+}
+
+# VK → primary key name mapping
+VK_TO_NAME: dict[int, str] = {
+    0x20: "space",
+    0x0D: "enter",
+    0x09: "tab",
+    0x1B: "escape",
+    0x08: "backspace",
+    0x2E: "delete",
+    0x2D: "insert",
+    0x24: "home",
+    0x23: "end",
+    0x21: "page_up",
+    0x22: "page_down",
+    0x26: "up",
+    0x28: "down",
+    0x25: "left",
+    0x27: "right",
+    **{0x70 + i: f"f{i + 1}" for i in range(12)},  # F1-F12
+    **{0x41 + i: chr(ord("a") + i) for i in range(26)},  # A-Z → a-z
+    **{0x30 + i: str(i) for i in range(10)},  # 0-9
+}
+
+# Trigger events produced by TriggerTable.process: (kind, full_trigger, key_name)
+EVENT_PRESS = "press"
+EVENT_RELEASE = "release"
+TriggerEvent = tuple[str, str, str]
+
+TriggerConfigs = dict[str, list[tuple[tuple[str, ...], str]]]
+
+# One keystroke of a trigger: (primary key name, held modifier names)
+Chord = tuple[str, frozenset[str]]
+
+# Strokes of a sequence trigger are separated by commas: "ctrl+k, p"
+SEQUENCE_SEPARATOR = ","
+DEFAULT_SEQUENCE_TIMEOUT_S = 1.0
+
+_NAME_ALIASES = {"win": "windows", "esc": "escape", "control": "ctrl"}
+
+
+def parse_chord(text: str) -> Chord:
+    """Parse one stroke like ``"ctrl+shift+k"`` into (primary, modifiers)."""
+    parts = [_NAME_ALIASES.get(p, p) for p in text.strip().lower().split("+")]
+    return parts[-1], frozenset(parts[:-1])
+
+
+def parse_trigger(trigger: str) -> tuple[Chord, ...]:
+    """Parse a trigger string into its strokes (a single chord for plain triggers)."""
+    return tuple(parse_chord(stroke) for stroke in trigger.split(SEQUENCE_SEPARATOR))
+
+
+def build_trigger_configs(trigger_keys: list[str]) -> TriggerConfigs:
+    """Group trigger strings by first primary key: {primary: [(sorted_modifiers, full_key), ...]}."""
+    configs: TriggerConfigs = {}
+    for full_key in trigger_keys:
+        primary, modifiers = parse_trigger(full_key)[0]
+        configs.setdefault(primary, []).append((tuple(sorted(modifiers)), full_key))
+        logger.debug(
+            f"Registered trigger: {primary} with modifiers {sorted(modifiers)} (full: {full_key})"
+        )
+    return configs
+
+
+class _Node:
+    """Trie node: either a complete trigger or a sequence prefix."""
+
+    __slots__ = ("children", "timeout_s", "trigger")
+
+    def __init__(self) -> None:
+        self.children: dict[Chord, _Node] = {}
+        self.trigger: str | None = None
+        self.timeout_s = 0.0
+
+
+class TriggerMatcher:
+    """Triggers compiled into a trie keyed by chord.
+
+    Each key press is one dict lookup from the current node, however many
+    triggers are configured. A node is either a complete trigger or the
+    prefix of longer sequences; when a configuration makes a trigger also a
+    prefix, the shorter trigger wins (pie menu triggers act on press and
+    cannot wait to see whether a longer sequence follows).
+    """
+
+    def __init__(
+        self,
+        trigger_keys: list[str],
+        timeouts: dict[str, float] | None = None,
+        default_timeout_s: float = DEFAULT_SEQUENCE_TIMEOUT_S,
+    ) -> None:
+        self.trigger_keys = list(trigger_keys)
+        self.timeouts = dict(timeouts or {})
+        self.trigger_configs = build_trigger_configs(trigger_keys)
+        self.root = _Node()
+        # Primary key names used by any stroke (decides whether a modifier
+        # VK has to go through matching at all)
+        self.primary_keys: frozenset[str] = frozenset()
+
+        timeouts = timeouts or {}
+        primaries: set[str] = set()
+        for trigger in trigger_keys:
+            chords = parse_trigger(trigger)
+            if self._insert(trigger, chords, timeouts.get(trigger, default_timeout_s)):
+                primaries.update(primary for primary, _ in chords)
+        self.primary_keys = frozenset(primaries)
+
+    def _insert(self, trigger: str, chords: tuple[Chord, ...], timeout_s: float) -> bool:
+        node = self.root
+        for chord in chords[:-1]:
+            node = node.children.setdefault(chord, _Node())
+            if node.trigger is not None:
+                logger.warning(f"Trigger '{trigger}' is shadowed by '{node.trigger}'; ignoring it")
+                return False
+            node.timeout_s = max(node.timeout_s, timeout_s)
+
+        last = node.children.setdefault(chords[-1], _Node())
+        if last.trigger is not None:
+            logger.warning(f"Trigger '{trigger}' duplicates '{last.trigger}'; ignoring it")
+            return False
+        if last.children:
+            logger.warning(f"Trigger '{trigger}' shadows longer sequences starting with it")
+            last.children = {}
+        last.trigger = trigger
+        return True
+
+
+class TriggerTable:
+    """Trigger configuration plus the live key state the hook decides on."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.matcher = TriggerMatcher([])
+        # Currently suppressed primary keys: {key_name: full_trigger_str}
+        self.active_suppressions: dict[str, str] = {}
+        # Currently held modifier names (tracked via VK)
+        self.held_modifiers: set[str] = set()
+        # While True every key passes through untouched (shortcut recording)
+        self.recording_mode = False
+        # Sequence in progress: trie node reached so far and its deadline
+        self._pending: _Node | None = None
+        self._pending_deadline = 0.0
+        # Keys swallowed as sequence prefixes (their key-up is suppressed too)
+        self._swallowed: set[str] = set()
+
+    @property
+    def trigger_configs(self) -> TriggerConfigs:
+        """{primary_key_name: [(sorted_modifier_tuple, full_trigger_str), ...]}"""
+        return self.matcher.trigger_configs
+
+    @property
+    def trigger_keys(self) -> list[str]:
+        """Raw trigger strings of the current configuration."""
+        return self.matcher.trigger_keys
+
+    def set_triggers(
+        self, trigger_keys: list[str], timeouts: dict[str, float] | None = None
+    ) -> None:
+        """Compile and swap in a new trigger list, keeping the live key state."""
+        self.use_matcher(TriggerMatcher(trigger_keys, timeouts))
+
+    def use_matcher(self, matcher: TriggerMatcher) -> None:
+        """Swap in an already compiled matcher (compile outside the hook lock)."""
+        self.matcher = matcher
+        self._pending = None
+
+    def reset_state(self) -> None:
+        """Forget held modifiers, in-flight suppressions and pending sequences."""
+        self.active_suppressions = {}
+        self.held_modifiers = set()
+        self._pending = None
+        self._swallowed = set()
+
+    def process(self, msg: int, vk: int) -> tuple[bool, TriggerEvent | None]:
+        """Decide on one low-level keyboard event.
+
+        Returns:
+            (allow, event): ``allow`` is False if the event must be suppressed;
+            ``event`` is a trigger press/release to dispatch, or None.
+        """
+        is_press = msg in (WM_KEYDOWN, WM_SYSKEYDOWN)
+        is_release = msg in (WM_KEYUP, WM_SYSKEYUP)
+
+        # ── Track modifier state ──────────────────────────────────────────
+        mod_name = ALL_MOD_VKS.get(vk)
+        if mod_name:
+            if is_press and mod_name not in self.held_modifiers:
+                self.held_modifiers.add(mod_name)
+                logger.info(f"MODIFIER ADDED: {mod_name} (Current: {self.held_modifiers})")
+            elif is_release and mod_name in self.held_modifiers:
+                self.held_modifiers.discard(mod_name)
+                logger.info(f"MODIFIER REMOVED: {mod_name} (Current: {self.held_modifiers})")
+            # Modifier keys ALSO need to be checked as primary trigger keys
+            # (e.g. if trigger is 'ctrl' alone)
+            if mod_name not in self.matcher.primary_keys:
+                return True, None  # Just a modifier, pass through
+
+        # ── Resolve primary key name ──────────────────────────────────────
+        key_name = VK_TO_NAME.get(vk) or mod_name
+        if key_name is None:
+            return True, None  # Unknown key — pass through
+
+        # ── Release of a suppressed trigger ───────────────────────────────
+        if is_release:
+            suppressed_trigger = self.active_suppressions.pop(key_name, None)
+            if suppressed_trigger is not None:
+                return False, (EVENT_RELEASE, suppressed_trigger, key_name)
+            if key_name in self._swallowed:
+                self._swallowed.discard(key_name)
+                return False, None
+            return True, None
+
+        if is_press:
+            if key_name in self.active_suppressions or key_name in self._swallowed:
+                return False, None  # Auto-repeat of a held trigger
+            if self.recording_mode:
+                return True, None
+            return self._advance((key_name, frozenset(self.held_modifiers)))
+
+        return True, None  # Pass through
+
+    def _advance(self, chord: Chord) -> tuple[bool, TriggerEvent | None]:
+        """Move through the trie on a key press.
+
+        A prefix stroke is swallowed (down and up) and never replayed: by
+        the time the sequence is known to have failed, the stroke would
+        reach the app out of order and possibly in another window.
+        """
+        node = None
+        pending, self._pending = self._pending, None
+        if pending is not None and self._clock() <= self._pending_deadline:
+            node = pending.children.get(chord)
+        if node is None:
+            # No sequence in progress, it timed out, or this stroke broke it:
+            # the key is judged on its own
+            node = self.matcher.root.children.get(chord)
+            if node is None:
+                return True, None
+
+        key_name = chord[0]
+        if node.trigger is not None:
+            self.active_suppressions[key_name] = node.trigger
+            return False, (EVENT_PRESS, node.trigger, key_name)
+
+        # Sequence prefix: swallow the stroke and wait for the next one
+        self._pending = node
+        self._pending_deadline = self._clock() + node.timeout_s
+        self._swallowed.add(key_name)
+        logger.debug(f"Sequence prefix {key_name}; waiting {node.timeout_s:.2f}s for next stroke")
+        return False, None
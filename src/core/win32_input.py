@@ -1,62 +1,71 @@
 import ctypes
+import functools
 import os
 import sys
+from collections.abc import Callable
 from ctypes import wintypes
-from typing import Any, ClassVar
+from typing import Any, ClassVar, NamedTuple
 
 from pynput import keyboard as pynput_keyboard
 
+from src.core.key_timing import KeySequenceScheduler, default_scheduler
 from src.core.logger import get_logger
+from src.core.native_hook import MAGIC_EXTRA_INFO
+
+# INPUT structures are defined on every platform so that injection plans
+# can be built and checked anywhere; only SendInput itself needs Windows.
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_void_p),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_void_p),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class InputUnion(ctypes.Union):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("ki", KEYBDINPUT),
+        ("mi", MOUSEINPUT),
+        ("hi", HARDWAREINPUT),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [("type", wintypes.DWORD), ("ii", InputUnion)]
 
-# Magic extra info to identify our own injected events
-MAGIC_EXTRA_INFO = 0x31415926
 
 if sys.platform == "win32":
     # Use WinDLL with use_last_error=True to correctly capture GetLastError
     user32 = ctypes.WinDLL("user32", use_last_error=True)
     kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 
-    INPUT_KEYBOARD = 1
-    KEYEVENTF_EXTENDEDKEY = 0x0001
-    KEYEVENTF_KEYUP = 0x0002
-    KEYEVENTF_UNICODE = 0x0004
-
-    class MOUSEINPUT(ctypes.Structure):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [
-            ("dx", wintypes.LONG),
-            ("dy", wintypes.LONG),
-            ("mouseData", wintypes.DWORD),
-            ("dwFlags", wintypes.DWORD),
-            ("time", wintypes.DWORD),
-            ("dwExtraInfo", ctypes.c_void_p),
-        ]
-
-    class KEYBDINPUT(ctypes.Structure):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [
-            ("wVk", wintypes.WORD),
-            ("wScan", wintypes.WORD),
-            ("dwFlags", wintypes.DWORD),
-            ("time", wintypes.DWORD),
-            ("dwExtraInfo", ctypes.c_void_p),
-        ]
-
-    class HARDWAREINPUT(ctypes.Structure):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [
-            ("uMsg", wintypes.DWORD),
-            ("wParamL", wintypes.WORD),
-            ("wParamH", wintypes.WORD),
-        ]
-
-    class InputUnion(ctypes.Union):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [
-            ("ki", KEYBDINPUT),
-            ("mi", MOUSEINPUT),
-            ("hi", HARDWAREINPUT),
-        ]
-
-    class INPUT(ctypes.Structure):
-        _fields_: ClassVar[list[tuple[str, Any]]] = [("type", wintypes.DWORD), ("ii", InputUnion)]
-
     def _send_key_win32(vk: int, is_press: bool) -> None:
         """Send a keyboard event with our magic dwExtraInfo so HookManager can ignore it."""
         try:
@@ -138,38 +147,8 @@ def send_pynput_key_safely(key, is_press: bool):
         except ValueError:
             # Handle unicode surrogates exactly like pynput does, but with our extra_info
             try:
-                byte_data = bytearray(key.char.encode("utf-16le"))
-                surrogates = [
-                    byte_data[i] | (byte_data[i + 1] << 8) for i in range(0, len(byte_data), 2)
-                ]
-
-                state_flags = KEYEVENTF_UNICODE | (KEYEVENTF_KEYUP if not is_press else 0)
-                extra = ctypes.c_void_p(MAGIC_EXTRA_INFO)
-
-                inputs = (INPUT * len(surrogates))(
-                    *(
-                        INPUT(
-                            INPUT_KEYBOARD,
-                            InputUnion(
-                                ki=KEYBDINPUT(
-                                    wVk=0,
-                                    wScan=scan,
-                                    dwFlags=state_flags,
-                                    time=0,
-                                    dwExtraInfo=extra,
-                                )
-                            ),
-                        )
-                        for scan in surrogates
-                    )
-                )
-
-                res = user32.SendInput(len(surrogates), inputs, ctypes.sizeof(INPUT))
-                if res == 0:
-                    err = ctypes.get_last_error()
-                    logger.error(f"SendInput Unicode FAILED (Error={err}): {surrogates}")
-                else:
-                    logger.debug(f"SendInput Unicode SUCCESS: {surrogates}")
+                if send_inputs(unicode_inputs(key.char, is_press), user32):
+                    logger.debug(f"SendInput Unicode SUCCESS: {utf16_units(key.char)}")
                 return
             except Exception as e:
                 logger.error(f"Failed surrogate injection for {key}: {e}")
@@ -198,6 +177,273 @@ def send_pynput_key_safely(key, is_press: bool):
         logger.error(f"Failed to send pynput key {key}: {e}")
 
 
+# ──────────────────────────────────────────────────────────────────────────
+# Batched injection
+# ──────────────────────────────────────────────────────────────────────────
+
+# Keys that need KEYEVENTF_EXTENDEDKEY when injected by raw VK
+_EXTENDED_VKS = frozenset({0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E, 0x5B, 0x5C})
+
+# A press/release plan: [(pynput key, is_press), ...] in injection order
+KeyPlan = list[tuple[Any, bool]]
+
+
+class KeyInput(NamedTuple):
+    """One raw keyboard INPUT record."""
+
+    vk: int
+    scan: int
+    flags: int
+
+
+def utf16_units(text: str) -> list[int]:
+    """UTF-16 code units of ``text`` (characters outside the BMP become surrogate pairs)."""
+    data = text.encode("utf-16le")
+    return [data[i] | (data[i + 1] << 8) for i in range(0, len(data), 2)]
+
+
+def unicode_inputs(text: str, is_press: bool) -> list[KeyInput]:
+    """KEYEVENTF_UNICODE records pressing (or releasing) every code unit of ``text``."""
+    flags = KEYEVENTF_UNICODE | (0 if is_press else KEYEVENTF_KEYUP)
+    return [KeyInput(0, unit, flags) for unit in utf16_units(text)]
+
+
+def chord_plan(keys: list[Any]) -> KeyPlan:
+    """Press ``keys`` in order, then release them in reverse order."""
+    return [(k, True) for k in keys] + [(k, False) for k in reversed(keys)]
+
+
+def key_inputs(key: Any, is_press: bool, map_vk: Callable[[int, int], int]) -> list[KeyInput]:
+    """Translate a pynput key event into raw INPUT records.
+
+    Mirrors send_pynput_key_safely: pynput's own ``_parameters`` when the
+    key has them, KEYEVENTF_UNICODE records for surrogate pairs, raw VK
+    (scan code via ``map_vk``, usually user32.MapVirtualKeyW) otherwise.
+
+    Raises:
+        ValueError: If the key cannot be expressed as INPUT records.
+    """
+    target = key.value if hasattr(key, "value") and hasattr(key.value, "_parameters") else key
+    if hasattr(target, "_parameters"):
+        try:
+            params = target._parameters(is_press)
+            return [
+                KeyInput(params.get("wVk", 0), params.get("wScan", 0), params.get("dwFlags", 0))
+            ]
+        except ValueError:
+            # pynput refuses surrogate pairs; send them as unicode units
+            return unicode_inputs(key.char, is_press)
+
+    if hasattr(key, "value") and hasattr(key.value, "vk"):
+        vk = key.value.vk
+    else:
+        vk = getattr(key, "vk", None)
+    if vk is None:
+        raise ValueError(f"Cannot map {key!r} to a virtual key")
+    flags = KEYEVENTF_EXTENDEDKEY if vk in _EXTENDED_VKS else 0
+    if not is_press:
+        flags |= KEYEVENTF_KEYUP
+    return [KeyInput(vk, map_vk(vk, 0), flags)]
+
+
+def build_input_array(inputs: list[KeyInput]) -> Any:
+    """Pack INPUT records (tagged with our dwExtraInfo) into one ctypes array."""
+    extra = ctypes.c_void_p(MAGIC_EXTRA_INFO)
+    return (INPUT * len(inputs))(
+        *(
+            INPUT(
+                INPUT_KEYBOARD,
+                InputUnion(
+                    ki=KEYBDINPUT(
+                        wVk=i.vk, wScan=i.scan, dwFlags=i.flags, time=0, dwExtraInfo=extra
+                    )
+                ),
+            )
+            for i in inputs
+        )
+    )
+
+
+def send_inputs(inputs: list[KeyInput], api: Any) -> int:
+    """Submit INPUT records with a single SendInput call. Returns the number injected."""
+    if not inputs:
+        return 0
+    sent = int(api.SendInput(len(inputs), build_input_array(inputs), ctypes.sizeof(INPUT)))
+    if sent != len(inputs):
+        err = 0
+        if sys.platform == "win32":
+            err = ctypes.get_last_error()
+        logger.error(f"SendInput injected {sent}/{len(inputs)} events (Error={err})")
+    return sent
+
+
+def send_key_plan(
+    plan: KeyPlan,
+    delay_s: float = 0.0,
+    api: Any = None,
+    *,
+    scheduler: KeySequenceScheduler | None = None,
+) -> None:
+    """Inject a whole press/release plan.
+
+    Without a delay the plan goes out as one INPUT array in a single
+    SendInput call, so no other input can interleave with it. With
+    ``delay_s`` > 0 each event is sent on its own, sleeping after each.
+
+    Args:
+        plan: [(key, is_press), ...] in injection order
+        delay_s: Pause after each event (key_sequence_delay_ms)
+        api: user32-like object providing SendInput/MapVirtualKeyW;
+            defaults to user32 on Windows. Elsewhere keys go through pynput.
+        scheduler: Paces events when ``delay_s`` > 0 (default: the shared one)
+    """
+    if api is None and sys.platform == "win32":
+        api = user32
+
+    if api is None:
+        steps = [functools.partial(send_pynput_key_safely, k, p) for k, p in plan]
+        if delay_s > 0:
+            (scheduler or default_scheduler).run(steps, delay_s)
+        else:
+            for step in steps:
+                step()
+        return
+
+    events: list[tuple[KeyInput, ...]] = []
+    for key, is_press in plan:
+        try:
+            events.append(tuple(key_inputs(key, is_press, api.MapVirtualKeyW)))
+        except ValueError as e:
+            logger.error(f"Skipping key {key}: {e}")
+    send_compiled_plan(tuple(events), delay_s, api, scheduler=scheduler)
+
+
+# A plan resolved ahead of time: the INPUT records of each event, in order
+CompiledKeyPlan = tuple[tuple[KeyInput, ...], ...]
+
+
+def compile_key_plan(plan: KeyPlan, api: Any = None) -> CompiledKeyPlan | None:
+    """Resolve a plan to raw INPUT records once, ahead of execution.
+
+    Scan codes follow the keyboard layout active at compile time, so
+    compiled plans should be rebuilt when the configuration is reloaded.
+
+    Returns:
+        The compiled plan, or None where SendInput is unavailable (the
+        plan then has to go through send_key_plan).
+
+    Raises:
+        ValueError: If a key cannot be expressed as INPUT records.
+    """
+    if api is None and sys.platform == "win32":
+        api = user32
+    if api is None:
+        return None
+    return tuple(tuple(key_inputs(key, is_press, api.MapVirtualKeyW)) for key, is_press in plan)
+
+
+def send_compiled_plan(
+    events: CompiledKeyPlan,
+    delay_s: float = 0.0,
+    api: Any = None,
+    *,
+    scheduler: KeySequenceScheduler | None = None,
+) -> None:
+    """Inject a compiled plan: one SendInput batch, or one call per event with ``delay_s``.
+
+    Paced events are scheduled against absolute deadlines (see key_timing),
+    so timer overshoot does not accumulate over a long chord.
+    """
+    if api is None:
+        api = user32
+    if delay_s > 0:
+        steps = [functools.partial(send_inputs, list(event), api) for event in events]
+        (scheduler or default_scheduler).run(steps, delay_s)
+        return
+    send_inputs([i for event in events for i in event], api)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Text typing
+# ──────────────────────────────────────────────────────────────────────────
+
+# INPUT records per SendInput call when typing text. Keeps each call short
+# enough that other input is not starved and a blocked call loses little.
+TEXT_CHUNK_INPUTS = 512
+
+# Control characters typed as real keys; most apps ignore them as unicode
+_TEXT_VKS = {"\n": 0x0D, "\t": 0x09}  # VK_RETURN, VK_TAB
+
+
+def text_inputs(text: str, map_vk: Callable[[int, int], int]) -> list[tuple[KeyInput, ...]]:
+    """INPUT records typing ``text``, grouped per character (press then release).
+
+    Newlines (LF or CRLF) and tabs become Enter/Tab key strokes;
+    everything else is sent as KEYEVENTF_UNICODE code units.
+    """
+    groups: list[tuple[KeyInput, ...]] = []
+    for char in text.replace("\r\n", "\n"):
+        vk = _TEXT_VKS.get(char)
+        if vk is not None:
+            scan = map_vk(vk, 0)
+            groups.append((KeyInput(vk, scan, 0), KeyInput(vk, scan, KEYEVENTF_KEYUP)))
+        else:
+            groups.append((*unicode_inputs(char, True), *unicode_inputs(char, False)))
+    return groups
+
+
+def compile_text(
+    text: str, api: Any = None, *, chunk_inputs: int = TEXT_CHUNK_INPUTS
+) -> CompiledKeyPlan | None:
+    """Resolve ``text`` to INPUT chunks of at most ``chunk_inputs`` records.
+
+    A character's records are never split across chunks.
+
+    Returns:
+        The chunks, or None where SendInput is unavailable (see send_text).
+    """
+    if api is None and sys.platform == "win32":
+        api = user32
+    if api is None:
+        return None
+    chunks: list[tuple[KeyInput, ...]] = []
+    chunk: list[KeyInput] = []
+    for group in text_inputs(text, api.MapVirtualKeyW):
+        if chunk and len(chunk) + len(group) > chunk_inputs:
+            chunks.append(tuple(chunk))
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        chunks.append(tuple(chunk))
+    return tuple(chunks)
+
+
+def send_input_chunks(chunks: CompiledKeyPlan, api: Any = None) -> int:
+    """Send each chunk with one SendInput call. Returns the number of records injected."""
+    if api is None:
+        api = user32
+    sent = 0
+    for chunk in chunks:
+        count = send_inputs(list(chunk), api)
+        sent += count
+        if count != len(chunk):
+            logger.error(f"Text injection stopped after {sent} input records")
+            break
+    return sent
+
+
+def send_text(text: str, api: Any = None) -> None:
+    """Type ``text`` in batched SendInput calls (pynput's typing elsewhere)."""
+    chunks = compile_text(text, api)
+    if chunks is None:
+        try:
+            _fallback_controller.type(text)
+        except Exception as e:
+            logger.error(f"Failed to type text: {e}")
+        return
+    send_input_chunks(chunks, api)
+
+
 def get_active_window_info() -> tuple[str | None, str | None]:
     """Get the executable name and title of the foreground window on Windows."""
     if sys.platform != "win32":
@@ -0,0 +1,327 @@
+"""Cached foreground window information.
+
+``get_active_window_info`` runs on every trigger press, yet the foreground
+process rarely changes between presses. ``WindowInfoProvider`` memoizes
+pid → exe name (keeping a process handle open, which both detects process
+exit cheaply and prevents the pid from being reused while cached) and the
+last hwnd → title for a short TTL.
+
+The OS calls sit behind the ``WindowSystem`` protocol; ``Win32WindowSystem``
+is the real implementation and ``FakeWindowSystem`` drives tests and
+benchmarks on any platform.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TITLE_TTL_S = 0.25
+DEFAULT_MAX_PROCESSES = 64
+
+
+class WindowSystem(Protocol):
+    """Raw window/process queries that the provider caches."""
+
+    def foreground_window(self) -> int:
+        """Handle of the foreground window, 0 if there is none."""
+        ...
+
+    def window_pid(self, hwnd: int) -> int: ...
+
+    def window_title(self, hwnd: int) -> str: ...
+
+    def open_process(self, pid: int) -> tuple[str, Any] | None:
+        """Return (lower-case exe basename, process token), or None if inaccessible."""
+        ...
+
+    def process_exited(self, token: Any) -> bool: ...
+
+    def close_process(self, token: Any) -> None: ...
+
+
+@dataclass
+class WindowInfoStats:
+    """Cache counters and lookup timing."""
+
+    lookups: int = 0
+    exe_hits: int = 0
+    exe_misses: int = 0
+    title_hits: int = 0
+    title_misses: int = 0
+    total_ns: int = 0
+
+    @property
+    def exe_hit_rate(self) -> float:
+        total = self.exe_hits + self.exe_misses
+        return self.exe_hits / total if total else 0.0
+
+    @property
+    def title_hit_rate(self) -> float:
+        total = self.title_hits + self.title_misses
+        return self.title_hits / total if total else 0.0
+
+    @property
+    def mean_lookup_us(self) -> float:
+        return self.total_ns / self.lookups / 1000 if self.lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"lookups={self.lookups} exe_hit_rate={self.exe_hit_rate:.0%} "
+            f"title_hit_rate={self.title_hit_rate:.0%} mean={self.mean_lookup_us:.1f}us"
+        )
+
+
+class WindowInfoProvider:
+    """Foreground window (exe, title) with pid and title caching. Thread-safe."""
+
+    def __init__(
+        self,
+        system: WindowSystem | None,
+        clock: Callable[[], float] = time.monotonic,
+        *,
+        title_ttl_s: float = DEFAULT_TITLE_TTL_S,
+        max_processes: int = DEFAULT_MAX_PROCESSES,
+    ) -> None:
+        self._system = system
+        self._clock = clock
+        self.title_ttl_s = title_ttl_s
+        self.max_processes = max_processes
+        self.stats = WindowInfoStats()
+
+        self._lock = threading.Lock()
+        # pid → (exe_name, process token); least recently used first
+        self._processes: OrderedDict[int, tuple[str, Any]] = OrderedDict()
+        self._title_hwnd = 0
+        self._title = ""
+        self._title_expires = 0.0
+
+    def get_active_window_info(self) -> tuple[str | None, str | None]:
+        """Get the executable name and title of the foreground window.
+
+        Returns:
+            (exe_name, title); exe_name is None if the process cannot be
+            queried, both are None if there is no foreground window.
+        """
+        _, exe, title = self.get_foreground_info()
+        return exe, title
+
+    def get_foreground_info(self) -> tuple[int, str | None, str | None]:
+        """Like get_active_window_info, with the foreground hwnd (0 if none) first."""
+        system = self._system
+        if system is None:
+            return 0, None, None
+        with self._lock:
+            start = time.perf_counter_ns()
+            try:
+                hwnd = system.foreground_window()
+                if not hwnd:
+                    return 0, None, None
+                title = self._get_title(system, hwnd)
+                return hwnd, self._get_exe(system, system.window_pid(hwnd)), title
+            except Exception as e:
+                logger.error(f"Error getting active window info: {e}")
+                return 0, None, None
+            finally:
+                self.stats.lookups += 1
+                self.stats.total_ns += time.perf_counter_ns() - start
+
+    def foreground_window(self) -> int:
+        """Handle of the foreground window (uncached, one cheap OS call)."""
+        return self._system.foreground_window() if self._system is not None else 0
+
+    def invalidate_title(self) -> None:
+        """Force the next lookup to re-read the window title."""
+        self._title_expires = 0.0
+
+    def clear(self) -> None:
+        """Drop all cached entries and release process handles."""
+        with self._lock:
+            for _, token in self._processes.values():
+                self._close(token)
+            self._processes.clear()
+            self._title_hwnd = 0
+
+    def _get_title(self, system: WindowSystem, hwnd: int) -> str:
+        now = self._clock()
+        if hwnd == self._title_hwnd and now < self._title_expires:
+            self.stats.title_hits += 1
+            return self._title
+        self.stats.title_misses += 1
+        self._title = system.window_title(hwnd)
+        self._title_hwnd = hwnd
+        self._title_expires = now + self.title_ttl_s
+        return self._title
+
+    def _get_exe(self, system: WindowSystem, pid: int) -> str | None:
+        cached = self._processes.get(pid)
+        if cached is not None:
+            exe, token = cached
+            if not system.process_exited(token):
+                self._processes.move_to_end(pid)
+                self.stats.exe_hits += 1
+                return exe
+            # Process gone: its pid may now belong to a different program
+            del self._processes[pid]
+            self._close(token)
+
+        self.stats.exe_misses += 1
+        opened = system.open_process(pid)
+        if opened is None:
+            return None
+        self._processes[pid] = opened
+        if len(self._processes) > self.max_processes:
+            _, (_, old_token) = self._processes.popitem(last=False)
+            self._close(old_token)
+        return opened[0]
+
+    def _close(self, token: Any) -> None:
+        if self._system is not None:
+            try:
+                self._system.close_process(token)
+            except Exception as e:
+                logger.debug(f"Could not close process handle: {e}")
+
+
+class FakeWindowSystem:
+    """In-memory WindowSystem for tests and benchmarks.
+
+    Windows are hwnd → (pid, title); processes are pid → exe name. Query
+    counts are kept so tests can assert what the cache avoided.
+    """
+
+    def __init__(self) -> None:
+        self.foreground = 0
+        self.windows: dict[int, tuple[int, str]] = {}
+        self.processes: dict[int, str] = {}
+        self.calls: dict[str, int] = {"window_title": 0, "open_process": 0}
+        self._generation: dict[int, int] = {}
+        self.open_tokens: set[tuple[int, int]] = set()
+
+    def focus(self, hwnd: int, pid: int, title: str, exe: str) -> None:
+        """Make a window the foreground window (creating it and its process)."""
+        self.windows[hwnd] = (pid, title)
+        self.processes.setdefault(pid, exe)
+        self.foreground = hwnd
+
+    def kill(self, pid: int) -> None:
+        """End a process; its pid becomes free for reuse."""
+        self.processes.pop(pid, None)
+        self._generation[pid] = self._generation.get(pid, 0) + 1
+
+    def foreground_window(self) -> int:
+        return self.foreground
+
+    def window_pid(self, hwnd: int) -> int:
+        return self.windows[hwnd][0]
+
+    def window_title(self, hwnd: int) -> str:
+        self.calls["window_title"] += 1
+        return self.windows[hwnd][1]
+
+    def open_process(self, pid: int) -> tuple[str, Any] | None:
+        self.calls["open_process"] += 1
+        exe = self.processes.get(pid)
+        if exe is None:
+            return None
+        token = (pid, self._generation.get(pid, 0))
+        self.open_tokens.add(token)
+        return exe, token
+
+    def process_exited(self, token: Any) -> bool:
+        pid, generation = token
+        return bool(self._generation.get(pid, 0) != generation)
+
+    def close_process(self, token: Any) -> None:
+        self.open_tokens.discard(token)
+
+
+if sys.platform == "win32":
+    import ctypes
+    import os
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+    _user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    _user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.QueryFullProcessImageNameW.argtypes = [
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.LPWSTR,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    _kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    _kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    _SYNCHRONIZE = 0x00100000
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _WAIT_TIMEOUT = 0x102
+
+    class Win32WindowSystem:
+        """WindowSystem backed by user32/kernel32.
+
+        Buffers are allocated once and reused; callers serialize access
+        (WindowInfoProvider holds its lock around every call).
+        """
+
+        def __init__(self) -> None:
+            self._title_buf = ctypes.create_unicode_buffer(256)
+            self._path_buf = ctypes.create_unicode_buffer(1024)
+            self._pid = wintypes.DWORD()
+            self._size = wintypes.DWORD()
+
+        def foreground_window(self) -> int:
+            return _user32.GetForegroundWindow() or 0
+
+        def window_pid(self, hwnd: int) -> int:
+            _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(self._pid))
+            return self._pid.value
+
+        def window_title(self, hwnd: int) -> str:
+            length = _user32.GetWindowTextLengthW(hwnd)
+            if length + 1 > len(self._title_buf):
+                self._title_buf = ctypes.create_unicode_buffer(length + 1)
+            _user32.GetWindowTextW(hwnd, self._title_buf, len(self._title_buf))
+            return self._title_buf.value
+
+        def open_process(self, pid: int) -> tuple[str, Any] | None:
+            handle = _kernel32.OpenProcess(
+                _SYNCHRONIZE | _PROCESS_QUERY_LIMITED_INFORMATION, False, pid
+            )
+            if not handle:
+                return None
+            self._size.value = len(self._path_buf)
+            if not _kernel32.QueryFullProcessImageNameW(
+                handle, 0, self._path_buf, ctypes.byref(self._size)
+            ):
+                # Not cached: the next lookup queries the process again
+                _kernel32.CloseHandle(handle)
+                return None
+            return os.path.basename(self._path_buf.value).lower(), handle
+
+        def process_exited(self, token: Any) -> bool:
+            return bool(_kernel32.WaitForSingleObject(token, 0) != _WAIT_TIMEOUT)
+
+        def close_process(self, token: Any) -> None:
+            _kernel32.CloseHandle(token)
+
+
+def create_default_provider() -> WindowInfoProvider:
+    """Return a provider for this platform (always (None, None) off Windows)."""
+    if sys.platform == "win32":
+        return WindowInfoProvider(Win32WindowSystem())
+    return WindowInfoProvider(None)
@@ -1,11 +1,13 @@
 import os
+import threading
 
-from PyQt6.QtCore import QSize, Qt, QThread, pyqtSignal
+from PyQt6.QtCore import QSize, QStandardPaths, Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon, QImage, QPainter, QPixmap
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtWidgets import (
     QComboBox,
     QDialog,
+    QFileDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
@@ -18,7 +20,8 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
-from src.core.config import load_icon_history, remove_from_icon_history
+from src.core.config import icon_display_name, load_icon_history, remove_from_icon_history
+from src.core.icon_import import ICON_EXTENSIONS, ImportedIcon, ImportSummary, import_icons
 from src.core.utils import get_resource_path, is_dark_mode, resolve_icon_path
 
 from .custom_widgets import _render_icon_pixmap
@@ -65,6 +68,58 @@ class IconLoaderThread(QThread):
         self._is_cancelled = True
 
 
+def _render_icon_image(path: str, size: int = 64) -> QImage:
+    """Render an SVG or raster icon to a square QImage (safe off the GUI thread)."""
+    image = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    if path.lower().endswith(".svg"):
+        renderer = QSvgRenderer(path)
+        if renderer.isValid():
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            renderer.render(painter)
+            painter.end()
+        return image
+    source = QImage(path)
+    if not source.isNull():
+        scaled = source.scaled(
+            size,
+            size,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        painter = QPainter(image)
+        painter.drawImage((size - scaled.width()) // 2, (size - scaled.height()) // 2, scaled)
+        painter.end()
+    return image
+
+
+class IconImportThread(QThread):
+    """Runs ``import_icons`` off the GUI thread and reports each file as a signal."""
+
+    progress = pyqtSignal(int, int, object)  # done, total, ImportedIcon
+    finished_import = pyqtSignal(object)  # ImportSummary
+
+    def __init__(self, paths: list[str], parent=None, *, thumbnails: bool = True):
+        super().__init__(parent)
+        self.paths = paths
+        self.thumbnails = thumbnails
+        self.summary: ImportSummary | None = None  # Set before finished_import is emitted
+        self._cancel = threading.Event()
+
+    def run(self):
+        self.summary = import_icons(
+            self.paths,
+            prepare=_render_icon_image if self.thumbnails else None,
+            on_progress=self.progress.emit,
+            cancel=self._cancel,
+        )
+        self.finished_import.emit(self.summary)
+
+    def cancel(self):
+        self._cancel.set()
+
+
 class IconPickerWidget(QDialog):
     """Dialog to select from preset icons with search functionality."""
 
@@ -82,6 +137,7 @@ class IconPickerWidget(QDialog):
         self.resize(860, 620)
         self.selected_icon_path = None
         self._loader_thread: IconLoaderThread | None = None
+        self._import_thread: IconImportThread | None = None
         self._loaded_count = 0
 
         layout = QVBoxLayout(self)
@@ -187,6 +243,13 @@ class IconPickerWidget(QDialog):
         btn_box.addWidget(self.status_label)
         btn_box.addStretch()
 
+        self.import_btn = QPushButton(self.tr("Import..."))
+        import_menu = QMenu(self.import_btn)
+        import_menu.addAction(self.tr("Icon Files..."), self._import_files)
+        import_menu.addAction(self.tr("Folder..."), self._import_folder)
+        self.import_btn.setMenu(import_menu)
+        btn_box.addWidget(self.import_btn)
+
         ok_btn = QPushButton(self.tr("OK"))
         ok_btn.clicked.connect(self._confirm_selection)
         cancel_btn = QPushButton(self.tr("Cancel"))
@@ -260,7 +323,7 @@ class IconPickerWidget(QDialog):
             resolved = resolve_icon_path(path)
             if not resolved or not os.path.exists(resolved):
                 continue
-            name = os.path.splitext(os.path.basename(resolved))[0]
+            name = icon_display_name(resolved)
             pixmap = _render_icon_pixmap(resolved, 64)
             if pixmap is None:
                 pixmap = QPixmap(64, 64)
@@ -273,17 +336,74 @@ class IconPickerWidget(QDialog):
             self.list_widget.insertItem(0, item)  # insert at top
 
     def accept(self):
-        if self._loader_thread and self._loader_thread.isRunning():
-            self._loader_thread.cancel()
-            self._loader_thread.wait()
+        self._stop_threads()
         super().accept()
 
     def reject(self):
-        if self._loader_thread and self._loader_thread.isRunning():
-            self._loader_thread.cancel()
-            self._loader_thread.wait()
+        self._stop_threads()
         super().reject()
 
+    def _stop_threads(self):
+        for thread in (self._loader_thread, self._import_thread):
+            if thread and thread.isRunning():
+                thread.cancel()
+                thread.wait()
+
+    # ------------------------------------------------------------------ #
+    # Bulk import                                                          #
+    # ------------------------------------------------------------------ #
+    def _import_files(self):
+        pics = QStandardPaths.standardLocations(QStandardPaths.StandardLocation.PicturesLocation)
+        patterns = " ".join(f"*{ext}" for ext in ICON_EXTENSIONS)
+        files, _ = QFileDialog.getOpenFileNames(
+            self,
+            self.tr("Import Icons"),
+            pics[0] if pics else "",
+            self.tr("Image Files ({})").format(patterns),
+        )
+        if files:
+            self.start_import(files)
+
+    def _import_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, self.tr("Import Icon Folder"))
+        if folder:
+            self.start_import([folder])
+
+    def start_import(self, paths: list[str]):
+        """Import files and/or folders in the background, adding each icon as it lands."""
+        if self._import_thread and self._import_thread.isRunning():
+            return
+        self.import_btn.setEnabled(False)
+        self.status_label.setText(self.tr("Importing icons..."))
+        self._import_thread = IconImportThread(paths, self)
+        self._import_thread.progress.connect(self._on_icon_imported)
+        self._import_thread.finished_import.connect(self._on_import_finished)
+        self._import_thread.start()
+
+    def _on_icon_imported(self, done: int, total: int, result: ImportedIcon):
+        self.status_label.setText(self.tr("Importing icons... {}/{}").format(done, total))
+        if result.path is None or result.duplicate:
+            return
+        item = QListWidgetItem(QIcon(QPixmap.fromImage(result.thumbnail)), result.name)
+        item.setData(Qt.ItemDataRole.UserRole, result.path)
+        item.setData(Qt.ItemDataRole.UserRole + 1, "User Icons")
+        item.setToolTip(result.source)
+        self.list_widget.insertItem(0, item)
+        self._apply_filter_to_item(item)
+
+    def _on_import_finished(self, summary: ImportSummary):
+        self.import_btn.setEnabled(True)
+        new = len(summary.imported) - summary.duplicates
+        text = self.tr("Imported {} icons ({} duplicates, {} failed)").format(
+            new, summary.duplicates, len(summary.failed)
+        )
+        self.status_label.setText(text)
+        if summary.failed:
+            details = "\n".join(
+                f"{os.path.basename(r.source)}: {r.error}" for r in summary.failed[:20]
+            )
+            QMessageBox.warning(self, self.tr("Import Icons"), f"{text}\n\n{details}")
+
     def _apply_filter_to_item(self, item: QListWidgetItem):
         """Evaluate both filters for a single item."""
         text = self.search_input.text().lower().strip()
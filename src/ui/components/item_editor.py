@@ -19,11 +19,13 @@ from PyQt6.QtWidgets import (
 )
 
 from src.core import config
-from src.core.config import MenuProfile, PieSlice, add_to_icon_history
+from src.core.config import MenuProfile, PieSlice
+from src.core.direct_actions import DirectActionTable
+from src.core.trigger_table import parse_trigger
 from src.core.utils import resolve_icon_path
 
 from .custom_widgets import KeySequenceEdit, _render_icon_pixmap
-from .icon_picker import IconPickerWidget
+from .icon_picker import IconImportThread, IconPickerWidget
 from .pie_preview import PiePreviewWidget
 
 
@@ -36,12 +38,15 @@ class ItemEditorDialog(QDialog):
         used_colors: list[str] | None = None,
         trigger_key: str | None = None,
         all_profiles: list[MenuProfile] | None = None,
+        profile: MenuProfile | None = None,
     ):
         super().__init__(parent)
         self.item = item
         self.all_profiles = all_profiles or []
+        self.profile = profile  # Profile the item belongs to (scopes hotkey conflicts)
         self.trigger_key = trigger_key
         self.icon_path = item.icon_path if item else None
+        self._icon_import: IconImportThread | None = None
         self.setWindowTitle("")  # Set in retranslateUi
         self.setModal(True)
         self.resize(500, 260)
@@ -116,6 +121,7 @@ class ItemEditorDialog(QDialog):
         # Mapping of internal type to display name
         self.type_display_map = {
             "key": self.tr("Key Input"),
+            "text": self.tr("Type Text"),
             "url": self.tr("Open URL"),
             "cmd": self.tr("Run Command"),
             "submenu": self.tr("Submenu"),
@@ -151,6 +157,13 @@ class ItemEditorDialog(QDialog):
 
         form_layout.addRow(self.lbl_value, self.value_layout)
 
+        # Optional direct hotkey: runs the action without opening the menu
+        self.hotkey_edit = KeySequenceEdit(item.hotkey if item else "")
+        if hook_control:
+            self.hotkey_edit.recording_toggled.connect(hook_control)
+        self.lbl_hotkey = QLabel()
+        form_layout.addRow(self.lbl_hotkey, self.hotkey_edit)
+
         self.color_btn = QPushButton()
         if item:
             self.current_color = item.color
@@ -255,6 +268,8 @@ class ItemEditorDialog(QDialog):
         self.lbl_label.setText(self.tr("Label:"))
         self.lbl_action_type.setText(self.tr("Action Type:"))
         self.lbl_value.setText(self.tr("Value:"))
+        self.lbl_hotkey.setText(self.tr("Direct Hotkey:"))
+        self.hotkey_edit.setToolTip(self.tr("Optional. Runs this action without opening the menu."))
         self.lbl_color.setText(self.tr("Color:"))
         self.lbl_icon.setText(self.tr("Icon:"))
 
@@ -337,6 +352,9 @@ class ItemEditorDialog(QDialog):
 
         # Update placeholder based on type
         atype = self.action_type_combo.currentData()
+        # Submenus only make sense inside the menu
+        self.lbl_hotkey.setVisible(atype != "submenu")
+        self.hotkey_edit.setVisible(atype != "submenu")
         if atype == "submenu":
             self.key_edit.setVisible(False)
             self.submenu_hint_label.setVisible(True)
@@ -351,6 +369,9 @@ class ItemEditorDialog(QDialog):
             elif atype == "cmd":
                 self.key_edit.setMode("text")
                 self.key_edit.setPlaceholderText(self.tr("notepad.exe or C:\\Path\\To\\App.exe"))
+            elif atype == "text":
+                self.key_edit.setMode("text")
+                self.key_edit.setPlaceholderText(self.tr("Text to type..."))
             else:
                 self.key_edit.setMode("key")
                 self.key_edit.setPlaceholderText(self.tr("Click to record keys..."))
@@ -382,13 +403,35 @@ class ItemEditorDialog(QDialog):
             self.tr("Image Files (*.png *.jpg *.jpeg *.ico *.svg);;All Files (*)"),
         )
         if file_path:
-            # Assetize icon and update current path
-            history = add_to_icon_history(file_path)
-            if history:
-                self.icon_path = history[0]
-            else:
-                self.icon_path = file_path
-            self._update_icon_preview()
+            # Assetize the icon off the GUI thread; the preview updates when it lands
+            thread = IconImportThread([file_path], self, thumbnails=False)
+            thread.finished_import.connect(self._on_icon_imported)
+            self._icon_import = thread
+            thread.start()
+
+    def _on_icon_imported(self, _summary) -> None:
+        thread = self.sender()
+        if isinstance(thread, IconImportThread):
+            self._apply_icon_import(thread)
+
+    def _apply_icon_import(self, thread: IconImportThread) -> None:
+        """Use the imported icon, unless a newer pick superseded ``thread``."""
+        if thread is not self._icon_import or thread.summary is None:
+            return
+        self._icon_import = None
+        results = thread.summary.results
+        self.icon_path = results[0].path if results and results[0].path else thread.paths[0]
+        self._update_icon_preview()
+
+    def _finish_icon_import(self) -> None:
+        """Wait for a pending icon import and apply it."""
+        if self._icon_import is not None:
+            self._icon_import.wait()
+            self._apply_icon_import(self._icon_import)
+
+    def done(self, result: int) -> None:
+        self._finish_icon_import()
+        super().done(result)
 
     def pick_preset_icon(self):
         dialog = IconPickerWidget(self, all_profiles=self.all_profiles)
@@ -430,10 +473,41 @@ class ItemEditorDialog(QDialog):
             if btn := getattr(self, "btn_clear_icon", None):
                 btn.setEnabled(False)
 
+    def _hotkey_conflict(self, hotkey: str) -> str | None:
+        """Why ``hotkey`` cannot be this slice's direct hotkey, or None if it is free.
+
+        Keys are compared by their parsed chords, so differently spelled
+        or ordered keys ("Shift+Ctrl+A", "ctrl+shift+a") still clash.
+        """
+        if self.trigger_key and parse_trigger(hotkey) == parse_trigger(self.trigger_key):
+            return self.tr("Cannot set the same key as the global trigger key.")
+        table = DirectActionTable(self.all_profiles)
+        trigger = table.trigger_for(hotkey)
+        if trigger:
+            return self.tr("'{0}' is already the trigger key of a menu.").format(trigger)
+        clashes = table.clashes(hotkey, self.profile, self.item)
+        if not clashes:
+            return None
+        other = clashes[0]
+        if other.item is None:
+            return self.tr("'{0}' is already the repeat key of profile '{1}'.").format(
+                hotkey, other.profile.name
+            )
+        return self.tr("'{0}' is already the direct hotkey of '{1}' in profile '{2}'.").format(
+            hotkey, other.item.label, other.profile.name
+        )
+
     def save(self):
+        self._finish_icon_import()
         label = self.label_edit.toPlainText().strip()
         action_type = self.action_type_combo.currentData()
-        key = "" if action_type == "submenu" else self.key_edit.text().strip()
+        if action_type == "submenu":
+            key = ""
+        elif action_type == "text":
+            # Snippets are typed verbatim, surrounding spaces included
+            key = self.key_edit.text()
+        else:
+            key = self.key_edit.text().strip()
 
         if not label:
             QMessageBox.warning(self, self.tr("Input Error"), self.tr("Please enter a label."))
@@ -452,6 +526,12 @@ class ItemEditorDialog(QDialog):
             )
             return
 
+        hotkey = "" if action_type == "submenu" else self.hotkey_edit.text().strip()
+        conflict = self._hotkey_conflict(hotkey) if hotkey else None
+        if conflict:
+            QMessageBox.warning(self, self.tr("Input Error"), conflict)
+            return
+
         # Preserve existing submenu_items if editing an existing submenu item
         existing_submenus = []
         if self.item and getattr(self.item, "submenu_items", None) is not None:
@@ -464,5 +544,6 @@ class ItemEditorDialog(QDialog):
             action_type=action_type,
             icon_path=self.icon_path,
             submenu_items=existing_submenus,
+            hotkey=hotkey,
         )
         self.accept()
@@ -18,14 +18,14 @@ from PyQt6.QtGui import (
 )
 
 from src.core.config import COLOR_PRESETS, AppSettings, PieSlice
+from src.core.pie_geometry import (
+    ROOT_START_ANGLE_DEG,
+    fan_span,
+    slice_center_angle,
+)
 from src.core.utils import resolve_icon_path
 from src.ui.components.custom_widgets import _render_icon_pixmap
 
-# ── Angle constants for pie layout ────────────────────────────────────────────
-MAX_FAN_SPAN_DEG = 180.0  # Maximum angular span for a submenu fan (degrees)
-FAN_SPAN_PER_ITEM_DEG = 60.0  # Angular span allocated per submenu child (degrees)
-ROOT_START_ANGLE_DEG = -90.0  # Root layer: first item centered at "Up" (degrees)
-
 
 class PieRenderMixin:
     """Provides methods for rendering a pie menu."""
@@ -55,33 +55,7 @@ class PieRenderMixin:
         Works by traversing from root through submenu levels, computing
         each level's fan span and child center angle.
         """
-        root_items = self._get_root_items()
-        if not root_items or not path or depth < 0 or depth >= len(path):
-            return 0.0
-
-        num_root = len(root_items)
-        if num_root == 0:
-            return 0.0
-        root_span = 360.0 / num_root
-        center = ROOT_START_ANGLE_DEG + (path[0] * root_span)
-
-        if depth == 0:
-            return center
-
-        current_list = getattr(root_items[path[0]], "submenu_items", None) or []
-        for d in range(1, depth + 1):
-            if not current_list or d >= len(path):
-                break
-            n = len(current_list)
-            fan_span = min(MAX_FAN_SPAN_DEG, FAN_SPAN_PER_ITEM_DEG * n)
-            slice_span = fan_span / n
-            idx = path[d]
-            start = center - fan_span / 2
-            center = start + idx * slice_span + slice_span / 2
-            if idx < len(current_list):
-                current_list = getattr(current_list[idx], "submenu_items", None) or []
-
-        return center % 360
+        return slice_center_angle(self._get_root_items(), depth, path)
 
     def _draw_layer(
         self,
@@ -98,11 +72,7 @@ class PieRenderMixin:
 
         num_items = len(items)
         # Root is 360, children fan out up to 180 depending on count
-        angle_span = (
-            360.0 / num_items
-            if depth == 0
-            else min(MAX_FAN_SPAN_DEG, FAN_SPAN_PER_ITEM_DEG * num_items) / num_items
-        )
+        angle_span = 360.0 / num_items if depth == 0 else fan_span(num_items) / num_items
 
         # Calculate start angle for this layer
         if depth == 0:
@@ -15,6 +15,7 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QDialog, QLabel, QPushButton, QTextBrowser, QVBoxLayout
 
 from src.core import config
+from src.core.config_store import ConfigStore
 from src.core.utils import is_dark_mode
 from src.core.version import __version__
 
@@ -26,11 +27,12 @@ class HelpDialog(QDialog):
     in a formatted HTML view with dark theme styling.
     """
 
-    def __init__(self, parent: QDialog | None = None) -> None:
+    def __init__(self, parent: QDialog | None = None, store: ConfigStore | None = None) -> None:
         """Initialize the help dialog.
 
         Args:
             parent: Parent widget (optional)
+            store: The app's config store; the file is loaded if omitted
         """
         super().__init__(parent)
         # Title set in retranslateUi
@@ -41,7 +43,10 @@ class HelpDialog(QDialog):
         self.setLayout(layout)
 
         # Cache config for display
-        self.profiles, self.settings = config.load_config()
+        if store is not None:
+            self.profiles, self.settings = list(store.profiles), store.settings
+        else:
+            self.profiles, self.settings = config.load_config()
 
         # Title
         title = QLabel(f"MixedBerryPie v{__version__}")
@@ -26,7 +26,8 @@ from PyQt6.QtWidgets import QApplication, QWidget
 
 from src.core.config import AppSettings, PieSlice
 from src.core.logger import get_logger
-from src.ui.components.pie_renderer import MAX_FAN_SPAN_DEG, PieRenderMixin
+from src.core.pie_geometry import MAX_FAN_SPAN_DEG
+from src.ui.components.pie_renderer import PieRenderMixin
 
 logger = get_logger(__name__)
 
@@ -6,6 +6,7 @@ from PyQt6.QtCore import (
     QPoint,
     Qt,
     QTimer,
+    pyqtSignal,
 )
 from PyQt6.QtGui import (
     QColor,
@@ -36,11 +37,12 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from src.core import config, i18n
+from src.core import config, config_shards, i18n
 from src.core.config import (
     MenuProfile,
     PieSlice,
 )
+from src.core.config_store import ConfigStore
 from src.core.logger import get_logger
 from src.core.utils import get_resource_path, is_dark_mode
 
@@ -63,17 +65,27 @@ logger = get_logger(__name__)
 class SettingsWindow(QWidget):
     """Main settings window for configuring MixedBerryPie profiles and preferences."""
 
+    # A write-behind save failed (emitted from the config writer's thread)
+    save_failed = pyqtSignal(str)
+
     def __init__(
         self,
         on_save_callback: Any,
         on_suspend_hooks: Any | None = None,
         on_resume_hooks: Any | None = None,
+        store: ConfigStore | None = None,
     ) -> None:
         super().__init__()
         logger.info("Initializing settings window with adaptive theme")
         self.on_save_callback = on_save_callback
         self.on_suspend_hooks = on_suspend_hooks
         self.on_resume_hooks = on_resume_hooks
+        # The app passes its store; a standalone window loads its own
+        self._owns_store = store is None
+        self.store = store if store is not None else ConfigStore()
+        self.save_failed.connect(self._on_save_failed)
+        unsubscribe = self.store.subscribe_save_failures(lambda e: self.save_failed.emit(str(e)))
+        self.destroyed.connect(lambda: unsubscribe())
 
         self.is_dirty = False
         self.settings = config.AppSettings()
@@ -207,6 +219,14 @@ class SettingsWindow(QWidget):
         self.lbl_global_hotkey = QLabel()
         trigger_layout.addRow(self.lbl_global_hotkey, trigger_input_widget)
 
+        # Repeat key: re-runs the last action of this profile without the menu
+        self.repeat_input = KeySequenceEdit()
+        self.repeat_input.textChanged.connect(self.on_repeat_key_changed)
+        self.repeat_input.textChanged.connect(self.set_dirty)
+        self.repeat_input.recording_toggled.connect(self.hook_control)
+        self.lbl_repeat_key = QLabel()
+        trigger_layout.addRow(self.lbl_repeat_key, self.repeat_input)
+
         # Target Apps Container
         self.target_apps_container = QFrame()
         self.target_apps_container.setMinimumHeight(32)
@@ -552,6 +572,19 @@ class SettingsWindow(QWidget):
         self.long_press_spin.value_changed.connect(self.set_dirty)
         trigger_behavior_layout.addRow(self.lbl_long_press, self.long_press_spin)
 
+        self.expert_checkbox = QCheckBox()
+        self.expert_checkbox.setChecked(self.settings.expert_mode)
+        self.expert_checkbox.stateChanged.connect(self.set_dirty)
+        trigger_behavior_layout.addRow(self.expert_checkbox)
+
+        self.lbl_expert_timeout = QLabel()
+        self.expert_timeout_spin = SteppedSlider(
+            steps=[100, 150, 200, 250, 300, 400, 500, 700], suffix="ms"
+        )
+        self.expert_timeout_spin.setValue(self.settings.expert_timeout_ms)
+        self.expert_timeout_spin.value_changed.connect(self.set_dirty)
+        trigger_behavior_layout.addRow(self.lbl_expert_timeout, self.expert_timeout_spin)
+
         self.group_trigger_behavior.setLayout(trigger_behavior_layout)
         behavior_layout.addWidget(self.group_trigger_behavior)
         behavior_layout.addStretch()
@@ -631,6 +664,10 @@ class SettingsWindow(QWidget):
         # Trigger
         self.group_trigger.setTitle(self.tr("Trigger Key"))
         self.lbl_global_hotkey.setText(self.tr("Global Hotkey:"))
+        self.lbl_repeat_key.setText(self.tr("Repeat Last Action:"))
+        self.repeat_input.setToolTip(
+            self.tr("Optional. Runs the last action chosen from this menu again.")
+        )
         self.lbl_target_apps.setText(self.tr("Target Apps:"))
         self.btn_pick_app.setToolTip(self.tr("Pick from running apps"))
 
@@ -695,6 +732,17 @@ class SettingsWindow(QWidget):
         self.long_press_spin.setToolTip(
             self.tr("Wait time before showing the menu (ms). 0 for immediate.")
         )
+        self.expert_checkbox.setText(self.tr("Expert mode: select by flicking the mouse"))
+        self.expert_checkbox.setToolTip(
+            self.tr(
+                "Press the trigger, move the mouse towards an item (turning for submenu items) "
+                "and release quickly to run it without showing the menu."
+            )
+        )
+        self.lbl_expert_timeout.setText(self.tr("Expert Stroke Time:"))
+        self.expert_timeout_spin.setToolTip(
+            self.tr("Releasing the trigger within this time selects by stroke direction.")
+        )
 
         # Logging
         self.group_logging.setTitle(self.tr("Logging"))
@@ -887,7 +935,14 @@ class SettingsWindow(QWidget):
         """Load settings and profiles from configuration."""
         self._is_loading = True
         logger.info("Loading settings data")
-        self.profiles, self.settings = config.load_config()  # Load all profiles and global settings
+        if not self.store.loaded:
+            self.store.load()
+        if self._owns_store:
+            # Nobody else reads a private store, so its objects are edited directly
+            self.profiles, self.settings = list(self.store.profiles), self.store.settings
+        else:
+            # Edit copies; the shared store only sees them on save
+            self.profiles, self.settings = self.store.checkout()
         self.action_delay_spin.setValue(self.settings.action_delay_ms)
         self.overlay_size_spin.setValue(self.settings.overlay_size)
         self.menu_opacity_slider.setValue(self.settings.menu_opacity)
@@ -902,6 +957,8 @@ class SettingsWindow(QWidget):
         self.enable_logging_checkbox.setChecked(self.settings.enable_file_logging)
         self.replay_checkbox.setChecked(self.settings.replay_unselected)
         self.long_press_spin.setValue(self.settings.long_press_delay_ms)
+        self.expert_checkbox.setChecked(self.settings.expert_mode)
+        self.expert_timeout_spin.setValue(self.settings.expert_timeout_ms)
         self.auto_scale_checkbox.setChecked(self.settings.auto_scale_with_menu)
         self._update_scale_visibility()  # Ensure rows are hidden/shown
         self.key_delay_spin.setValue(getattr(self.settings, "key_sequence_delay_ms", 0))
@@ -961,6 +1018,7 @@ class SettingsWindow(QWidget):
 
         p = self.profiles[index]
         self.trigger_input.setText(p.trigger_key)
+        self.repeat_input.setText(p.repeat_key)
 
         # Display list as tags
         targets = p.target_apps if p.target_apps else []
@@ -1135,6 +1193,10 @@ class SettingsWindow(QWidget):
         if self.current_profile_idx != -1:
             self.profiles[self.current_profile_idx].trigger_key = text
 
+    def on_repeat_key_changed(self, text):
+        if self.current_profile_idx != -1:
+            self.profiles[self.current_profile_idx].repeat_key = text
+
     def clear_trigger_key(self):
         self.trigger_input.setText("")
         self.set_dirty()
@@ -1237,6 +1299,7 @@ class SettingsWindow(QWidget):
             used_colors=used_colors,
             trigger_key=current_trigger,
             all_profiles=self.profiles,
+            profile=self.profiles[self.current_profile_idx],
         )
         dialog.exec()
         if dialog.result_item:
@@ -1262,6 +1325,9 @@ class SettingsWindow(QWidget):
 
         # Pass current trigger key for validation
         current_trigger = self.trigger_input.text()
+        profile = (
+            self.profiles[self.current_profile_idx] if self.current_profile_idx != -1 else None
+        )
 
         dialog = ItemEditorDialog(
             self,
@@ -1269,6 +1335,7 @@ class SettingsWindow(QWidget):
             hook_control=self.hook_control,
             trigger_key=current_trigger,
             all_profiles=self.profiles,
+            profile=profile,
         )
         dialog.exec()
         if dialog.result_item:
@@ -1598,9 +1665,15 @@ class SettingsWindow(QWidget):
             # Save strictly to verify current state is valid
             if not self.save_all_silent():
                 return
+            # The save may only be scheduled; the copy must include it
+            if not self.store.flush():
+                raise OSError("設定ファイルの書き込みが完了しませんでした")
 
-            src = config.CONFIG_FILE
-            shutil.copy(src, file_path)
+            if config_shards.is_sharded():
+                # Exports are always one file, like the classic layout
+                config_shards.export_single_file(file_path)
+            else:
+                shutil.copy(config.CONFIG_FILE, file_path)
             QMessageBox.information(
                 self, "エクスポート完了", f"設定を以下にエクスポートしました:\n{file_path}"
             )
@@ -1639,10 +1712,16 @@ class SettingsWindow(QWidget):
                 json.load(f)
                 # Check for bare minimum structure (e.g. valid json)
 
-            # Replace config file
-            shutil.copy(file_path, config.CONFIG_FILE)
+            # Replace config file (after pending writes, which would overwrite it)
+            self.store.flush()
+            if config_shards.is_sharded():
+                if not config_shards.import_single_file(file_path):
+                    raise ValueError("設定をプロファイルごとのファイルに変換できませんでした")
+            else:
+                shutil.copy(file_path, config.CONFIG_FILE)
 
             # Reload
+            self.store.load()
             self.load_data()
             self.on_save_callback()  # Notify app to reload
             QMessageBox.information(self, "インポート完了", "設定を正常にインポートしました。")
@@ -1685,6 +1764,8 @@ class SettingsWindow(QWidget):
         self.settings.enable_file_logging = self.enable_logging_checkbox.isChecked()
         self.settings.replay_unselected = self.replay_checkbox.isChecked()
         self.settings.long_press_delay_ms = self.long_press_spin.value()
+        self.settings.expert_mode = self.expert_checkbox.isChecked()
+        self.settings.expert_timeout_ms = self.expert_timeout_spin.value()
         self.settings.auto_scale_with_menu = self.auto_scale_checkbox.isChecked()
         self.settings.key_sequence_delay_ms = self.key_delay_spin.value()
         self.settings.color_mode = self.combo_color_mode.currentData()
@@ -1710,7 +1791,7 @@ class SettingsWindow(QWidget):
                 return False
             seen_keys[profile.trigger_key] = profile.name
 
-        if config.save_config(self.profiles, self.settings):
+        if self.store.commit(self.profiles, self.settings):
             self.is_dirty = False
             if self.on_save_callback:
                 self.on_save_callback()
@@ -1733,6 +1814,14 @@ class SettingsWindow(QWidget):
             QMessageBox.critical(self, "エラー", "設定の保存に失敗しました。")
             return False
 
+    def _on_save_failed(self, message: str) -> None:
+        """A scheduled save did not reach the disk: keep the changes marked unsaved."""
+        logger.error(f"Settings were not saved: {message}")
+        self.is_dirty = True
+        self.btn_save.setEnabled(True)
+        self.btn_save.setText(self.tr("Save & Apply"))
+        QMessageBox.critical(self, "エラー", f"設定の保存に失敗しました。\n{message}")
+
     def closeEvent(self, event):
         if self.is_dirty:
             reply = QMessageBox.question(
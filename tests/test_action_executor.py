@@ -0,0 +1,104 @@
+"""Tests for the ordered action executor."""
+
+import threading
+import time
+
+import pytest
+
+from src.core.action_executor import DROP_OLDEST, ActionExecutor
+
+
+@pytest.fixture
+def executor():
+    ex = ActionExecutor()
+    yield ex
+    ex.shutdown()
+
+
+def test_runs_in_submission_order_on_one_thread(executor):
+    calls = []
+    threads = set()
+
+    def action(n):
+        threads.add(threading.get_ident())
+        calls.append(("start", n))
+        time.sleep(0.005)
+        calls.append(("end", n))
+
+    for n in range(3):
+        executor.submit(action, n)
+    assert executor.wait_idle(2)
+
+    assert calls == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    assert len(threads) == 1
+    assert executor.stats.executed == 3
+
+
+def test_delay_is_honoured(executor):
+    started = []
+    submitted = time.perf_counter()
+    executor.submit(lambda: started.append(time.perf_counter()), delay_s=0.05)
+    assert executor.wait_idle(2)
+
+    assert started[0] - submitted >= 0.05
+    timing = executor.stats.recent[-1]
+    assert 0 <= timing.late_ms < 20
+
+
+def test_cancel_pending_drops_waiting_actions(executor):
+    ran: list[int] = []
+    executor.submit(ran.append, 1, delay_s=0.2)
+    executor.submit(ran.append, 2, delay_s=0.2)
+    assert executor.cancel_pending() == 2
+    executor.submit(ran.append, 3)
+    assert executor.wait_idle(2)
+
+    assert ran == [3]
+    assert executor.stats.cancelled == 2
+
+
+def test_backlog_drops_newest_by_default():
+    ex = ActionExecutor(max_pending=2)
+    try:
+        assert ex.submit(print, delay_s=10)
+        assert ex.submit(print, delay_s=10)
+        assert not ex.submit(print, delay_s=10)
+        assert ex.pending == 2
+        assert ex.stats.dropped == 1
+    finally:
+        ex.shutdown()
+
+
+def test_backlog_drop_oldest():
+    ran: list[int] = []
+    gate = threading.Event()
+    ex = ActionExecutor(max_pending=2, drop_policy=DROP_OLDEST)
+    try:
+        ex.submit(gate.wait, 2)  # Occupies the worker
+        time.sleep(0.02)
+        for n in range(3):
+            ex.submit(ran.append, n)
+        gate.set()
+        assert ex.wait_idle(2)
+        assert ran == [1, 2]
+    finally:
+        ex.shutdown()
+
+
+def test_failing_action_does_not_stop_worker(executor):
+    ran: list[str] = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    executor.submit(boom)
+    executor.submit(ran.append, "after")
+    assert executor.wait_idle(2)
+
+    assert ran == ["after"]
+    assert executor.stats.failed == 1
+
+
+def test_invalid_drop_policy():
+    with pytest.raises(ValueError):
+        ActionExecutor(drop_policy="random")
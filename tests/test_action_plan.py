@@ -0,0 +1,97 @@
+"""Tests for compiled slice action plans."""
+
+from unittest.mock import patch
+
+from pynput import keyboard as pynput_keyboard
+
+from src.core.action_plan import ActionPlanCache, compile_action
+from src.core.config import MenuProfile, PieSlice
+from src.core.win32_input import KEYEVENTF_KEYUP
+
+
+class FakeUser32:
+    def MapVirtualKeyW(self, vk, _map_type):
+        return vk + 0x100
+
+
+def test_key_action_parses_keys():
+    plan = compile_action("Ctrl+Shift+S", "key")
+    assert plan.valid
+    assert plan.keys == (
+        pynput_keyboard.Key.ctrl,
+        pynput_keyboard.Key.shift,
+        pynput_keyboard.KeyCode.from_char("s"),
+    )
+    assert plan.warnings == ()
+
+
+def test_key_action_preresolves_inputs_with_api():
+    a, b = (pynput_keyboard.KeyCode.from_vk(vk) for vk in (0x41, 0x42))
+    with patch("src.core.action_plan.parse_key", side_effect=[a, b]):
+        plan = compile_action("a+b", "key", api=FakeUser32())
+    assert plan.inputs is not None
+    assert [(e[0].vk, e[0].flags) for e in plan.inputs] == [
+        (0x41, 0),
+        (0x42, 0),
+        (0x42, KEYEVENTF_KEYUP),
+        (0x41, KEYEVENTF_KEYUP),
+    ]
+
+
+def test_key_action_without_api_has_no_inputs():
+    assert compile_action("a", "key").inputs is None
+
+
+def test_unknown_key_name_warns_but_runs():
+    plan = compile_action("ctrl+xyz", "key")
+    assert plan.valid
+    assert plan.keys[1] == pynput_keyboard.KeyCode.from_char("x")
+    assert plan.warnings == ("unknown key 'xyz', sending 'x'",)
+
+
+def test_empty_key_name_is_invalid():
+    assert compile_action("ctrl++", "key").error == "empty key name in 'ctrl++'"
+    assert compile_action("", "key").error == "empty action value"
+
+
+def test_cmd_action_pretokenized():
+    assert compile_action('code "C:/my dir"', "cmd").argv == ("code", "C:/my dir")
+    assert not compile_action('code "C:/my dir', "cmd").valid
+    assert compile_action("   ", "cmd").error == "empty command"
+
+
+def test_text_action_precompiles_chunks():
+    plan = compile_action("Hi!", "text", api=FakeUser32())
+    assert plan.valid
+    assert plan.inputs is not None
+    assert sum(len(chunk) for chunk in plan.inputs) == 6
+    assert compile_action("Hi!", "text").inputs is None
+
+
+def test_url_action():
+    plan = compile_action("https://example.com", "url")
+    assert plan.valid
+    assert plan.value == "https://example.com"
+
+
+def test_cache_rebuild_reports_problems_and_skips_navigation():
+    nested = PieSlice("Bad", 'run "x', "#000", action_type="cmd")
+    items = [
+        PieSlice("Copy", "ctrl+c", "#000"),
+        PieSlice("More", "", "#000", action_type="submenu", submenu_items=[nested]),
+        PieSlice("Back", "", "#000", action_type="back"),
+    ]
+    cache = ActionPlanCache()
+    problems = cache.rebuild([MenuProfile(name="p", trigger_key="tab", items=items)])
+
+    assert len(cache) == 2
+    assert [p.value for p in problems] == ['run "x']
+
+
+def test_cache_get_compiles_once():
+    cache = ActionPlanCache()
+    cache.rebuild([])
+    with patch("src.core.action_plan.compile_action", wraps=compile_action) as mock_compile:
+        first = cache.get("ctrl+v", "key")
+        assert cache.get("ctrl+v", "key") is first
+    assert mock_compile.call_count == 1
@@ -1,6 +1,7 @@
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
+from pynput import keyboard as pynput_keyboard
 
 # qapp fixture is provided by conftest.py
 from src.core.config import AppSettings, MenuProfile, PieSlice
@@ -130,25 +131,53 @@ def test_do_execute_multi_key_shortcut(app_setup):
     """Test that _do_execute correctly parses and sequences multi-key shortcuts (e.g. ctrl+c)"""
     pie_app, _, _ = app_setup
 
-    with (
-        patch("src.app.send_pynput_key_safely") as mock_send,
-        patch("src.app._parse_key", side_effect=lambda x: f"mock_key_{x}"),
-    ):
+    with patch("src.app.send_key_plan") as mock_send:
         pie_app._do_execute("ctrl+c", "key")
 
         # Verify hook manager was asked to release its tracking modifiers
         pie_app.hook_manager.release_all_modifiers.assert_called_once()
 
-        # Verify the press calls happen in forward order (True for is_press)
-        mock_send.assert_has_calls(
-            [
-                call("mock_key_ctrl", True),
-                call("mock_key_c", True),
-                # Verify the release calls happen in reverse order (False for is_press)
-                call("mock_key_c", False),
-                call("mock_key_ctrl", False),
-            ]
-        )
+        # Presses in forward order, releases in reverse, sent as one plan
+        ctrl, c = pynput_keyboard.Key.ctrl, pynput_keyboard.KeyCode.from_char("c")
+        plan = mock_send.call_args[0][0]
+        assert plan == [(ctrl, True), (c, True), (c, False), (ctrl, False)]
+
+
+def test_do_execute_uses_compiled_plan(app_setup):
+    """Actions compiled at load time run from the plan, without re-parsing."""
+    pie_app, _, _ = app_setup
+    pie_app.action_plans.get("a", "key")
+
+    with (
+        patch("src.core.action_plan.parse_key") as mock_parse,
+        patch("src.app.send_key_plan") as mock_send,
+    ):
+        pie_app._do_execute("a", "key")
+
+    mock_parse.assert_not_called()
+    mock_send.assert_called_once()
+
+
+def test_do_execute_cmd_uses_pretokenized_argv(app_setup):
+    pie_app, _, _ = app_setup
+    with patch("src.app.subprocess.Popen") as mock_popen:
+        pie_app._do_execute('notepad "my file.txt"', "cmd")
+    mock_popen.assert_called_once_with(("notepad", "my file.txt"), shell=False)
+
+
+def test_do_execute_text_releases_modifiers_and_types(app_setup):
+    pie_app, _, _ = app_setup
+    with patch("src.app.send_text") as mock_type:
+        pie_app._do_execute("Hello, 世界", "text")
+    pie_app.hook_manager.release_all_modifiers.assert_called_once()
+    mock_type.assert_called_once_with("Hello, 世界")
+
+
+def test_do_execute_skips_invalid_action(app_setup):
+    pie_app, _, _ = app_setup
+    with patch("src.app.subprocess.Popen") as mock_popen:
+        pie_app._do_execute('notepad "unterminated', "cmd")
+    mock_popen.assert_not_called()
 
 
 def test_on_slice_exited_push(app_setup):
@@ -225,3 +254,173 @@ def test_on_slice_exited_pop(app_setup):
 
     # _do_show_overlay should be called with parent_items
     pie_app.key_signal.do_show_signal.emit.assert_called_once_with(parent_items)
+
+
+def test_action_selected_is_queued_on_executor(app_setup):
+    """Selected actions go through the ordered executor with the configured delay"""
+    pie_app, _, test_settings = app_setup
+    test_settings.action_delay_ms = 40
+    pie_app.action_executor = MagicMock()
+
+    pie_app._on_action_selected("ctrl+c", "key")
+
+    pie_app.action_executor.submit.assert_called_once_with(
+        pie_app._do_execute, "ctrl+c", "key", delay_s=0.04, label="ctrl+c"
+    )
+
+
+def test_preresolution_off_keeps_action_executor(app_setup):
+    pie_app, _, test_settings = app_setup
+    test_settings.preresolve_profiles = False
+    with patch.object(pie_app.action_executor, "shutdown") as mock_shutdown:
+        pie_app.apply_profile_preresolution()
+    mock_shutdown.assert_not_called()
+
+
+@pytest.fixture
+def direct_app(app_setup):
+    """App whose profile has a direct hotkey on its slice and a repeat key."""
+    pie_app, test_profile, test_settings = app_setup
+    test_profile.items[0].hotkey = "f8"
+    test_profile.repeat_key = "f7"
+    pie_app.compile_actions()
+    pie_app.action_executor = MagicMock()
+    return pie_app, test_profile, test_settings
+
+
+def test_direct_keys_are_registered_with_the_hook(direct_app):
+    pie_app, _, _ = direct_app
+    assert pie_app.hook_trigger_keys() == ["tab", "f7", "f8"]
+    assert set(pie_app.sequence_timeouts()) == {"tab", "f7", "f8"}
+
+
+def test_direct_hotkey_runs_without_overlay(direct_app):
+    pie_app, _, test_settings = direct_app
+    test_settings.action_delay_ms = 40
+
+    pie_app.on_trigger_press("f8")
+
+    pie_app.key_signal.do_show_signal.emit.assert_not_called()
+    pie_app.action_executor.submit.assert_called_once_with(
+        pie_app._do_execute, "a", "key", delay_s=0.0, label="hotkey:a"
+    )
+    # The release is swallowed, not replayed
+    assert pie_app.on_trigger_release("f8") is True
+
+
+def test_repeat_key_reruns_last_menu_action(direct_app):
+    pie_app, test_profile, _ = direct_app
+
+    # Nothing chosen yet: the key is handed back (replayed)
+    pie_app.on_trigger_press("f7")
+    assert pie_app.on_trigger_release("f7") is False
+    pie_app.action_executor.submit.assert_not_called()
+
+    pie_app._do_show_overlay_dynamic(test_profile)
+    pie_app._on_action_selected("ctrl+z", "key")
+    pie_app.action_executor.submit.reset_mock()
+
+    pie_app.on_trigger_press("f7")
+    pie_app.action_executor.submit.assert_called_once_with(
+        pie_app._do_execute, "ctrl+z", "key", delay_s=0.0, label="repeat:ctrl+z"
+    )
+    assert pie_app.on_trigger_release("f7") is True
+
+
+def test_direct_hotkey_scoped_to_target_apps(direct_app):
+    pie_app, test_profile, _ = direct_app
+    test_profile.target_apps = ["code.exe"]
+    pie_app.compile_actions()
+
+    pie_app.window_info = MagicMock()
+    pie_app.window_info.get_active_window_info.return_value = ("notepad.exe", "notes")
+    pie_app.on_trigger_press("f8")
+    pie_app.action_executor.submit.assert_not_called()
+    assert pie_app.on_trigger_release("f8") is False
+
+    pie_app.window_info.get_active_window_info.return_value = ("code.exe", "main.py")
+    pie_app.on_trigger_press("f8")
+    pie_app.action_executor.submit.assert_called_once()
+    assert pie_app.on_trigger_release("f8") is True
+
+
+def test_direct_hotkeys_of_profile_without_trigger(direct_app):
+    pie_app, test_profile, _ = direct_app
+    hotkeys_only = MenuProfile(
+        name="Hotkeys", trigger_key="", items=[PieSlice("Copy", "ctrl+c", "#fff", hotkey="f9")]
+    )
+    with patch.object(
+        type(pie_app), "profiles", PropertyMock(return_value=(test_profile, hotkeys_only))
+    ):
+        pie_app.compile_actions()
+
+    pie_app.on_trigger_press("f9")
+    pie_app.action_executor.submit.assert_called_once_with(
+        pie_app._do_execute, "ctrl+c", "key", delay_s=0.0, label="hotkey:ctrl+c"
+    )
+    assert pie_app.on_trigger_release("f9") is True
+
+
+@pytest.fixture
+def expert_app(app_setup):
+    """App in expert mode with a scripted, unthreaded cursor."""
+    from src.core.marking_menu import MarkingMenu
+
+    pie_app, test_profile, test_settings = app_setup
+    test_profile.items = [
+        PieSlice("Up", "ctrl+c", "#ffffff"),
+        PieSlice("Down", "ctrl+v", "#ffffff"),
+    ]
+    test_settings.expert_mode = True
+    test_settings.expert_timeout_ms = 250
+    cursor = MagicMock(return_value=(100, 100))
+    pie_app.marking_menu = MarkingMenu(cursor, threaded=False)
+    pie_app.action_executor = MagicMock()
+    return pie_app, test_profile, cursor
+
+
+def test_expert_press_waits_for_stroke_timeout(expert_app):
+    pie_app, test_profile, _ = expert_app
+
+    pie_app.on_trigger_press("tab")
+
+    assert pie_app.pending_profile is test_profile
+    pie_app.key_signal.timer_start_signal.emit.assert_called_once_with(250)
+    pie_app.key_signal.do_show_signal.emit.assert_not_called()
+
+
+def test_quick_stroke_runs_action_without_overlay(expert_app):
+    pie_app, _, cursor = expert_app
+
+    pie_app.on_trigger_press("tab")
+    cursor.return_value = (100, 160)  # Flick down
+
+    assert pie_app.on_trigger_release("tab") is True
+    pie_app.action_executor.submit.assert_called_once_with(
+        pie_app._do_execute, "ctrl+v", "key", delay_s=0.0, label="stroke:ctrl+v"
+    )
+    pie_app.overlay.show_menu.assert_not_called()
+    assert pie_app.marking_menu.stats.selections == 1
+
+
+def test_quick_tap_without_stroke_keeps_tap_behavior(expert_app):
+    pie_app, _, _ = expert_app
+    pie_app.settings.replay_unselected = True
+
+    pie_app.on_trigger_press("tab")
+
+    assert pie_app.on_trigger_release("tab") is False
+    pie_app.action_executor.submit.assert_not_called()
+    assert pie_app.marking_menu.stats.unrecognized == 1
+
+
+def test_hesitation_falls_back_to_menu(expert_app):
+    pie_app, test_profile, _ = expert_app
+
+    pie_app.on_trigger_press("tab")
+    pie_app._on_long_press_timeout()
+
+    assert pie_app.pending_profile is None
+    assert pie_app.is_menu_visible
+    assert pie_app.menu_profile is test_profile
+    assert pie_app.marking_menu.stats.menu_fallbacks == 1
@@ -1,6 +1,14 @@
 import json
+from unittest.mock import MagicMock
 
-from src.core.config import AppSettings, MenuProfile, PieSlice, load_config, save_config
+from src.core.config import (
+    AppSettings,
+    MenuProfile,
+    PieSlice,
+    freeze_config,
+    load_config,
+    save_config,
+)
 
 
 def test_load_config_missing_file(tmp_path, monkeypatch):
@@ -184,3 +192,163 @@ def test_config_recursive_submenus(tmp_path, monkeypatch):
     loaded_deep = loaded_child.submenu_items[0]
     assert loaded_deep.label == "Deep"
     assert len(loaded_deep.submenu_items) == 0
+
+
+def test_config_direct_keys_roundtrip(tmp_path, monkeypatch):
+    """Slice hotkeys (also in submenus) and profile repeat keys survive save/load"""
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(tmp_path / "menu_config.json"))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+
+    child = PieSlice(label="Child", key="ctrl+v", color="#000000", hotkey="f9")
+    parent = PieSlice(
+        label="More", key="", color="#000000", action_type="submenu", submenu_items=[child]
+    )
+    profile = MenuProfile(
+        name="P",
+        trigger_key="tab",
+        items=[PieSlice(label="Copy", key="ctrl+c", color="#000000", hotkey="f8"), parent],
+        repeat_key="f7",
+    )
+    save_config([profile], AppSettings())
+
+    profiles, _ = load_config()
+    assert profiles[0].repeat_key == "f7"
+    assert profiles[0].items[0].hotkey == "f8"
+    assert profiles[0].items[1].submenu_items[0].hotkey == "f9"
+
+
+def _snapshot_setup(tmp_path, monkeypatch):
+    config_file = tmp_path / "menu_config.json"
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(config_file))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+    child = PieSlice(label="Deep", key="ctrl+v", color="#000000", hotkey="f9")
+    parent = PieSlice(
+        label="More", key="", color="#000000", action_type="submenu", submenu_items=[child]
+    )
+    profile = MenuProfile(
+        name="P", trigger_key="tab", items=[parent], target_apps=["app.exe"], repeat_key="f7"
+    )
+    settings = AppSettings(action_delay_ms=40, custom_presets={"Mine": ["#000000"]})
+    save_config([profile], settings)
+    return config_file, profile, settings
+
+
+def test_load_config_uses_snapshot_without_parsing_json(tmp_path, monkeypatch):
+    """A snapshot matching the JSON is loaded without JSON parsing"""
+    _, profile, settings = _snapshot_setup(tmp_path, monkeypatch)
+    assert (tmp_path / "menu_config.snapshot").exists()
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("JSON was parsed")
+
+    monkeypatch.setattr("src.core.config.json.loads", fail)
+    profiles, loaded_settings = load_config()
+
+    assert profiles == [profile]
+    assert loaded_settings == settings
+    # Every load returns fresh objects
+    assert load_config()[0][0].items[0] is not profiles[0].items[0]
+
+
+def test_snapshot_ignored_when_json_changes(tmp_path, monkeypatch):
+    """Editing the JSON by hand invalidates the snapshot"""
+    config_file, _, _ = _snapshot_setup(tmp_path, monkeypatch)
+    data = json.loads(config_file.read_text(encoding="utf-8"))
+    data["profiles"][0]["name"] = "Edited"
+    config_file.write_text(json.dumps(data), encoding="utf-8")
+
+    profiles, _ = load_config()
+    assert profiles[0].name == "Edited"
+
+    # The snapshot was rebuilt for the edited file
+    monkeypatch.setattr("src.core.config.json.loads", MagicMock(side_effect=AssertionError))
+    assert load_config()[0][0].name == "Edited"
+
+
+def test_corrupt_or_foreign_snapshot_falls_back_to_json(tmp_path, monkeypatch):
+    """Unreadable snapshots and snapshots of another schema are ignored"""
+    _, profile, _ = _snapshot_setup(tmp_path, monkeypatch)
+    snapshot = tmp_path / "menu_config.snapshot"
+
+    snapshot.write_bytes(b"\x00garbage")
+    assert load_config()[0] == [profile]
+
+    monkeypatch.setattr("src.core.config._SNAPSHOT_SCHEMA", ("other",))
+    assert load_config()[0] == [profile]
+
+
+def _compact_setup(tmp_path, monkeypatch):
+    config_file = tmp_path / "menu_config.json"
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(config_file))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+    deep = PieSlice(label="Deep", key="ctrl+v", color="#FF0000", icon_path="icons/a.svg")
+    nested = PieSlice(
+        label="Nested", key="", color="#00FF00", action_type="submenu", submenu_items=[deep]
+    )
+    items = [
+        PieSlice(label="A", key="a", color="#FF0000", icon_path="icons/a.svg", hotkey="f8"),
+        PieSlice(label="", key="", color="#FF0000", icon_path=""),
+        PieSlice(
+            label="More", key="", color="#00FF00", action_type="submenu", submenu_items=[nested]
+        ),
+        PieSlice(label="Back", key="", color="#000000", action_type="back"),
+    ]
+    profiles = [
+        MenuProfile(name="P", trigger_key="tab", items=items, target_apps=["app.exe"]),
+        MenuProfile(name="Q", trigger_key="f1", items=[], sequence_timeout_ms=500, repeat_key="f7"),
+    ]
+    settings = AppSettings(compact_config=True, custom_presets={"Mine": ["#000000"]})
+    save_config(profiles, settings)
+    (tmp_path / "menu_config.snapshot").unlink()
+    return config_file, profiles, settings
+
+
+def test_compact_config_omits_defaults_and_interns_tables(tmp_path, monkeypatch):
+    """The compact encoding stores defaults implicitly and colors/icons once"""
+    config_file, _, _ = _compact_setup(tmp_path, monkeypatch)
+    data = json.loads(config_file.read_text(encoding="utf-8"))
+
+    assert data["encoding"] == "compact"
+    assert data["colors"] == ["#FF0000", "#00FF00", "#000000"]
+    assert data["icons"] == ["icons/a.svg", ""]
+    first, empty = data["profiles"][0]["items"][:2]
+    assert first == {"label": "A", "key": "a", "color": 0, "icon_path": 0, "hotkey": "f8"}
+    assert empty == {"label": "", "key": "", "color": 0, "icon_path": 1}
+    assert "target_apps" not in data["profiles"][1]
+
+
+def test_compact_config_roundtrip_is_exact(tmp_path, monkeypatch):
+    """Loading a compact file rebuilds the saved model, and saving it again is byte-identical"""
+    config_file, profiles, settings = _compact_setup(tmp_path, monkeypatch)
+    saved = config_file.read_bytes()
+
+    loaded_profiles, loaded_settings = load_config()
+    assert loaded_profiles == profiles
+    assert loaded_settings == settings
+
+    save_config(loaded_profiles, loaded_settings)
+    assert config_file.read_bytes() == saved
+
+
+def test_nested_submenus_load_from_json_and_snapshot(tmp_path, monkeypatch):
+    """Every level of a submenu is loaded, from JSON and from the snapshot"""
+    _, profiles, settings = _compact_setup(tmp_path, monkeypatch)
+
+    for _ in range(2):  # JSON (no snapshot yet), then the snapshot written by the first load
+        loaded, _ = load_config()
+        assert loaded[0].items[0].submenu_items == []
+        nested = loaded[0].items[2].submenu_items[0]
+        assert nested.submenu_items == profiles[0].items[2].submenu_items[0].submenu_items
+        assert freeze_config(loaded, settings) == freeze_config(profiles, settings)
+
+
+def test_loaded_slices_are_slotted_and_share_strings(tmp_path, monkeypatch):
+    """Slices carry no __dict__ and repeated colors/icon paths are one object"""
+    _compact_setup(tmp_path, monkeypatch)
+    for _ in range(2):  # JSON, then snapshot
+        items = load_config()[0][0].items
+        assert not hasattr(items[0], "__dict__")
+        assert items[0].color is items[1].color
+        deep = items[2].submenu_items[0].submenu_items[0]
+        assert deep.icon_path is items[0].icon_path
+        assert deep.action_type is items[0].action_type
@@ -1,128 +1,17 @@
 """Tests for config.py helper functions extracted during refactoring."""
 
-import hashlib
 import os
 
 import pytest
 
 from src.core.config import (
-    _copy_with_collision_handling,
-    _find_duplicate_in_dir,
-    _hash_file,
     _icon_path_to_abs,
-    _normalize_icon_path,
     _validate_setting_type,
     add_to_icon_history,
+    normalize_icon_path,
 )
 
-# ── _hash_file ───────────────────────────────────────────────────────────────
-
-
-def test_hash_file_known_content(tmp_path):
-    f = tmp_path / "test.bin"
-    f.write_bytes(b"hello world")
-    expected = hashlib.sha256(b"hello world").hexdigest()
-    assert _hash_file(str(f)) == expected
-
-
-def test_hash_file_empty_file(tmp_path):
-    f = tmp_path / "empty.bin"
-    f.write_bytes(b"")
-    expected = hashlib.sha256(b"").hexdigest()
-    assert _hash_file(str(f)) == expected
-
-
-def test_hash_file_large_file(tmp_path):
-    """File larger than _HASH_CHUNK_SIZE (65536) to verify chunked reading."""
-    data = b"x" * 100_000
-    f = tmp_path / "large.bin"
-    f.write_bytes(data)
-    expected = hashlib.sha256(data).hexdigest()
-    assert _hash_file(str(f)) == expected
-
-
-# ── _find_duplicate_in_dir ───────────────────────────────────────────────────
-
-
-def test_find_duplicate_match(tmp_path):
-    content = b"duplicate content"
-    (tmp_path / "existing.png").write_bytes(content)
-    src_hash = hashlib.sha256(content).hexdigest()
-    result = _find_duplicate_in_dir(str(tmp_path), src_hash)
-    assert result is not None
-    assert os.path.basename(result) == "existing.png"
-
-
-def test_find_duplicate_no_match(tmp_path):
-    (tmp_path / "other.png").write_bytes(b"different content")
-    src_hash = hashlib.sha256(b"not matching").hexdigest()
-    assert _find_duplicate_in_dir(str(tmp_path), src_hash) is None
-
-
-def test_find_duplicate_empty_dir(tmp_path):
-    assert _find_duplicate_in_dir(str(tmp_path), "abc123") is None
-
-
-def test_find_duplicate_ignores_subdirs(tmp_path):
-    subdir = tmp_path / "subdir"
-    subdir.mkdir()
-    src_hash = hashlib.sha256(b"anything").hexdigest()
-    assert _find_duplicate_in_dir(str(tmp_path), src_hash) is None
-
-
-# ── _copy_with_collision_handling ────────────────────────────────────────────
-
-
-def test_copy_no_collision(tmp_path):
-    src = tmp_path / "source" / "icon.png"
-    src.parent.mkdir()
-    src.write_bytes(b"icon data")
-    dest_dir = tmp_path / "dest"
-    dest_dir.mkdir()
-
-    result = _copy_with_collision_handling(str(src), str(dest_dir))
-    assert os.path.basename(result) == "icon.png"
-    assert os.path.exists(result)
-    with open(result, "rb") as f:
-        assert f.read() == b"icon data"
-
-
-def test_copy_name_collision(tmp_path):
-    src = tmp_path / "source" / "icon.png"
-    src.parent.mkdir()
-    src.write_bytes(b"new data")
-    dest_dir = tmp_path / "dest"
-    dest_dir.mkdir()
-    (dest_dir / "icon.png").write_bytes(b"existing data")
-
-    result = _copy_with_collision_handling(str(src), str(dest_dir))
-    assert os.path.basename(result) == "icon_1.png"
-    assert os.path.exists(result)
-
-
-def test_copy_multiple_collisions(tmp_path):
-    src = tmp_path / "source" / "icon.png"
-    src.parent.mkdir()
-    src.write_bytes(b"newest data")
-    dest_dir = tmp_path / "dest"
-    dest_dir.mkdir()
-    (dest_dir / "icon.png").write_bytes(b"v1")
-    (dest_dir / "icon_1.png").write_bytes(b"v2")
-
-    result = _copy_with_collision_handling(str(src), str(dest_dir))
-    assert os.path.basename(result) == "icon_2.png"
-
-
-def test_copy_src_in_dest_renames(tmp_path):
-    """When src is already in dest_dir, existing file triggers collision rename."""
-    f = tmp_path / "icon.png"
-    f.write_bytes(b"data")
-    result = _copy_with_collision_handling(str(f), str(tmp_path))
-    assert os.path.basename(result) == "icon_1.png"
-    assert os.path.exists(result)
-
-
-# ── _normalize_icon_path ────────────────────────────────────────────────────
+# ── normalize_icon_path ─────────────────────────────────────────────────────
 
 
 def test_normalize_inside_user_icons(tmp_path, monkeypatch):
@@ -133,7 +22,7 @@ def test_normalize_inside_user_icons(tmp_path, monkeypatch):
     monkeypatch.setattr("src.core.config.CONFIG_DIR", config_dir)
 
     abs_path = os.path.join(user_icons_dir, "test.png")
-    result = _normalize_icon_path(abs_path)
+    result = normalize_icon_path(abs_path)
     assert result == "user_icons/test.png"
 
 
@@ -143,7 +32,7 @@ def test_normalize_outside_user_icons(tmp_path, monkeypatch):
     monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path / "config"))
 
     external_path = str(tmp_path / "external" / "icon.png")
-    assert _normalize_icon_path(external_path) == external_path
+    assert normalize_icon_path(external_path) == external_path
 
 
 def test_normalize_backslash_conversion(tmp_path, monkeypatch):
@@ -154,7 +43,7 @@ def test_normalize_backslash_conversion(tmp_path, monkeypatch):
     monkeypatch.setattr("src.core.config.CONFIG_DIR", config_dir)
 
     abs_path = os.path.join(user_icons_dir, "sub", "test.png")
-    result = _normalize_icon_path(abs_path)
+    result = normalize_icon_path(abs_path)
     assert "\\" not in result  # All forward slashes on Windows
 
 
@@ -0,0 +1,180 @@
+"""Tests for the sharded (manifest + one file per profile) config layout."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core import config, config_shards
+from src.core.config import AppSettings, MenuProfile, PieSlice, load_config, save_config
+
+
+def _profiles() -> list[MenuProfile]:
+    submenu = PieSlice("Sub", "", "#000000", "submenu", submenu_items=[PieSlice("C", "c", "#111")])
+    return [
+        MenuProfile(name="Default", trigger_key="ctrl+space", items=[PieSlice("A", "a", "#fff")]),
+        MenuProfile(name="Photo Edit", trigger_key="f1", items=[submenu], target_apps=["ps.exe"]),
+        MenuProfile(name="photo edit", trigger_key="f2", items=[], repeat_key="f3"),
+    ]
+
+
+@pytest.fixture
+def sharded(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(tmp_path / "menu_config.json"))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+    config_shards._reset_cache()
+    save_config(_profiles(), AppSettings(menu_opacity=70))
+    assert config_shards.migrate_to_shards()
+    yield tmp_path
+    config_shards._reset_cache()
+
+
+def _shards(tmp_path) -> set[str]:
+    return set(os.listdir(tmp_path / "profiles")) - {".cache"}
+
+
+def test_shard_file_names_are_unique_and_safe():
+    assert config_shards.shard_file_names(["Photo Edit", "photo edit", "a/b", "", "日本語"]) == [
+        "photo_edit.json",
+        "photo_edit-2.json",
+        "a_b.json",
+        "profile.json",
+        "日本語.json",
+    ]
+
+
+def test_migration_writes_manifest_and_one_file_per_profile(sharded):
+    assert not os.path.exists(config.CONFIG_FILE)
+    assert _shards(sharded) == {"default.json", "photo_edit.json", "photo_edit-2.json"}
+    manifest = json.loads((sharded / "menu_config.manifest.json").read_text(encoding="utf-8"))
+    assert [e["name"] for e in manifest["profiles"]] == ["Default", "Photo Edit", "photo edit"]
+    assert manifest["settings"]["menu_opacity"] == 70
+
+    profiles, settings = load_config()
+    assert profiles == _profiles()
+    assert settings.menu_opacity == 70
+
+
+def test_round_trip_to_single_file_is_lossless(sharded):
+    expected = config._config_json(config.freeze_config(_profiles(), AppSettings(menu_opacity=70)))
+
+    assert config_shards.migrate_to_single_file()
+
+    assert not config_shards.is_sharded()
+    assert not os.path.exists(sharded / "profiles")
+    with open(config.CONFIG_FILE, encoding="utf-8") as f:
+        assert f.read() == expected
+
+
+def test_save_writes_only_changed_shards(sharded):
+    profiles, settings = load_config()
+    before = {name: os.stat(sharded / "profiles" / name).st_mtime_ns for name in _shards(sharded)}
+
+    profiles[1].items[0].submenu_items[0].key = "x"
+    with patch("src.core.config._atomic_write", wraps=config._atomic_write) as mock_write:
+        save_config(profiles, settings)
+    written = {os.path.basename(c.args[0]) for c in mock_write.call_args_list}
+
+    assert written == {"photo_edit.json", "menu_config.manifest.json", ".cache"}
+    assert os.stat(sharded / "profiles" / "default.json").st_mtime_ns == before["default.json"]
+    assert load_config()[0][1].items[0].submenu_items[0].key == "x"
+
+
+def test_load_parses_only_changed_shards(sharded):
+    load_config()
+    shard = sharded / "profiles" / "default.json"
+    data = json.loads(shard.read_text(encoding="utf-8"))
+    data["trigger_key"] = "f9"
+    shard.write_text(json.dumps(data), encoding="utf-8")
+
+    with patch("src.core.config._parse_profile", wraps=config._parse_profile) as mock_parse:
+        profiles, _ = load_config()
+
+    # Edited behind the manifest's back: still used, and the only shard parsed
+    assert mock_parse.call_count == 1
+    assert profiles[0].trigger_key == "f9"
+
+
+def test_shard_cache_survives_restart(sharded):
+    load_config()
+    config_shards._reset_cache()  # A new process: only profiles/.cache is left
+
+    with patch("src.core.config._parse_profile") as mock_parse:
+        profiles, _ = load_config()
+    mock_parse.assert_not_called()
+    assert profiles == _profiles()
+
+
+def test_removed_profile_deletes_its_shard(sharded):
+    profiles, settings = load_config()
+    save_config(profiles[:1], settings)
+    assert _shards(sharded) == {"default.json"}
+
+
+def test_source_key_follows_shard_edits(sharded):
+    key = config.source_key()
+    assert key is not None
+    shard = sharded / "profiles" / "default.json"
+    shard.write_text(shard.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    assert config.source_key() != key
+
+
+def test_corrupted_shard_is_skipped_and_backed_up(sharded):
+    (sharded / "profiles" / "default.json").write_text("{broken", encoding="utf-8")
+    config_shards._reset_cache()
+
+    profiles, _ = load_config()
+
+    assert [p.name for p in profiles] == ["Photo Edit", "photo edit"]
+    assert os.path.exists(sharded / "profiles" / "default.json.backup")
+
+
+def test_manifest_entry_without_hash_is_loaded_and_hashed_on_save(sharded):
+    manifest_path = sharded / "menu_config.manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    sha = manifest["profiles"][0].pop("sha256")
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    profiles, settings = load_config()
+    assert profiles == _profiles()
+    assert not os.path.exists(sharded / "profiles" / "default.json.backup")
+
+    save_config(profiles, settings)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert manifest["profiles"][0]["sha256"] == sha
+    assert _shards(sharded) == {"default.json", "photo_edit.json", "photo_edit-2.json"}
+
+
+def test_manifest_entry_without_file_is_skipped(sharded):
+    manifest_path = sharded / "menu_config.manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["profiles"][1]["file"] = None
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    profiles, _ = load_config()
+    assert [p.name for p in profiles] == ["Default", "photo edit"]
+
+
+def test_failed_load_does_not_delete_shards_on_save(sharded):
+    with patch("src.core.config._parse_settings", side_effect=ValueError("bad settings")):
+        profiles, settings = load_config()
+    assert profiles == config.DEFAULT_PROFILES
+
+    save_config(profiles, settings)
+    assert {"default.json", "photo_edit.json", "photo_edit-2.json"} <= _shards(sharded)
+
+
+def test_export_and_import_single_file(sharded, tmp_path):
+    exported = tmp_path / "export.json"
+    config_shards.export_single_file(str(exported))
+    data = json.loads(exported.read_text(encoding="utf-8"))
+    assert data["schema_version"] == 5 and len(data["profiles"]) == 3
+
+    data["profiles"] = data["profiles"][:1]
+    exported.write_text(json.dumps(data), encoding="utf-8")
+    assert config_shards.import_single_file(str(exported))
+
+    assert config_shards.is_sharded()
+    assert [p.name for p in load_config()[0]] == ["Default"]
+    assert _shards(sharded) == {"default.json"}
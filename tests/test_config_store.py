@@ -0,0 +1,146 @@
+"""Tests for ConfigStore: loading, editing, diffing and change notifications."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.config import AppSettings, MenuProfile, PieSlice, save_config
+from src.core.config_store import (
+    PROFILE_ADDED,
+    PROFILE_CHANGED,
+    PROFILE_REMOVED,
+    PROFILES_REORDERED,
+    SETTING_CHANGED,
+    ConfigChange,
+    ConfigStore,
+    diff_profiles,
+    diff_settings,
+)
+
+
+def _profile(name: str, trigger: str = "tab", key: str = "a") -> MenuProfile:
+    return MenuProfile(name=name, trigger_key=trigger, items=[PieSlice(name, key, "#ffffff")])
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(tmp_path / "menu_config.json"))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+    save_config([_profile("A"), _profile("B", "f1")], AppSettings(menu_opacity=80))
+    store = ConfigStore()
+    store.load()
+    return store
+
+
+def test_diff_profiles():
+    a, b, c = _profile("A"), _profile("B"), _profile("C")
+    changed_b = _profile("B", key="z")
+
+    changes = diff_profiles([a, b], [changed_b, c])
+
+    assert [(ch.kind, ch.name) for ch in changes] == [
+        (PROFILE_CHANGED, "B"),
+        (PROFILE_ADDED, "C"),
+        (PROFILE_REMOVED, "A"),
+    ]
+    assert diff_profiles([a, b], [b, a]) == [ConfigChange(PROFILES_REORDERED)]
+    assert diff_profiles([a, b], [_profile("A"), _profile("B")]) == []
+
+
+def test_diff_settings():
+    changes = diff_settings(AppSettings(), AppSettings(menu_opacity=10, expert_mode=True))
+    assert {(c.name, c.old, c.new) for c in changes} == {
+        ("menu_opacity", 60, 10),
+        ("expert_mode", False, True),
+    }
+    assert all(c.kind == SETTING_CHANGED for c in changes)
+
+
+def test_profiles_view_is_read_only(store):
+    assert isinstance(store.profiles, tuple)
+    assert [p.name for p in store.profiles] == ["A", "B"]
+
+
+def test_commit_publishes_changes_and_keeps_editor_copy_private(store):
+    listener = MagicMock()
+    store.subscribe(listener)
+    settings = store.settings
+
+    profiles, edited = store.checkout()
+    profiles[0].trigger_key = "f2"
+    edited.menu_opacity = 50
+    assert store.profiles[0].trigger_key == "tab"
+
+    assert store.commit(profiles, edited) is True
+
+    changes = listener.call_args[0][0]
+    assert {(c.kind, c.name) for c in changes} == {
+        (PROFILE_CHANGED, "A"),
+        (SETTING_CHANGED, "menu_opacity"),
+    }
+    # Settings keep their identity; later editor changes do not leak in
+    assert store.settings is settings
+    assert settings.menu_opacity == 50
+    profiles[0].trigger_key = "f3"
+    assert store.profiles[0].trigger_key == "f2"
+
+
+def test_unchanged_profiles_keep_identity(store):
+    a, b = store.profiles
+    profiles, settings = store.checkout()
+    profiles[1].trigger_key = "f5"
+
+    store.commit(profiles, settings)
+
+    assert store.profiles[0] is a
+    assert store.profiles[1] is not b
+
+
+def test_failed_commit_changes_nothing(store):
+    listener = MagicMock()
+    store.subscribe(listener)
+    profiles, settings = store.checkout()
+    profiles.pop()
+
+    with patch("src.core.config.save_config", return_value=False):
+        assert store.commit(profiles, settings) is False
+
+    assert len(store.profiles) == 2
+    listener.assert_not_called()
+
+
+def test_update_settings(store):
+    listener = MagicMock()
+    unsubscribe = store.subscribe(listener)
+
+    assert store.update_settings(first_run=False, menu_opacity=80) is True
+    assert listener.call_args[0][0] == [ConfigChange(SETTING_CHANGED, "first_run", True, False)]
+
+    with pytest.raises(ValueError):
+        store.update_settings(no_such_setting=1)
+
+    unsubscribe()
+    store.update_settings(menu_opacity=20)
+    assert listener.call_count == 1
+
+
+def test_refresh_only_reloads_changed_file(store):
+    with patch("src.core.config.load_config") as mock_load:
+        assert store.refresh() == []
+        mock_load.assert_not_called()
+
+    # Written behind the store's back
+    save_config([_profile("A")], AppSettings(menu_opacity=80))
+    changes = store.refresh()
+    assert [(c.kind, c.name) for c in changes] == [(PROFILE_REMOVED, "B")]
+
+
+def test_failing_listener_does_not_stop_others(store):
+    broken = MagicMock(side_effect=RuntimeError("boom"))
+    listener = MagicMock()
+    store.subscribe(broken)
+    store.subscribe(listener)
+
+    store.update_settings(menu_opacity=10)
+
+    listener.assert_called_once()
@@ -0,0 +1,189 @@
+"""Tests for the debounced background config writer."""
+
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core import config
+from src.core.config import AppSettings, MenuProfile, PieSlice, freeze_config, write_config
+from src.core.config_store import ConfigStore
+from src.core.config_writer import ConfigWriter
+
+
+def _profiles(key: str = "a") -> list[MenuProfile]:
+    return [MenuProfile(name="P", trigger_key="tab", items=[PieSlice("Item", key, "#ffffff")])]
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.config.CONFIG_FILE", str(tmp_path / "menu_config.json"))
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def writer(config_dir):
+    writer = ConfigWriter(debounce_s=0.05, max_delay_s=1.0)
+    yield writer
+    writer.shutdown()
+
+
+def test_write_config_is_atomic_and_timed(config_dir):
+    timing = write_config(freeze_config(_profiles(), AppSettings(menu_opacity=33)))
+
+    # No temporary files are left behind
+    assert set(os.listdir(config_dir)) == {"menu_config.json", "menu_config.snapshot"}
+    assert timing.size == os.path.getsize(config.CONFIG_FILE)
+    assert timing.serialize_ms >= 0 and timing.fsync_ms >= 0
+    profiles, settings = config.load_config()
+    assert profiles[0].items[0].key == "a"
+    assert settings.menu_opacity == 33
+
+
+def test_write_config_keeps_old_file_on_failure(config_dir):
+    write_config(freeze_config(_profiles("old")))
+    with (
+        patch("src.core.config.os.fsync", side_effect=OSError("disk full")),
+        pytest.raises(OSError),
+    ):
+        write_config(freeze_config(_profiles("new")))
+
+    assert set(os.listdir(config_dir)) == {"menu_config.json", "menu_config.snapshot"}
+    with open(config.CONFIG_FILE, encoding="utf-8") as f:
+        assert json.load(f)["profiles"][0]["items"][0]["key"] == "old"
+
+
+def test_frozen_config_does_not_follow_later_edits():
+    profiles = _profiles()
+    frozen = freeze_config(profiles)
+    profiles[0].items[0].key = "changed"
+    profiles[0].target_apps.append("app.exe")
+
+    assert frozen.profiles[0] == freeze_config(_profiles()).profiles[0]
+
+
+def test_burst_of_saves_is_coalesced(writer):
+    for i in range(5):
+        writer.schedule(_profiles(f"k{i}"), AppSettings())
+
+    assert writer.flush()
+    assert (writer.stats.requests, writer.stats.writes, writer.stats.coalesced) == (5, 1, 4)
+    profiles, _ = config.load_config()
+    assert profiles[0].items[0].key == "k4"
+
+
+def test_save_waits_for_debounce(config_dir):
+    writer = ConfigWriter(debounce_s=10.0, max_delay_s=10.0)
+    writer.schedule(_profiles(), AppSettings())
+
+    assert writer.pending
+    assert not os.path.exists(config.CONFIG_FILE)
+    # flush() does not wait for the debounce
+    assert writer.flush(timeout=2.0)
+    assert os.path.exists(config.CONFIG_FILE)
+    writer.shutdown()
+
+
+def test_failed_write_is_reported_and_retried(writer):
+    errors: list[Exception] = []
+    writer.on_failed = errors.append
+    with patch("src.core.config.write_config", side_effect=OSError("read-only")):
+        writer.schedule(_profiles(), AppSettings())
+        assert writer.flush() is False
+    assert writer.stats.failed == 1
+    assert [str(e) for e in errors] == ["read-only"]
+    # The failed state is kept for a retry and not reported as saved
+    assert writer.pending
+    assert isinstance(writer.last_error, OSError)
+
+    assert writer.flush()
+    assert writer.stats.writes == 1
+    assert writer.last_error is None
+    assert "failed=1" in writer.stats.summary()
+    profiles, _ = config.load_config()
+    assert profiles[0].items[0].key == "a"
+
+
+def test_newer_state_supersedes_failed_write(writer):
+    with patch("src.core.config.write_config", side_effect=OSError("read-only")):
+        writer.schedule(_profiles("old"), AppSettings())
+        assert writer.flush() is False
+
+    writer.schedule(_profiles("new"), AppSettings())
+    assert writer.flush()
+    profiles, _ = config.load_config()
+    assert profiles[0].items[0].key == "new"
+
+
+def test_shutdown_reports_unsaved_state(config_dir):
+    writer = ConfigWriter(debounce_s=10.0)
+    with patch("src.core.config.write_config", side_effect=OSError("read-only")):
+        writer.schedule(_profiles(), AppSettings())
+        assert writer.shutdown(timeout=1.0) is False
+
+
+def test_shutdown_writes_pending_state(config_dir):
+    writer = ConfigWriter(debounce_s=10.0)
+    writer.schedule(_profiles("last"), AppSettings())
+    writer.shutdown()
+
+    assert not writer.pending
+    profiles, _ = config.load_config()
+    assert profiles[0].items[0].key == "last"
+
+
+def test_writes_happen_off_the_calling_thread(writer):
+    threads = []
+
+    def record(frozen):
+        threads.append(threading.current_thread())
+        return write_config(frozen)
+
+    with patch("src.core.config.write_config", side_effect=record):
+        writer.schedule(_profiles(), AppSettings())
+        writer.flush()
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_store_with_writer_saves_behind(writer):
+    config.save_config(_profiles(), AppSettings())
+    store = ConfigStore(writer=writer)
+    store.load()
+
+    profiles, settings = store.checkout()
+    profiles[0].trigger_key = "f5"
+    assert store.commit(profiles, settings) is True
+    assert store.update_settings(menu_opacity=12) is True
+    # Applied and published at once; on disk after the flush
+    assert store.profiles[0].trigger_key == "f5"
+    assert store.refresh() == []
+    assert store.flush()
+
+    on_disk, on_disk_settings = config.load_config()
+    assert (on_disk[0].trigger_key, on_disk_settings.menu_opacity) == ("f5", 12)
+    # The store knows the file it wrote, so there is nothing to reload
+    with patch("src.core.config.load_config") as mock_load:
+        assert store.refresh() == []
+        mock_load.assert_not_called()
+
+
+def test_store_reports_failed_write_behind_save(writer):
+    config.save_config(_profiles(), AppSettings())
+    store = ConfigStore(writer=writer)
+    store.load()
+    errors: list[Exception] = []
+    unsubscribe = store.subscribe_save_failures(errors.append)
+
+    profiles, settings = store.checkout()
+    profiles[0].trigger_key = "f5"
+    with patch("src.core.config.write_config", side_effect=OSError("disk full")):
+        assert store.commit(profiles, settings) is True
+        assert store.flush() is False
+    assert [str(e) for e in errors] == ["disk full"]
+
+    unsubscribe()
+    assert store.flush()
+    assert config.load_config()[0][0].trigger_key == "f5"
@@ -0,0 +1,43 @@
+"""Tests for the shared debounced write-behind worker."""
+
+import pytest
+
+from src.core.debounced_writer import DebouncedWriter
+
+
+def test_max_delay_bounds_continuous_saves():
+    now = [0.0]
+    written: list[int] = []
+    writer = DebouncedWriter(
+        written.append, name="Test", debounce_s=1.0, max_delay_s=2.0, clock=lambda: now[0]
+    )
+    assert writer.schedule(1) is False
+    now[0] = 1.5
+    assert writer.schedule(2) is True  # Superseded the first state
+    assert writer._due == pytest.approx(2.0)
+    writer.shutdown()
+
+
+def test_burst_writes_latest_state_once():
+    written: list[int] = []
+    writer = DebouncedWriter(written.append, name="Test", debounce_s=60)
+    for state in range(3):
+        writer.schedule(state)
+    assert writer.pending and written == []
+    assert writer.flush()
+    assert written == [2]
+    assert writer.shutdown()
+
+
+def test_failed_state_is_dropped_without_retry():
+    def fail(state):
+        raise OSError("read-only")
+
+    errors: list[Exception] = []
+    writer = DebouncedWriter(fail, name="Test", debounce_s=60)
+    writer.on_failed = errors.append
+    writer.schedule(1)
+    assert writer.flush() is False
+    assert [str(e) for e in errors] == ["read-only"]
+    assert not writer.pending
+    assert writer.shutdown() is False
@@ -0,0 +1,107 @@
+"""Tests for direct slice hotkeys and profile repeat keys."""
+
+from src.core.config import MenuProfile, PieSlice
+from src.core.direct_actions import DirectActionTable
+
+
+def item(key, hotkey="", action_type="key", children=None):
+    return PieSlice(
+        label=key or "sub",
+        key=key,
+        color="#000",
+        action_type=action_type,
+        hotkey=hotkey,
+        submenu_items=children or [],
+    )
+
+
+def test_collects_hotkeys_and_repeat_keys_in_order():
+    nested = item("ctrl+v", hotkey="f9")
+    profile = MenuProfile(
+        name="p",
+        trigger_key="tab",
+        items=[item("ctrl+c", hotkey="f8"), item("", action_type="submenu", children=[nested])],
+        repeat_key="f7",
+    )
+    table = DirectActionTable([profile])
+
+    assert table.keys == ["f7", "f8", "f9"]
+    assert "f8" in table
+    repeat = table.resolve("f7", None, None)
+    assert repeat is not None and repeat.is_repeat
+    binding = table.resolve("f9", None, None)
+    assert binding is not None and binding.item is nested
+
+
+def test_menu_triggers_take_precedence():
+    a = MenuProfile(name="a", trigger_key="tab", items=[item("x", hotkey="f1")])
+    b = MenuProfile(name="b", trigger_key="f1", items=[], repeat_key="tab")
+    table = DirectActionTable([a, b])
+    assert table.keys == []
+
+
+def test_navigation_slices_cannot_have_hotkeys():
+    profile = MenuProfile(
+        name="p", trigger_key="tab", items=[item("", hotkey="f2", action_type="back")]
+    )
+    assert DirectActionTable([profile]).keys == []
+
+
+def test_resolve_prefers_profile_targeting_foreground_app():
+    glob = MenuProfile(name="global", trigger_key="tab", items=[item("ctrl+r", hotkey="f5")])
+    code = MenuProfile(
+        name="code", trigger_key="tab", items=[item("ctrl+b", hotkey="f5")], target_apps=["Code"]
+    )
+    table = DirectActionTable([glob, code])
+
+    for exe, title, expected in (
+        ("code.exe", "main.py", code),
+        ("electron.exe", "main.py - Code", code),
+        ("notepad.exe", "notes", glob),
+        (None, None, glob),
+    ):
+        binding = table.resolve("f5", exe, title)
+        assert binding is not None and binding.profile is expected
+    assert table.resolve("f6", "code.exe", None) is None
+
+
+def test_profile_without_trigger_key_has_working_hotkeys():
+    code = MenuProfile(
+        name="code", trigger_key="", items=[item("ctrl+b", hotkey="f5")], target_apps=["code.exe"]
+    )
+    table = DirectActionTable([code])
+
+    binding = table.resolve("f5", "code.exe", "main.py")
+    assert binding is not None and binding.profile is code
+    assert table.resolve("f5", "notepad.exe", "notes") is None
+
+
+def test_keys_are_compared_by_chord():
+    a = MenuProfile(
+        name="a", trigger_key="Ctrl+Shift+A", items=[item("x", hotkey="shift+control+a")]
+    )
+    b = MenuProfile(
+        name="b",
+        trigger_key="tab",
+        items=[item("y", hotkey="Win+E"), item("z", hotkey="windows+e")],
+        repeat_key="Esc",
+    )
+    table = DirectActionTable([a, b])
+
+    assert table.keys == ["Esc", "Win+E"]  # The first spelling is registered
+    assert "escape" in table
+    assert table.trigger_for("shift+ctrl+a") == "Ctrl+Shift+A"
+    assert [bd.item.label for bd in table.clashes("WIN+e", b) if bd.item] == ["y", "z"]
+
+
+def test_clashes_are_scoped_to_target_apps():
+    first = item("ctrl+b", hotkey="f5")
+    code = MenuProfile(name="code", trigger_key="tab", items=[first], target_apps=["Code.exe"])
+    other = MenuProfile(name="other", trigger_key="tab", items=[], target_apps=["code.exe"])
+    glob = MenuProfile(name="global", trigger_key="tab", items=[])
+    table = DirectActionTable([code, other, glob])
+
+    assert [bd.item for bd in table.clashes("F5", other)] == [first]
+    assert table.clashes("f5", code, first) == []  # Its own binding
+    assert table.clashes("f5", glob) == []
+    assert len(table.clashes("f5", None)) == 1
@@ -0,0 +1,102 @@
+"""Tests for focus-driven profile pre-resolution."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.config import AppSettings, MenuProfile
+from src.core.focus_tracker import ManualFocusEventSource, ProfilePreResolver
+from src.core.profile_resolver import ProfileResolver
+from src.core.window_info import FakeWindowSystem, WindowInfoProvider
+
+
+def profile(name, trigger="tab", targets=None):
+    return MenuProfile(name=name, trigger_key=trigger, items=[], target_apps=targets or [])
+
+
+GLOBAL_TAB = profile("global")
+CODE_TAB = profile("code", targets=["code.exe"])
+BROWSER_F1 = profile("docs", trigger="f1", targets=["- docs"])
+
+
+@pytest.fixture
+def env():
+    system = FakeWindowSystem()
+    source = ManualFocusEventSource()
+    resolver_box = [ProfileResolver([GLOBAL_TAB, CODE_TAB, BROWSER_F1])]
+    pre = ProfilePreResolver(source, WindowInfoProvider(system), lambda: resolver_box[0])
+    return system, source, resolver_box, pre
+
+
+def test_focus_changes_drive_resolution(env):
+    system, source, _, pre = env
+    system.focus(1, 10, "main.py", "code.exe")
+    pre.start()
+    assert pre.lookup("tab") == (True, CODE_TAB)
+    assert pre.lookup("f1") == (True, None)
+
+    system.focus(2, 20, "Python - Docs", "firefox.exe")
+    source.emit()
+    assert pre.lookup("tab") == (True, GLOBAL_TAB)
+    assert pre.lookup("f1") == (True, BROWSER_F1)
+    assert pre.refresh_count == 2
+
+
+def test_title_change_event_bypasses_title_cache(env):
+    system, source, _, pre = env
+    system.focus(2, 20, "Start page", "firefox.exe")
+    pre.start()
+    assert pre.lookup("f1") == (True, None)
+
+    system.windows[2] = (20, "Python - Docs")
+    source.emit()
+    assert pre.lookup("f1") == (True, BROWSER_F1)
+
+
+def test_missed_focus_change_falls_back(env):
+    system, _, _, pre = env
+    system.focus(1, 10, "main.py", "code.exe")
+    pre.start()
+    system.focus(2, 20, "x", "notepad.exe")  # no event delivered yet
+    assert pre.lookup("tab") == (False, None)
+    assert pre.misses == 1
+
+
+def test_config_reload_invalidates_snapshot(env):
+    system, _, resolver_box, pre = env
+    system.focus(1, 10, "main.py", "code.exe")
+    pre.start()
+    resolver_box[0] = ProfileResolver([GLOBAL_TAB])
+    assert pre.lookup("tab") == (False, None)
+    pre.refresh()
+    assert pre.lookup("tab") == (True, GLOBAL_TAB)
+
+
+def test_stop_detaches_from_source(env):
+    system, source, _, pre = env
+    system.focus(1, 10, "main.py", "code.exe")
+    pre.start()
+    pre.stop()
+    source.emit()
+    assert pre.refresh_count == 1
+    assert pre.lookup("tab") == (False, None)
+
+
+def test_app_uses_preresolved_profile(qapp):
+    with (
+        patch("src.app.QSystemTrayIcon"),
+        patch("src.app.HookManager"),
+        patch("src.core.config.load_config", return_value=([GLOBAL_TAB], AppSettings())),
+    ):
+        from src.app import MixedBerryPieApp
+
+        app = MixedBerryPieApp()
+    app.key_signal = MagicMock()
+    app.window_info = MagicMock()
+    app.preresolver = MagicMock()
+    app.preresolver.lookup.return_value = (True, CODE_TAB)
+
+    app.on_trigger_press("tab")
+
+    app.window_info.get_active_window_info.assert_not_called()
+    app.key_signal.do_show_signal.emit.assert_called_once_with(CODE_TAB)
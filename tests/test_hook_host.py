@@ -0,0 +1,117 @@
+"""Tests for the out-of-process hook host and its parent-side manager."""
+
+import multiprocessing
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import hook_host
+from src.core.hook_host import HookHost, measure_event_latency
+from src.core.hook_manager import OutOfProcessHookManager
+from src.core.trigger_table import WM_KEYDOWN, WM_KEYUP
+
+VK_SPACE = 0x20
+VK_CTRL_L = 0xA2
+
+
+def key(vk: int):
+    return SimpleNamespace(vkCode=vk)
+
+
+def drain(conn) -> list:
+    messages = []
+    while conn.poll(0.1):
+        messages.append(conn.recv())
+    return messages
+
+
+@pytest.fixture
+def host_pair():
+    parent, child = multiprocessing.Pipe()
+    host = HookHost(child)
+    host.table.set_triggers(["ctrl+space"])
+    yield host, parent
+    parent.close()
+    child.close()
+
+
+class TestHookHost:
+    def test_trigger_events_and_modifiers_are_sent(self, host_pair):
+        host, parent = host_pair
+        assert host.filter_event(WM_KEYDOWN, key(VK_CTRL_L)) is True
+        assert host.filter_event(WM_KEYDOWN, key(VK_SPACE)) is False
+        assert host.filter_event(WM_KEYUP, key(VK_SPACE)) is False
+        assert host.filter_event(WM_KEYUP, key(VK_CTRL_L)) is True
+
+        assert drain(parent) == [
+            (hook_host.MSG_MODIFIERS, ["ctrl"]),
+            (hook_host.MSG_TRIGGER, ("press", "ctrl+space", "space")),
+            (hook_host.MSG_TRIGGER, ("release", "ctrl+space", "space")),
+            (hook_host.MSG_MODIFIERS, []),
+        ]
+
+    def test_repeated_modifier_press_sends_once(self, host_pair):
+        host, parent = host_pair
+        host.filter_event(WM_KEYDOWN, key(VK_CTRL_L))
+        host.filter_event(WM_KEYDOWN, key(VK_CTRL_L))
+        assert drain(parent) == [(hook_host.MSG_MODIFIERS, ["ctrl"])]
+
+    def test_commands(self, host_pair):
+        host, _ = host_pair
+        assert host.handle_command((hook_host.CMD_TRIGGERS, ["tab"], {})) is True
+        assert host.table.trigger_keys == ["tab"]
+        host.handle_command((hook_host.CMD_RECORDING_MODE, True))
+        assert host.table.recording_mode is True
+        assert host.handle_command((hook_host.CMD_STOP,)) is False
+
+
+def test_measure_event_latency_follows_schedule():
+    now = [0]
+    sleep = MagicMock(side_effect=lambda s: now.__setitem__(0, now[0] + int(s * 1e9)))
+    filter_func = MagicMock(return_value=True)
+
+    latencies = measure_event_latency(filter_func, 3, 0.001, clock=lambda: now[0], sleep=sleep)
+
+    assert latencies == [0, 0, 0]
+    assert sleep.call_count == 3
+    assert [c.args[0] for c in filter_func.call_args_list] == [WM_KEYDOWN, WM_KEYUP, WM_KEYDOWN]
+
+
+class TestOutOfProcessHookManager:
+    def make_manager(self):
+        return OutOfProcessHookManager(
+            on_trigger_press=MagicMock(), on_trigger_release=MagicMock(return_value=True)
+        )
+
+    def test_host_messages_update_state_and_dispatch(self):
+        mgr = self.make_manager()
+        mgr._handle_host_message((hook_host.MSG_MODIFIERS, ["alt", "ctrl"]))
+        assert mgr._held_modifiers == {"alt", "ctrl"}
+
+        with patch("threading.Thread") as thread_cls:
+            mgr._handle_host_message((hook_host.MSG_TRIGGER, ("press", "ctrl+space", "space")))
+        thread_cls.assert_called_once()
+        assert thread_cls.call_args.kwargs["target"] == mgr._handle_press
+        assert thread_cls.call_args.kwargs["args"][0] == "ctrl+space"
+
+        mgr._handle_host_message((hook_host.MSG_READY,))
+        assert mgr.wait_ready(0)
+
+    def test_update_triggers_without_host_starts_it(self):
+        mgr = self.make_manager()
+        with patch.object(mgr, "start_hook") as start_hook:
+            mgr.update_triggers(["tab"])
+        start_hook.assert_called_once_with(["tab"], None)
+
+    def test_spawned_host_round_trip(self):
+        mgr = self.make_manager()
+        mgr.start_hook(["ctrl+space"])
+        try:
+            assert mgr.wait_ready(timeout=30)
+            assert mgr.is_host_alive()
+            latencies = mgr.run_benchmark(4, 0.001, timeout=30)
+            assert latencies is not None and len(latencies) == 4
+        finally:
+            mgr.stop_hook()
+        assert not mgr.is_host_alive()
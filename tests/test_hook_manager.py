@@ -2,6 +2,8 @@
 
 import os
 import sys
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,7 +11,7 @@ from pynput import keyboard as pynput_keyboard
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.core.hook_manager import HookManager, _parse_key
+from src.core.hook_manager import HookManager
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -99,6 +101,58 @@ def test_stop_hook_clears_state():
     assert mgr._held_modifiers == set()
 
 
+# ── update_triggers / recording mode ──────────────────────────────────────────
+
+
+def test_update_triggers_swaps_config_without_restarting_listener():
+    mgr, _, _ = make_manager()
+    with patch.object(mgr, "_start_listener"):
+        mgr.start_hook(["ctrl+space"])
+    listener = MagicMock()
+    listener.is_alive.return_value = True
+    mgr._listener = listener
+    mgr._held_modifiers.add("ctrl")
+
+    with patch.object(mgr, "start_hook") as mock_start:
+        mgr.update_triggers(["f12", "shift+tab"])
+
+    mock_start.assert_not_called()
+    listener.stop.assert_not_called()
+    assert mgr._listener is listener
+    assert set(mgr._trigger_configs) == {"f12", "tab"}
+    assert mgr._held_modifiers == {"ctrl"}  # state preserved
+
+
+def test_update_triggers_starts_hook_when_not_running():
+    mgr, _, _ = make_manager()
+    with patch.object(mgr, "start_hook") as mock_start:
+        mgr.update_triggers(["f12"])
+    mock_start.assert_called_once_with(["f12"], None)
+
+
+def test_recording_mode_passes_trigger_through():
+    mgr, _, _ = make_manager()
+    with patch.object(mgr, "_start_listener"):
+        mgr.start_hook(["ctrl+space"])
+    mgr._held_modifiers = {"ctrl"}
+
+    mgr.set_recording_mode(True)
+    assert mgr._win32_event_filter(WM_KEYDOWN, make_data(VK_SPACE)) is True
+    assert mgr._active_suppressions == {}
+
+    mgr.set_recording_mode(False)
+    with patch("threading.Thread"):
+        assert mgr._win32_event_filter(WM_KEYDOWN, make_data(VK_SPACE)) is False
+
+
+def test_recording_mode_still_suppresses_inflight_release():
+    mgr, _, _ = make_manager(release_return=True)
+    mgr._active_suppressions["space"] = "ctrl+space"
+    mgr.set_recording_mode(True)
+    with patch("threading.Thread"):
+        assert mgr._win32_event_filter(WM_KEYUP, make_data(VK_SPACE)) is False
+
+
 # ── win32_event_filter: modifier tracking ─────────────────────────────────────
 
 
@@ -200,31 +254,55 @@ def test_handle_release_not_consumed_replays():
     mock_replay.assert_called_once_with("space")
 
 
-# ── release_all_modifiers ─────────────────────────────────────────────────────
+def test_release_waits_for_its_press_callback():
+    """On a quick tap the release callback never runs before the press callback."""
+    mgr, press_cb, release_cb = make_manager(release_return=True)
+    press_started, unblock = threading.Event(), threading.Event()
+    order: list[tuple[str, str]] = []
 
+    def slow_press(trigger):
+        press_started.set()
+        unblock.wait(5)
+        order.append(("press", trigger))
 
-def test_release_all_modifiers():
-    mgr, _, _ = make_manager()
-    mgr._held_modifiers = {"ctrl", "shift"}
-    with patch("src.core.hook_manager.send_pynput_key_safely") as mock_release:
-        mgr.release_all_modifiers()
-    assert mock_release.call_count == 2
+    def release(trigger):
+        order.append(("release", trigger))
+        return True
 
+    press_cb.side_effect = slow_press
+    release_cb.side_effect = release
 
-# ── _parse_key ────────────────────────────────────────────────────────────────
+    mgr._dispatch_trigger_event(("press", "f8", "f8"))
+    assert press_started.wait(5)
+    mgr._dispatch_trigger_event(("release", "f8", "f8"))
+    time.sleep(0.05)
+    assert order == []
 
+    unblock.set()
+    deadline = time.monotonic() + 5
+    while len(order) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert order == [("press", "f8"), ("release", "f8")]
 
-def test_parse_key_space():
-    assert _parse_key("space") == pynput_keyboard.Key.space
 
+# ── release_all_modifiers ─────────────────────────────────────────────────────
 
-def test_parse_key_char():
-    key = _parse_key("p")
-    assert hasattr(key, "char") and key.char == "p"
+
+def test_release_all_modifiers():
+    mgr, _, _ = make_manager()
+    mgr._held_modifiers = {"ctrl", "shift"}
+    with patch("src.core.hook_manager.send_key_plan") as mock_release:
+        mgr.release_all_modifiers()
+    mock_release.assert_called_once_with(
+        [(pynput_keyboard.Key.ctrl, False), (pynput_keyboard.Key.shift, False)]
+    )
 
 
-def test_parse_key_f5():
-    assert _parse_key("f5") == pynput_keyboard.Key.f5
+def test_release_all_modifiers_nothing_held():
+    mgr, _, _ = make_manager()
+    with patch("src.core.hook_manager.send_key_plan") as mock_release:
+        mgr.release_all_modifiers()
+    mock_release.assert_not_called()
 
 
 # ── multi-profile same primary ────────────────────────────────────────────────
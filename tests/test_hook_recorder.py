@@ -0,0 +1,219 @@
+"""Tests for raw hook event recording and replay."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.hook_manager import HookManager
+from src.core.hook_recorder import (
+    VERDICT_PASS,
+    VERDICT_SUPPRESS,
+    VERDICT_UNFILTERED,
+    HookEvent,
+    HookEventRecorder,
+    RecordedClock,
+    TriggerUpdate,
+    read_recording,
+    replay_events,
+)
+from src.core.trigger_table import TriggerTable
+
+WM_KEYDOWN = 0x100
+WM_KEYUP = 0x101
+VK_SPACE = 0x20
+VK_CTRL_L = 0xA2
+
+
+def make_data(vk: int, scan: int = 0, flags: int = 0, ev_time: int = 0):
+    return SimpleNamespace(vkCode=vk, scanCode=scan, flags=flags, time=ev_time)
+
+
+def make_manager(triggers):
+    mgr = HookManager(on_trigger_press=MagicMock(), on_trigger_release=MagicMock(return_value=True))
+    mgr._table.set_triggers(triggers)
+    return mgr
+
+
+def record_session(mgr, path, stream):
+    """Run events through the filter while recording, like the native hook does."""
+    mgr.start_recording(str(path))
+    with patch("threading.Thread"):
+        for msg, vk, injected in stream:
+            data = make_data(vk)
+            verdict = None if injected else mgr._win32_event_filter(msg, data)
+            mgr._on_hook_event(msg, data, injected, verdict, 1000)
+    mgr.stop_recording()
+
+
+CTRL_SPACE_STREAM = [
+    (WM_KEYDOWN, VK_CTRL_L, False),
+    (WM_KEYDOWN, VK_SPACE, False),
+    (WM_KEYDOWN, 0x41, True),  # injected 'a'
+    (WM_KEYUP, VK_SPACE, False),
+    (WM_KEYUP, VK_CTRL_L, False),
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "rec.mbph"
+    ticks = iter(range(0, 10_000, 100))
+    rec = HookEventRecorder(str(path), metadata={"triggers": ["tab"]}, clock=lambda: next(ticks))
+    rec.record(WM_KEYDOWN, make_data(0x09, scan=15, flags=0x80, ev_time=42), False, False, 500)
+    rec.record(WM_KEYUP, make_data(0x41), True, None, 0)
+    rec.close()
+
+    metadata, events = read_recording(str(path))
+    assert metadata == {"triggers": ["tab"], "trigger_updates": []}
+    assert len(events) == 2
+    first, second = events
+    assert (first.vk, first.scan_code, first.flags, first.time) == (0x09, 15, 0x80, 42)
+    assert first.verdict == VERDICT_SUPPRESS
+    assert first.latency_ns == 500
+    assert first.t_ns == 100
+    assert second.injected is True
+    assert second.verdict == VERDICT_UNFILTERED
+
+
+def test_record_after_close_is_ignored(tmp_path):
+    rec = HookEventRecorder(str(tmp_path / "rec.mbph"))
+    rec.close()
+    rec.record(WM_KEYDOWN, make_data(VK_SPACE), False, True, 0)
+    assert rec.count == 0
+
+
+def test_read_rejects_foreign_file(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a recording")
+    with pytest.raises(ValueError):
+        read_recording(str(path))
+
+
+def test_manager_records_filter_verdicts(tmp_path):
+    path = tmp_path / "session.mbph"
+    mgr = make_manager(["ctrl+space"])
+    record_session(mgr, path, CTRL_SPACE_STREAM)
+    assert not mgr.is_recording
+
+    metadata, events = read_recording(str(path))
+    assert metadata["triggers"] == ["ctrl+space"]
+    assert [e.verdict for e in events] == [
+        VERDICT_PASS,
+        VERDICT_SUPPRESS,
+        VERDICT_UNFILTERED,
+        VERDICT_SUPPRESS,
+        VERDICT_PASS,
+    ]
+
+
+def test_replay_matches_recording(tmp_path):
+    path = tmp_path / "session.mbph"
+    record_session(make_manager(["ctrl+space"]), path, CTRL_SPACE_STREAM)
+    _, events = read_recording(str(path))
+
+    with patch("threading.Thread"):
+        report = replay_events(make_manager(["ctrl+space"])._win32_event_filter, events)
+
+    assert report.total_events == 5
+    assert report.filtered_events == 4  # injected event skipped
+    assert report.mismatches == []
+    assert len(report.latencies_ns) == 4
+
+
+def test_replay_reports_verdict_diffs(tmp_path):
+    path = tmp_path / "session.mbph"
+    record_session(make_manager(["ctrl+space"]), path, CTRL_SPACE_STREAM)
+    _, events = read_recording(str(path))
+
+    # Replaying against a configuration without the trigger passes everything
+    report = replay_events(make_manager([])._win32_event_filter, events)
+
+    assert [idx for idx, _, _ in report.mismatches] == [1, 3]
+    assert all(actual == VERDICT_PASS for _, _, actual in report.mismatches)
+
+
+def test_replay_realtime_sleeps_until_recorded_offset():
+    events = [
+        HookEvent(0, WM_KEYDOWN, VK_SPACE, 0, 0, 0, False, VERDICT_PASS, 0),
+        HookEvent(5_000_000, WM_KEYUP, VK_SPACE, 0, 0, 0, False, VERDICT_PASS, 0),
+    ]
+    sleep = MagicMock()
+    replay_events(lambda _m, _d: True, events, realtime=True, clock=lambda: 0, sleep=sleep)
+    sleep.assert_called_once_with(0.005)
+
+
+def test_header_stores_sequence_timeouts(tmp_path):
+    path = tmp_path / "session.mbph"
+    mgr = make_manager([])
+    mgr._table.set_triggers(["ctrl+k, p"], {"ctrl+k, p": 0.25})
+    record_session(mgr, path, [])
+
+    metadata, _ = read_recording(str(path))
+    assert metadata["triggers"] == ["ctrl+k, p"]
+    assert metadata["sequence_timeouts"] == {"ctrl+k, p": 0.25}
+
+
+def test_trigger_update_is_recorded_in_stream(tmp_path):
+    path = tmp_path / "session.mbph"
+    mgr = make_manager(["ctrl+space"])
+    mgr._listener = MagicMock()
+    mgr._listener.is_alive.return_value = True
+    mgr.start_recording(str(path))
+    with patch("threading.Thread"):
+        for msg, vk, injected in CTRL_SPACE_STREAM[:2]:
+            mgr._on_hook_event(msg, make_data(vk), injected, True, 0)
+        mgr.update_triggers(["tab"], {"tab": 0.5})
+        mgr._on_hook_event(WM_KEYUP, make_data(VK_SPACE), False, True, 0)
+    mgr.stop_recording()
+
+    metadata, events = read_recording(str(path))
+    assert len(events) == 3
+    (update,) = metadata["trigger_updates"]
+    assert update.event_index == 2
+    assert update.config == {"triggers": ["tab"], "sequence_timeouts": {"tab": 0.5}}
+
+
+def test_replay_applies_trigger_updates_in_order():
+    events = [
+        HookEvent(0, WM_KEYDOWN, VK_SPACE, 0, 0, 0, False, VERDICT_PASS, 0),
+        HookEvent(1, WM_KEYUP, VK_SPACE, 0, 0, 0, False, VERDICT_PASS, 0),
+        HookEvent(2, WM_KEYDOWN, VK_SPACE, 0, 0, 0, False, VERDICT_SUPPRESS, 0),
+    ]
+    update = TriggerUpdate(1, 2, {"triggers": ["space"]})
+    mgr = make_manager([])
+
+    with patch("threading.Thread"):
+        report = replay_events(
+            mgr._win32_event_filter,
+            events,
+            trigger_updates=[update],
+            apply_triggers=lambda config: mgr._table.set_triggers(config["triggers"]),
+        )
+
+    assert report.mismatches == []
+
+
+def test_replay_honors_recorded_sequence_timeout(tmp_path):
+    vk_k, vk_p = 0x4B, 0x50
+    path = tmp_path / "rec.mbph"
+    ticks = iter([0, 0, 100_000_000, 2_000_000_000, 2_100_000_000])
+    config = {"triggers": ["k, p"], "sequence_timeouts": {"k, p": 0.5}}
+    rec = HookEventRecorder(str(path), metadata=config, clock=lambda: next(ticks))
+    rec.record(WM_KEYDOWN, make_data(vk_k), False, False, 0)  # Sequence prefix
+    rec.record(WM_KEYUP, make_data(vk_k), False, False, 0)
+    rec.record(WM_KEYDOWN, make_data(vk_p), False, True, 0)  # Too late: plain "p"
+    rec.record(WM_KEYUP, make_data(vk_p), False, True, 0)
+    rec.close()
+    metadata, events = read_recording(str(path))
+
+    def replay(event_clock):
+        mgr = make_manager([])
+        if event_clock is not None:
+            mgr._table = TriggerTable(clock=event_clock)
+        mgr._table.set_triggers(metadata["triggers"], metadata["sequence_timeouts"])
+        with patch("threading.Thread"):
+            return replay_events(mgr._win32_event_filter, events, event_clock=event_clock)
+
+    assert replay(RecordedClock()).mismatches == []
+    # On the wall clock the fast replay completes the sequence instead
+    assert replay(None).mismatches
@@ -0,0 +1,183 @@
+"""Tests for the keyboard hook watchdog (latency histogram + liveness check)."""
+
+from unittest.mock import MagicMock, patch
+
+from src.core.hook_manager import HookManager
+from src.core.hook_watchdog import HookWatchdog, LatencyHistogram
+
+
+class FakeClock:
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBackend:
+    def __init__(self, down: bool = False) -> None:
+        self.keys = frozenset({0x41}) if down else frozenset()
+
+    def pressed_keys(self) -> frozenset[int]:
+        return self.keys
+
+
+def make_watchdog(down=False, **kwargs):
+    clock = FakeClock()
+    backend = FakeBackend(down)
+    reinstall = MagicMock()
+    dog = HookWatchdog(reinstall=reinstall, backend=backend, clock=clock, **kwargs)
+    return dog, clock, backend, reinstall
+
+
+# ── LatencyHistogram ──────────────────────────────────────────────────────────
+
+
+def test_histogram_buckets():
+    hist = LatencyHistogram(bounds_us=(10, 100))
+    hist.add(5_000)  # 5us
+    hist.add(10_000)  # 10us (inclusive upper bound)
+    hist.add(50_000)  # 50us
+    hist.add(2_000_000)  # 2ms -> overflow
+    assert hist.counts == [2, 1, 1]
+    assert hist.total == 4
+    assert hist.max_ns == 2_000_000
+
+
+def test_histogram_percentile():
+    hist = LatencyHistogram(bounds_us=(10, 100))
+    for _ in range(99):
+        hist.add(1_000)
+    hist.add(500_000)
+    assert hist.percentile_us(50) == 10
+    assert hist.percentile_us(100) is None  # overflow bucket
+
+
+# ── observe ───────────────────────────────────────────────────────────────────
+
+
+def test_observe_counts_slow_calls_and_rate_limits_warning():
+    dog, clock, _, _ = make_watchdog(warn_threshold_ms=10)
+    with patch("src.core.hook_watchdog.logger") as mock_logger:
+        dog.observe(20_000_000)
+        dog.observe(30_000_000)
+        clock.now += 10
+        dog.observe(25_000_000)
+    assert dog.slow_calls == 3
+    assert mock_logger.warning.call_count == 2
+
+
+def test_observe_injected_only_updates_liveness():
+    dog, _clock, _, _ = make_watchdog()
+    dog.observe(None)
+    assert dog.histogram.total == 0
+
+
+# ── check ─────────────────────────────────────────────────────────────────────
+
+
+def test_check_reinstalls_when_keys_pressed_but_hook_silent():
+    dog, clock, _, reinstall = make_watchdog(down=True, stall_timeout_s=2.0)
+    clock.now += 3.0
+    assert dog.check() is True
+    reinstall.assert_called_once()
+    assert dog.reinstall_count == 1
+
+    # Grace period after a reinstall
+    clock.now += 1.0
+    assert dog.check() is False
+
+
+def test_check_ok_when_events_arrive():
+    dog, clock, _, reinstall = make_watchdog(down=True, stall_timeout_s=2.0)
+    clock.now += 3.0
+    dog.observe(1_000)
+    clock.now += 0.5
+    assert dog.check() is False
+    reinstall.assert_not_called()
+
+
+def test_check_ignores_stuck_key():
+    dog, clock, _, _ = make_watchdog(down=True, stall_timeout_s=2.0)
+    clock.now += 3.0
+    assert dog.check() is True
+
+    # The same key reported down forever (no key-up ever injected) is not a stall
+    for _ in range(10):
+        clock.now += 3.0
+        assert dog.check() is False
+    assert dog.reinstall_count == 1
+
+
+def test_check_backs_off_after_repeated_reinstalls():
+    dog, clock, backend, reinstall = make_watchdog(down=True, stall_timeout_s=2.0)
+    clock.now += 3.0
+    assert dog.check() is True
+
+    # Second reinstall waits for the base timeout, the third for twice that
+    clock.now += 2.0
+    backend.keys = frozenset({0x42})
+    assert dog.check() is True
+    clock.now += 2.0
+    backend.keys = frozenset({0x43})
+    assert dog.check() is False
+    clock.now += 2.0
+    backend.keys = frozenset({0x44})
+    assert dog.check() is True
+    assert reinstall.call_count == 3
+
+    # An event after the reinstall proves the hook works again and resets the backoff
+    clock.now += 0.5
+    dog.observe(1_000)
+    clock.now += 2.0
+    backend.keys = frozenset({0x45})
+    assert dog.check() is True
+
+
+def test_check_ignores_idle_keyboard():
+    dog, clock, _, reinstall = make_watchdog(down=False)
+    clock.now += 60.0
+    assert dog.check() is False
+    reinstall.assert_not_called()
+
+
+def test_check_without_backend_is_noop():
+    reinstall = MagicMock()
+    dog = HookWatchdog(reinstall=reinstall, backend=None, clock=FakeClock())
+    assert dog.check() is False
+    dog.start()
+    assert dog._thread is None
+
+
+def test_check_survives_reinstall_failure():
+    dog, clock, _, reinstall = make_watchdog(down=True)
+    reinstall.side_effect = RuntimeError("boom")
+    clock.now += 10.0
+    assert dog.check() is True
+
+
+# ── HookManager integration ───────────────────────────────────────────────────
+
+
+def test_manager_feeds_watchdog_and_reinstalls():
+    mgr = HookManager(on_trigger_press=MagicMock(), on_trigger_release=MagicMock())
+    clock = FakeClock()
+    backend = FakeBackend(down=True)
+    mgr._watchdog = HookWatchdog(reinstall=mgr._reinstall_listener, backend=backend, clock=clock)
+
+    mgr._on_hook_event(0x100, MagicMock(vkCode=0x41), False, True, 2_000)
+    assert mgr._watchdog.histogram.total == 1
+
+    mgr._held_modifiers.add("ctrl")
+    mgr._active_suppressions["space"] = "ctrl+space"
+    clock.now += 10.0
+    with (
+        patch.object(mgr, "_stop_listener_unsafe") as mock_stop,
+        patch.object(mgr, "_start_listener") as mock_start,
+    ):
+        assert mgr._watchdog.check() is True
+
+    mock_stop.assert_called_once()
+    mock_start.assert_called_once()
+    assert mgr._held_modifiers == set()
+    assert mgr._active_suppressions == {}
@@ -0,0 +1,85 @@
+"""Tests for the in-memory icon history with write-behind persistence."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.core.icon_history import IconHistory
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    return tmp_path / "config" / "icon_history.json"
+
+
+@pytest.fixture
+def history(history_file):
+    h = IconHistory(str(history_file), max_entries=3, debounce_s=60)
+    yield h
+    h.close()
+
+
+def _on_disk(path) -> list[str]:
+    data: list[str] = json.loads(path.read_text(encoding="utf-8"))
+    return data
+
+
+def test_add_moves_existing_entry_to_front(history):
+    history.add("/icons/a.png")
+    history.add("/icons/b.png")
+    assert history.add("/icons/../icons/a.png") == ["/icons/../icons/a.png", "/icons/b.png"]
+
+
+def test_add_caps_at_max_entries(history):
+    for name in "abcd":
+        history.add(f"/icons/{name}.png")
+    assert history.paths() == ["/icons/d.png", "/icons/c.png", "/icons/b.png"]
+
+
+def test_remove(history):
+    history.add("/icons/a.png")
+    assert history.remove("/icons/a.png")
+    assert not history.remove("/icons/a.png")
+    assert history.paths() == []
+
+
+def test_burst_is_written_once_on_flush(history, history_file):
+    with patch.object(IconHistory, "_write", wraps=history._write) as mock_write:
+        for name in "abc":
+            history.add(f"/icons/{name}.png")
+        assert not history_file.exists()  # Still inside the debounce window
+        assert history.flush()
+    mock_write.assert_called_once()
+    assert _on_disk(history_file) == ["/icons/c.png", "/icons/b.png", "/icons/a.png"]
+
+
+def test_written_after_debounce(history_file):
+    h = IconHistory(str(history_file), debounce_s=0.01)
+    h.add("/icons/a.png")
+    h.close()
+    assert _on_disk(history_file) == ["/icons/a.png"]
+
+
+def test_file_is_read_once(history_file):
+    history_file.parent.mkdir()
+    history_file.write_text(json.dumps(["/icons/a.png", "/icons/a.png", 3, "/icons/b.png"]))
+    h = IconHistory(str(history_file))
+
+    with patch("builtins.open", wraps=open) as mock_open:
+        assert h.paths() == ["/icons/a.png", "/icons/b.png"]
+        h.paths()
+        h.add("/icons/c.png")
+    assert mock_open.call_count == 1
+
+
+def test_corrupted_file_starts_empty(history_file):
+    history_file.parent.mkdir()
+    history_file.write_text("{broken")
+    assert IconHistory(str(history_file)).paths() == []
+
+
+def test_replace_deduplicates(history, history_file):
+    history.replace(["/icons/a.png", "/icons/a.png", "/icons/b.png"])
+    history.flush()
+    assert _on_disk(history_file) == ["/icons/a.png", "/icons/b.png"]
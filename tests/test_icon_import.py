@@ -0,0 +1,101 @@
+"""Tests for the bulk icon import pipeline."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core import config
+from src.core.icon_history import IconHistory
+from src.core.icon_import import collect_icon_files, import_icons, validate_icon_file
+from src.ui.components.icon_picker import IconImportThread
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"/>'
+
+
+@pytest.fixture
+def icon_env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(config_dir))
+    monkeypatch.setattr("src.core.config.USER_ICONS_DIR", str(config_dir / "user_icons"))
+    monkeypatch.setattr("src.core.config.ICON_HISTORY_FILE", str(config_dir / "icon_history.json"))
+    assets = tmp_path / "assets"
+    (assets / "sub").mkdir(parents=True)
+    (assets / "a.png").write_bytes(PNG + b"a")
+    (assets / "b.svg").write_bytes(SVG)
+    (assets / "sub" / "c.png").write_bytes(PNG + b"c")
+    (assets / "readme.txt").write_text("not an icon")
+    yield assets
+    config.icon_history().close()
+
+
+def test_collect_expands_folders_and_skips_other_files(icon_env):
+    files = collect_icon_files([str(icon_env), str(icon_env / "a.png")])
+    expected = ["a.png", "b.svg", os.path.join("sub", "c.png")]
+    assert [os.path.relpath(f, icon_env) for f in files] == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "reason"),
+    [
+        ("x.bmp", b"BM", "Unsupported"),
+        ("x.png", b"", "empty"),
+        ("x.png", b"GIF89a", "does not match"),
+        ("x.svg", b"hello", "Not an SVG"),
+    ],
+)
+def test_validate_rejects(tmp_path, name, content, reason):
+    path = tmp_path / name
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match=reason):
+        validate_icon_file(str(path))
+
+
+def test_import_folder(icon_env):
+    progress = []
+    summary = import_icons(
+        [str(icon_env)], prepare=lambda p: f"thumb:{p}", on_progress=lambda *a: progress.append(a)
+    )
+
+    assert [r.name for r in summary.imported] == ["a", "b", "c"]
+    assert all((r.path or "").startswith("user_icons/") for r in summary.imported)
+    assert all(r.thumbnail.startswith("thumb:") for r in summary.imported)
+    assert sorted(done for done, _, _ in progress) == [1, 2, 3]
+    assert {total for _, total, _ in progress} == {3}
+    assert config.load_icon_history() == [r.path for r in summary.imported]
+
+
+def test_history_is_committed_once(icon_env):
+    with patch.object(IconHistory, "add_many", autospec=True) as mock_add:
+        import_icons([str(icon_env)])
+    mock_add.assert_called_once()
+
+
+def test_duplicates_and_failures_are_reported(icon_env, tmp_path):
+    (tmp_path / "copy.png").write_bytes(PNG + b"a")
+    (tmp_path / "broken.png").write_bytes(b"nope")
+    import_icons([str(icon_env / "a.png")])
+
+    summary = import_icons([str(tmp_path / "copy.png"), str(tmp_path / "broken.png")])
+
+    assert [r.duplicate for r in summary.results] == [True, False]
+    assert (summary.failed[0].error or "").startswith("Content does not match")
+    assert summary.imported[0].path == config.load_icon_history()[0]
+
+
+def test_cancel_skips_pending_files(icon_env):
+    cancel = threading.Event()
+    cancel.set()
+    summary = import_icons([str(icon_env)], max_workers=1, cancel=cancel)
+    assert summary.cancelled
+    assert len(summary.results) < 3
+
+
+def test_import_thread_renders_thumbnails(qapp, icon_env):
+    thread = IconImportThread([str(icon_env / "b.svg")])
+    thread.start()
+    assert thread.wait(5000)
+    assert thread.summary is not None
+    assert thread.summary.imported[0].thumbnail.width() == 64
@@ -0,0 +1,182 @@
+"""Tests for the content-addressed user icon store."""
+
+import hashlib
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core import icon_store as icon_store_module
+from src.core.config import add_to_icon_history, icon_display_name, remove_from_icon_history
+from src.core.icon_store import INDEX_NAME, IconStore, hash_file
+
+# ── hash_file ────────────────────────────────────────────────────────────────
+
+
+def test_hash_file_known_content(tmp_path):
+    f = tmp_path / "test.bin"
+    f.write_bytes(b"hello world")
+    assert hash_file(str(f)) == hashlib.sha256(b"hello world").hexdigest()
+
+
+def test_hash_file_empty_file(tmp_path):
+    f = tmp_path / "empty.bin"
+    f.write_bytes(b"")
+    assert hash_file(str(f)) == hashlib.sha256(b"").hexdigest()
+
+
+def test_hash_file_large_file(tmp_path):
+    """File larger than _HASH_CHUNK_SIZE (65536) to verify chunked reading."""
+    data = b"x" * 100_000
+    f = tmp_path / "large.bin"
+    f.write_bytes(data)
+    assert hash_file(str(f)) == hashlib.sha256(data).hexdigest()
+
+
+# ── IconStore ────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    directory = tmp_path / "user_icons"
+    directory.mkdir()
+    return directory
+
+
+def _icon(tmp_path, name: str, content: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_add_names_file_by_content_hash(tmp_path, store_dir):
+    store = IconStore(str(store_dir))
+    stored = store.add(_icon(tmp_path, "Save.PNG", b"save"))
+
+    assert os.path.basename(stored) == hashlib.sha256(b"save").hexdigest() + ".png"
+    with open(stored, "rb") as f:
+        assert f.read() == b"save"
+    assert store.original_name(stored) == "Save.PNG"
+    index = json.loads((store_dir / INDEX_NAME).read_text(encoding="utf-8"))
+    assert index["entries"][hashlib.sha256(b"save").hexdigest()]["name"] == "Save.PNG"
+
+
+def test_duplicate_hashes_only_the_incoming_file(tmp_path, store_dir):
+    store = IconStore(str(store_dir))
+    first = store.add(_icon(tmp_path, "a.png", b"same"))
+    for i in range(5):
+        store.add(_icon(tmp_path, f"other{i}.png", bytes([i])))
+
+    with patch.object(icon_store_module, "hash_file", wraps=hash_file) as mock_hash:
+        again = store.add(_icon(tmp_path, "b.png", b"same"))
+
+    assert again == first
+    assert mock_hash.call_count == 1
+
+
+def test_index_survives_restart(tmp_path, store_dir):
+    stored = IconStore(str(store_dir)).add(_icon(tmp_path, "a.png", b"a"))
+
+    store = IconStore(str(store_dir))
+    with patch.object(icon_store_module, "hash_file", wraps=hash_file) as mock_hash:
+        assert store.lookup(hashlib.sha256(b"a").hexdigest()) == stored
+    mock_hash.assert_not_called()
+    assert store.original_name(stored) == "a.png"
+
+
+def test_legacy_files_are_indexed_once(tmp_path, store_dir):
+    (store_dir / "old_icon.png").write_bytes(b"legacy")
+
+    store = IconStore(str(store_dir))
+    reused = store.add(_icon(tmp_path, "new_name.png", b"legacy"))
+
+    assert reused == str(store_dir / "old_icon.png")
+    assert sorted(os.listdir(store_dir)) == [INDEX_NAME, "old_icon.png"]
+    with patch.object(icon_store_module, "hash_file") as mock_hash:
+        IconStore(str(store_dir)).original_name(reused)
+    mock_hash.assert_not_called()
+
+
+def test_interrupted_copies_are_skipped_but_tmp_names_are_indexed(tmp_path, store_dir):
+    (store_dir / "tmpl.png").write_bytes(b"template")
+    (store_dir / ".iconstore-tmp-abc123").write_bytes(b"partial")
+
+    store = IconStore(str(store_dir))
+
+    assert store.lookup(hashlib.sha256(b"template").hexdigest()) == str(store_dir / "tmpl.png")
+    assert store.lookup(hashlib.sha256(b"partial").hexdigest()) is None
+
+
+def test_deleted_file_drops_entry(tmp_path, store_dir):
+    store = IconStore(str(store_dir))
+    stored = store.add(_icon(tmp_path, "a.png", b"a"))
+    os.remove(stored)
+
+    assert store.lookup(hashlib.sha256(b"a").hexdigest()) is None
+    assert os.path.exists(store.add(_icon(tmp_path, "a.png", b"a")))
+
+
+def test_changed_file_is_rehashed(tmp_path, store_dir):
+    store = IconStore(str(store_dir))
+    stored = store.add(_icon(tmp_path, "a.png", b"a"))
+    with open(stored, "wb") as f:
+        f.write(b"edited by hand")
+
+    assert store.lookup(hashlib.sha256(b"a").hexdigest()) is None
+    assert store.lookup(hashlib.sha256(b"edited by hand").hexdigest()) == stored
+
+
+def test_remove_deletes_file_and_entry(tmp_path, store_dir):
+    store = IconStore(str(store_dir))
+    stored = store.add(_icon(tmp_path, "a.png", b"a"))
+
+    assert store.remove(stored)
+    assert not os.path.exists(stored)
+    assert IconStore(str(store_dir)).original_name(stored) is None
+    assert not store.remove(stored)
+
+
+def test_unreadable_index_is_rebuilt(tmp_path, store_dir):
+    stored = IconStore(str(store_dir)).add(_icon(tmp_path, "a.png", b"a"))
+    (store_dir / INDEX_NAME).write_text("{broken", encoding="utf-8")
+
+    assert IconStore(str(store_dir)).lookup(hashlib.sha256(b"a").hexdigest()) == stored
+
+
+# ── config integration ───────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def icon_env(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    monkeypatch.setattr("src.core.config.CONFIG_DIR", str(config_dir))
+    monkeypatch.setattr("src.core.config.USER_ICONS_DIR", str(config_dir / "user_icons"))
+    monkeypatch.setattr("src.core.config.ICON_HISTORY_FILE", str(config_dir / "icon_history.json"))
+    return config_dir
+
+
+def test_history_keeps_original_name_for_display(tmp_path, icon_env):
+    history = add_to_icon_history(_icon(tmp_path, "brush.svg", b"<svg/>"))
+
+    stored = os.path.join(icon_env, history[0])
+    assert os.path.basename(stored) != "brush.svg"
+    assert icon_display_name(stored) == "brush"
+    assert icon_display_name(str(tmp_path / "elsewhere.png")) == "elsewhere"
+
+
+def test_remove_from_history_drops_index_entry(tmp_path, icon_env):
+    history = add_to_icon_history(_icon(tmp_path, "brush.svg", b"<svg/>"))
+    stored = os.path.join(icon_env, history[0])
+
+    assert remove_from_icon_history(stored) == []
+    assert not os.path.exists(stored)
+    index = json.loads((icon_env / "user_icons" / INDEX_NAME).read_text(encoding="utf-8"))
+    assert index["entries"] == {}
+
+
+def test_remove_from_history_accepts_stored_relative_path(tmp_path, icon_env):
+    history = add_to_icon_history(_icon(tmp_path, "brush.svg", b"<svg/>"))
+
+    assert remove_from_icon_history(history[0]) == []
+    assert not os.path.exists(os.path.join(icon_env, history[0]))
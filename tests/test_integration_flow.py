@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.app import MixedBerryPieApp
-from src.core.config import AppSettings, MenuProfile
+from src.core.config import AppSettings, MenuProfile, load_config
 from src.ui.settings_ui import SettingsWindow
 
 
@@ -27,6 +27,8 @@ def integration_setup(qapp, tmp_path, monkeypatch):
         # Mock overlay to track updates
         app.overlay = MagicMock()
         yield app, config_file
+        # Write-behind saves must land in tmp_path, before CONFIG_FILE is restored
+        app.config_store.close()
 
 
 def test_settings_save_reloads_app_config(integration_setup):
@@ -79,12 +81,49 @@ def test_trigger_key_change_updates_hooks(integration_setup):
 
     with (
         patch("src.ui.settings_ui.QMessageBox"),
-        patch.object(app.hook_manager, "start_hook") as mock_start_hook,
+        patch.object(app.hook_manager, "update_triggers") as mock_update_triggers,
     ):
         window.save_all()
 
-        # Verify hook manager was restarted with new trigger
-        # reload_config calls update_hooks which calls hook_manager.start_hook
-        mock_start_hook.assert_called_with(["f12"])
+        # Verify the running hook was reconfigured with the new trigger
+        # reload_config calls update_hooks which calls hook_manager.update_triggers
+        mock_update_triggers.assert_called_with(["f12"], {"f12": 1.0})
 
     assert app.profiles[0].trigger_key == "f12"
+
+
+def test_shared_store_save_updates_app_without_reloading(integration_setup):
+    """With the app's store, a save updates the app through change events only."""
+    app, _config_file = integration_setup
+
+    window = SettingsWindow(on_save_callback=app.save_settings, store=app.config_store)
+    window.trigger_input.setText("f12")
+    window.menu_opacity_slider.setValue(50)
+
+    with (
+        patch("src.ui.settings_ui.QMessageBox"),
+        patch("src.core.config.load_config") as mock_load,
+        patch.object(app, "compile_actions", wraps=app.compile_actions) as mock_compile,
+    ):
+        window.save_all()
+        mock_load.assert_not_called()
+        mock_compile.assert_called_once()
+
+    assert app.profiles[0].trigger_key == "f12"
+    assert app.settings.menu_opacity == 50
+    app.overlay.update_settings.assert_called_with(app.settings)
+
+    # A settings-only change leaves the compiled actions alone
+    window.menu_opacity_slider.setValue(40)
+    with (
+        patch("src.ui.settings_ui.QMessageBox"),
+        patch.object(app, "compile_actions") as mock_compile,
+    ):
+        window.save_all()
+        mock_compile.assert_not_called()
+    assert app.settings.menu_opacity == 40
+
+    # The file is written behind; flushing puts the latest state on disk
+    assert app.config_store.flush()
+    profiles, settings = load_config()
+    assert (profiles[0].trigger_key, settings.menu_opacity) == ("f12", 40)
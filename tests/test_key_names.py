@@ -0,0 +1,23 @@
+"""Tests for shortcut key name parsing."""
+
+from pynput import keyboard as pynput_keyboard
+
+from src.core.key_names import is_known_key_name, parse_key
+
+
+def test_parse_key_space():
+    assert parse_key("space") == pynput_keyboard.Key.space
+
+
+def test_parse_key_char():
+    key = parse_key("p")
+    assert hasattr(key, "char") and key.char == "p"
+
+
+def test_parse_key_f5():
+    assert parse_key("f5") == pynput_keyboard.Key.f5
+
+
+def test_unknown_name_falls_back_to_first_character():
+    assert not is_known_key_name("pgup")
+    assert parse_key("pgup") == pynput_keyboard.KeyCode.from_char("p")
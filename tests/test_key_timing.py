@@ -0,0 +1,67 @@
+"""Tests for deadline-based key sequence pacing (virtual clock)."""
+
+from src.core.key_timing import FakeTimingEngine, KeySequenceScheduler, SequenceTiming
+
+
+def make_scheduler(**engine_kwargs):
+    engine = FakeTimingEngine(**engine_kwargs)
+    return KeySequenceScheduler(engine), engine
+
+
+def test_fake_engine_sleep_rounds_up_to_tick():
+    engine = FakeTimingEngine(granularity_s=0.0156)
+    engine.sleep(0.002)
+    assert engine.now() == 0.0156
+    with engine.precise():
+        engine.sleep(0.0021)
+    assert round(engine.now(), 6) == 0.018
+
+
+def test_naive_sleeps_inflate_short_delays():
+    """The old cumulative time.sleep pacing on a 15.6 ms timer tick."""
+    engine = FakeTimingEngine()
+    timing = SequenceTiming(0.002)
+    for _ in range(4):
+        timing.offsets.append(engine.now())
+        engine.sleep(0.002)
+    assert timing.mean_interval_ms > 15
+
+
+def test_scheduler_meets_requested_interval():
+    scheduler, engine = make_scheduler()
+    timing = scheduler.run([lambda: None] * 6, 0.002)
+
+    assert len(timing.offsets) == 6
+    assert abs(timing.mean_interval_ms - 2.0) < 0.1
+    assert timing.jitter_ms < 0.1
+    # Returns one interval after the last step
+    assert engine.now() >= 6 * 0.002
+
+
+def test_late_step_does_not_shift_later_deadlines():
+    scheduler, engine = make_scheduler(granularity_s=0.0, precise_granularity_s=0.0)
+    slow_once = iter([0.007])
+
+    def step():
+        engine.time += next(slow_once, 0.0)
+
+    timing = scheduler.run([step] * 5, 0.005)
+    # Step 1 starts late (7 ms in), steps 2+ are back on the 5 ms grid
+    assert abs(timing.offsets[1] - 0.007) < 1e-3
+    assert abs(timing.offsets[2] - 0.010) < 1e-3
+    assert abs(timing.offsets[4] - 0.020) < 1e-3
+
+
+def test_wait_is_precise():
+    scheduler, engine = make_scheduler()
+    scheduler.wait(0.003)
+    assert 0.003 <= engine.now() < 0.0031
+    scheduler.wait(0)
+    assert engine.now() < 0.0031
+
+
+def test_summary_reports_requested_and_achieved():
+    scheduler, _ = make_scheduler()
+    assert scheduler.summary() == "no paced sequences"
+    scheduler.run([lambda: None] * 3, 0.004)
+    assert scheduler.summary().startswith("sequences=1 requested=4.00ms achieved=4.0")
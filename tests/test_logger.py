@@ -0,0 +1,35 @@
+"""Tests for the startup log buffer."""
+
+import logging
+
+import pytest
+
+from src.core import logger as logger_module
+from src.core.logger import get_logger, set_file_logging
+
+
+@pytest.fixture
+def startup_buffer(tmp_path, monkeypatch):
+    get_logger("test")  # Configure the root logger first
+    monkeypatch.setattr(logger_module, "LOG_FILE", tmp_path / "app.log")
+    monkeypatch.setattr(logger_module, "_FILE_HANDLER", None)
+    buffer = logger_module._StartupBuffer()
+    logging.getLogger("piemenu").addHandler(buffer)
+    monkeypatch.setattr(logger_module, "_STARTUP_BUFFER", buffer)
+    yield tmp_path / "app.log"
+    set_file_logging(False)
+    logging.getLogger("piemenu").removeHandler(buffer)
+
+
+def test_records_before_file_logging_are_written(startup_buffer):
+    get_logger("test").info("logged while loading config")
+    set_file_logging(True)
+    assert "logged while loading config" in startup_buffer.read_text(encoding="utf-8")
+
+
+def test_records_are_dropped_when_file_logging_is_off(startup_buffer):
+    buffer = logger_module._STARTUP_BUFFER
+    get_logger("test").info("not kept")
+    set_file_logging(False)
+    assert buffer not in logging.getLogger("piemenu").handlers
+    assert not startup_buffer.exists()
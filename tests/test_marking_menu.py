@@ -0,0 +1,190 @@
+"""Tests for marking-menu stroke segmentation, recognition and sampling."""
+
+import math
+import time
+
+import pytest
+
+from src.core.config import PieSlice
+from src.core.marking_menu import (
+    ExpertStats,
+    MarkingMenu,
+    StrokeSampler,
+    angle_difference,
+    item_at_path,
+    recognize_stroke,
+    segment_stroke,
+)
+from src.core.pie_geometry import slice_center_angle
+
+
+def _items(n: int, prefix: str = "Item") -> list[PieSlice]:
+    return [
+        PieSlice(label=f"{prefix}{i}", key=f"{prefix.lower()}{i}", color="#FF0000")
+        for i in range(n)
+    ]
+
+
+def _line(start: tuple[float, float], end: tuple[float, float], steps: int = 10):
+    (x0, y0), (x1, y1) = start, end
+    return [(x0 + (x1 - x0) * i / steps, y0 + (y1 - y0) * i / steps) for i in range(steps + 1)]
+
+
+def _polar(angle_deg: float, length: float) -> tuple[float, float]:
+    rad = math.radians(angle_deg)
+    return length * math.cos(rad), length * math.sin(rad)
+
+
+def _with_submenu() -> list[PieSlice]:
+    """Four root items; the right one (index 1) opens three children."""
+    items = _items(4)
+    items[1].action_type = "submenu"
+    items[1].submenu_items = _items(3, "Child")
+    return items
+
+
+# ── Segmentation ─────────────────────────────────────────────────────────────
+
+
+def test_angle_difference_wraps():
+    assert angle_difference(350, 10) == pytest.approx(20)
+    assert angle_difference(90, 270) == pytest.approx(180)
+
+
+def test_straight_stroke_is_one_segment():
+    segments = segment_stroke(_line((0, 0), (0, -80)))
+    assert len(segments) == 1
+    # Up on screen is -90 in the pie layout (270 normalized)
+    assert segments[0].angle == pytest.approx(270)
+    assert segments[0].length == pytest.approx(80)
+
+
+def test_corner_splits_stroke():
+    points = _line((0, 0), (80, 0)) + _line((80, 0), (80, 80))[1:]
+    segments = segment_stroke(points)
+    assert [round(s.angle) for s in segments] == [0, 90]
+
+
+def test_short_strokes_and_release_overshoot_are_ignored():
+    assert segment_stroke(_line((0, 0), (10, 5))) == []
+    assert segment_stroke([(5, 5)]) == []
+    # A tiny hook at the end of the stroke is not a second segment
+    points = _line((0, 0), (80, 0)) + _line((80, 0), (80, 10), steps=3)[1:]
+    assert len(segment_stroke(points)) == 1
+
+
+def test_jitter_does_not_split_stroke():
+    points = [(x, (-1) ** x) for x in range(0, 90, 2)]
+    assert len(segment_stroke(points)) == 1
+
+
+# ── Recognition ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    ("end", "expected"),
+    [((0, -60), 0), ((60, 0), 1), ((0, 60), 2), ((-60, 0), 3), ((50, -45), 1)],
+)
+def test_first_segment_picks_root_slice(end, expected):
+    items = _items(4)
+    assert recognize_stroke(items, segment_stroke(_line((0, 0), end))) == [expected]
+
+
+def test_second_segment_picks_submenu_child():
+    items = _with_submenu()
+    # The right slice's children fan out around it, from up to down
+    for child in range(3):
+        angle = slice_center_angle(items, 1, [1, child])
+        segments = [
+            *segment_stroke(_line((0, 0), (80, 0))),
+            *segment_stroke(_line((0, 0), _polar(angle, 80))),
+        ]
+        assert recognize_stroke(items, segments) == [1, child]
+
+
+def test_stroke_ending_on_submenu_or_beyond_leaf_is_rejected():
+    items = _with_submenu()
+    assert recognize_stroke(items, segment_stroke(_line((0, 0), (80, 0)))) is None
+    beyond_leaf = _line((0, 0), (0, -80)) + _line((0, -80), (80, -80))[1:]
+    assert recognize_stroke(items, segment_stroke(beyond_leaf)) is None
+
+
+def test_second_segment_outside_fan_is_rejected():
+    items = _with_submenu()
+    # Back towards the center (left) is far from every child of the right slice
+    points = _line((0, 0), (80, 0)) + _line((80, 0), (0, 0))[1:]
+    assert recognize_stroke(items, segment_stroke(points)) is None
+
+
+def test_item_at_path():
+    items = _with_submenu()
+    child = item_at_path(items, [1, 2])
+    assert child is not None and child.label == "Child2"
+    assert item_at_path(items, [7]) is None
+    assert item_at_path(items, []) is None
+
+
+# ── Sampling and statistics ─────────────────────────────────────────────────
+
+
+class ScriptedCursor:
+    def __init__(self, points):
+        self.points = list(points)
+
+    def __call__(self):
+        return self.points.pop(0) if len(self.points) > 1 else self.points[0]
+
+
+def test_sampler_records_until_end():
+    sampler = StrokeSampler(ScriptedCursor([(0, 0), (10, 0), (20, 0)]))
+    sampler.begin(threaded=False)
+    sampler.sample()
+    assert sampler.end() == [(0.0, 0.0), (10.0, 0.0), (20.0, 0.0)]
+    assert not sampler.active
+
+
+def test_sampler_thread_samples_in_background():
+    cursor = ScriptedCursor([(x, 0) for x in range(0, 100, 5)])
+    sampler = StrokeSampler(cursor, interval_s=0.001)
+    sampler.begin()
+    assert sampler.active
+    deadline = time.monotonic() + 2.0
+    while len(cursor.points) > 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    points = sampler.end()
+    assert points[0] == (0.0, 0.0)
+    assert points[-1] == (95.0, 0.0)
+
+
+def test_sampler_survives_cursor_errors():
+    def broken():
+        raise OSError("no cursor")
+
+    sampler = StrokeSampler(broken)
+    sampler.begin(threaded=False)
+    assert sampler.end() == []
+
+
+def test_marking_menu_selects_and_counts():
+    items = _items(4)
+    cursor = ScriptedCursor(_line((100, 100), (100, 20)))
+    menu = MarkingMenu(cursor, threaded=False)
+
+    menu.begin()
+    for _ in range(10):
+        menu.sampler.sample()
+    assert menu.finish(items) is items[0]
+
+    menu.begin()
+    assert menu.finish(items) is None  # No motion since the last stroke
+
+    menu.begin()
+    menu.fall_back_to_menu()
+
+    assert (menu.stats.selections, menu.stats.unrecognized, menu.stats.menu_fallbacks) == (1, 1, 1)
+    assert menu.stats.expert_rate == pytest.approx(1 / 3)
+
+
+def test_expert_stats_summary():
+    assert ExpertStats().expert_rate == 0.0
+    assert "expert_rate=50%" in ExpertStats(selections=1, menu_fallbacks=1).summary()
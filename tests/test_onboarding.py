@@ -57,9 +57,9 @@ def test_subsequent_run_does_not_trigger_timer(onboarding_setup):
             pytest.fail("QTimer.singleShot called with show_welcome_dialog when first_run is False")
 
 
-@patch("src.core.config.save_config")
-@patch("src.app.WelcomeDialog")
-def test_show_welcome_dialog_logic(mock_dialog_cls, mock_save, onboarding_setup):
+@patch("src.core.config_writer.ConfigWriter.schedule")
+@patch("src.ui.welcome_dialog.WelcomeDialog")
+def test_show_welcome_dialog_logic(mock_dialog_cls, mock_schedule, onboarding_setup):
     """Test show_welcome_dialog execution path."""
     mock_load, _, mock_profiles, mock_settings = onboarding_setup
 
@@ -81,5 +81,5 @@ def test_show_welcome_dialog_logic(mock_dialog_cls, mock_save, onboarding_setup)
     # assert first_run set to False
     assert not mock_settings.first_run
 
-    # assert config saved
-    mock_save.assert_called_once_with(mock_profiles, mock_settings)
+    # assert config save scheduled (written behind by the config writer)
+    mock_schedule.assert_called_once_with(mock_profiles, mock_settings)
@@ -0,0 +1,91 @@
+"""Tests for compiled trigger → profile resolution."""
+
+import random
+
+from src.core.config import MenuProfile
+from src.core.profile_resolver import ProfileResolver
+
+
+def profile(name, trigger="tab", targets=None):
+    return MenuProfile(name=name, trigger_key=trigger, items=[], target_apps=targets or [])
+
+
+def reference_resolve(profiles, trigger_key, active_exe, active_title):
+    """The original linear resolution loop from MixedBerryPieApp.on_trigger_press."""
+    matches = [p for p in profiles if p.trigger_key == trigger_key]
+    if not matches:
+        return None
+    selected = None
+    if active_exe:
+        for p in matches:
+            if p.target_apps:
+                is_match = False
+                for target in p.target_apps:
+                    target = target.lower()
+                    if target in active_exe or (active_title and target in active_title.lower()):
+                        is_match = True
+                        break
+                if is_match:
+                    selected = p
+                    break
+    if not selected:
+        selected = next((p for p in matches if not p.target_apps), None)
+    return selected
+
+
+def test_targeted_profile_beats_global():
+    glob = profile("global")
+    code = profile("code", targets=["Code.exe"])
+    resolver = ProfileResolver([glob, code])
+    assert resolver.resolve("tab", "code.exe", "main.py") is code
+    assert resolver.resolve("tab", "notepad.exe", "") is glob
+
+
+def test_first_matching_profile_wins_over_exact_exe_hit():
+    by_title = profile("title", targets=["visual studio"])
+    by_exe = profile("exe", targets=["devenv.exe"])
+    resolver = ProfileResolver([by_title, by_exe])
+    assert resolver.resolve("tab", "devenv.exe", "Project - Visual Studio") is by_title
+    assert resolver.resolve("tab", "devenv.exe", "Untitled") is by_exe
+
+
+def test_unknown_exe_uses_global_only():
+    glob = profile("global")
+    resolver = ProfileResolver([profile("t", targets=["term"]), glob])
+    assert resolver.resolve("tab", None, "terminal") is glob
+
+
+def test_no_profile_for_trigger():
+    resolver = ProfileResolver([profile("t", targets=["zz"])])
+    assert resolver.resolve("f12", "zz.exe", "") is None
+    assert resolver.resolve("tab", "y.exe", "") is None
+
+
+def test_results_are_memoized():
+    resolver = ProfileResolver([profile("global")])
+    resolver.resolve("tab", "a.exe", "t")
+    resolver.resolve("tab", "a.exe", "t")
+    assert resolver.resolve.cache_info().hits == 1
+
+
+def test_matches_reference_precedence():
+    rng = random.Random(1234)  # noqa: S311
+    words = ["code", "chrome", "term", "Fire", "note", "pad", "x", "", "a.b", "(x)"]
+    triggers = ["tab", "ctrl+space", "f1"]
+    profiles = [
+        profile(
+            f"p{i}",
+            trigger=rng.choice(triggers),
+            targets=rng.sample(words, rng.randint(0, 3)),
+        )
+        for i in range(40)
+    ]
+    resolver = ProfileResolver(profiles)
+    exes = [None, "", "code.exe", "chrome.exe", "notepad.exe", "firefox.exe", "a.b.exe"]
+    titles = [None, "", "Terminal", "Notes (x)", "A.B Chrome", "untitled"]
+
+    for trigger in [*triggers, "none"]:
+        for exe in exes:
+            for title in titles:
+                expected = reference_resolve(profiles, trigger, exe, title)
+                assert resolver.resolve(trigger, exe, title) is expected, (trigger, exe, title)
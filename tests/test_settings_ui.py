@@ -57,6 +57,19 @@ def test_save_all_updates_settings_from_ui(settings_ui_setup):
         assert saved_settings.long_press_delay_ms == 1000
 
 
+def test_failed_write_behind_save_marks_window_unsaved(settings_ui_setup):
+    window, _, _, _, mock_msgbox = settings_ui_setup
+    window.is_dirty = False
+    window.btn_save.setEnabled(False)
+
+    window.store._on_write_failed(OSError("disk full"))
+
+    assert window.is_dirty is True
+    assert window.btn_save.isEnabled()
+    mock_msgbox.critical.assert_called_once()
+    assert "disk full" in mock_msgbox.critical.call_args[0][2]
+
+
 def test_dirty_flag_on_change(settings_ui_setup):
     """Test that the is_dirty flag is set when UI elements are touched"""
     window, _, _, _, _ = settings_ui_setup
@@ -0,0 +1,149 @@
+"""Tests for the compiled trigger matcher and key-event decisions."""
+
+import pytest
+
+from src.core.trigger_table import (
+    WM_KEYDOWN,
+    WM_KEYUP,
+    TriggerMatcher,
+    TriggerTable,
+    parse_trigger,
+)
+
+VK_SPACE = 0x20
+VK_CTRL_L = 0xA2
+VK_K = 0x4B
+VK_P = 0x50
+VK_X = 0x58
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_table(triggers, clock, timeouts=None):
+    table = TriggerTable(clock=clock)
+    table.set_triggers(triggers, timeouts)
+    return table
+
+
+def tap(table, vk):
+    return table.process(WM_KEYDOWN, vk), table.process(WM_KEYUP, vk)
+
+
+def test_parse_trigger_normalizes_aliases():
+    assert parse_trigger("Ctrl+K, Win+Esc") == (
+        ("k", frozenset({"ctrl"})),
+        ("escape", frozenset({"windows"})),
+    )
+
+
+def test_press_and_release_of_trigger(clock):
+    table = make_table(["ctrl+space"], clock)
+    assert table.process(WM_KEYDOWN, VK_CTRL_L) == (True, None)
+    assert table.process(WM_KEYDOWN, VK_SPACE) == (False, ("press", "ctrl+space", "space"))
+    assert table.process(WM_KEYDOWN, VK_SPACE) == (False, None)  # auto-repeat
+    assert table.process(WM_KEYUP, VK_SPACE) == (False, ("release", "ctrl+space", "space"))
+
+
+def test_recording_mode_passes_trigger(clock):
+    table = make_table(["space"], clock)
+    table.recording_mode = True
+    assert table.process(WM_KEYDOWN, VK_SPACE) == (True, None)
+
+
+def test_sequence_swallows_prefix_and_fires_on_last_stroke(clock):
+    table = make_table(["ctrl+k, p"], clock)
+    table.process(WM_KEYDOWN, VK_CTRL_L)
+    assert tap(table, VK_K) == ((False, None), (False, None))
+    table.process(WM_KEYUP, VK_CTRL_L)
+
+    clock.now = 0.5
+    assert table.process(WM_KEYDOWN, VK_P) == (False, ("press", "ctrl+k, p", "p"))
+    assert table.process(WM_KEYUP, VK_P) == (False, ("release", "ctrl+k, p", "p"))
+
+
+def test_sequence_times_out(clock):
+    table = make_table(["ctrl+k, p"], clock, timeouts={"ctrl+k, p": 0.2})
+    table.held_modifiers = {"ctrl"}
+    tap(table, VK_K)
+    table.held_modifiers = set()
+
+    clock.now = 0.3
+    assert tap(table, VK_P) == ((True, None), (True, None))
+
+
+def test_broken_sequence_judges_key_on_its_own(clock):
+    table = make_table(["ctrl+k, p", "x"], clock)
+    table.held_modifiers = {"ctrl"}
+    tap(table, VK_K)
+    table.held_modifiers = set()
+
+    assert table.process(WM_KEYDOWN, VK_X) == (False, ("press", "x", "x"))
+    # The sequence was abandoned; 'p' alone is not a trigger
+    assert table.process(WM_KEYDOWN, VK_P) == (True, None)
+
+
+def test_abandoned_prefix_is_not_replayed(clock):
+    table = make_table(["ctrl+k, p"], clock, timeouts={"ctrl+k, p": 0.2})
+    table.process(WM_KEYDOWN, VK_CTRL_L)
+    assert tap(table, VK_K) == ((False, None), (False, None))
+    table.process(WM_KEYUP, VK_CTRL_L)
+
+    # Mismatch: only the breaking stroke reaches the app, the prefix stays eaten
+    assert tap(table, VK_X) == ((True, None), (True, None))
+
+    # Timeout: same outcome
+    table.process(WM_KEYDOWN, VK_CTRL_L)
+    tap(table, VK_K)
+    table.process(WM_KEYUP, VK_CTRL_L)
+    clock.now = 0.3
+    assert tap(table, VK_X) == ((True, None), (True, None))
+    assert table._pending is None
+    assert table._swallowed == set()
+
+
+def test_sequences_share_prefix(clock):
+    table = make_table(["ctrl+k, p", "ctrl+k, x"], clock)
+    table.held_modifiers = {"ctrl"}
+    tap(table, VK_K)
+    table.held_modifiers = set()
+    assert table.process(WM_KEYDOWN, VK_X) == (False, ("press", "ctrl+k, x", "x"))
+
+
+def test_shorter_trigger_shadows_sequence():
+    matcher = TriggerMatcher(["ctrl+k, p", "ctrl+k"])
+    node = matcher.root.children[("k", frozenset({"ctrl"}))]
+    assert node.trigger == "ctrl+k"
+    assert node.children == {}
+
+
+def test_duplicate_trigger_keeps_first():
+    matcher = TriggerMatcher(["ctrl+space", "Ctrl+Space"])
+    assert matcher.root.children[("space", frozenset({"ctrl"}))].trigger == "ctrl+space"
+
+
+def test_swap_keeps_swallowed_release_suppressed(clock):
+    table = make_table(["ctrl+k, p"], clock)
+    table.held_modifiers = {"ctrl"}
+    table.process(WM_KEYDOWN, VK_K)
+    table.set_triggers([])
+    assert table.process(WM_KEYUP, VK_K) == (False, None)
+
+
+def test_lookup_cost_does_not_depend_on_trigger_count(clock):
+    """Only the first-stroke node for the pressed chord is ever examined."""
+    many = [f"ctrl+f{i % 12 + 1}, {chr(ord('a') + i % 26)}" for i in range(300)] + ["ctrl+space"]
+    table = make_table(many, clock)
+    table.held_modifiers = {"ctrl"}
+    assert table.process(WM_KEYDOWN, VK_SPACE) == (False, ("press", "ctrl+space", "space"))
+    assert len(table.matcher.root.children) == 13
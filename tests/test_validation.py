@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.core.config import AppSettings, MenuProfile
+from src.core.config import AppSettings, MenuProfile, PieSlice
 from src.ui.settings_ui import ItemEditorDialog, SettingsWindow
 
 # qapp fixture is provided by conftest.py
@@ -65,6 +65,72 @@ def test_no_conflict_different_key(validation_setup):
     dialog.accept.assert_called_once()
 
 
+def test_text_action_keeps_surrounding_spaces(validation_setup):
+    """Text snippets are saved verbatim, unlike key/url/cmd values"""
+    dialog, mock_msgbox = validation_setup
+
+    dialog.label_edit.setPlainText("Sign-off")
+    dialog.action_type_combo.setCurrentIndex(dialog.action_type_combo.findData("text"))
+    dialog.key_edit.setText(" Best regards ")
+    dialog.accept = MagicMock()
+
+    dialog.save()
+
+    mock_msgbox.warning.assert_not_called()
+    assert dialog.result_item.action_type == "text"
+    assert dialog.result_item.key == " Best regards "
+
+
+def test_direct_hotkey_saved_and_checked_against_trigger(validation_setup):
+    """A slice hotkey is stored on the item but may not equal the trigger key"""
+    dialog, mock_msgbox = validation_setup
+
+    dialog.label_edit.setPlainText("Copy")
+    dialog.action_type_combo.setCurrentIndex(dialog.action_type_combo.findData("key"))
+    dialog.key_edit.setText("ctrl+c")
+    dialog.hotkey_edit.setText("Tab")
+    dialog.accept = MagicMock()
+
+    dialog.save()
+    mock_msgbox.warning.assert_called_once()
+    dialog.accept.assert_not_called()
+
+    mock_msgbox.warning.reset_mock()
+    dialog.hotkey_edit.setText("f8")
+    dialog.save()
+    mock_msgbox.warning.assert_not_called()
+    assert dialog.result_item.hotkey == "f8"
+
+
+def test_direct_hotkey_conflicts_ignore_spelling(qapp):
+    """Hotkeys clash with triggers and other hotkeys however they are written"""
+    editing = PieSlice(label="Paste", key="ctrl+v", color="#000", hotkey="ctrl+shift+v")
+    other = PieSlice(label="Copy", key="ctrl+c", color="#000", hotkey="F8")
+    menu = MenuProfile(name="Main", trigger_key="Ctrl+Space", items=[editing, other])
+    tools = MenuProfile(name="Tools", trigger_key="shift+control+t", items=[])
+    dialog = ItemEditorDialog(
+        item=editing, trigger_key="ctrl+space", all_profiles=[menu, tools], profile=menu
+    )
+    with (
+        patch("src.ui.components.item_editor.QMessageBox") as mock_msgbox,
+        patch.object(dialog, "accept") as mock_accept,
+    ):
+        for hotkey in ("Control+Space", "Ctrl+Shift+T", "f8"):
+            mock_msgbox.warning.reset_mock()
+            dialog.hotkey_edit.setText(hotkey)
+            dialog.save()
+            mock_msgbox.warning.assert_called_once()
+        mock_accept.assert_not_called()
+
+        mock_msgbox.warning.reset_mock()
+        dialog.hotkey_edit.setText("Shift+Ctrl+V")  # The slice's own hotkey
+        dialog.save()
+        mock_msgbox.warning.assert_not_called()
+        mock_accept.assert_called_once()
+    dialog.close()
+    dialog.deleteLater()
+
+
 def test_settings_validation_empty_trigger_allowed(qapp):
     """Test that SettingsWindow allows saving a profile with no trigger key (inactive profile)"""
     with (
@@ -1,10 +1,29 @@
+import ctypes
 import sys
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 from pynput import keyboard as pynput_keyboard
 
-from src.core.win32_input import MAGIC_EXTRA_INFO, send_pynput_key_safely
+from src.core.key_timing import FakeTimingEngine, KeySequenceScheduler
+from src.core.win32_input import (
+    INPUT,
+    KEYEVENTF_EXTENDEDKEY,
+    KEYEVENTF_KEYUP,
+    KEYEVENTF_UNICODE,
+    MAGIC_EXTRA_INFO,
+    TEXT_CHUNK_INPUTS,
+    KeyInput,
+    chord_plan,
+    compile_text,
+    key_inputs,
+    send_input_chunks,
+    send_key_plan,
+    send_pynput_key_safely,
+    send_text,
+    text_inputs,
+)
 
 
 @pytest.mark.skipif(sys.platform != "win32", reason="requires Windows")
@@ -76,3 +95,140 @@ def test_send_unicode_surrogate_win32():
         assert inp.ii.ki.wVk == 0
         assert inp.ii.ki.dwFlags & 0x0004  # KEYEVENTF_UNICODE
         assert inp.ii.ki.dwExtraInfo == MAGIC_EXTRA_INFO
+
+
+# ── Batched injection (platform independent, fake user32) ───────────────────
+
+
+class FakeUser32:
+    """Records SendInput batches as lists of (vk, scan, flags, extra_info)."""
+
+    def __init__(self):
+        self.batches = []
+
+    def SendInput(self, count, inputs, size):
+        assert size == ctypes.sizeof(INPUT)
+        self.batches.append(
+            [(i.ii.ki.wVk, i.ii.ki.wScan, i.ii.ki.dwFlags, i.ii.ki.dwExtraInfo) for i in inputs]
+        )
+        return count
+
+    def MapVirtualKeyW(self, vk, _map_type):
+        return vk + 0x100
+
+
+def vk_key(vk):
+    return SimpleNamespace(vk=vk)
+
+
+def test_chord_plan_releases_in_reverse():
+    assert chord_plan(["ctrl", "shift", "s"]) == [
+        ("ctrl", True),
+        ("shift", True),
+        ("s", True),
+        ("s", False),
+        ("shift", False),
+        ("ctrl", False),
+    ]
+
+
+def test_key_inputs_from_vk_marks_extended_keys():
+    api = FakeUser32()
+    assert key_inputs(vk_key(0x41), True, api.MapVirtualKeyW) == [KeyInput(0x41, 0x141, 0)]
+    assert key_inputs(vk_key(0x25), False, api.MapVirtualKeyW) == [
+        KeyInput(0x25, 0x125, KEYEVENTF_EXTENDEDKEY | KEYEVENTF_KEYUP)
+    ]
+
+
+def test_key_inputs_uses_pynput_parameters():
+    params = {"wVk": 0x20, "wScan": 0x39, "dwFlags": 0}
+    key = SimpleNamespace(_parameters=lambda is_press: params)
+    assert key_inputs(key, True, FakeUser32().MapVirtualKeyW) == [KeyInput(0x20, 0x39, 0)]
+
+
+def test_key_inputs_surrogate_pair_uses_unicode_units():
+    def refuse(_is_press):
+        raise ValueError("surrogate")
+
+    key = SimpleNamespace(_parameters=refuse, char="😀")
+    inputs = key_inputs(key, False, FakeUser32().MapVirtualKeyW)
+    assert [i.scan for i in inputs] == [0xD83D, 0xDE00]
+    assert all(i.flags == KEYEVENTF_UNICODE | KEYEVENTF_KEYUP for i in inputs)
+
+
+def test_send_key_plan_is_one_sendinput_call():
+    api = FakeUser32()
+    send_key_plan(chord_plan([vk_key(0x11), vk_key(0x43)]), api=api)
+
+    assert len(api.batches) == 1
+    batch = api.batches[0]
+    assert [(vk, flags) for vk, _, flags, _ in batch] == [
+        (0x11, 0),
+        (0x43, 0),
+        (0x43, KEYEVENTF_KEYUP),
+        (0x11, KEYEVENTF_KEYUP),
+    ]
+    assert all(extra == MAGIC_EXTRA_INFO for *_, extra in batch)
+
+
+def test_send_key_plan_with_delay_sends_each_event():
+    api = FakeUser32()
+    scheduler = KeySequenceScheduler(FakeTimingEngine())
+    send_key_plan(
+        chord_plan([vk_key(0x11), vk_key(0x43)]), delay_s=0.01, api=api, scheduler=scheduler
+    )
+    assert [len(b) for b in api.batches] == [1, 1, 1, 1]
+    assert len(scheduler.recent[0].offsets) == 4
+
+
+def test_send_key_plan_skips_unmappable_keys():
+    api = FakeUser32()
+    send_key_plan([(SimpleNamespace(), True), (vk_key(0x41), True)], api=api)
+    assert [vk for vk, *_ in api.batches[0]] == [0x41]
+
+
+# ── Text typing ───────────────────────────────────────────────────────────────
+
+
+def test_text_inputs_unicode_and_control_keys():
+    groups = text_inputs("a\r\n😀", FakeUser32().MapVirtualKeyW)
+    assert groups[0] == (
+        KeyInput(0, ord("a"), KEYEVENTF_UNICODE),
+        KeyInput(0, ord("a"), KEYEVENTF_UNICODE | KEYEVENTF_KEYUP),
+    )
+    # CRLF becomes one Enter stroke
+    assert groups[1] == (KeyInput(0x0D, 0x10D, 0), KeyInput(0x0D, 0x10D, KEYEVENTF_KEYUP))
+    # Surrogate pair: both units down, then both up
+    assert [(i.scan, i.flags & KEYEVENTF_KEYUP) for i in groups[2]] == [
+        (0xD83D, 0),
+        (0xDE00, 0),
+        (0xD83D, KEYEVENTF_KEYUP),
+        (0xDE00, KEYEVENTF_KEYUP),
+    ]
+
+
+def test_compile_text_chunks_without_splitting_characters():
+    chunks = compile_text("ab😀cd", FakeUser32(), chunk_inputs=5)
+    assert chunks is not None
+    assert [len(c) for c in chunks] == [4, 4, 4]
+    long_chunks = compile_text("x" * 1000, FakeUser32())
+    assert long_chunks is not None
+    assert sum(len(c) for c in long_chunks) == 2000
+    assert max(len(c) for c in long_chunks) <= TEXT_CHUNK_INPUTS
+
+
+def test_send_text_one_call_per_chunk():
+    api = FakeUser32()
+    send_text("hello " * 100, api)
+    assert len(api.batches) == 3
+    assert sum(len(b) for b in api.batches) == 1200
+    assert all(extra == MAGIC_EXTRA_INFO for b in api.batches for *_, extra in b)
+
+
+def test_send_input_chunks_stops_after_blocked_call():
+    api = FakeUser32()
+    chunks = compile_text("abc", api, chunk_inputs=2)
+    assert chunks is not None
+    with patch.object(api, "SendInput", return_value=0) as mock_send:
+        assert send_input_chunks(chunks, api) == 0
+    mock_send.assert_called_once()
@@ -0,0 +1,93 @@
+"""Tests for the cached foreground window info provider."""
+
+import pytest
+
+from src.core.window_info import FakeWindowSystem, WindowInfoProvider
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def env():
+    system = FakeWindowSystem()
+    clock = FakeClock()
+    provider = WindowInfoProvider(system, clock, title_ttl_s=0.25, max_processes=2)
+    return system, clock, provider
+
+
+def test_no_system_or_window(env):
+    _, _, provider = env
+    assert WindowInfoProvider(None).get_active_window_info() == (None, None)
+    assert provider.get_active_window_info() == (None, None)
+
+
+def test_exe_is_memoized_per_pid(env):
+    system, clock, provider = env
+    system.focus(1, 100, "main.py - Code", "code.exe")
+    assert provider.get_active_window_info() == ("code.exe", "main.py - Code")
+    clock.now = 10
+    system.focus(2, 100, "other.py - Code", "code.exe")
+    assert provider.get_active_window_info() == ("code.exe", "other.py - Code")
+
+    assert system.calls["open_process"] == 1
+    assert provider.stats.exe_hits == 1
+    assert provider.stats.exe_misses == 1
+
+
+def test_title_cached_for_ttl(env):
+    system, clock, provider = env
+    system.focus(1, 100, "old", "a.exe")
+    provider.get_active_window_info()
+    system.windows[1] = (100, "new")
+
+    clock.now = 0.1
+    assert provider.get_active_window_info() == ("a.exe", "old")
+    clock.now = 0.3
+    assert provider.get_active_window_info() == ("a.exe", "new")
+    assert system.calls["window_title"] == 2
+    assert provider.stats.title_hit_rate == pytest.approx(1 / 3)
+
+
+def test_pid_reuse_after_exit_is_detected(env):
+    system, _, provider = env
+    system.focus(1, 100, "t", "old.exe")
+    provider.get_active_window_info()
+    system.kill(100)
+    system.focus(2, 100, "t", "new.exe")
+
+    assert provider.get_active_window_info() == ("new.exe", "t")
+    assert system.open_tokens == {(100, 1)}  # old handle closed
+
+
+def test_inaccessible_process_returns_title_only(env):
+    system, _, provider = env
+    system.windows[1] = (100, "Admin window")
+    system.foreground = 1
+    assert provider.get_active_window_info() == (None, "Admin window")
+    # Not cached: a later lookup asks again
+    system.processes[100] = "admin.exe"
+    assert provider.get_active_window_info()[0] == "admin.exe"
+
+
+def test_lru_eviction_closes_handles(env):
+    system, _, provider = env
+    for pid in (1, 2, 3):
+        system.focus(pid, pid, "t", f"p{pid}.exe")
+        provider.get_active_window_info()
+    assert {token[0] for token in system.open_tokens} == {2, 3}
+
+    provider.clear()
+    assert system.open_tokens == set()
+
+
+def test_errors_are_contained(env):
+    system, _, provider = env
+    system.foreground = 99  # unknown hwnd → KeyError inside the fake
+    assert provider.get_active_window_info() == (None, None)
+    assert provider.stats.lookups == 1